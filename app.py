@@ -14,9 +14,9 @@ from app.utils.logger import setup_logger
 from blueprints.error_handlers import error_handlers
 from flask_login import LoginManager, login_required, logout_user
 from flask_migrate import Migrate
-from flask_apscheduler import APScheduler
 from config import Config
-from app.extensions import migrate, scheduler, csrf
+from app.extensions import migrate, csrf
+from app.scheduler import start_scheduler
 
 # Initialize Flask extensions
 db = SQLAlchemy()
@@ -29,7 +29,6 @@ def create_app(config_class=Config):
     db.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
-    scheduler.init_app(app)
     csrf.init_app(app)
     
     login_manager.login_view = 'login'
@@ -96,15 +95,6 @@ def create_app(config_class=Config):
         logout_user()
         return redirect(url_for('login'))
     
-    # Jira synchronization scheduler
-    @scheduler.task('cron', id='sync_jira', hour='*/1')
-    def sync_jira_data():
-        with app.app_context():
-            from app.tasks.jira_sync import sync_all
-            sync_all()
-
-    scheduler.start()
-
     return app
 
 def init_test_data(app):
@@ -171,4 +161,6 @@ app = create_app()
 setup_logger(app)
 
 if __name__ == '__main__':
+    # Jira synchronization scheduler (single job set in app.scheduler)
+    start_scheduler(app)
     app.run(host='0.0.0.0', port=5003) 
\ No newline at end of file
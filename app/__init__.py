@@ -289,6 +289,9 @@ def create_app(config_object: str = "app.config.Config") -> Flask:
             # Add versioned cache control with strong ETag for static resources
             response.headers['Cache-Control'] = 'public, max-age=604800, immutable'
             response.headers['Vary'] = 'Accept-Encoding'
+        elif 'Cache-Control' in response.headers:
+            # Keep the policy chosen by the view (conditional JSON responses)
+            pass
         elif not is_html and not request.path.startswith('/api/'):
             # Default cache for non-HTML, non-API responses
             response.headers['Cache-Control'] = 'public, max-age=3600'
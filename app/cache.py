@@ -1,108 +1,730 @@
-from typing import Any, Optional, Callable
-from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from functools import wraps
 import hashlib
-import json
 import logging
-from functools import wraps
-from flask_caching import Cache
+import os
+import pickle
+import sqlite3
+import threading
+import time
 
 logger = logging.getLogger(__name__)
-cache = Cache()
 
-def init_cache(app):
-    """Inicjalizuje cache dla aplikacji."""
-    cache_config = {
-        'CACHE_TYPE': app.config.get('CACHE_TYPE', 'simple'),
-        'CACHE_DEFAULT_TIMEOUT': app.config.get('CACHE_TIMEOUT', 300),
-        'CACHE_KEY_PREFIX': app.config.get('CACHE_PREFIX', 'team_stats_'),
-        'CACHE_THRESHOLD': app.config.get('CACHE_MAX_ITEMS', 1000)
-    }
-    cache.init_app(app, config=cache_config)
+DEFAULT_NAMESPACE = 'default'
+TAG_NAMESPACE = '__tags__'
+_MISSING = object()
+
 
 def generate_cache_key(*args, **kwargs) -> str:
     """Generuje klucz cache'u na podstawie argumentów."""
     key_parts = [str(arg) for arg in args]
     key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()))
-    
+
     key_string = "|".join(key_parts)
     return hashlib.md5(key_string.encode()).hexdigest()
 
+
+def tag(kind: str, value: Any) -> str:
+    """Tag encji, np. ``tag('team', 3)`` -> ``'team:3'``."""
+    return f"{kind}:{value}"
+
+
+def month_tag(day: Any) -> str:
+    """Tag miesiąca, do którego należy data."""
+    return f"month:{day.strftime('%Y-%m')}"
+
+
+def month_tags(start: Any, end: Any) -> List[str]:
+    """Tagi wszystkich miesięcy zakresu dat (włącznie)."""
+    if isinstance(start, datetime):
+        start = start.date()
+    if isinstance(end, datetime):
+        end = end.date()
+    tags = []
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        tags.append(month_tag(month))
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return tags
+
+
+def _new_tag_version() -> bytes:
+    return os.urandom(8).hex().encode('ascii')
+
+
+class CacheMetrics:
+    """Liczniki trafień, chybień i usunięć per przestrzeń nazw."""
+
+    FIELDS = ('hits', 'shared_hits', 'misses', 'sets', 'evictions', 'coalesced', 'stale', 'invalidations', 'errors')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def incr(self, namespace: str, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[namespace][field] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for namespace, counts in self._counts.items():
+                lookups = counts['hits'] + counts['shared_hits'] + counts['misses']
+                result[namespace] = dict(counts, hit_ratio=round(
+                    (counts['hits'] + counts['shared_hits']) / lookups, 4) if lookups else 0.0)
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class LocalLRU:
+    """Cache w pamięci procesu ograniczony liczbą wpisów i rozmiarem w bajtach.
+
+    Wartości trzymane są zserializowane, więc rozmiar jest znany dokładnie,
+    a zwrócony obiekt można modyfikować bez psucia cache'u. Wygasłe wpisy
+    usuwane są przy odczycie albo gdy wypadną z końca LRU - bez
+    okresowego przeglądania całości.
+    """
+
+    def __init__(self, max_items: int, max_bytes: int, metrics: CacheMetrics):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._metrics = metrics
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            blob, expires, _ = entry
+            if expires is not None and expires <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return blob
+
+    def set(self, key: str, blob: bytes, timeout: Optional[float], namespace: str) -> None:
+        with self._lock:
+            self._pop(key)
+            if len(blob) > self.max_bytes:
+                return
+            self._entries[key] = (blob, time.time() + timeout if timeout else None, namespace)
+            self._bytes += len(blob)
+            while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+                _, (old, _, old_namespace) = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+                self._metrics.incr(old_namespace, 'evictions')
+
+    def add(self, key: str, blob: bytes, timeout: Optional[float], namespace: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return False
+        self.set(key, blob, timeout, namespace)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self, prefix: str = '') -> None:
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+
+class SQLiteBackend:
+    """Współdzielony cache w pliku SQLite - dla wdrożeń bez Redisa."""
+
+    name = 'sqlite'
+    PURGE_EVERY = 500  # co tyle zapisów usuwane są wygasłe wiersze
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_entries ('
+                     'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires)')
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def ping(self) -> bool:
+        self._conn().execute('SELECT 1')
+        return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, blob: bytes, timeout: Optional[float]) -> None:
+        self._conn().execute('INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+                             (key, blob, time.time() + timeout if timeout else None))
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._conn().execute('DELETE FROM cache_entries WHERE expires <= ?', (time.time(),))
+
+    def add(self, key: str, blob: bytes, timeout: Optional[float]) -> bool:
+        conn = self._conn()
+        now = time.time()
+        conn.execute('DELETE FROM cache_entries WHERE key = ? AND expires <= ?', (key, now))
+        cursor = conn.execute('INSERT OR IGNORE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+                              (key, blob, now + timeout if timeout else None))
+        return cursor.rowcount == 1
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT key, value FROM cache_entries WHERE key IN ({','.join('?' * len(chunk))}) "
+                "AND (expires IS NULL OR expires > ?)", (*chunk, time.time())
+            )
+            found.update(rows)
+        return found
+
+    def delete(self, key: str) -> None:
+        self._conn().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def clear(self, prefix: str = '') -> None:
+        if prefix:
+            self._conn().execute('DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+        else:
+            self._conn().execute('DELETE FROM cache_entries')
+
+
+class RedisBackend:
+    """Współdzielony cache w Redisie."""
+
+    name = 'redis'
+
+    def __init__(self, url: str):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+
+    def ping(self) -> bool:
+        return bool(self._client.ping())
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, blob: bytes, timeout: Optional[float]) -> None:
+        self._client.set(key, blob, px=int(timeout * 1000) if timeout else None)
+
+    def add(self, key: str, blob: bytes, timeout: Optional[float]) -> bool:
+        return bool(self._client.set(key, blob, nx=True, px=int(timeout * 1000) if timeout else None))
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        return {key: value for key, value in zip(keys, self._client.mget(keys)) if value is not None}
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def clear(self, prefix: str = '') -> None:
+        batch = []
+        for key in self._client.scan_iter(match=f"{prefix}*", count=1000):
+            batch.append(key)
+            if len(batch) >= 500:
+                self._client.delete(*batch)
+                batch = []
+        if batch:
+            self._client.delete(*batch)
+
+
+class _Uncacheable(Exception):
+    """Odpowiedź widoku, której nie zapisujemy (błąd, strumień)."""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class TieredCache:
+    """Jedyny cache aplikacji: LRU w procesie przed współdzielonym backendem.
+
+    Odczyt sprawdza najpierw LRU procesu, potem backend współdzielony
+    (Redis, a bez niego plik SQLite - ``CACHE_TYPE``) i kopiuje trafienie
+    do LRU. Wpisy w LRU żyją najwyżej ``CACHE_LOCAL_TIMEOUT`` sekund, co
+    ogranicza nieaktualność między procesami. Klucze mają przestrzenie
+    nazw - można je czyścić osobno, a metryki liczone są per przestrzeń.
+    :meth:`get_or_set` (i dekoratory na nim oparte) liczy brakującą
+    wartość tylko raz: pozostałe wątki i procesy czekają na wynik zamiast
+    równocześnie odpytywać bazę. Błędy backendu są logowane i traktowane
+    jak chybienie.
+
+    Wpis może dostać tagi encji, z których powstał (``tags=[tag('team',
+    3), ...]``). Zapamiętuje ich wersje, a :meth:`invalidate_tags` nadaje
+    tagom nowe - wpis z nieaktualną wersją jest przy odczycie chybieniem.
+    Dzięki temu dane zależne od zmienionych encji znikają od razu w
+    procesie, który je zmienił, a w pozostałych najpóźniej po
+    ``CACHE_LOCAL_TIMEOUT`` (zob. ``app.models.cache_tags``), a czasy życia
+    mogą być długie.
+    """
+
+    def __init__(self, app=None):
+        self.metrics = CacheMetrics()
+        self.default_timeout = 300
+        self._local = LocalLRU(1000, 64 * 1024 * 1024, self.metrics)
+        self._local_timeout = 60
+        self._lock_timeout = 30
+        self._shared = None
+        self._enabled = True
+        self._prefix = ''
+        self._flights: Dict[str, list] = {}
+        self._flights_lock = threading.Lock()
+        self._tags: Dict[str, bytes] = {}  # wersje tagów, gdy nie ma backendu współdzielonego
+        self._known_tags: Dict[str, Tuple[bytes, float]] = {}  # wersje z backendu i czas ich pobrania
+        self._tags_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, config: Optional[Dict[str, Any]] = None) -> None:
+        """Konfiguruje cache z ``app.config`` (``config`` nadpisuje pojedyncze klucze)."""
+        config = dict(app.config, **(config or {}))
+        cache_type = str(config.get('CACHE_TYPE', 'sqlite')).lower()
+        cache_type = {'simplecache': 'simple', 'nullcache': 'null', 'rediscache': 'redis'}.get(cache_type, cache_type)
+
+        self._enabled = cache_type != 'null'
+        self.default_timeout = config.get('CACHE_DEFAULT_TIMEOUT', 300)
+        self._prefix = config.get('CACHE_KEY_PREFIX', '') or ''
+        self._local = LocalLRU(
+            config.get('CACHE_LOCAL_MAX_ITEMS', 1000),
+            config.get('CACHE_LOCAL_MAX_BYTES', 64 * 1024 * 1024),
+            self.metrics
+        )
+        self._local_timeout = config.get('CACHE_LOCAL_TIMEOUT', 60)
+        self._lock_timeout = config.get('CACHE_LOCK_TIMEOUT', 30)
+        self._shared = self._create_backend(cache_type, config, app) if self._enabled else None
+        self._known_tags = {}
+        app.extensions['cache'] = self
+        logger.info(f"Cache initialized: type={cache_type}, shared backend={self.backend_name}")
+
+    @staticmethod
+    def _create_backend(cache_type: str, config: Dict[str, Any], app):
+        if cache_type == 'redis':
+            url = config.get('CACHE_REDIS_URL') or config.get('REDIS_URL')
+            if url:
+                try:
+                    backend = RedisBackend(url)
+                    backend.ping()
+                    return backend
+                except Exception as e:
+                    logger.warning(f"Redis cache unavailable ({str(e)}), falling back to SQLite")
+            cache_type = 'sqlite'
+        if cache_type == 'sqlite':
+            path = config.get('CACHE_SQLITE_PATH') or os.path.join(app.instance_path, 'cache.sqlite3')
+            return SQLiteBackend(path)
+        return None
+
+    @property
+    def backend_name(self) -> str:
+        if not self._enabled:
+            return 'null'
+        return self._shared.name if self._shared else 'local'
+
+    def _key(self, namespace: str, key: Any) -> str:
+        return f"{self._prefix}{namespace}:{key}"
+
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """``None`` - domyślny czas, ``0`` - bez wygasania."""
+        timeout = self.default_timeout if timeout is None else timeout
+        return timeout or None
+
+    def _local_ttl(self, timeout: Optional[float]) -> Optional[float]:
+        if self._shared is None:
+            return timeout
+        return min(timeout, self._local_timeout) if timeout else self._local_timeout
+
+    def _shared_call(self, namespace: str, method: str, *args, default=None):
+        try:
+            return getattr(self._shared, method)(*args)
+        except Exception as e:
+            self.metrics.incr(namespace, 'errors')
+            logger.warning(f"Shared cache {method} failed: {str(e)}")
+            return default
+
+    def _decode(self, namespace: str, full_key: str, blob: bytes) -> Any:
+        """Wartość wpisu albo ``_MISSING``, jeśli któryś z jego tagów został unieważniony."""
+        versions, value = pickle.loads(blob)
+        # Najpierw wersje pamiętane w procesie; backend pytamy dopiero, gdy się nie zgadzają
+        if versions and self._tag_versions(versions, cached=True) != versions \
+                and (self._shared is None or self._tag_versions(versions) != versions):
+            self._local.delete(full_key)
+            self.metrics.incr(namespace, 'stale')
+            return _MISSING
+        return value
+
+    def _lookup(self, namespace: str, key: Any, record: bool = True) -> Any:
+        if not self._enabled:
+            if record:
+                self.metrics.incr(namespace, 'misses')
+            return _MISSING
+        full_key = self._key(namespace, key)
+        value = _MISSING
+        blob = self._local.get(full_key)
+        if blob is not None:
+            value = self._decode(namespace, full_key, blob)
+            if value is not _MISSING:
+                if record:
+                    self.metrics.incr(namespace, 'hits')
+                return value
+        elif self._shared is not None:
+            blob = self._shared_call(namespace, 'get', full_key)
+            if blob is not None:
+                value = self._decode(namespace, full_key, blob)
+            if value is not _MISSING:
+                self._local.set(full_key, blob, self._local_timeout, namespace)
+                if record:
+                    self.metrics.incr(namespace, 'shared_hits')
+                return value
+        if record:
+            self.metrics.incr(namespace, 'misses')
+        return _MISSING
+
+    def get(self, key: Any, namespace: str = DEFAULT_NAMESPACE, default: Any = None) -> Any:
+        value = self._lookup(namespace, key)
+        return default if value is _MISSING else value
+
+    def set(self, key: Any, value: Any, timeout: Optional[float] = None, namespace: str = DEFAULT_NAMESPACE,
+            tags: Optional[Iterable[str]] = None) -> bool:
+        """Zapisuje wartość; ``tags`` to encje, których zmiana ma unieważnić wpis."""
+        if not self._enabled:
+            return False
+        versions = self._tag_versions(tags, create=True) if tags else None
+        return self._store(namespace, key, value, timeout, versions)
+
+    def _store(self, namespace: str, key: Any, value: Any, timeout: Optional[float],
+               versions: Optional[Dict[str, bytes]]) -> bool:
+        if versions is not None and None in versions.values():
+            return False  # bez wersji tagów nie da się później sprawdzić aktualności
+        timeout = self._timeout(timeout)
+        full_key = self._key(namespace, key)
+        blob = pickle.dumps((versions, value), protocol=pickle.HIGHEST_PROTOCOL)
+        self._local.set(full_key, blob, self._local_ttl(timeout), namespace)
+        if self._shared is not None:
+            self._shared_call(namespace, 'set', full_key, blob, timeout)
+        self.metrics.incr(namespace, 'sets')
+        return True
+
+    def add(self, key: Any, value: Any, timeout: Optional[float] = None, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Zapisuje wartość tylko, gdy klucza nie ma - atomowo także między procesami."""
+        if not self._enabled:
+            return True
+        timeout = self._timeout(timeout)
+        full_key = self._key(namespace, key)
+        blob = pickle.dumps((None, value), protocol=pickle.HIGHEST_PROTOCOL)
+        if self._shared is not None:
+            return bool(self._shared_call(namespace, 'add', full_key, blob, timeout, default=False))
+        return self._local.add(full_key, blob, timeout, namespace)
+
+    def delete(self, key: Any, namespace: str = DEFAULT_NAMESPACE) -> None:
+        full_key = self._key(namespace, key)
+        self._local.delete(full_key)
+        if self._shared is not None:
+            self._shared_call(namespace, 'delete', full_key)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Czyści jedną przestrzeń nazw albo cały cache aplikacji."""
+        prefix = self._key(namespace, '') if namespace else self._prefix
+        self._local.clear(prefix)
+        if namespace in (None, TAG_NAMESPACE):
+            with self._tags_lock:
+                self._known_tags.clear()
+        if self._shared is not None:
+            self._shared_call(namespace or DEFAULT_NAMESPACE, 'clear', prefix)
+        logger.info(f"Cache cleared: {namespace or 'all namespaces'}")
+
+    def _tag_versions(self, tags: Iterable[str], create: bool = False,
+                      cached: bool = False) -> Optional[Dict[str, Optional[bytes]]]:
+        """Bieżące wersje tagów (``None`` dla tagu bez wersji); ``None``, gdy backend nie odpowiada.
+
+        Z ``cached`` wersje pobrane z backendu w ciągu ostatnich
+        ``CACHE_LOCAL_TIMEOUT`` sekund są brane z pamięci procesu - tyle samo
+        może być nieaktualne LRU, więc trafienia w nim nie kosztują zapytania.
+        """
+        tags = sorted(set(tags))
+        if self._shared is None:
+            with self._tags_lock:
+                if create:
+                    for name in tags:
+                        self._tags.setdefault(name, _new_tag_version())
+                return {name: self._tags.get(name) for name in tags}
+
+        if cached:
+            now = time.monotonic()
+            with self._tags_lock:
+                known = {name: self._known_tags.get(name) for name in tags}
+            if all(entry and now - entry[1] < self._local_timeout for entry in known.values()):
+                return {name: entry[0] for name, entry in known.items()}
+
+        keys = [self._key(TAG_NAMESPACE, name) for name in tags]
+        found = self._shared_call(TAG_NAMESPACE, 'get_many', keys)
+        if found is None:
+            return None
+        versions = {name: found.get(key) for name, key in zip(tags, keys)}
+        if create:
+            for name, key in zip(tags, keys):
+                if versions[name] is None:
+                    version = _new_tag_version()
+                    if not self._shared_call(TAG_NAMESPACE, 'add', key, version, None, default=False):
+                        version = self._shared_call(TAG_NAMESPACE, 'get', key)
+                    versions[name] = version
+        self._remember_tags(versions)
+        return versions
+
+    def _remember_tags(self, versions: Dict[str, Optional[bytes]]) -> None:
+        now = time.monotonic()
+        with self._tags_lock:
+            for name, version in versions.items():
+                if version is None:
+                    self._known_tags.pop(name, None)
+                else:
+                    self._known_tags[name] = (version, now)
+
+    def tag_versions(self, tags: Iterable[str]) -> Optional[Dict[str, bytes]]:
+        """Bieżące wersje tagów (brakujące są tworzone), np. dla walidatorów HTTP.
+
+        ``None``, gdy cache jest wyłączony albo backend nie odpowiada.
+        """
+        if not self._enabled:
+            return None
+        versions = self._tag_versions(tags, create=True)
+        if versions is None or None in versions.values():
+            return None
+        return versions
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Unieważnia wszystkie wpisy oznaczone którymkolwiek z tagów.
+
+        Tag dostaje nową losową wersję; wpisy zapamiętały wersje z chwili
+        zapisu, więc przy następnym odczycie okażą się nieaktualne - bez
+        wyszukiwania ich po kluczach, w każdym procesie (w innych niż ten
+        najpóźniej po ``CACHE_LOCAL_TIMEOUT``).
+        """
+        tags = sorted(set(tags))
+        if not self._enabled or not tags:
+            return
+        if self._shared is None:
+            with self._tags_lock:
+                for name in tags:
+                    self._tags[name] = _new_tag_version()
+        else:
+            versions = {name: _new_tag_version() for name in tags}
+            for name, version in versions.items():
+                self._shared_call(TAG_NAMESPACE, 'set', self._key(TAG_NAMESPACE, name), version, None)
+            self._remember_tags(versions)  # ten proces widzi unieważnienie od razu
+        self.metrics.incr(TAG_NAMESPACE, 'invalidations', len(tags))
+        logger.debug(f"Invalidated cache tags: {', '.join(tags)}")
+
+    def get_or_set(self, key: Any, creator: Callable[[], Any], timeout: Optional[float] = None,
+                   namespace: str = DEFAULT_NAMESPACE, tags: Optional[Iterable[str]] = None) -> Any:
+        """Wartość z cache'u albo wynik ``creator()`` - liczony raz dla wszystkich czekających."""
+        value = self._lookup(namespace, key)
+        if value is not _MISSING:
+            return value
+        if not self._enabled:
+            return creator()
+
+        full_key = self._key(namespace, key)
+        with self._flight(full_key):
+            value = self._lookup(namespace, key, record=False)
+            if value is not _MISSING:
+                self.metrics.incr(namespace, 'coalesced')
+                return value
+            # Wersje tagów sprzed obliczenia: zmiana danych w jego trakcie unieważni wynik
+            versions = self._tag_versions(tags, create=True) if tags else None
+            return self._compute(namespace, key, full_key, creator, timeout, versions)
+
+    def _compute(self, namespace: str, key: Any, full_key: str, creator: Callable[[], Any],
+                 timeout: Optional[float], versions: Optional[Dict[str, bytes]]) -> Any:
+        lock_key = f"{full_key}:lock"
+        if self._shared is None or self._shared_call(namespace, 'add', lock_key, b'1', self._lock_timeout,
+                                                     default=True):
+            try:
+                value = creator()
+                self._store(namespace, key, value, timeout, versions)
+                return value
+            finally:
+                if self._shared is not None:
+                    self._shared_call(namespace, 'delete', lock_key)
+
+        # Inny proces już liczy tę wartość - czekamy na jego wynik
+        deadline = time.monotonic() + self._lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            blob = self._shared_call(namespace, 'get', full_key)
+            if blob is not None:
+                value = self._decode(namespace, full_key, blob)
+                if value is not _MISSING:
+                    self._local.set(full_key, blob, self._local_timeout, namespace)
+                    self.metrics.incr(namespace, 'coalesced')
+                    return value
+            if self._shared_call(namespace, 'get', lock_key) is None:
+                break
+        value = creator()
+        self._store(namespace, key, value, timeout, versions)
+        return value
+
+    @contextmanager
+    def _flight(self, key: str):
+        with self._flights_lock:
+            entry = self._flights.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._flights_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._flights[key]
+
+    def memoize(self, timeout: Optional[float] = None, namespace: Optional[str] = None,
+                tags: Optional[Callable[..., Iterable[str]]] = None) -> Callable:
+        """Dekorator cache'ujący wynik funkcji per argumenty.
+
+        ``tags`` dostaje te same argumenty co funkcja i zwraca tagi wpisu.
+        """
+        def decorator(f: Callable) -> Callable:
+            ns = namespace or f"{f.__module__}.{f.__qualname__}"
+
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                key = generate_cache_key(*args, **kwargs)
+                return self.get_or_set(key, lambda: f(*args, **kwargs), timeout, ns,
+                                       tags=tags(*args, **kwargs) if tags else None)
+            wrapper.uncached = f
+            wrapper.cache_namespace = ns
+            return wrapper
+        return decorator
+
+    def delete_memoized(self, f: Callable, *args, **kwargs) -> None:
+        """Usuwa wynik funkcji dla podanych argumentów albo wszystkie jej wyniki."""
+        if args or kwargs:
+            self.delete(generate_cache_key(*args, **kwargs), f.cache_namespace)
+        else:
+            self.clear(f.cache_namespace)
+
+    def cached(self, timeout: Optional[float] = None, namespace: str = 'views',
+               tags: Optional[Callable[..., Iterable[str]]] = None,
+               vary: Optional[Callable[..., Any]] = None) -> Callable:
+        """Dekorator widoku: cache'uje odpowiedzi 200 per ścieżka i parametry zapytania.
+
+        ``tags`` dostaje argumenty widoku i zwraca tagi odpowiedzi. ``vary``
+        (te same argumenty) zwraca to, od czego odpowiedź zależy poza
+        zapytaniem, np. domyślny okres liczony od dzisiaj - trafia do klucza.
+        """
+        def decorator(f: Callable) -> Callable:
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                from flask import current_app, make_response, request
+
+                def render():
+                    response = make_response(f(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        raise _Uncacheable(response)
+                    headers = [(k, v) for k, v in response.headers.items() if k.lower() != 'set-cookie']
+                    return response.get_data(), response.status_code, headers
+
+                key_parts = [request.path, *sorted(request.args.items(multi=True))]
+                extra = vary(*args, **kwargs) if vary else None
+                if extra is not None:
+                    key_parts.append(('vary', extra))
+                key = generate_cache_key(*key_parts)
+                try:
+                    body, status, headers = self.get_or_set(key, render, timeout, namespace,
+                                                            tags=tags(*args, **kwargs) if tags else None)
+                except _Uncacheable as e:
+                    return e.response
+                return current_app.response_class(body, status=status, headers=headers)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """Metryki per przestrzeń nazw i zajętość LRU procesu."""
+        return {
+            'backend': self.backend_name,
+            'local': {
+                'items': len(self._local),
+                'bytes': self._local.size_bytes,
+                'max_items': self._local.max_items,
+                'max_bytes': self._local.max_bytes
+            },
+            'namespaces': self.metrics.snapshot()
+        }
+
+
+cache = TieredCache()
+
+
+def init_cache(app):
+    """Inicjalizuje cache dla aplikacji."""
+    cache.init_app(app)
+
+
 def cache_stats(timeout: Optional[int] = None):
     """Dekorator do cache'owania wyników funkcji statystyk."""
     def decorator(f: Callable) -> Callable:
-        @wraps(f)
-        def wrapper(*args, **kwargs):
-            # Generuj klucz cache'u
-            cache_key = generate_cache_key(
-                f.__name__,
-                *args,
-                **kwargs
-            )
-            
-            # Spróbuj pobrać z cache'u
-            result = cache.get(cache_key)
-            if result is not None:
-                logger.debug(f"Cache hit for {cache_key}")
-                return result
-            
-            # Wykonaj funkcję i zapisz wynik w cache'u
-            result = f(*args, **kwargs)
-            cache.set(cache_key, result, timeout=timeout)
-            logger.debug(f"Cache miss for {cache_key}")
-            
-            return result
-        return wrapper
+        return cache.memoize(timeout=timeout, namespace=f"stats.{f.__name__}")(f)
     return decorator
 
+
 def invalidate_team_cache(team_id: int) -> None:
     """Unieważnia cache dla danego zespołu."""
-    pattern = f"team_{team_id}_*"
-    cache.delete_many(pattern)
+    cache.invalidate_tags(tag('team', team_id))
     logger.info(f"Invalidated cache for team {team_id}")
 
-def clear_expired_cache() -> None:
-    """Czyści wygasłe wpisy z cache'u."""
-    if hasattr(cache, 'clear_expired'):
-        cache.clear_expired()
-        logger.info("Cleared expired cache entries")
 
 class CacheManager:
     """Klasa do zarządzania cache'm."""
-    
+
     def __init__(self, app=None):
         self.app = app
         if app is not None:
             self.init_app(app)
-    
+
     def init_app(self, app):
         """Inicjalizuje manager cache'u dla aplikacji."""
         self.app = app
         init_cache(app)
-        
-        # Dodaj zadanie czyszczenia cache'u do harmonogramu
-        if app.config.get('CACHE_CLEANUP_ENABLED', True):
-            self.schedule_cache_cleanup()
-    
-    def schedule_cache_cleanup(self):
-        """Planuje regularne czyszczenie cache'u."""
-        from apscheduler.schedulers.background import BackgroundScheduler
-        scheduler = BackgroundScheduler()
-        
-        interval = self.app.config.get('CACHE_CLEANUP_INTERVAL', 3600)  # domyślnie co godzinę
-        scheduler.add_job(
-            clear_expired_cache,
-            'interval',
-            seconds=interval,
-            id='cache_cleanup'
-        )
-        scheduler.start()
-    
+
     def get_cache_stats(self) -> dict:
         """Zwraca statystyki cache'u."""
-        return {
-            'size': len(cache.cache._cache),
-            'hits': cache.cache.hits,
-            'misses': cache.cache.misses,
-            'maxsize': cache.cache.maxsize,
-            'currsize': cache.cache.currsize
-        } 
\ No newline at end of file
+        return cache.stats()
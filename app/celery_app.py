@@ -12,7 +12,7 @@ celery.conf.update(
     task_serializer='json',
     accept_content=['json'],
     result_serializer='json',
-    include=['app.tasks.jira_sync']
+    include=['app.tasks.jira_sync', 'app.tasks']
 )
 
 if __name__ == '__main__':
@@ -228,6 +228,13 @@ def migrate_all_command():
             click.echo('Error migrating holidays table')
             return
 
+        from migrations.add_holiday_updated_at import upgrade as upgrade_holiday_updated_at
+        if upgrade_holiday_updated_at():
+            click.echo('Successfully added holiday updated_at column')
+        else:
+            click.echo('Error adding holiday updated_at column')
+            return
+
         # Run leave balances migration
         from migrations.add_leave_balances import upgrade as upgrade_leave_balances
         if upgrade_leave_balances():
@@ -1,7 +1,12 @@
 import click
+from flask import current_app
 from flask.cli import with_appcontext
 from app.models import Report
 from app.extensions import db
+from app.services.report_jobs import get_report_job_queue
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import json
 import logging
 from datetime import datetime
 from croniter import croniter
@@ -21,9 +26,72 @@ def should_run_report(report: Report) -> bool:
         logger.error(f"Error checking report schedule: {str(e)}")
         return False
 
+def run_due_reports(reports: List[Report], backend: Optional[str] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Run reports through the report job queue and return per-report timings.
+
+    Reports with the same type and parameters share one computation: the
+    first of each group is queued, the others receive a copy of its
+    result. Groups run concurrently on the queue's worker pool, and a group
+    whose data version has not changed since its last completed result is
+    answered from that result without recomputing. ``seconds`` is the
+    computation time of the report's own result, 0 when it was reused.
+    """
+    queue = get_report_job_queue()
+    timeout = timeout if timeout is not None else current_app.config.get('REPORT_JOB_TIMEOUT', 3600)
+
+    groups = OrderedDict()
+    for report in reports:
+        key = (report.report_type, json.dumps(report.get_parameters(), sort_keys=True, default=str))
+        groups.setdefault(key, []).append(report)
+
+    # Queue one computation per group first so they all run in parallel
+    queued = {}
+    for key, members in groups.items():
+        leader = members[0]
+        try:
+            result, reused = queue.submit(leader.report_type, leader.get_parameters(), report_id=leader.id,
+                                          backend=backend)
+            queued[key] = (result.id, reused)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error queueing report {leader.name}: {str(e)}")
+            queued[key] = (None, False)
+
+    timings = []
+    for key, members in groups.items():
+        result_id, reused = queued[key]
+        result = queue.wait(result_id, timeout) if result_id else None
+        status = result.status if result else 'failed'
+        # Waiting for the groups before this one is not this report's time
+        seconds = 0.0 if reused or result is None else result.execution_time or 0.0
+        for index, report in enumerate(members):
+            entry = {
+                'report_id': report.id,
+                'report': report.name,
+                'result_id': result_id,
+                'status': status,
+                'reused': reused,
+                'shared_with': None,
+                'seconds': round(seconds, 3)
+            }
+            if index and status == 'completed':
+                copy, _ = queue.submit(report.report_type, report.get_parameters(), report_id=report.id,
+                                       backend=backend)
+                entry.update(result_id=copy.id, status=copy.status, reused=True,
+                             shared_with=members[0].id, seconds=round(copy.execution_time or 0.0, 3))
+            if entry['status'] == 'completed':
+                report.last_run_at = datetime.utcnow()
+            logger.info(f"Scheduled report {report.name}: {entry['status']} in {entry['seconds']:.3f}s"
+                        f"{' (reused)' if entry['reused'] else ''}")
+            timings.append(entry)
+    db.session.commit()
+    return timings
+
 @click.command('run-scheduled-reports')
+@click.option('--backend', default=None, help='Report job backend (thread, celery, inline).')
 @with_appcontext
-def run_scheduled_reports_command():
+def run_scheduled_reports_command(backend):
     """Run all scheduled reports that are due."""
     try:
         reports = Report.query.filter(
@@ -31,21 +99,16 @@ def run_scheduled_reports_command():
             Report.schedule.isnot(None)
         ).all()
         
-        run_count = 0
-        error_count = 0
+        due = [report for report in reports if should_run_report(report)]
+        timings = run_due_reports(due, backend=backend)
         
-        for report in reports:
-            if should_run_report(report):
-                try:
-                    result = report.run()
-                    if result and result.status == 'completed':
-                        run_count += 1
-                    else:
-                        error_count += 1
-                except Exception as e:
-                    logger.error(f"Error running report {report.name}: {str(e)}")
-                    error_count += 1
+        for entry in timings:
+            suffix = f", shared with report {entry['shared_with']}" if entry['shared_with'] else ''
+            reused = ', reused' if entry['reused'] else ''
+            click.echo(f"{entry['report']}: {entry['status']} in {entry['seconds']:.3f}s{reused}{suffix}")
         
+        run_count = sum(1 for entry in timings if entry['status'] == 'completed')
+        error_count = len(timings) - run_count
         click.echo(f"Ran {run_count} reports successfully, {error_count} failed")
     except Exception as e:
         logger.error(f"Error running scheduled reports: {str(e)}")
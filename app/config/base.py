@@ -76,6 +76,29 @@ class Config:
     JIRA_USERNAME = os.environ.get('JIRA_USERNAME')
     JIRA_API_TOKEN = os.environ.get('JIRA_API_TOKEN')
     VERIFY_SSL = os.environ.get('VERIFY_SSL', 'True').lower() == 'true'
+
+    # Synchronizacja worklogów
+    WORKLOG_UPSERT_CHUNK_SIZE = int(os.environ.get('WORKLOG_UPSERT_CHUNK_SIZE', '500'))
+    JIRA_FETCH_CONCURRENCY = int(os.environ.get('JIRA_FETCH_CONCURRENCY', '8'))
+    JIRA_FETCH_RATE = float(os.environ.get('JIRA_FETCH_RATE', '10'))  # zapytań na sekundę
+    JIRA_FETCH_QUEUE_SIZE = int(os.environ.get('JIRA_FETCH_QUEUE_SIZE', '100'))
+    JIRA_USER_PAGE_SIZE = int(os.environ.get('JIRA_USER_PAGE_SIZE', '1000'))  # użytkowników na stronę /user/search
+    SYNC_SCHEDULER = os.environ.get('SYNC_SCHEDULER', 'apscheduler')  # apscheduler, celery lub none
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'True').lower() == 'true'  # harmonogram w procesach web (wsgi.py, run.py)
+    SYNC_LEASE_SECONDS = int(os.environ.get('SYNC_LEASE_SECONDS', '7200'))
+    SYNC_LEASE_HEARTBEAT_SECONDS = int(os.environ.get('SYNC_LEASE_HEARTBEAT_SECONDS', '0'))  # 0 = co 1/3 czasu blokady
+    SYNC_RESUME_MAX_ATTEMPTS = int(os.environ.get('SYNC_RESUME_MAX_ATTEMPTS', '3'))  # potem przerwany przebieg zaczyna się od nowa
+    JIRA_SEARCH_PAGE_SIZE = int(os.environ.get('JIRA_SEARCH_PAGE_SIZE', '100'))  # zadań na stronę wyszukiwania JQL
+    JIRA_READ_CACHE_TTL = int(os.environ.get('JIRA_READ_CACHE_TTL', '300'))  # wyniki JQL świeże przez tyle sekund
+    JIRA_READ_CACHE_STALE = int(os.environ.get('JIRA_READ_CACHE_STALE', '1800'))  # potem podawane i odświeżane w tle
+
+    # Raporty
+    REPORT_ANALYTICS_BACKEND = os.environ.get('REPORT_ANALYTICS_BACKEND', 'python')  # python lub numpy (kolumnowy)
+    REPORT_JOB_BACKEND = os.environ.get('REPORT_JOB_BACKEND', 'thread')  # thread, celery lub inline
+    REPORT_JOB_WORKERS = int(os.environ.get('REPORT_JOB_WORKERS', '2'))  # wątki lokalnej puli raportów
+    REPORT_JOB_TIMEOUT = int(os.environ.get('REPORT_JOB_TIMEOUT', '3600'))  # po tylu sekundach zadanie uznajemy za porzucone
+    REPORT_JOB_MAX_WAIT = int(os.environ.get('REPORT_JOB_MAX_WAIT', '30'))  # maks. czas long-pollingu statusu
+    WORKLOG_STATS_CACHE_TIMEOUT = int(os.environ.get('WORKLOG_STATS_CACHE_TIMEOUT', '3600'))  # statystyki listy worklogów (unieważniane tagami)
     
     # Podstawowa konfiguracja
     BASE_DIR = Path(__file__).parent.parent.parent
@@ -119,9 +142,20 @@ class Config:
     OPENAPI_URL_PREFIX = '/api/docs'
     OPENAPI_SWAGGER_UI_PATH = '/swagger'
     
-    # Cache settings
-    CACHE_TYPE = 'simple'
+    # Cache settings - LRU w procesie przed współdzielonym backendem
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'sqlite')  # redis | sqlite | simple (tylko LRU) | null
     CACHE_DEFAULT_TIMEOUT = 300
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or os.environ.get('REDIS_URL')
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH')  # domyślnie instance/cache.sqlite3
+    CACHE_LOCAL_MAX_ITEMS = int(os.environ.get('CACHE_LOCAL_MAX_ITEMS', '1000'))
+    CACHE_LOCAL_MAX_BYTES = int(os.environ.get('CACHE_LOCAL_MAX_BYTES', str(64 * 1024 * 1024)))
+    CACHE_LOCAL_TIMEOUT = int(os.environ.get('CACHE_LOCAL_TIMEOUT', '60'))  # maks. nieaktualność między procesami
+    CACHE_LOCK_TIMEOUT = int(os.environ.get('CACHE_LOCK_TIMEOUT', '30'))  # single-flight między procesami
+    BUSINESS_CALENDAR_TTL = int(os.environ.get('BUSINESS_CALENDAR_TTL', '300'))  # kalendarz świąt, gdy cache nie odpowiada
+    CACHE_WARMUP_ENABLED = os.environ.get('CACHE_WARMUP_ENABLED', 'True').lower() == 'true'  # rozgrzewanie po synchronizacji
+    CACHE_WARMUP_TOP_N = int(os.environ.get('CACHE_WARMUP_TOP_N', '10'))  # najczęstszych zestawów parametrów na widok
+    CACHE_WARMUP_LOOKBACK_DAYS = int(os.environ.get('CACHE_WARMUP_LOOKBACK_DAYS', '30'))  # pomijaj nieużywane dłużej
+    CACHE_WARMUP_FLUSH_SECONDS = float(os.environ.get('CACHE_WARMUP_FLUSH_SECONDS', '60'))  # co ile zapisywać liczniki żądań
     
     # Security settings
     WTF_CSRF_ENABLED = True
@@ -136,6 +170,13 @@ class Config:
     REQUEST_TIMEOUT = 30
     JIRA_TIMEOUT = 10
 
+    # Pula połączeń HTTP do JIRA
+    JIRA_HTTP_POOL_SIZE = int(os.environ.get('JIRA_HTTP_POOL_SIZE', '20'))  # połączeń na host
+    JIRA_HTTP_POOL_CONNECTIONS = int(os.environ.get('JIRA_HTTP_POOL_CONNECTIONS', '10'))  # liczba hostów
+    JIRA_HTTP_RETRIES = int(os.environ.get('JIRA_HTTP_RETRIES', '3'))
+    JIRA_HTTP_CONNECT_TIMEOUT = float(os.environ.get('JIRA_HTTP_CONNECT_TIMEOUT', '5'))
+    JIRA_HTTP_READ_TIMEOUT = float(os.environ.get('JIRA_HTTP_READ_TIMEOUT', '30'))
+
     # Konfiguracja logowania
     LOG_LEVEL = logging.INFO
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -145,7 +186,6 @@ class Config:
     
     # Konfiguracja cache'u
     CACHE_KEY_PREFIX = 'team_stats_'
-    CACHE_THRESHOLD = 1000
     
     # Konfiguracja eksportu
     EXPORT_FORMATS = ['csv', 'pdf']
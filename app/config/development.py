@@ -10,7 +10,7 @@ class DevelopmentConfig(Config):
     LOG_LEVEL = logging.DEBUG
     
     # Cache settings
-    CACHE_TYPE = 'simple'
+    CACHE_TYPE = 'sqlite'
     CACHE_DEFAULT_TIMEOUT = 300
     
     # Development-specific settings
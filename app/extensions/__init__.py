@@ -3,10 +3,10 @@ from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_jwt_extended import JWTManager
 from flask_session import Session
-from flask_caching import Cache
 from flask_wtf.csrf import CSRFProtect
 from celery import Celery
 from flask_mail import Mail
+from app.cache import cache
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -14,7 +14,6 @@ migrate = Migrate()
 login_manager = LoginManager()
 jwt = JWTManager()
 session = Session()
-cache = Cache()
 csrf = CSRFProtect()
 celery = Celery('app')
 mail = Mail()
@@ -11,6 +11,7 @@ from .user import User
 from .team import Team
 from .project import Project
 from .worklog import Worklog
+from .worklog_daily_rollup import WorklogDailyRollup
 from .issue import Issue
 from .jira_config import JiraConfig
 from .setting import Setting
@@ -25,6 +26,12 @@ from .holiday import Holiday
 from .leave_balance import LeaveBalance
 from .team_capacity import TeamCapacity, TeamAllocation
 from .report import Report, ReportResult
+from .sync_watermark import SyncWatermark
+from .sync_run import SyncRun, SyncCheckpoint
+from .sync_job import SyncJob, SyncLease
+from .report_aggregate import ReportAggregate, ReportAggregateDependency
+from .cache_warmup import CacheWarmupKey
+from . import cache_tags  # noqa: F401 - rejestruje unieważnianie cache'u po zmianach danych
 
 # Export only what's necessary
 __all__ = [
@@ -35,6 +42,7 @@ __all__ = [
     'portfolio_projects',
     'Team',
     'Worklog',
+    'WorklogDailyRollup',
     'ProjectAssignment',
     'TeamMembership',
     'Holiday',
@@ -42,5 +50,13 @@ __all__ = [
     'TeamCapacity',
     'TeamAllocation',
     'Report',
-    'ReportResult'
+    'ReportResult',
+    'SyncWatermark',
+    'SyncRun',
+    'SyncCheckpoint',
+    'SyncJob',
+    'SyncLease',
+    'ReportAggregate',
+    'ReportAggregateDependency',
+    'CacheWarmupKey'
 ] 
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Cache invalidation driven by data changes.
+
+Cached entries are tagged with the entities they are computed from (see
+:func:`app.cache.tag`). Flushes of the models below collect the tags their
+old and new values touch; the tags are invalidated once the outermost
+transaction commits, so a reader can never cache data from before the
+commit under the new tag versions. Releasing or rolling back a savepoint
+(``begin_nested``) neither invalidates nor forgets the collected tags.
+"""
+from typing import Any, Dict, Iterable, List, Set
+import logging
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.cache import cache, tag, month_tag, month_tags
+from app.models.worklog import Worklog
+from app.models.team_membership import TeamMembership
+from app.models.project_assignment import ProjectAssignment
+from app.models.leave import Leave
+from app.models.holiday import Holiday
+from app.models.portfolio import Portfolio, portfolio_projects
+from app.models.team_capacity import TeamCapacity, TeamAllocation
+from app.models.user_role import UserRole
+from app.models.team import Team
+from app.models.user import User
+from app.models.project import Project
+from app.models.issue import Issue
+from app.models.role import Role
+
+logger = logging.getLogger(__name__)
+
+
+def _worklog_tags(values: Dict[str, Any]) -> List[str]:
+    tags = ['worklogs', tag('user', values['user_id']), tag('project', values['project_id'])]
+    if values['work_date']:
+        tags.append(month_tag(values['work_date']))
+    return tags
+
+
+def _leave_tags(values: Dict[str, Any]) -> List[str]:
+    tags = ['leaves', tag('user', values['user_id'])]
+    if values['start_date'] and values['end_date']:
+        tags.extend(month_tags(values['start_date'], values['end_date']))
+    return tags
+
+
+# Model -> (columns the tags depend on, tags for one set of column values)
+TAGGED_MODELS: Dict[type, tuple] = {
+    Worklog: (('user_id', 'project_id', 'work_date'), _worklog_tags),
+    TeamMembership: (('team_id', 'user_id'),
+                     lambda v: ['memberships', tag('team', v['team_id']), tag('user', v['user_id'])]),
+    ProjectAssignment: (('user_id', 'project_id'),
+                        lambda v: ['assignments', tag('user', v['user_id']), tag('project', v['project_id'])]),
+    Leave: (('user_id', 'start_date', 'end_date'), _leave_tags),
+    Holiday: (('date',), lambda v: ['holidays', month_tag(v['date'])] if v['date'] else ['holidays']),
+    Portfolio: (('id',), lambda v: [tag('portfolio', v['id'])]),
+    TeamCapacity: (('team_id',), lambda v: ['capacity', tag('team', v['team_id'])]),
+    TeamAllocation: (('capacity_id',), lambda v: ['capacity']),
+    UserRole: (('user_id',), lambda v: ['user_roles']),
+    # Rows whose names and flags appear in API payloads
+    Team: (('id',), lambda v: ['teams', tag('team', v['id'])]),
+    User: (('id',), lambda v: ['users']),
+    Project: (('id',), lambda v: ['projects']),
+    Issue: (('id',), lambda v: ['issues']),
+    Role: (('id',), lambda v: ['roles']),
+}
+
+
+def tags_for(obj: Any) -> Set[str]:
+    """Tags touched by a pending change of ``obj`` - for its current and previous values."""
+    columns, build = TAGGED_MODELS[type(obj)]
+    state = db.inspect(obj)
+    current = {column: getattr(obj, column) for column in columns}
+    tags = set(build(current))
+    previous = dict(current)
+    for column in columns:
+        history = state.attrs[column].history
+        if history.deleted:
+            previous[column] = history.deleted[0]
+    if previous != current:
+        tags.update(build(previous))
+    return tags
+
+
+def rollup_key_tags(keys: Iterable[Any]) -> Set[str]:
+    """Worklog tags for ``(day, user_id, project_id)`` rollup keys."""
+    tags = set()
+    for key in keys:
+        if key is not None:
+            day, user_id, project_id = key
+            tags.update(_worklog_tags({'user_id': user_id, 'project_id': project_id, 'work_date': day}))
+    return tags
+
+
+def note_cache_tags(session, tags: Iterable[str]) -> None:
+    """Invalidate ``tags`` when ``session`` commits - for bulk writes that bypass the flush."""
+    session.info.setdefault('cache_tags', set()).update(tags)
+
+
+def team_tags(team_id: int) -> List[str]:
+    """Tags of an entry computed from a team's members: the team and each member."""
+    user_ids = db.session.execute(
+        select(TeamMembership.user_id).where(TeamMembership.team_id == team_id)
+    ).scalars()
+    return [tag('team', team_id)] + [tag('user', user_id) for user_id in user_ids]
+
+
+def portfolio_tags(portfolio_id: int) -> List[str]:
+    """Tags of an entry computed from a portfolio's projects: the portfolio and each project."""
+    project_ids = db.session.execute(
+        select(portfolio_projects.c.project_id).where(portfolio_projects.c.portfolio_id == portfolio_id)
+    ).scalars()
+    return [tag('portfolio', portfolio_id)] + [tag('project', project_id) for project_id in project_ids]
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_cache_tags(session, flush_context):
+    """Remember the tags the flushed changes touch until the transaction commits."""
+    tags = session.info.setdefault('cache_tags', set())
+    changed = list(session.new) + list(session.deleted) + [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in changed:
+        if type(obj) in TAGGED_MODELS:
+            tags.update(tags_for(obj))
+    if not tags:
+        session.info.pop('cache_tags', None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_cache_tags(session):
+    if session.in_nested_transaction():
+        return  # a released savepoint - the data is not committed yet
+    tags = session.info.pop('cache_tags', None)
+    if tags:
+        try:
+            cache.invalidate_tags(*tags)
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags: {str(e)}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_cache_tags(session):
+    if session.in_nested_transaction():
+        return  # keep the tags of earlier flushes; extra ones only cost a recomputation
+    session.info.pop('cache_tags', None)
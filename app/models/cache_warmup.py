@@ -0,0 +1,113 @@
+from app.extensions import db
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import logging
+from sqlalchemy.dialects import sqlite, postgresql
+
+logger = logging.getLogger(__name__)
+
+class CacheWarmupKey(db.Model):
+    """A parameter set of a cached dashboard, with its popularity and last warm-up.
+
+    Requests to warmable views are counted per ``target`` and parameter set
+    (without the date range, which the warmer fills in per period); after a
+    sync the most requested sets are recomputed and the time each period
+    took is kept in ``warm_stats``.
+    """
+    __tablename__ = 'cache_warmup_keys'
+    __table_args__ = (
+        db.UniqueConstraint('target', 'params_hash', name='uq_cache_warmup_keys_target_params'),
+        db.Index('idx_cache_warmup_keys_target_requested', 'target', 'last_requested_at'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    target = db.Column(db.String(50), nullable=False)  # portfolio_analysis, workload, team_capacity
+    params_hash = db.Column(db.String(64), nullable=False)
+    params = db.Column(db.Text, nullable=False)  # JSON: view_args and query args
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+    first_requested_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_requested_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_warmed_at = db.Column(db.DateTime)
+    last_warm_seconds = db.Column(db.Float)
+    warm_stats = db.Column(db.Text)  # JSON: {period: {seconds, status}}
+
+    def __repr__(self):
+        return f'<CacheWarmupKey {self.target} {self.request_count}>'
+
+    @staticmethod
+    def canonical(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
+
+    @classmethod
+    def record(cls, target: str, params: Dict[str, Any], count: int = 1,
+               requested_at: Optional[datetime] = None) -> None:
+        """Add ``count`` requests for ``params``, in its own transaction.
+
+        The view's session is left alone, so counting can never commit or
+        roll back the request's own work.
+        """
+        cls.record_many([(target, cls.canonical(params), count, requested_at or datetime.utcnow())])
+
+    @classmethod
+    def record_many(cls, counts: Iterable[Tuple[str, str, int, datetime]]) -> None:
+        """Add ``(target, canonical params, count, last requested at)`` counts in one transaction."""
+        table = cls.__table__
+        with db.engine.begin() as connection:
+            dialect = connection.dialect.name
+            for target, payload, count, requested_at in counts:
+                digest = hashlib.sha256(f'{target}:{payload}'.encode('utf-8')).hexdigest()
+                if dialect in ('sqlite', 'postgresql'):
+                    insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+                    stmt = insert(table).values(target=target, params_hash=digest, params=payload,
+                                                request_count=count, first_requested_at=requested_at,
+                                                last_requested_at=requested_at)
+                    connection.execute(stmt.on_conflict_do_update(
+                        index_elements=[table.c.target, table.c.params_hash],
+                        set_={'request_count': table.c.request_count + count, 'last_requested_at': requested_at}
+                    ))
+                    continue
+
+                updated = connection.execute(
+                    table.update()
+                    .where(table.c.target == target, table.c.params_hash == digest)
+                    .values(request_count=table.c.request_count + count, last_requested_at=requested_at)
+                ).rowcount
+                if not updated:
+                    connection.execute(table.insert().values(target=target, params_hash=digest, params=payload,
+                                                             request_count=count, first_requested_at=requested_at,
+                                                             last_requested_at=requested_at))
+
+    @classmethod
+    def popular(cls, target: str, since: datetime, limit: int) -> List['CacheWarmupKey']:
+        """The ``limit`` most requested parameter sets of ``target`` still in use since ``since``."""
+        return cls.query.filter(
+            cls.target == target,
+            cls.last_requested_at >= since
+        ).order_by(cls.request_count.desc(), cls.last_requested_at.desc()).limit(limit).all()
+
+    def get_params(self) -> Dict[str, Any]:
+        return json.loads(self.params)
+
+    def get_warm_stats(self) -> Dict[str, Any]:
+        return json.loads(self.warm_stats) if self.warm_stats else {}
+
+    def record_warmup(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Store how long warming each period took."""
+        self.warm_stats = json.dumps(stats, default=str)
+        self.last_warm_seconds = round(sum(s['seconds'] for s in stats.values()), 3)
+        self.last_warmed_at = datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'target': self.target,
+            'params': self.get_params(),
+            'request_count': self.request_count,
+            'last_requested_at': self.last_requested_at.isoformat() if self.last_requested_at else None,
+            'last_warmed_at': self.last_warmed_at.isoformat() if self.last_warmed_at else None,
+            'last_warm_seconds': self.last_warm_seconds,
+            'warm_stats': self.get_warm_stats()
+        }
@@ -1,5 +1,7 @@
 from app.extensions import db
 from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 import logging
 from typing import List, Dict, Optional
 
@@ -23,6 +25,7 @@ class Holiday(db.Model):
     region = db.Column(db.String(50))  # For region-specific holidays
     type = db.Column(db.String(20), default='public')  # public, company, custom
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     is_recurring = db.Column(db.Boolean, default=False)  # For annual holidays
 
@@ -41,7 +44,8 @@ class Holiday(db.Model):
             'region': self.region,
             'type': self.type,
             'is_recurring': self.is_recurring,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
     @classmethod
@@ -128,17 +132,27 @@ class Holiday(db.Model):
     @classmethod
     def get_working_days(cls, start_date: datetime, end_date: datetime, country_code: str = 'PL') -> int:
         """Calculate number of working days between two dates, excluding holidays."""
-        from datetime import timedelta
-        
-        working_days = 0
-        current_date = start_date
-        
-        while current_date <= end_date:
-            # Skip weekends
-            if current_date.weekday() < 5:  # Monday = 0, Sunday = 6
-                # Check if it's not a holiday
-                if not cls.is_holiday(current_date, country_code):
-                    working_days += 1
-            current_date += timedelta(days=1)
-            
-        return working_days 
\ No newline at end of file
+        from app.services.business_calendar import get_business_calendar
+        return get_business_calendar(country_code).working_days(start_date, end_date)
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_holidays_changed(session, flush_context):
+    """Remember that holidays changed, so cached calendars are dropped on commit."""
+    if any(isinstance(obj, Holiday) for obj in list(session.new) + list(session.dirty) + list(session.deleted)):
+        session.info['holidays_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_business_calendar(session):
+    if session.in_nested_transaction():
+        return  # a savepoint released; the outer transaction may still roll back
+    if session.info.pop('holidays_changed', False):
+        from app.services.business_calendar import invalidate_business_calendar
+        invalidate_business_calendar()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_holiday_changes(session):
+    if not session.in_nested_transaction():
+        session.info.pop('holidays_changed', None)
@@ -1,6 +1,6 @@
 from app.extensions import db
 from datetime import datetime
-from sqlalchemy import text, func
+from sqlalchemy import text
 import logging
 from typing import Dict, List, Optional
 
@@ -146,37 +146,26 @@ class Portfolio(db.Model):
             return False
 
     def get_role_distribution(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict[str, float]:
-        """Get distribution of work hours by role within the portfolio."""
+        """Get distribution of work hours by role within the portfolio.
+
+        Read from the monthly role aggregates, with the partial months at
+        the edges of the range summed from the daily rollup.
+        """
         try:
-            from app.models.worklog import Worklog
-            from app.models.user_role import UserRole
-            
-            query = db.session.query(
-                UserRole.role_id,
-                func.sum(Worklog.hours_spent).label('total_hours')
-            ).join(
-                Worklog, Worklog.user_id == UserRole.user_id
-            ).filter(
-                Worklog.project_id.in_([p.id for p in self.projects])
-            )
-
-            if start_date:
-                query = query.filter(Worklog.date >= start_date)
-            if end_date:
-                query = query.filter(Worklog.date <= end_date)
-
-            results = query.group_by(UserRole.role_id).all()
-            
-            # Convert role_ids to role names
+            from app.models.report_aggregate import ReportAggregate
             from app.models.role import Role
+
+            project_ids = [p.id for p in self.projects]
+            if not project_ids:
+                return {}
+
+            roles = dict(db.session.query(Role.id, Role.name))
             role_hours = {}
             total_hours = 0
-            
-            for role_id, hours in results:
-                role = Role.query.get(role_id)
-                if role:
-                    role_hours[role.name] = float(hours)
-                    total_hours += float(hours)
+            for cell in ReportAggregate.cells_between('role', roles, start_date, end_date, project_ids=project_ids):
+                name = roles[cell.scope_id]
+                role_hours[name] = role_hours.get(name, 0) + cell.time_spent_seconds / 3600
+                total_hours += cell.time_spent_seconds / 3600
 
             # Convert to percentages
             if total_hours > 0:
@@ -188,34 +177,18 @@ class Portfolio(db.Model):
             return {}
 
     def get_planned_vs_actual_hours(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict[str, Dict[str, float]]:
-        """Get planned vs actual hours for the portfolio."""
+        """Get planned vs actual hours for the portfolio.
+
+        Planned hours come from the allocation of active project assignments
+        over working days; both sides are read from the monthly portfolio
+        aggregates and the daily rollup for partial months.
+        """
         try:
-            from app.models.worklog import Worklog
-            from app.models.project_assignment import ProjectAssignment
-
-            # Get actual hours
-            actual_query = db.session.query(
-                func.sum(Worklog.hours_spent).label('actual_hours')
-            ).filter(
-                Worklog.project_id.in_([p.id for p in self.projects])
-            )
-
-            # Get planned hours
-            planned_query = db.session.query(
-                func.sum(ProjectAssignment.planned_hours).label('planned_hours')
-            ).filter(
-                ProjectAssignment.project_id.in_([p.id for p in self.projects])
-            )
-
-            if start_date:
-                actual_query = actual_query.filter(Worklog.date >= start_date)
-                planned_query = planned_query.filter(ProjectAssignment.start_date >= start_date)
-            if end_date:
-                actual_query = actual_query.filter(Worklog.date <= end_date)
-                planned_query = planned_query.filter(ProjectAssignment.end_date <= end_date)
-
-            actual_hours = actual_query.scalar() or 0
-            planned_hours = planned_query.scalar() or 0
+            from app.models.report_aggregate import ReportAggregate
+
+            cells = ReportAggregate.cells_between('portfolio', [self.id], start_date, end_date)
+            actual_hours = round(sum(cell.time_spent_seconds for cell in cells) / 3600, 2)
+            planned_hours = round(sum(cell.planned_seconds for cell in cells) / 3600, 2)
 
             return {
                 'actual': float(actual_hours),
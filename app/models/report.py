@@ -1,8 +1,9 @@
 from app.extensions import db
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import json
+import zlib
 
 logger = logging.getLogger(__name__)
 
@@ -68,41 +69,85 @@ class Report(db.Model):
             return None
 
 class ReportResult(db.Model):
-    """Model for storing report execution results."""
+    """Model for storing report execution results.
+
+    Results double as background job records: a run starts ``pending``,
+    reports ``progress`` (0-100) while ``running`` and ends ``completed`` or
+    ``failed``. ``result_hash`` identifies the (type, parameters, data
+    version) a result was computed for, so identical requests reuse it.
+    The payload is stored zlib-compressed in ``result_blob``; ``result_data``
+    is kept for results written before compression was introduced.
+    """
     __tablename__ = 'report_results'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        db.Index('idx_report_results_hash', 'result_hash', 'status'),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     report_id = db.Column(db.Integer, db.ForeignKey('reports.id', ondelete='CASCADE'))
+    report_type = db.Column(db.String(50))
+    parameters = db.Column(db.Text)  # JSON string of the parameters actually used
+    result_hash = db.Column(db.String(64))
+    data_version = db.Column(db.String(64))
     execution_date = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
     status = db.Column(db.String(20), default='pending')  # pending, running, completed, failed
-    result_data = db.Column(db.Text)  # JSON string of report results
+    progress = db.Column(db.Integer, default=0)
+    result_data = db.Column(db.Text)  # JSON string of report results (legacy, uncompressed)
+    result_blob = db.Column(db.LargeBinary)  # zlib-compressed JSON of report results
     error_message = db.Column(db.Text)
     execution_time = db.Column(db.Float)  # in seconds
+    requested_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
 
     def __repr__(self):
         return f'<ReportResult {self.report_id} - {self.execution_date}>'
 
-    def to_dict(self) -> Dict:
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self, include_data: bool = True) -> Dict:
         """Convert report result to dictionary."""
-        return {
+        data = {
             'id': self.id,
             'report_id': self.report_id,
+            'report_type': self.report_type,
             'execution_date': self.execution_date.isoformat() if self.execution_date else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
             'status': self.status,
-            'result_data': json.loads(self.result_data) if self.result_data else None,
+            'progress': self.progress or 0,
             'error_message': self.error_message,
             'execution_time': self.execution_time
         }
+        if include_data:
+            data['result_data'] = self.get_result()
+        return data
+
+    def get_parameters(self) -> Dict:
+        """Get the parameters the result was computed for."""
+        return json.loads(self.parameters) if self.parameters else {}
+
+    def get_result(self) -> Optional[Any]:
+        """Get report result data."""
+        if self.result_blob is not None:
+            return json.loads(zlib.decompress(self.result_blob).decode('utf-8'))
+        return json.loads(self.result_data) if self.result_data else None
 
-    def set_result(self, data: Dict) -> None:
+    def set_result(self, data: Any) -> None:
         """Set report result data."""
-        self.result_data = json.dumps(data)
+        self.result_blob = zlib.compress(json.dumps(data, default=str).encode('utf-8'))
+        self.result_data = None
         self.status = 'completed'
-        self.execution_time = (datetime.utcnow() - self.execution_date).total_seconds()
+        self.progress = 100
+        self.finished_at = datetime.utcnow()
+        self.execution_time = (self.finished_at - (self.started_at or self.execution_date)).total_seconds()
 
     def set_error(self, error_message: str) -> None:
         """Set error message for failed report."""
         self.error_message = error_message
         self.status = 'failed'
-        self.execution_time = (datetime.utcnow() - self.execution_date).total_seconds() 
\ No newline at end of file
+        self.finished_at = datetime.utcnow()
+        self.execution_time = (self.finished_at - (self.started_at or self.execution_date)).total_seconds()
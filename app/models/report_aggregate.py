@@ -0,0 +1,478 @@
+from app.extensions import db
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Scopes that get materialized monthly aggregates
+AGGREGATE_SCOPES = ('team', 'portfolio', 'role')
+
+# Working hours per day used for planned hours of project assignments
+PLANNED_HOURS_PER_DAY = 8
+
+
+def month_start(value: Any) -> date:
+    """First day of the month containing ``value``."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _parse_ids(value: Optional[str]) -> Set[int]:
+    return {int(i) for i in value.split(',') if i} if value else set()
+
+
+def _join_ids(values: Iterable[int]) -> str:
+    return ','.join(str(v) for v in sorted(values))
+
+
+def _holds_writes(session) -> bool:
+    """Whether ``session`` has uncommitted writes: pending objects, flushes or DML statements."""
+    return bool(session.new or session.dirty or session.deleted or session.info.get('uncommitted_writes'))
+
+
+class ReportAggregate(db.Model):
+    """Monthly worklog totals per team, portfolio or role and project.
+
+    Cells are computed from ``worklog_daily_rollup`` for the members recorded
+    in :class:`ReportAggregateDependency` (users for teams and roles,
+    projects for portfolios). Worklog changes push a recompute of the cells
+    whose months and members they touch; membership and assignment changes
+    are detected on read by comparing the recorded dependencies with the
+    current ones, and only the cells they affect are rebuilt.
+    """
+    __tablename__ = 'report_aggregates'
+    __table_args__ = (
+        db.UniqueConstraint('scope', 'scope_id', 'month', 'project_id', name='uq_report_aggregate'),
+        db.Index('idx_report_aggregates_lookup', 'scope', 'scope_id', 'month'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(20), nullable=False)  # team, portfolio, role
+    scope_id = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.Date, nullable=False)  # first day of the month
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    time_spent_seconds = db.Column(db.BigInteger, nullable=False, default=0)
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    planned_seconds = db.Column(db.BigInteger, nullable=False, default=0)  # portfolios only
+    user_ids = db.Column(db.Text)  # comma separated users who logged time
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ReportAggregate {self.scope}:{self.scope_id} {self.month} project={self.project_id}>'
+
+    @property
+    def hours(self) -> float:
+        return round((self.time_spent_seconds or 0) / 3600, 2)
+
+    @property
+    def planned_hours(self) -> float:
+        return round((self.planned_seconds or 0) / 3600, 2)
+
+    @property
+    def users(self) -> Set[int]:
+        return _parse_ids(self.user_ids)
+
+    @classmethod
+    def cells(cls, scope: str, scope_ids: Iterable[int], start_date: Any = None, end_date: Any = None,
+              project_ids: Optional[Iterable[int]] = None) -> List['ReportAggregate']:
+        """Return fresh cells of the given scopes for the months overlapping a date range."""
+        scope_ids = list(scope_ids)
+        if not scope_ids:
+            return []
+        ReportAggregateDependency.ensure_fresh(scope, scope_ids)
+
+        query = cls.query.filter(cls.scope == scope, cls.scope_id.in_(scope_ids))
+        if start_date:
+            query = query.filter(cls.month >= month_start(start_date))
+        if end_date:
+            query = query.filter(cls.month <= month_start(end_date))
+        if project_ids is not None:
+            query = query.filter(cls.project_id.in_(list(project_ids)))
+        return query.order_by(cls.scope_id, cls.month, cls.project_id).all()
+
+    @classmethod
+    def cells_between(cls, scope: str, scope_ids: Iterable[int], start_date: Any = None, end_date: Any = None,
+                      project_ids: Optional[Iterable[int]] = None) -> List['ReportAggregate']:
+        """Return cells covering exactly ``start_date``..``end_date``.
+
+        Whole months inside the range are read from the materialized cells;
+        the partial months at its edges are summed from
+        ``worklog_daily_rollup`` for the recorded members and returned as
+        unsaved cells.
+        """
+        from app.models.worklog_daily_rollup import _as_date
+
+        scope_ids = list(scope_ids)
+        if not scope_ids:
+            return []
+        start, end = _as_date(start_date), _as_date(end_date)
+        whole_start = start if start is None or start.day == 1 else next_month(start)
+        whole_end = (end if end is None or end == next_month(end) - timedelta(days=1)
+                     else month_start(end) - timedelta(days=1))
+
+        partial = []
+        if start and end and whole_start > whole_end and month_start(start) == month_start(end):
+            partial.append((start, end))
+        else:
+            if start and whole_start != start:
+                partial.append((start, whole_start - timedelta(days=1)))
+            if end and whole_end != end:
+                partial.append((month_start(end), end))
+
+        if whole_start is None or whole_end is None or whole_start <= whole_end:
+            cells = cls.cells(scope, scope_ids, whole_start, whole_end, project_ids)
+        else:
+            ReportAggregateDependency.ensure_fresh(scope, scope_ids)
+            cells = []
+        if partial:
+            project_ids = set(project_ids) if project_ids is not None else None
+            members = {dep.scope_id: _parse_ids(dep.members) for dep in ReportAggregateDependency.query.filter(
+                ReportAggregateDependency.scope == scope, ReportAggregateDependency.scope_id.in_(scope_ids))}
+            connection = db.session.connection()
+            for scope_id in scope_ids:
+                for low, high in partial:
+                    cells.extend(cls._partial_cells(connection, scope, scope_id, members.get(scope_id, set()),
+                                                    low, high, project_ids))
+        return sorted(cells, key=lambda cell: (cell.scope_id, cell.month, cell.project_id))
+
+    @classmethod
+    def _partial_cells(cls, connection, scope: str, scope_id: int, members: Set[int], start: date, end: date,
+                       project_ids: Optional[Set[int]] = None) -> List['ReportAggregate']:
+        """Unsaved cells of one scope for the days ``start``..``end`` of a single month."""
+        from app.models.worklog_daily_rollup import WorklogDailyRollup
+
+        if not members:
+            return []
+        rollup = WorklogDailyRollup.__table__
+        member_column = rollup.c.project_id if scope == 'portfolio' else rollup.c.user_id
+        query = select(rollup.c.user_id, rollup.c.project_id, rollup.c.time_spent_seconds,
+                       rollup.c.entry_count).where(member_column.in_(members),
+                                                   rollup.c.work_date >= start, rollup.c.work_date <= end)
+        if project_ids is not None:
+            query = query.where(rollup.c.project_id.in_(project_ids))
+
+        cells = {}
+        for user_id, project_id, seconds, entries in connection.execute(query):
+            cell = cells.get(project_id)
+            if cell is None:
+                cell = cells[project_id] = {'seconds': 0, 'entries': 0, 'planned': 0, 'users': set()}
+            cell['seconds'] += seconds or 0
+            cell['entries'] += entries or 0
+            cell['users'].add(user_id)
+
+        if scope == 'portfolio':
+            planned_projects = members & project_ids if project_ids is not None else members
+            for (_, project_id), seconds in cls._planned_seconds(connection, planned_projects,
+                                                                 window=(start, end)).items():
+                cell = cells.get(project_id)
+                if cell is None:
+                    cell = cells[project_id] = {'seconds': 0, 'entries': 0, 'planned': 0, 'users': set()}
+                cell['planned'] += seconds
+
+        return [cls(scope=scope, scope_id=scope_id, month=month_start(start), project_id=project_id,
+                    time_spent_seconds=cell['seconds'], entry_count=cell['entries'],
+                    planned_seconds=cell['planned'], user_ids=_join_ids(cell['users']))
+                for project_id, cell in cells.items()]
+
+    @classmethod
+    def refresh_for_worklogs(cls, keys: Iterable[Tuple[date, int, int]], connection=None) -> int:
+        """Recompute materialized cells touched by changed rollup keys.
+
+        Called by :meth:`WorklogDailyRollup.refresh`; returns the number of
+        (scope, month) groups rebuilt.
+        """
+        connection = connection or db.session.connection()
+        months_by_user, months_by_project = defaultdict(set), defaultdict(set)
+        for day, user_id, project_id in keys:
+            months_by_user[user_id].add(month_start(day))
+            months_by_project[project_id].add(month_start(day))
+        if not months_by_user:
+            return 0
+
+        rebuilt = 0
+        deps = ReportAggregateDependency.__table__
+        for scope, scope_id, members in connection.execute(select(deps.c.scope, deps.c.scope_id, deps.c.members)):
+            by_member = months_by_project if scope == 'portfolio' else months_by_user
+            months = set()
+            for member in _parse_ids(members) & set(by_member):
+                months |= by_member[member]
+            if months:
+                cls._rebuild(connection, scope, scope_id, _parse_ids(members), months=months)
+                rebuilt += 1
+        return rebuilt
+
+    @classmethod
+    def _rebuild(cls, connection, scope: str, scope_id: int, members: Set[int],
+                 months: Optional[Set[date]] = None, projects: Optional[Set[int]] = None) -> None:
+        """Replace the cells of one scope, optionally limited to some months or projects."""
+        from app.models.worklog_daily_rollup import WorklogDailyRollup
+
+        table = cls.__table__
+        delete = table.delete().where(table.c.scope == scope, table.c.scope_id == scope_id)
+        if months is not None:
+            delete = delete.where(table.c.month.in_(months))
+        if projects is not None:
+            delete = delete.where(table.c.project_id.in_(projects))
+        connection.execute(delete)
+        if not members or months == set() or projects == set():
+            return
+
+        rollup = WorklogDailyRollup.__table__
+        member_column = rollup.c.project_id if scope == 'portfolio' else rollup.c.user_id
+        query = select(rollup.c.work_date, rollup.c.user_id, rollup.c.project_id,
+                       rollup.c.time_spent_seconds, rollup.c.entry_count).where(member_column.in_(members))
+        if months:
+            query = query.where(rollup.c.work_date >= min(months),
+                                rollup.c.work_date < next_month(max(months)))
+        if projects is not None:
+            query = query.where(rollup.c.project_id.in_(projects))
+
+        cells = {}
+        for work_date, user_id, project_id, seconds, entries in connection.execute(query):
+            month = month_start(work_date)
+            if months and month not in months:
+                continue
+            cell = cells.get((month, project_id))
+            if cell is None:
+                cell = cells[(month, project_id)] = {'seconds': 0, 'entries': 0, 'planned': 0, 'users': set()}
+            cell['seconds'] += seconds or 0
+            cell['entries'] += entries or 0
+            cell['users'].add(user_id)
+
+        if scope == 'portfolio':
+            planned_projects = members & projects if projects is not None else members
+            for (month, project_id), seconds in cls._planned_seconds(connection, planned_projects, months).items():
+                cell = cells.get((month, project_id))
+                if cell is None:
+                    cell = cells[(month, project_id)] = {'seconds': 0, 'entries': 0, 'planned': 0, 'users': set()}
+                cell['planned'] += seconds
+
+        now = datetime.utcnow()
+        rows = [{
+            'scope': scope,
+            'scope_id': scope_id,
+            'month': month,
+            'project_id': project_id,
+            'time_spent_seconds': cell['seconds'],
+            'entry_count': cell['entries'],
+            'planned_seconds': cell['planned'],
+            'user_ids': _join_ids(cell['users']),
+            'updated_at': now
+        } for (month, project_id), cell in cells.items()]
+        if rows:
+            connection.execute(table.insert(), rows)
+
+    @staticmethod
+    def _planned_seconds(connection, project_ids: Set[int], months: Optional[Set[date]] = None,
+                         window: Optional[Tuple[date, date]] = None) -> Dict[Tuple[date, int], int]:
+        """Planned time of active assignments: allocation share of every working day.
+
+        ``window`` limits the days counted to ``(first, last)``; holidays of
+        the business calendar are not working days.
+        """
+        from app.models.project_assignment import ProjectAssignment
+        from app.services.business_calendar import get_business_calendar
+
+        if not project_ids:
+            return {}
+        assignments = ProjectAssignment.__table__
+        rows = connection.execute(
+            select(assignments.c.project_id, assignments.c.allocation,
+                   assignments.c.start_date, assignments.c.end_date)
+            .where(assignments.c.project_id.in_(project_ids),
+                   assignments.c.is_active == True,  # noqa: E712
+                   assignments.c.start_date.isnot(None))
+        )
+
+        planned = defaultdict(int)
+        calendar = get_business_calendar()
+        today = date.today()
+        for project_id, allocation, start, end in rows:
+            # Open-ended assignments are planned up to the end of the current month
+            end = end or next_month(month_start(today)) - timedelta(days=1)
+            if window:
+                start, end = max(start, window[0]), min(end, window[1])
+            month = month_start(start)
+            while month <= end:
+                if months is None or month in months:
+                    month_end = next_month(month) - timedelta(days=1)
+                    days = calendar.working_days(max(start, month), min(end, month_end))
+                    planned[(month, project_id)] += int(days * PLANNED_HOURS_PER_DAY * 3600 * (allocation or 0) / 100)
+                month = next_month(month)
+        return planned
+
+
+class ReportAggregateDependency(db.Model):
+    """What the materialized cells of one team, portfolio or role were computed from."""
+    __tablename__ = 'report_aggregate_dependencies'
+    __table_args__ = (
+        db.UniqueConstraint('scope', 'scope_id', name='uq_report_aggregate_dependency'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(20), nullable=False)
+    scope_id = db.Column(db.Integer, nullable=False)
+    members = db.Column(db.Text)  # comma separated user ids (team, role) or project ids (portfolio)
+    assignments = db.Column(db.Text)  # JSON {project_id: digest} of project assignments (portfolio)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ReportAggregateDependency {self.scope}:{self.scope_id}>'
+
+    @classmethod
+    def ensure_fresh(cls, scope: str, scope_ids: Iterable[int]) -> None:
+        """Materialize missing scopes and rebuild the cells whose dependencies changed.
+
+        A session without writes is left alone: the refresh runs in its own
+        transaction on a separate connection, so read-only getters never
+        commit or roll back the caller's session. When the session holds
+        writes, the refresh runs on the session's own connection instead; it
+        sees the uncommitted data, doesn't wait for the session's write lock,
+        and is committed or rolled back together with it.
+        """
+        if scope not in AGGREGATE_SCOPES:
+            raise ValueError(f"Unknown aggregate scope: {scope}")
+
+        scope_ids = list(scope_ids)
+        if _holds_writes(db.session):
+            db.session.flush()
+            cls._refresh(db.session.connection(), scope, scope_ids)
+        else:
+            with db.engine.begin() as connection:
+                cls._refresh(connection, scope, scope_ids)
+
+    @classmethod
+    def _refresh(cls, connection, scope: str, scope_ids: List[int]) -> None:
+        table = cls.__table__
+        current = cls._current_members(connection, scope, scope_ids)
+        digests = (cls._assignment_digests(connection, set().union(*current.values()))
+                   if scope == 'portfolio' else {})
+        recorded = {row.scope_id: row for row in connection.execute(
+            select(table.c.scope_id, table.c.members, table.c.assignments)
+            .where(table.c.scope == scope, table.c.scope_id.in_(scope_ids))
+        )}
+
+        for scope_id in scope_ids:
+            members = current.get(scope_id, set())
+            assignments = {str(p): digests[p] for p in sorted(members) if p in digests}
+            dep = recorded.get(scope_id)
+
+            if dep is None:
+                ReportAggregate._rebuild(connection, scope, scope_id, members)
+            else:
+                before = _parse_ids(dep.members)
+                moved = before ^ members
+                if moved:
+                    if scope == 'portfolio':
+                        ReportAggregate._rebuild(connection, scope, scope_id, members, projects=moved)
+                    else:
+                        ReportAggregate._rebuild(connection, scope, scope_id, members,
+                                                 months=cls._months_of_users(connection, moved))
+                if scope == 'portfolio':
+                    old_assignments = json.loads(dep.assignments) if dep.assignments else {}
+                    replanned = {int(p) for p in set(old_assignments) | set(assignments)
+                                 if old_assignments.get(p) != assignments.get(p)} - moved
+                    if replanned & members:
+                        ReportAggregate._rebuild(connection, scope, scope_id, members,
+                                                 projects=replanned & members)
+                if not moved and (scope != 'portfolio' or dep.assignments == json.dumps(assignments)):
+                    continue
+
+            values = {
+                'members': _join_ids(members),
+                'assignments': json.dumps(assignments) if scope == 'portfolio' else None,
+                'computed_at': datetime.utcnow()
+            }
+            if dep is None:
+                connection.execute(table.insert().values(scope=scope, scope_id=scope_id, **values))
+            else:
+                connection.execute(table.update()
+                                   .where(table.c.scope == scope, table.c.scope_id == scope_id)
+                                   .values(**values))
+            logger.info(f"Rebuilt {scope} {scope_id} report aggregates")
+
+    @staticmethod
+    def _current_members(connection, scope: str, scope_ids: List[int]) -> Dict[int, Set[int]]:
+        from app.models.team_membership import TeamMembership
+        from app.models.user_role import UserRole
+        from app.models.portfolio import portfolio_projects
+
+        if scope == 'team':
+            table = TeamMembership.__table__
+            query = select(table.c.team_id, table.c.user_id).where(table.c.team_id.in_(scope_ids))
+        elif scope == 'role':
+            table = UserRole.__table__
+            query = select(table.c.role_id, table.c.user_id).where(table.c.role_id.in_(scope_ids))
+        else:
+            query = select(portfolio_projects.c.portfolio_id, portfolio_projects.c.project_id).where(
+                portfolio_projects.c.portfolio_id.in_(scope_ids))
+
+        members = defaultdict(set)
+        for scope_id, member in connection.execute(query):
+            members[scope_id].add(member)
+        return members
+
+    @staticmethod
+    def _assignment_digests(connection, project_ids: Set[int]) -> Dict[int, str]:
+        from app.models.project_assignment import ProjectAssignment
+        from app.services.business_calendar import get_business_calendar
+
+        if not project_ids:
+            return {}
+        table = ProjectAssignment.__table__
+        rows = defaultdict(list)
+        current_month = month_start(date.today()).isoformat()
+        # Planned hours skip holidays, so a holiday change replans every assignment
+        holidays = get_business_calendar().digest()
+        for row in connection.execute(
+            select(table.c.project_id, table.c.id, table.c.allocation, table.c.is_active,
+                   table.c.start_date, table.c.end_date)
+            .where(table.c.project_id.in_(project_ids))
+            .order_by(table.c.id)
+        ):
+            rows[row.project_id].append(repr(tuple(row)))
+            if row.end_date is None:
+                # Open-ended assignments are planned up to the current month, so they go stale with it
+                rows[row.project_id].append(current_month)
+        return {project_id: hashlib.md5('|'.join(values + [holidays]).encode()).hexdigest()
+                for project_id, values in rows.items()}
+
+    @staticmethod
+    def _months_of_users(connection, user_ids: Set[int]) -> Set[date]:
+        from app.models.worklog_daily_rollup import WorklogDailyRollup
+
+        rollup = WorklogDailyRollup.__table__
+        days = connection.execute(select(rollup.c.work_date).distinct().where(rollup.c.user_id.in_(user_ids)))
+        return {month_start(day) for (day,) in days}
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_flushed_writes(session, flush_context):
+    session.info['uncommitted_writes'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _note_executed_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['uncommitted_writes'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _forget_writes(session):
+    if session.in_nested_transaction():
+        return  # a savepoint - the outer transaction still holds the writes
+    session.info.pop('uncommitted_writes', None)
@@ -1,6 +1,5 @@
 from app.extensions import db
 from datetime import datetime
-from sqlalchemy import func
 import logging
 import json
 from typing import Dict, List, Optional
@@ -252,30 +251,17 @@ class Role(db.Model):
     def get_workload_statistics(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict[str, float]:
         """Get workload statistics for this role."""
         try:
-            from app.models.worklog import Worklog
-            from app.models.user_role import UserRole
-            
-            query = db.session.query(
-                func.sum(Worklog.hours_spent).label('total_hours'),
-                func.count(func.distinct(Worklog.user_id)).label('active_users')
-            ).join(
-                UserRole, UserRole.user_id == Worklog.user_id
-            ).filter(
-                UserRole.role_id == self.id
-            )
-
-            if start_date:
-                query = query.filter(Worklog.date >= start_date)
-            if end_date:
-                query = query.filter(Worklog.date <= end_date)
+            from app.models.report_aggregate import ReportAggregate
 
-            result = query.first()
+            cells = ReportAggregate.cells_between('role', [self.id], start_date, end_date)
+            total_hours = sum(cell.time_spent_seconds for cell in cells) / 3600
+            active_users = len(set().union(*(cell.users for cell in cells)))
             
             return {
-                'total_hours': float(result.total_hours or 0),
-                'active_users': int(result.active_users or 0),
-                'avg_hours_per_user': float(result.total_hours or 0) / int(result.active_users or 1) if result.active_users else 0,
-                'total_cost': float(result.total_hours or 0) * self.hourly_rate
+                'total_hours': float(total_hours),
+                'active_users': int(active_users),
+                'avg_hours_per_user': float(total_hours) / active_users if active_users else 0,
+                'total_cost': float(total_hours) * (self.hourly_rate or 0)
             }
 
         except Exception as e:
@@ -285,29 +271,23 @@ class Role(db.Model):
     def get_project_distribution(self) -> Dict[str, float]:
         """Get distribution of work across projects for this role."""
         try:
-            from app.models.worklog import Worklog
-            from app.models.user_role import UserRole
+            from app.models.report_aggregate import ReportAggregate
             from app.models.project import Project
             
-            query = db.session.query(
-                Project.name,
-                func.sum(Worklog.hours_spent).label('hours')
-            ).join(
-                UserRole, UserRole.user_id == Worklog.user_id
-            ).join(
-                Project, Project.id == Worklog.project_id
-            ).filter(
-                UserRole.role_id == self.id
-            ).group_by(
-                Project.name
-            )
+            hours_by_project = {}
+            for cell in ReportAggregate.cells('role', [self.id]):
+                hours_by_project[cell.project_id] = hours_by_project.get(cell.project_id, 0) + cell.time_spent_seconds / 3600
+            names = dict(db.session.query(Project.id, Project.name).filter(Project.id.in_(list(hours_by_project))))
 
-            results = query.all()
-            total_hours = sum(float(r.hours or 0) for r in results)
+            results = {}
+            for project_id, hours in hours_by_project.items():
+                name = names.get(project_id, f"Project {project_id}")
+                results[name] = results.get(name, 0) + hours
+            total_hours = sum(results.values())
             
             if total_hours > 0:
-                return {r.name: (float(r.hours or 0) / total_hours) * 100 for r in results}
-            return {r.name: 0 for r in results}
+                return {name: (hours / total_hours) * 100 for name, hours in results.items()}
+            return {name: 0 for name in results}
 
         except Exception as e:
             logger.error(f"Error getting project distribution for role {self.name}: {str(e)}")
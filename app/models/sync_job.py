@@ -0,0 +1,111 @@
+from app.extensions import db
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SyncJob(db.Model):
+    """A queued request to run a JIRA synchronization.
+
+    Schedulers and admin endpoints only insert rows here; whichever process
+    holds the ``jira_sync`` lease executes them one at a time.
+    """
+    __tablename__ = 'sync_jobs'
+    __table_args__ = (
+        db.Index('idx_sync_jobs_status', 'status', 'id'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # full, users, projects, worklogs
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed, coalesced
+    trigger = db.Column(db.String(50))  # schedule, admin, celery, cli
+    parameters = db.Column(db.Text)  # JSON string of keyword arguments
+    requested_by_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'))
+    coalesced_count = db.Column(db.Integer, default=0)
+    run_id = db.Column(db.Integer, db.ForeignKey('sync_runs.id', ondelete='SET NULL'))
+    result = db.Column(db.Text)  # JSON string of the sync stats
+    error_message = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<SyncJob {self.id} {self.kind} {self.status}>'
+
+    def get_parameters(self) -> Dict:
+        """Get job parameters as dictionary."""
+        return json.loads(self.parameters) if self.parameters else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job to dictionary."""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'trigger': self.trigger,
+            'parameters': self.get_parameters(),
+            'coalesced_count': self.coalesced_count,
+            'run_id': self.run_id,
+            'result': json.loads(self.result) if self.result else None,
+            'error_message': self.error_message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class SyncLease(db.Model):
+    """Named, expiring lock shared by every process using the database."""
+    __tablename__ = 'sync_leases'
+    __table_args__ = {'extend_existing': True}
+
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(200), nullable=False)
+    acquired_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<SyncLease {self.name} owner={self.owner} until={self.expires_at}>'
+
+    @classmethod
+    def acquire(cls, name: str, owner: str, ttl: timedelta) -> bool:
+        """Take or renew the lease; returns False while another owner holds it."""
+        now = datetime.utcnow()
+        # A single conditional UPDATE is atomic, so two processes can't both win
+        updated = cls.query.filter(
+            cls.name == name,
+            or_(cls.owner == owner, cls.expires_at < now)
+        ).update({'owner': owner, 'acquired_at': now, 'expires_at': now + ttl}, synchronize_session=False)
+        if updated:
+            db.session.commit()
+            return True
+
+        if db.session.get(cls, name) is not None:
+            db.session.rollback()
+            return False
+        try:
+            db.session.add(cls(name=name, owner=owner, acquired_at=now, expires_at=now + ttl))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+            return False
+
+    @classmethod
+    def release(cls, name: str, owner: str) -> None:
+        """Give the lease up if we still own it."""
+        cls.query.filter_by(name=name, owner=owner).delete(synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def holder(cls, name: str) -> Optional['SyncLease']:
+        """Return the current, unexpired lease or None."""
+        lease = db.session.get(cls, name)
+        if lease and lease.expires_at >= datetime.utcnow():
+            return lease
+        return None
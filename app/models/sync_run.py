@@ -0,0 +1,191 @@
+from app.extensions import db
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from flask import current_app
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SyncRun(db.Model):
+    """One execution of a JIRA synchronization.
+
+    A run is split into phases (users, projects, worklogs, ...), each tracked
+    by :class:`SyncCheckpoint` rows. A run that did not finish cleanly stays
+    ``running`` or ``failed`` and is picked up again by the next run of the
+    same kind, which skips every checkpoint already marked done. After
+    ``SYNC_RESUME_MAX_ATTEMPTS`` resumes, or once it is older than the resume
+    window, it is ``abandoned`` and a fresh run redoes every phase.
+    """
+    __tablename__ = 'sync_runs'
+    __table_args__ = (
+        db.Index('idx_sync_runs_kind_status', 'kind', 'status'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # full, users, projects, worklogs
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed, abandoned
+    phase = db.Column(db.String(50))
+    stats = db.Column(db.Text)  # JSON string of the final stats
+    error_message = db.Column(db.Text)
+    resumed_count = db.Column(db.Integer, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    checkpoints = db.relationship('SyncCheckpoint', backref='run', lazy='dynamic',
+                                  cascade='all, delete-orphan', order_by='SyncCheckpoint.id')
+
+    def __repr__(self):
+        return f'<SyncRun {self.id} {self.kind} {self.status}>'
+
+    @classmethod
+    def start(cls, kind: str, resume_window: Optional[timedelta] = timedelta(days=1),
+              max_resumes: Optional[int] = None) -> 'SyncRun':
+        """Resume the latest unfinished run of ``kind`` or create a new one."""
+        if max_resumes is None:
+            max_resumes = current_app.config.get('SYNC_RESUME_MAX_ATTEMPTS', 3)
+
+        run = cls.query.filter(
+            cls.kind == kind,
+            cls.status.in_(('running', 'failed'))
+        ).order_by(cls.id.desc()).first()
+        if run and (resume_window is None
+                    or run.started_at < datetime.utcnow() - resume_window
+                    or (run.resumed_count or 0) >= max_resumes):
+            # Its completed phases are too old to skip; start over
+            logger.info(f"Abandoning sync run {run.id} ({kind}) after {run.resumed_count or 0} resumes")
+            run.status = 'abandoned'
+            run.finished_at = run.finished_at or datetime.utcnow()
+            run = None
+
+        if run:
+            run.status = 'running'
+            run.error_message = None
+            run.finished_at = None
+            run.resumed_count = (run.resumed_count or 0) + 1
+            logger.info(f"Resuming sync run {run.id} ({kind}), attempt {run.resumed_count + 1}")
+        else:
+            run = cls(kind=kind, status='running')
+            db.session.add(run)
+        run.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        return run
+
+    @classmethod
+    def latest(cls, kind: Optional[str] = None) -> Optional['SyncRun']:
+        """Return the most recent run, optionally of one kind."""
+        query = cls.query
+        if kind:
+            query = query.filter_by(kind=kind)
+        return query.order_by(cls.id.desc()).first()
+
+    def checkpoint(self, phase: str, project_id: Optional[int] = None) -> 'SyncCheckpoint':
+        """Return the checkpoint for a phase (and project), creating it if needed."""
+        checkpoint = self.checkpoints.filter_by(phase=phase, project_id=project_id).first()
+        if checkpoint is None:
+            checkpoint = SyncCheckpoint(run=self, phase=phase, project_id=project_id)
+            db.session.add(checkpoint)
+        self.phase = phase
+        self.heartbeat_at = datetime.utcnow()
+        return checkpoint
+
+    def is_done(self, phase: str, project_id: Optional[int] = None) -> bool:
+        """Check whether a phase (and project) already completed in this run."""
+        return self.checkpoints.filter_by(phase=phase, project_id=project_id, status='done').count() > 0
+
+    def finish(self, stats: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """Close the run; it stays resumable if an error or unfinished checkpoint remains."""
+        pending = self.checkpoints.filter(SyncCheckpoint.status != 'done').count()
+        self.status = 'failed' if error or pending else 'completed'
+        self.error_message = error
+        self.finished_at = datetime.utcnow()
+        self.heartbeat_at = self.finished_at
+        if stats is not None:
+            self.stats = json.dumps(stats, default=str)
+        db.session.commit()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert run and its checkpoints to dictionary."""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'phase': self.phase,
+            'stats': json.loads(self.stats) if self.stats else None,
+            'error_message': self.error_message,
+            'resumed_count': self.resumed_count,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'checkpoints': [c.to_dict() for c in self.checkpoints]
+        }
+
+
+class SyncCheckpoint(db.Model):
+    """Progress of one phase (optionally for one project) within a sync run."""
+    __tablename__ = 'sync_checkpoints'
+    __table_args__ = (
+        db.UniqueConstraint('run_id', 'phase', 'project_id', name='uq_sync_checkpoint'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('sync_runs.id', ondelete='CASCADE'), nullable=False)
+    phase = db.Column(db.String(50), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'))
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, done, failed
+    page_offset = db.Column(db.Integer, nullable=False, default=0)  # startAt of the next search page
+    cursor = db.Column(db.Text)  # query the offset belongs to
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer)
+    error_message = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    project = db.relationship('Project')
+
+    def __repr__(self):
+        return f'<SyncCheckpoint {self.run_id} {self.phase} project={self.project_id} {self.status}>'
+
+    def resume_offset(self, cursor: str) -> int:
+        """Offset to resume from, or 0 if it was recorded for a different query."""
+        return self.page_offset if self.cursor == cursor and self.status != 'done' else 0
+
+    def advance(self, offset: int, total: Optional[int] = None, cursor: Optional[str] = None) -> None:
+        """Record that everything before ``offset`` has been stored."""
+        self.page_offset = offset
+        if total is not None:
+            self.total = total
+        if cursor is not None:
+            self.cursor = cursor
+        self.run.heartbeat_at = datetime.utcnow()
+
+    def complete(self, processed: Optional[int] = None) -> None:
+        """Mark the checkpoint done."""
+        self.status = 'done'
+        self.error_message = None
+        if processed is not None:
+            self.processed = processed
+
+    def fail(self, error: str) -> None:
+        """Mark the checkpoint failed, keeping its offset for the next attempt."""
+        self.status = 'failed'
+        self.error_message = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert checkpoint to dictionary."""
+        return {
+            'phase': self.phase,
+            'project_id': self.project_id,
+            'project_key': self.project.jira_key if self.project else None,
+            'status': self.status,
+            'page_offset': self.page_offset,
+            'processed': self.processed,
+            'total': self.total,
+            'percent': round(100.0 * self.page_offset / self.total, 1) if self.total else None,
+            'error_message': self.error_message,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
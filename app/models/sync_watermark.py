@@ -0,0 +1,54 @@
+from app.extensions import db
+from datetime import datetime
+from typing import Dict, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SyncWatermark(db.Model):
+    """Per-project position in the JIRA worklog change feeds.
+
+    Values are stored exactly as JIRA returns them: milliseconds since epoch,
+    taken from the ``until`` field of the last page of
+    ``/rest/api/2/worklog/updated`` and ``/rest/api/2/worklog/deleted``.
+    """
+    __tablename__ = 'sync_watermarks'
+    __table_args__ = {'extend_existing': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, unique=True)
+    worklogs_updated_since = db.Column(db.BigInteger, nullable=False, default=0)
+    worklogs_deleted_since = db.Column(db.BigInteger, nullable=False, default=0)
+    last_sync_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    project = db.relationship('Project', backref=db.backref('sync_watermark', uselist=False, cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<SyncWatermark project={self.project_id} updated={self.worklogs_updated_since}>'
+
+    @classmethod
+    def for_projects(cls, project_ids: Iterable[int]) -> Dict[int, 'SyncWatermark']:
+        """Load watermarks for the given projects in a single query."""
+        project_ids = list(project_ids)
+        if not project_ids:
+            return {}
+        rows = cls.query.filter(cls.project_id.in_(project_ids)).all()
+        return {row.project_id: row for row in rows}
+
+    def advance(self, updated_since: int, deleted_since: int) -> None:
+        """Move the watermark forward; never moves it backwards."""
+        self.worklogs_updated_since = max(self.worklogs_updated_since or 0, int(updated_since))
+        self.worklogs_deleted_since = max(self.worklogs_deleted_since or 0, int(deleted_since))
+        self.last_sync_at = datetime.utcnow()
+
+    def to_dict(self):
+        """Convert watermark to dictionary."""
+        return {
+            'project_id': self.project_id,
+            'worklogs_updated_since': self.worklogs_updated_since,
+            'worklogs_deleted_since': self.worklogs_deleted_since,
+            'last_sync_at': self.last_sync_at.isoformat() if self.last_sync_at else None
+        }
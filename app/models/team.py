@@ -208,27 +208,27 @@ class Team(db.Model):
         return self.members
 
     def get_activity_percentage(self) -> float:
-        """Oblicza procent aktywności zespołu."""
+        """Oblicza procent aktywności zespołu.
+
+        Okno obejmuje ostatnie 30 dni: pełne miesiące z agregatów
+        miesięcznych zespołu, brzegowe z dziennego rollupu.
+        """
         try:
-            from app.models import Worklog
+            from app.models.report_aggregate import ReportAggregate
+            from app.services.business_calendar import get_business_calendar
             
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30)
             
-            active_members_count = self.users.count()
+            active_members_count = len(self.team_members)
             if not active_members_count:
                 return 0
             
-            expected_hours = active_members_count * 8 * 20  # 20 dni roboczych * 8h
+            working_days = get_business_calendar().working_days(start_date, end_date)
+            expected_hours = active_members_count * 8 * working_days
             
-            total_hours = db.session.query(
-                db.func.sum(Worklog.time_spent)
-            ).join(
-                TeamMembership, TeamMembership.user_id == Worklog.user_id
-            ).filter(
-                TeamMembership.team_id == self.id,
-                Worklog.date.between(start_date, end_date)
-            ).scalar() or 0
+            total_hours = sum(cell.time_spent_seconds for cell in
+                              ReportAggregate.cells_between('team', [self.id], start_date, end_date)) / 3600
             
             return round((total_hours / expected_hours) * 100, 2) if expected_hours > 0 else 0
             
@@ -243,37 +243,27 @@ class Team(db.Model):
 
     def get_expected_hours(self, start_date: datetime, end_date: datetime) -> float:
         """Oblicza oczekiwaną liczbę godzin pracy w danym okresie."""
+        from app.services.business_calendar import get_business_calendar
         settings = self.get_settings()
-        total_hours = 0
-        current_date = start_date
-        
-        while current_date <= end_date:
-            if self.is_work_day(current_date):
-                total_hours += settings['default_work_hours']
-            current_date += timedelta(days=1)
-        
-        return total_hours
+        return get_business_calendar().expected_hours(
+            start_date, end_date, settings['default_work_hours'], settings['work_days'])
+
+    def _member_rollup(self, start_date: datetime, end_date: datetime, group_by) -> List[Dict[str, Any]]:
+        """Sumy z worklog_daily_rollup dla członków zespołu."""
+        from app.models.worklog_daily_rollup import WorklogDailyRollup
+        member_ids = [m.user_id for m in db.session.query(TeamMembership.user_id).filter_by(team_id=self.id)]
+        if not member_ids:
+            return []
+        return WorklogDailyRollup.summarize(start_date, end_date, group_by=group_by, user_ids=member_ids)
+
+    def _usernames(self, user_ids) -> Dict[int, str]:
+        from app.models.user import User
+        return dict(db.session.query(User.id, User.username).filter(User.id.in_(set(user_ids))))
 
     def get_workload(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Oblicza obciążenie zespołu w danym okresie."""
-        db = get_db()
-        cursor = db.cursor()
-        
-        cursor.execute("""
-            SELECT user_name, SUM(time_spent) as total_hours
-            FROM worklogs
-            WHERE user_name IN (
-                SELECT user_name FROM team_memberships WHERE team_id = ?
-            )
-            AND work_date BETWEEN ? AND ?
-            GROUP BY user_name
-        """, (
-            self.id,
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d')
-        ))
-        
-        results = cursor.fetchall()
+        results = self._member_rollup(start_date, end_date, ('user_id',))
+        usernames = self._usernames(row['user_id'] for row in results)
         expected_hours = self.get_expected_hours(start_date, end_date)
         
         workload = {
@@ -282,37 +272,17 @@ class Team(db.Model):
         }
         
         for row in results:
-            workload['users'][row['user_name']] = {
-                'hours': row['total_hours'],
-                'percentage': (row['total_hours'] / expected_hours * 100) if expected_hours > 0 else 0
+            hours = round(row['time_spent_seconds'] / 3600, 2)
+            workload['users'][usernames.get(row['user_id'], f"User {row['user_id']}")] = {
+                'hours': hours,
+                'percentage': (hours / expected_hours * 100) if expected_hours > 0 else 0
             }
         
         return workload
 
     def get_activity(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Pobiera raport aktywności zespołu."""
-        db = get_db()
-        cursor = db.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                DATE(work_date) as date,
-                SUM(time_spent) as hours,
-                COUNT(DISTINCT issue_key) as tasks
-            FROM worklogs
-            WHERE user_name IN (
-                SELECT user_name FROM team_memberships WHERE team_id = ?
-            )
-            AND work_date BETWEEN ? AND ?
-            GROUP BY DATE(work_date)
-            ORDER BY date
-        """, (
-            self.id,
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d')
-        ))
-        
-        results = cursor.fetchall()
+        results = self._member_rollup(start_date, end_date, ('work_date',))
         
         activity = {
             'daily_activity': {},
@@ -323,10 +293,12 @@ class Team(db.Model):
         }
         
         for row in results:
-            activity['daily_activity'][row['date']] = row['hours']
-            activity['tasks'][row['date']] = row['tasks']
-            activity['total_hours'] += row['hours']
-            activity['total_tasks'] += row['tasks']
+            date = row['work_date'].strftime('%Y-%m-%d')
+            hours = round(row['time_spent_seconds'] / 3600, 2)
+            activity['daily_activity'][date] = hours
+            activity['tasks'][date] = row['issue_count']
+            activity['total_hours'] += hours
+            activity['total_tasks'] += row['issue_count']
         
         days = len(results)
         if days > 0:
@@ -336,27 +308,8 @@ class Team(db.Model):
 
     def get_efficiency(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Pobiera raport efektywności zespołu."""
-        db = get_db()
-        cursor = db.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                user_name,
-                SUM(time_spent) as hours,
-                COUNT(DISTINCT issue_key) as tasks
-            FROM worklogs
-            WHERE user_name IN (
-                SELECT user_name FROM team_memberships WHERE team_id = ?
-            )
-            AND work_date BETWEEN ? AND ?
-            GROUP BY user_name
-        """, (
-            self.id,
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d')
-        ))
-        
-        results = cursor.fetchall()
+        results = self._member_rollup(start_date, end_date, ('user_id',))
+        usernames = self._usernames(row['user_id'] for row in results)
         
         efficiency = {
             'users': {},
@@ -366,9 +319,9 @@ class Team(db.Model):
         }
         
         for row in results:
-            user = row['user_name']
-            hours = row['hours']
-            tasks = row['tasks']
+            user = usernames.get(row['user_id'], f"User {row['user_id']}")
+            hours = round(row['time_spent_seconds'] / 3600, 2)
+            tasks = row['issue_count']
             
             efficiency['users'][user] = {
                 'hours': hours,
@@ -110,24 +110,14 @@ class TeamCapacity(db.Model):
             ).first()
             
             if not capacity:
-                from app.models.holiday import Holiday
+                from app.services.business_calendar import get_business_calendar
                 from datetime import date
                 import calendar
                 
-                # Calculate working days
+                # Working days excluding weekends and holidays
                 _, num_days = calendar.monthrange(year, month)
-                start_date = date(year, month, 1)
-                end_date = date(year, month, num_days)
-                
-                # Get holidays in the period
-                holidays = Holiday.query.filter(
-                    Holiday.date.between(start_date, end_date)
-                ).count()
-                
-                # Calculate working days excluding weekends and holidays
-                working_days = sum(1 for day in range(1, num_days + 1)
-                                 if date(year, month, day).weekday() < 5)
-                working_days -= holidays
+                working_days = get_business_calendar().working_days(
+                    date(year, month, 1), date(year, month, num_days))
                 
                 capacity = cls(
                     team_id=team_id,
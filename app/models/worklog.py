@@ -10,7 +10,14 @@ logger = logging.getLogger(__name__)
 class Worklog(db.Model):
     """Model reprezentujący wpis czasu pracy."""
     __tablename__ = 'worklogs'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Keyset pagination of /admin/worklogs/data: (sort column, id) per sort key and filter
+        db.Index('idx_worklogs_work_date_id', 'work_date', 'id'),
+        db.Index('idx_worklogs_user_work_date_id', 'user_id', 'work_date', 'id'),
+        db.Index('idx_worklogs_project_work_date_id', 'project_id', 'work_date', 'id'),
+        db.Index('idx_worklogs_time_spent_id', 'time_spent_seconds', 'id'),
+        {'extend_existing': True}
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     jira_worklog_id = db.Column(db.String(100), unique=True)
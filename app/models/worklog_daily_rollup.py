@@ -0,0 +1,264 @@
+from app.extensions import db
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.models.worklog import Worklog
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns a summary can be grouped by
+ROLLUP_DIMENSIONS = ('work_date', 'user_id', 'project_id')
+
+RollupKey = Tuple[date, int, int]
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _parse_issue_ids(value: Optional[str]) -> Set[int]:
+    return {int(i) for i in value.split(',') if i} if value else set()
+
+
+class WorklogDailyRollup(db.Model):
+    """Worklog totals per day, user and project.
+
+    Reports read these rows instead of scanning ``worklogs``. ``issue_ids``
+    holds the distinct local issue ids of the day, so distinct issue counts
+    over any range stay exact when rows are merged.
+
+    Rows are recomputed from raw worklogs for every key touched by an ORM
+    flush (see the listener below) and explicitly by the bulk paths of the
+    JIRA sync, which bypass the session.
+    """
+    __tablename__ = 'worklog_daily_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('work_date', 'user_id', 'project_id', name='uq_worklog_daily_rollup'),
+        db.Index('idx_worklog_rollup_user_date', 'user_id', 'work_date'),
+        db.Index('idx_worklog_rollup_project_date', 'project_id', 'work_date'),
+        {'extend_existing': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    work_date = db.Column(db.Date, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    time_spent_seconds = db.Column(db.BigInteger, nullable=False, default=0)
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    issue_count = db.Column(db.Integer, nullable=False, default=0)
+    issue_ids = db.Column(db.Text)  # comma separated distinct issue ids
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<WorklogDailyRollup {self.work_date} user={self.user_id} project={self.project_id}>'
+
+    @staticmethod
+    def key_for(work_date: Any, user_id: Optional[int], project_id: Optional[int]) -> Optional[RollupKey]:
+        """Build a rollup key, or None when the worklog isn't complete yet."""
+        day = _as_date(work_date)
+        if day is None or user_id is None or project_id is None:
+            return None
+        return day, user_id, project_id
+
+    @classmethod
+    def keys_for_worklogs(cls, worklog_ids: Sequence[int], connection=None) -> Set[RollupKey]:
+        """Return the keys currently occupied by the given worklogs."""
+        connection = connection or db.session.connection()
+        worklogs = Worklog.__table__
+        keys = set()
+        worklog_ids = list(worklog_ids)
+        for i in range(0, len(worklog_ids), 500):
+            rows = connection.execute(
+                select(worklogs.c.work_date, worklogs.c.user_id, worklogs.c.project_id)
+                .where(worklogs.c.id.in_(worklog_ids[i:i + 500]))
+            )
+            keys.update(cls.key_for(*row) for row in rows)
+        keys.discard(None)
+        return keys
+
+    @classmethod
+    def refresh(cls, keys: Iterable[Optional[RollupKey]], connection=None) -> int:
+        """Recompute the rollup rows for ``keys`` from raw worklogs.
+
+        Keys are grouped per day; each day is rebuilt with one read of the
+        matching worklogs, one delete and one insert. The materialized
+        monthly aggregates built on these rows follow. Returns the number of
+        rows written.
+        """
+        from app.models.report_aggregate import ReportAggregate
+
+        connection = connection or db.session.connection()
+        keys = {key for key in keys if key is not None}
+        by_day = defaultdict(lambda: (set(), set()))
+        for key in keys:
+            users, projects = by_day[key[0]]
+            users.add(key[1])
+            projects.add(key[2])
+
+        worklogs = Worklog.__table__
+        table = cls.__table__
+        written = 0
+        for day, (users, projects) in by_day.items():
+            start = datetime.combine(day, time.min)
+            rows = connection.execute(
+                select(worklogs.c.user_id, worklogs.c.project_id,
+                       worklogs.c.issue_id, worklogs.c.time_spent_seconds)
+                .where(
+                    worklogs.c.work_date >= start,
+                    worklogs.c.work_date < start + timedelta(days=1),
+                    worklogs.c.user_id.in_(users),
+                    worklogs.c.project_id.in_(projects)
+                )
+            )
+            totals = cls._aggregate((day, user_id, project_id, issue_id, seconds)
+                                    for user_id, project_id, issue_id, seconds in rows)
+
+            # Every (user, project) pair of the day is recomputed, so deleting the cross product is exact
+            connection.execute(table.delete().where(
+                table.c.work_date == day,
+                table.c.user_id.in_(users),
+                table.c.project_id.in_(projects)
+            ))
+            if totals:
+                connection.execute(table.insert(), totals)
+            written += len(totals)
+
+        ReportAggregate.refresh_for_worklogs(keys, connection)
+        return written
+
+    @classmethod
+    def rebuild(cls, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        """Recompute every rollup row in a date range (all dates by default)."""
+        from app.models.report_aggregate import ReportAggregate, ReportAggregateDependency
+
+        connection = db.session.connection()
+        worklogs = Worklog.__table__
+        table = cls.__table__
+
+        query = select(worklogs.c.work_date, worklogs.c.user_id, worklogs.c.project_id,
+                       worklogs.c.issue_id, worklogs.c.time_spent_seconds)
+        delete = table.delete()
+        if start_date:
+            query = query.where(worklogs.c.work_date >= datetime.combine(_as_date(start_date), time.min))
+            delete = delete.where(table.c.work_date >= _as_date(start_date))
+        if end_date:
+            query = query.where(worklogs.c.work_date < datetime.combine(_as_date(end_date) + timedelta(days=1), time.min))
+            delete = delete.where(table.c.work_date <= _as_date(end_date))
+
+        rows = connection.execution_options(yield_per=10000).execute(query)
+        totals = cls._aggregate((_as_date(work_date), user_id, project_id, issue_id, seconds)
+                                for work_date, user_id, project_id, issue_id, seconds in rows)
+        connection.execute(delete)
+        for i in range(0, len(totals), 1000):
+            connection.execute(table.insert(), totals[i:i + 1000])
+
+        # Materialized monthly aggregates are rebuilt lazily on their next read
+        connection.execute(ReportAggregateDependency.__table__.delete())
+        connection.execute(ReportAggregate.__table__.delete())
+        logger.info(f"Rebuilt {len(totals)} worklog rollup rows")
+        return len(totals)
+
+    @staticmethod
+    def _aggregate(rows: Iterable[Tuple[date, int, int, int, int]]) -> List[Dict[str, Any]]:
+        buckets = {}
+        for day, user_id, project_id, issue_id, seconds in rows:
+            bucket = buckets.get((day, user_id, project_id))
+            if bucket is None:
+                bucket = buckets[(day, user_id, project_id)] = [0, 0, set()]
+            bucket[0] += seconds or 0
+            bucket[1] += 1
+            bucket[2].add(issue_id)
+
+        now = datetime.utcnow()
+        return [{
+            'work_date': day,
+            'user_id': user_id,
+            'project_id': project_id,
+            'time_spent_seconds': seconds,
+            'entry_count': entries,
+            'issue_count': len(issues),
+            'issue_ids': ','.join(str(i) for i in sorted(issues)),
+            'updated_at': now
+        } for (day, user_id, project_id), (seconds, entries, issues) in buckets.items()]
+
+    @classmethod
+    def summarize(cls, start_date: Any, end_date: Any, group_by: Sequence[str] = ('user_id',),
+                  user_ids: Optional[Iterable[int]] = None,
+                  project_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Aggregate rollup rows in ``[start_date, end_date]``.
+
+        Returns one dict per group with the ``group_by`` columns plus
+        ``time_spent_seconds``, ``entry_count``, ``issue_count`` (distinct
+        issues across the whole group) and ``days`` (days with any work).
+        """
+        for column in group_by:
+            if column not in ROLLUP_DIMENSIONS:
+                raise ValueError(f"Cannot group worklog rollup by {column}")
+
+        query = db.session.query(
+            *[getattr(cls, column) for column in ROLLUP_DIMENSIONS],
+            cls.time_spent_seconds, cls.entry_count, cls.issue_ids
+        ).filter(cls.work_date >= _as_date(start_date), cls.work_date <= _as_date(end_date))
+        if user_ids is not None:
+            query = query.filter(cls.user_id.in_(list(user_ids)))
+        if project_ids is not None:
+            query = query.filter(cls.project_id.in_(list(project_ids)))
+
+        groups = {}
+        for row in query:
+            key = tuple(getattr(row, column) for column in group_by)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {'seconds': 0, 'entries': 0, 'issues': set(), 'days': set()}
+            group['seconds'] += row.time_spent_seconds or 0
+            group['entries'] += row.entry_count or 0
+            group['issues'] |= _parse_issue_ids(row.issue_ids)
+            group['days'].add(row.work_date)
+
+        return [{
+            **dict(zip(group_by, key)),
+            'time_spent_seconds': group['seconds'],
+            'entry_count': group['entries'],
+            'issue_count': len(group['issues']),
+            'days': len(group['days'])
+        } for key, group in sorted(groups.items(), key=lambda item: tuple(str(k) for k in item[0]))]
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_worklog_rollup_keys(session, flush_context, instances):
+    """Remember which rollup keys the pending worklog changes touch."""
+    keys = session.info.setdefault('worklog_rollup_keys', set())
+    moved = []
+    for worklog in session.new:
+        if isinstance(worklog, Worklog):
+            keys.add(WorklogDailyRollup.key_for(worklog.work_date, worklog.user_id, worklog.project_id))
+    for worklog in session.dirty:
+        if not isinstance(worklog, Worklog):
+            continue
+        state = db.inspect(worklog)
+        if any(state.attrs[column].history.has_changes() for column in ROLLUP_DIMENSIONS + ('time_spent_seconds', 'issue_id')):
+            moved.append(worklog.id)
+            keys.add(WorklogDailyRollup.key_for(worklog.work_date, worklog.user_id, worklog.project_id))
+    moved.extend(worklog.id for worklog in session.deleted if isinstance(worklog, Worklog))
+
+    # The database still holds the keys the changed worklogs are leaving
+    if moved:
+        keys.update(WorklogDailyRollup.keys_for_worklogs(moved, session.connection()))
+    keys.discard(None)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_worklog_rollup(session, flush_context):
+    """Keep the rollup in step with worklogs written through the ORM."""
+    keys = session.info.pop('worklog_rollup_keys', None)
+    if keys:
+        WorklogDailyRollup.refresh(keys, session.connection())
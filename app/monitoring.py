@@ -21,6 +21,11 @@ class Monitor:
         self.start_times = {}
         self.memory_usage = {}
         self.query_counts = {}
+        self.gauges = {}
+
+    def register_gauge(self, name: str, callback: Callable[[], Dict[str, Any]]) -> None:
+        """Register a callback whose current values are reported with the metrics."""
+        self.gauges[name] = callback
 
     @contextmanager
     def measure(self, name: str):
@@ -120,6 +125,10 @@ class Monitor:
                     'count': len(counts)
                 }
                 for name, counts in self.query_counts.items()
+            },
+            'gauges': {
+                name: callback()
+                for name, callback in self.gauges.items()
             }
         }
 
@@ -4,11 +4,11 @@ from app.decorators import admin_required
 from app.utils.db import get_db
 from app.services import hash_password
 from app.services.jira_service import get_jira_service, sync_jira_users, sync_jira_data, test_connection, save_jira_config, get_jira_projects, JiraService
+from app.services.sync_coordinator import get_sync_coordinator
 from app.models.user import User
 from app.models.role import Role
 from app.models.user_role import UserRole
 from app.models.team import Team
-from app.models.team_membership import TeamMembership as TeamMember
 from app.models.portfolio import Portfolio, portfolio_projects
 from app.models.project import Project
 from app.extensions import db, cache, csrf
@@ -18,17 +18,27 @@ from app.forms.team import TeamForm
 from app.forms.portfolio import PortfolioForm
 from app.forms.project import ProjectForm
 from app.models.jira_config import JiraConfig
+from app.models.sync_run import SyncRun
+from app.models.sync_job import SyncJob
 from app.utils.crypto import encrypt_password
+from app.utils.loaders import get_loader
+from app.utils.pagination import keyset_page
+from app.utils.http_cache import conditional
+from app.cache import generate_cache_key, tag, month_tags
+from app.models.cache_tags import portfolio_tags
+from app.models.cache_warmup import CacheWarmupKey
+from app.services.cache_warmup import warmable
 from app.services.admin_service import save_app_settings
 from app.exceptions import JiraValidationError, JiraConnectionError
 import logging
 from datetime import datetime, timezone, timedelta
 import os
-import json
 import csv
 import io
 from typing import Dict, Any
 from app.models.worklog import Worklog
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.services.workload_service import WorkloadReport
 from app.services.jira_client import get_jira_client
 from app.models.issue import Issue
 from jira import JIRA
@@ -37,13 +47,10 @@ import requests
 from pathlib import Path
 from app.models.leave_request import LeaveRequest
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text, func, distinct
+from sqlalchemy import text
 import traceback
-import time
-import hashlib
 import bleach
 from werkzeug.exceptions import HTTPException
-from functools import wraps
 import threading
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -75,7 +82,6 @@ def get_admin_stats():
     """Get admin dashboard statistics."""
     try:
         from app.services.jira_service import get_jira_service
-        from sqlalchemy import text
         
         jira_service = get_jira_service()
         jira_connected = False
@@ -402,8 +408,8 @@ def manage_teams():
                     # Add members
                     if form.members.data:
                         logger.info(f"Adding members: {form.members.data}")
-                        for user_id in form.members.data:
-                            user = User.query.get(user_id)
+                        users = get_loader().load_many(User, form.members.data)
+                        for user in users.values():
                             if user:
                                 # Create membership manually
                                 membership = TeamMembership(
@@ -417,11 +423,8 @@ def manage_teams():
                     # Add projects
                     if form.projects.data:
                         logger.info(f"Adding projects: {form.projects.data}")
-                        project_list = []
-                        for project_id in form.projects.data:
-                            project = Project.query.get(project_id)
-                            if project:
-                                project_list.append(project)
+                        projects = get_loader().load_many(Project, form.projects.data)
+                        project_list = [project for project in projects.values() if project]
                         
                         team.assigned_projects = project_list
                         logger.info(f"Set {len(project_list)} projects to team {team.id}")
@@ -658,10 +661,8 @@ def manage_portfolios():
                 # Add selected projects if any
                 if form.projects.data:
                     from app.models.project import Project
-                    for project_id in form.projects.data:
-                        project = Project.query.get(project_id)
-                        if project:
-                            portfolio.projects.append(project)
+                    projects = get_loader().load_many(Project, form.projects.data)
+                    portfolio.projects.extend(project for project in projects.values() if project)
                 
                 db.session.add(portfolio)
                 db.session.commit()
@@ -842,8 +843,8 @@ def create_user():
         
         # Add roles from request or ensure default role
         if 'roles' in data:
-            for role_id in data['roles']:
-                role = Role.query.get(role_id)
+            roles = get_loader().load_many(Role, data['roles'])
+            for role in roles.values():
                 if role:
                     new_user.add_role(role)
         else:
@@ -884,8 +885,8 @@ def update_user(user_id):
             user.user_roles = []
             
             # Dodaj nowe role
-            for role_id in data['roles']:
-                role = Role.query.get(role_id)
+            roles = get_loader().load_many(Role, data['roles'])
+            for role in roles.values():
                 if role:
                     user.add_role(role)
 
@@ -929,47 +930,38 @@ def delete_user(user_name):
         logger.error(f"Error deleting user {user_name}: {str(e)}")
         return jsonify({"error": "Błąd podczas usuwania użytkownika"}), 500
 
+def _queue_sync(kind, message, **parameters):
+    """Queue a JIRA sync in the coordinator instead of running it in the request."""
+    jira_service = get_jira_service()
+    if not jira_service or not jira_service.is_configured:
+        return jsonify({
+            'status': 'error',
+            'message': 'JIRA is not configured'
+        }), 400
+
+    coordinator = get_sync_coordinator()
+    job, coalesced = coordinator.enqueue(
+        kind, trigger='admin', requested_by_id=current_user.id, **parameters
+    )
+    coordinator.start_worker()
+
+    return jsonify({
+        'status': 'success',
+        'queued': True,
+        'coalesced': coalesced,
+        'message': message,
+        'job': job.to_dict()
+    }), 202
+
 @admin_bp.route('/sync/jira', methods=['POST'])
 @login_required
 @admin_required
 def sync_all_jira():
     """Synchronize all JIRA data."""
     try:
-        logger.info("Starting full JIRA synchronization")
-        jira_service = get_jira_service()
-        
-        if not jira_service:
-            logger.error("Failed to get JIRA service")
-            return jsonify({
-                'status': 'error',
-                'message': 'Could not initialize JIRA service'
-            }), 500
-            
-        if not jira_service.is_connected:
-            logger.error("JIRA service is not connected")
-            return jsonify({
-                'status': 'error',
-                'message': 'Not connected to JIRA. Please check your configuration.'
-            }), 400
-
-        success, results = jira_service.sync_all()
-        
-        if success:
-            logger.info(f"Full sync completed successfully: {results}")
-            return jsonify({
-                'status': 'success',
-                'message': 'Full synchronization completed successfully',
-                'stats': results
-            })
-        else:
-            logger.error(f"Full sync failed: {results.get('error', 'Unknown error')}")
-            return jsonify({
-                'status': 'error',
-                'message': results.get('error', 'Synchronization failed')
-            }), 500
-            
+        return _queue_sync('full', 'Full synchronization queued')
     except Exception as e:
-        logger.error(f"Error in full sync: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing full sync: {str(e)}", exc_info=True)
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -981,27 +973,12 @@ def sync_all_jira():
 def sync_users():
     """Synchronize users from JIRA."""
     try:
-        jira_service = get_jira_service()
-        if not jira_service or not jira_service.is_configured:
-            return jsonify({
-                'status': 'error',
-                'message': 'JIRA is not configured'
-            }), 400
-
-        stats = jira_service.sync_users()
-        logger.info(f"Sync completed with stats: {stats}")
-
-        return jsonify({
-            'status': 'success',
-            'message': f"Successfully synchronized {stats['total']} users",
-            'stats': stats
-        })
-
+        return _queue_sync('users', 'User synchronization queued')
     except Exception as e:
-        logger.error(f"Error in sync_jira_users: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing users sync: {str(e)}", exc_info=True)
         return jsonify({
             'status': 'error',
-            'message': f"Error synchronizing users: {str(e)}"
+            'message': str(e)
         }), 500
 
 @admin_bp.route('/sync-projects', methods=['POST'])
@@ -1011,34 +988,9 @@ def sync_users():
 def sync_projects():
     """Synchronize projects from JIRA."""
     try:
-        logger.info("Starting JIRA project synchronization")
-        jira_service = get_jira_service()
-        
-        if not jira_service:
-            logger.error("Failed to get JIRA service")
-            return jsonify({
-                'status': 'error',
-                'message': 'Could not initialize JIRA service'
-            }), 500
-            
-        if not jira_service.is_connected:
-            logger.error("JIRA service is not connected")
-            return jsonify({
-                'status': 'error',
-                'message': 'Not connected to JIRA. Please check your configuration.'
-            }), 400
-
-        stats = jira_service.sync_projects()
-        logger.info(f"Project sync completed: {stats}")
-        
-        return jsonify({
-            'status': 'success',
-            'message': 'Project synchronization completed successfully',
-            'stats': stats
-        })
-        
+        return _queue_sync('projects', 'Project synchronization queued')
     except Exception as e:
-        logger.error(f"Error syncing projects: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing projects sync: {str(e)}", exc_info=True)
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -1050,34 +1002,9 @@ def sync_projects():
 def sync_worklogs():
     """Synchronize worklogs from JIRA."""
     try:
-        logger.info("Starting JIRA worklog synchronization")
-        jira_service = get_jira_service()
-        
-        if not jira_service:
-            logger.error("Failed to get JIRA service")
-            return jsonify({
-                'status': 'error',
-                'message': 'Could not initialize JIRA service'
-            }), 500
-            
-        if not jira_service.is_connected:
-            logger.error("JIRA service is not connected")
-            return jsonify({
-                'status': 'error',
-                'message': 'Not connected to JIRA. Please check your configuration.'
-            }), 400
-
-        stats = jira_service.sync_worklogs()
-        logger.info(f"Worklog sync completed: {stats}")
-        
-        return jsonify({
-            'status': 'success',
-            'message': 'Worklog synchronization completed successfully',
-            'stats': stats
-        })
-        
+        return _queue_sync('worklogs', 'Worklog synchronization queued', days_back=request.args.get('days', 30, type=int))
     except Exception as e:
-        logger.error(f"Error syncing worklogs: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing worklogs sync: {str(e)}", exc_info=True)
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -1120,9 +1047,13 @@ def system_stats_api():
 @login_required
 @admin_required
 def clear_cache():
-    """Czyści cache aplikacji."""
+    """Czyści cache aplikacji, jedną przestrzeń nazw (``{"namespace": ...}``) albo wpisy z tagami (``{"tags": [...]}``)."""
     try:
-        cache.clear()
+        data = request.get_json(silent=True) or {}
+        if data.get('tags'):
+            cache.invalidate_tags(*data['tags'])
+        else:
+            cache.clear(namespace=data.get('namespace'))
         logger.info("Cache cleared successfully")
         return jsonify({
             'status': 'success',
@@ -1135,6 +1066,14 @@ def clear_cache():
             'message': 'Wystąpił błąd podczas czyszczenia cache'
         }), 500
 
+@admin_bp.route('/cache/stats')
+@login_required
+@admin_required
+def cache_stats():
+    """Metryki cache'u: trafienia, chybienia i usunięcia per przestrzeń nazw oraz rozgrzewanie."""
+    warmup = CacheWarmupKey.query.order_by(CacheWarmupKey.target, CacheWarmupKey.request_count.desc()).limit(100)
+    return jsonify({**cache.stats(), 'warmup': [key.to_dict() for key in warmup]})
+
 @admin_bp.route('/api/jira/projects', methods=['GET'])
 @login_required
 @admin_required
@@ -1165,7 +1104,7 @@ def get_jira_projects_api():
 @login_required
 @admin_required
 def get_sync_status():
-    """Endpoint do sprawdzania statusu ostatniej synchronizacji."""
+    """Endpoint do sprawdzania postępu bieżącej lub ostatniej synchronizacji."""
     try:
         jira_config = JiraConfig.query.filter_by(is_active=True).first()
         if not jira_config:
@@ -1173,11 +1112,24 @@ def get_sync_status():
                 'status': 'error',
                 'message': 'Brak konfiguracji JIRA'
             }), 404
+
+        run = SyncRun.latest()
+        last_completed = SyncRun.query.filter_by(status='completed').order_by(SyncRun.id.desc()).first()
+
+        # Zadanie z kolejki śledzone przez panel po zleceniu synchronizacji
+        job_id = request.args.get('job_id', type=int)
+        job = db.session.get(SyncJob, job_id) if job_id else None
+        if job and job.run_id:
+            run = db.session.get(SyncRun, job.run_id) or run
             
         return jsonify({
             'status': 'success',
-            'last_sync': jira_config.updated_at.isoformat() if jira_config.updated_at else None,
-            'is_active': jira_config.is_active
+            'last_sync': last_completed.finished_at.isoformat() if last_completed and last_completed.finished_at else None,
+            'is_active': jira_config.is_active,
+            'is_running': bool(run and run.status == 'running'),
+            'run': run.to_dict() if run else None,
+            'job': job.to_dict() if job else None,
+            'queue': get_sync_coordinator().status()
         })
         
     except Exception as e:
@@ -1197,27 +1149,12 @@ def jira():
 def sync_jira_users():
     """Synchronize users from JIRA."""
     try:
-        jira_service = get_jira_service()
-        if not jira_service or not jira_service.is_configured:
-            return jsonify({
-                'status': 'error',
-                'message': 'JIRA is not configured'
-            }), 400
-
-        stats = jira_service.sync_users()
-        logger.info(f"Sync completed with stats: {stats}")
-
-        return jsonify({
-            'status': 'success',
-            'message': f"Successfully synchronized {stats['total']} users",
-            'stats': stats
-        })
-
+        return _queue_sync('users', 'User synchronization queued')
     except Exception as e:
-        logger.error(f"Error in sync_jira_users: {str(e)}", exc_info=True)
+        logger.error(f"Error queueing users sync: {str(e)}", exc_info=True)
         return jsonify({
             'status': 'error',
-            'message': f"Error synchronizing users: {str(e)}"
+            'message': str(e)
         }), 500
 
 @admin_bp.route('/static/<path:filename>')
@@ -1518,93 +1455,126 @@ def manage_worklogs():
         flash('Error loading worklogs', 'error')
         return redirect(url_for('admin.index'))
 
+# Sort keys accepted by /worklogs/data; each has a matching (column, id) index
+WORKLOG_SORT_FIELDS = {
+    'work_date': Worklog.work_date,
+    'time_spent_seconds': Worklog.time_spent_seconds,
+    'id': Worklog.id,
+    'user': User.username,
+    'project': Project.name,
+    'issue': Issue.jira_key,
+}
+
+def _worklog_stats(start_date, end_date, project_id, user_id) -> Dict[str, Any]:
+    """Worklog statistics for a filter set, from the daily rollup and cached per filter set."""
+    # Most selective tag every relevant worklog change bumps
+    if user_id:
+        tags = [tag('user', user_id)]
+    elif project_id:
+        tags = [tag('project', project_id)]
+    elif start_date and end_date:
+        tags = month_tags(start_date, end_date)
+    else:
+        tags = ['worklogs']
+    cache_key = generate_cache_key(start_date, end_date, project_id, user_id)
+    return cache.get_or_set(
+        cache_key,
+        lambda: _compute_worklog_stats(start_date, end_date, project_id, user_id),
+        timeout=current_app.config.get('WORKLOG_STATS_CACHE_TIMEOUT', 3600),
+        namespace='worklog_stats',
+        tags=tags
+    )
+
+def _compute_worklog_stats(start_date, end_date, project_id, user_id) -> Dict[str, Any]:
+    query = db.session.query(
+        db.func.sum(WorklogDailyRollup.entry_count).label('total_count'),
+        db.func.sum(WorklogDailyRollup.time_spent_seconds).label('total_time'),
+        db.func.count(db.distinct(WorklogDailyRollup.user_id)).label('active_users')
+    )
+    if start_date:
+        query = query.filter(WorklogDailyRollup.work_date >= start_date.date())
+    if end_date:
+        query = query.filter(WorklogDailyRollup.work_date <= end_date.date())
+    if project_id:
+        query = query.filter(WorklogDailyRollup.project_id == project_id)
+    if user_id:
+        query = query.filter(WorklogDailyRollup.user_id == user_id)
+    row = query.first()
+
+    total_hours = round((row.total_time or 0) / 3600, 2)
+    avg_daily_hours = 0
+    if start_date and end_date:
+        days = (end_date - start_date).days + 1
+        if days > 0:
+            avg_daily_hours = round(total_hours / days, 2)
+
+    return {
+        'total_count': int(row.total_count or 0),
+        'total_hours': total_hours,
+        'active_users': row.active_users or 0,
+        'avg_daily_hours': avg_daily_hours
+    }
+
 @admin_bp.route('/worklogs/data')
 @login_required
 @admin_required
+@conditional(tags=lambda: ['worklogs', 'users', 'projects', 'issues'])
 def get_worklogs_data():
-    """Get worklog data with filters and statistics."""
+    """Get worklog data with filters and statistics.
+
+    Pages are fetched by keyset on (sort column, id): pass the returned
+    ``next_cursor`` as ``cursor`` to get the following page. ``page`` is
+    still accepted for numbered pages.
+    """
     try:
         # Get filter parameters
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
-        project_id = request.args.get('project_id')
-        user_id = request.args.get('user_id')
+        project_id = request.args.get('project_id', type=int)
+        user_id = request.args.get('user_id', type=int)
+        cursor = request.args.get('cursor')
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
+        per_page = min(max(request.args.get('per_page', 50, type=int), 1), 500)
 
-        # Base query for statistics
-        stats_query = db.session.query(
-            db.func.count(Worklog.id).label('total_count'),
-            db.func.sum(Worklog.time_spent_seconds).label('total_time'),
-            db.func.count(db.distinct(Worklog.user_id)).label('active_users')
-        )
+        start_date = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_date = datetime.strptime(end_date, '%Y-%m-%d') if end_date else None
+
+        stats = _worklog_stats(start_date, end_date, project_id, user_id)
+
+        # Apply sorting to data query
+        sort_column = request.args.get('sort', 'work_date')
+        sort_dir = request.args.get('order', 'desc')
+        sort_field = WORKLOG_SORT_FIELDS.get(sort_column, Worklog.work_date)
 
-        # Base query for data
-        base_query = Worklog.query\
+        query = db.session.query(Worklog, sort_field)\
             .join(Worklog.user)\
             .join(Worklog.project)\
-            .join(Worklog.issue)
+            .join(Worklog.issue)\
+            .options(
+                db.contains_eager(Worklog.user),
+                db.contains_eager(Worklog.project),
+                db.contains_eager(Worklog.issue)
+            )
 
-        # Apply filters to both queries
         if start_date:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-            base_query = base_query.filter(Worklog.work_date >= start_date)
-            stats_query = stats_query.filter(Worklog.work_date >= start_date)
-
+            query = query.filter(Worklog.work_date >= start_date)
         if end_date:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
-            base_query = base_query.filter(Worklog.work_date <= end_date)
-            stats_query = stats_query.filter(Worklog.work_date <= end_date)
-
+            query = query.filter(Worklog.work_date < end_date + timedelta(days=1))
         if project_id:
-            base_query = base_query.filter(Worklog.project_id == project_id)
-            stats_query = stats_query.filter(Worklog.project_id == project_id)
-
+            query = query.filter(Worklog.project_id == project_id)
         if user_id:
-            base_query = base_query.filter(Worklog.user_id == user_id)
-            stats_query = stats_query.filter(Worklog.user_id == user_id)
-
-        # Get statistics
-        stats = stats_query.first()
-        total_count = stats.total_count or 0
-        total_hours = round((stats.total_time or 0) / 3600, 2)
-        active_users = stats.active_users or 0
-
-        # Calculate average daily hours if date range is provided
-        avg_daily_hours = 0
-        if start_date and end_date:
-            days = (end_date - start_date).days + 1
-            if days > 0:
-                avg_daily_hours = round(total_hours / days, 2)
-
-        # Apply sorting and pagination to data query
-        sort_column = request.args.get('sort', 'work_date')
-        sort_dir = request.args.get('order', 'desc')
-
-        if sort_column == 'user':
-            sort_field = User.display_name
-        elif sort_column == 'project':
-            sort_field = Project.name
-        elif sort_column == 'issue':
-            sort_field = Issue.jira_key
-        else:
-            sort_field = getattr(Worklog, sort_column)
-
-        if sort_dir == 'desc':
-            base_query = base_query.order_by(sort_field.desc())
-        else:
-            base_query = base_query.order_by(sort_field.asc())
+            query = query.filter(Worklog.user_id == user_id)
 
-        # Get paginated results
-        pagination = base_query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        items, next_cursor = keyset_page(
+            query, sort_field, Worklog.id, per_page,
+            descending=sort_dir == 'desc',
+            cursor=cursor,
+            offset=0 if cursor else (max(page, 1) - 1) * per_page
         )
 
         # Prepare worklog data
         worklogs = []
-        for worklog in pagination.items:
+        for worklog in items:
             worklogs.append({
                 'id': worklog.id,
                 'user': {
@@ -1625,28 +1595,30 @@ def get_worklogs_data():
                 'time_spent_hours': round(worklog.time_spent_seconds / 3600, 2),
                 'work_date': worklog.work_date.strftime('%Y-%m-%d'),
                 'description': worklog.description,
-                'created_at': worklog.created_at.strftime('%Y-%m-%d %H:%M:%S')
+                'created_at': worklog.created_at.strftime('%Y-%m-%d %H:%M:%S') if worklog.created_at else None
             })
 
+        total = stats['total_count']
         return jsonify({
             'status': 'success',
             'data': {
                 'worklogs': worklogs,
                 'pagination': {
-                    'page': pagination.page,
-                    'pages': pagination.pages,
-                    'total': pagination.total,
-                    'per_page': pagination.per_page
+                    'page': None if cursor else page,
+                    'pages': (total + per_page - 1) // per_page,
+                    'total': total,
+                    'per_page': per_page,
+                    'next_cursor': next_cursor
                 },
-                'stats': {
-                    'total_count': total_count,
-                    'total_hours': total_hours,
-                    'active_users': active_users,
-                    'avg_daily_hours': avg_daily_hours
-                }
+                'stats': stats
             }
         })
 
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error getting worklog data: {str(e)}", exc_info=True)
         return jsonify({
@@ -1732,9 +1704,16 @@ def workload_report():
         flash('Error loading workload report', 'danger')
         return redirect(url_for('admin.index'))
 
+def _default_workload_day():
+    """Dzisiejsza data, gdy brakuje zakresu - domyślne ostatnie 30 dni przesuwają się codziennie."""
+    return None if request.args.get('date_range') else datetime.now().date().isoformat()
+
 @admin_bp.route('/reports/workload/data')
 @login_required
 @admin_required
+@warmable('workload')
+@cache.cached(timeout=3600, namespace='workload', tags=lambda: ['worklogs', 'teams', 'memberships', 'users'],
+              vary=_default_workload_day)
 def get_workload_data():
     """API endpoint that returns workload data for the report."""
     try:
@@ -1762,237 +1741,14 @@ def get_workload_data():
         
         logger.debug(f"Generating workload report with filters: team_id={team_id}, project_ids={project_ids}, date_range={date_range}")
         
-        # Initialize data structures for the response
-        team_workload = {
-            'labels': [],
-            'datasets': [{
-                'label': 'Team Hours',
-                'data': [],
-                'backgroundColor': []
-            }]
-        }
-        
-        user_workload = {
-            'labels': [],
-            'datasets': [{
-                'label': 'User Hours',
-                'data': [],
-                'backgroundColor': []
-            }]
-        }
-        
-        detailed_stats = []
-        
-        # Base query for users who have logged time
-        user_query = db.session.query(
-            User.id,
-            User.display_name,
-            func.sum(Worklog.time_spent_seconds).label('total_time'),
-            func.count(distinct(Project.id)).label('projects_count')
-        ).join(
-            Worklog, Worklog.user_id == User.id
-        ).join(
-            Project, Project.id == Worklog.project_id
-        ).filter(
-            User.is_active == True
-        )
-        
-        # Apply date range filter
-        if start_date:
-            user_query = user_query.filter(Worklog.work_date >= start_date)
-        if end_date:
-            user_query = user_query.filter(Worklog.work_date <= end_date)
-        
-        # Apply team filter if provided
-        team_members = []
-        team_name = "All Teams"
-        if team_id:
-            team = Team.query.get(team_id)
-            if team:
-                team_name = team.name
-                team_members = [member.id for member in team.members]
-                user_query = user_query.filter(User.id.in_(team_members))
-        
-        # Apply project filter if provided
-        if project_ids:
-            # Multiple project selection
-            if len(project_ids) > 0 and project_ids[0] != '':
-                user_query = user_query.filter(Worklog.project_id.in_(project_ids))
-                logger.debug(f"Filtering by {len(project_ids)} projects: {project_ids}")
-        
-        # Group and execute user query
-        user_results = user_query.group_by(User.id).all()
-        
-        # Get team data
-        team_results = []
-        team_project_filter = {}
-        
-        # If specific team is selected, we only need that team's data
-        if team_id:
-            team_query = db.session.query(
-                Team.id,
-                Team.name,
-                func.sum(Worklog.time_spent_seconds).label('total_time'),
-                func.count(distinct(Project.id)).label('projects_count')
-            ).join(
-                TeamMember, TeamMember.team_id == Team.id
-            ).join(
-                Worklog, Worklog.user_id == TeamMember.user_id
-            ).join(
-                Project, Project.id == Worklog.project_id
-            ).filter(
-                Team.is_active == True,
-                Team.id == team_id
-            )
-            
-            # Apply date range filter
-            if start_date:
-                team_query = team_query.filter(Worklog.work_date >= start_date)
-            if end_date:
-                team_query = team_query.filter(Worklog.work_date <= end_date)
-                
-            # Apply project filter if provided
-            if project_ids and len(project_ids) > 0 and project_ids[0] != '':
-                team_query = team_query.filter(Worklog.project_id.in_(project_ids))
-                team_project_filter = {int(pid): True for pid in project_ids}
-                
-            # Group and execute team query
-            team_results = team_query.group_by(Team.id).all()
-        else:
-            # If no team is selected, get data for all teams
-            team_query = db.session.query(
-                Team.id,
-                Team.name,
-                func.sum(Worklog.time_spent_seconds).label('total_time'),
-                func.count(distinct(Project.id)).label('projects_count')
-            ).join(
-                TeamMember, TeamMember.team_id == Team.id
-            ).join(
-                Worklog, Worklog.user_id == TeamMember.user_id
-            ).join(
-                Project, Project.id == Worklog.project_id
-            ).filter(
-                Team.is_active == True
-            )
-            
-            # Apply date range filter
-            if start_date:
-                team_query = team_query.filter(Worklog.work_date >= start_date)
-            if end_date:
-                team_query = team_query.filter(Worklog.work_date <= end_date)
-                
-            # Apply project filter if provided
-            if project_ids and len(project_ids) > 0 and project_ids[0] != '':
-                team_query = team_query.filter(Worklog.project_id.in_(project_ids))
-                team_project_filter = {int(pid): True for pid in project_ids}
-                
-            # Group and execute team query
-            team_results = team_query.group_by(Team.id).all()
-        
-        # Process team results
-        colors = ['#4e73df', '#1cc88a', '#36b9cc', '#f6c23e', '#e74a3b', '#858796', '#5a5c69',
-                 '#4d5c68', '#3e5c76', '#2e5984', '#1e5f8f', '#0f639a', '#0068a5', '#006db0']
-        
-        # Define the working days counting function at the top level of the function
-        # Calculate working days (exclude weekends)
-        def count_working_days(start_date, end_date):
-            working_days = 0
-            current_date = start_date
-            while current_date <= end_date:
-                # Check if current date is a weekday (0-4 for Monday to Friday)
-                if current_date.weekday() < 5:
-                    working_days += 1
-                current_date += timedelta(days=1)
-            return working_days
-        
-        # Add "All Teams" entry if we have multiple teams
-        if len(team_results) > 1 or not team_id:
-            # Calculate total hours across all teams
-            total_team_hours = sum(result.total_time for result in team_results) / 3600
-            total_projects_count = sum(result.projects_count for result in team_results)
-            
-            team_workload['labels'].append("All Teams")
-            team_workload['datasets'][0]['data'].append(round(total_team_hours, 2))
-            team_workload['datasets'][0]['backgroundColor'].append(colors[0])
-            
-            # Calculate working days in the date range
-            working_days = count_working_days(start_date, end_date) if start_date and end_date else 0
-            
-            detailed_stats.append({
-                'name': "All Teams",
-                'total_hours': round(total_team_hours, 2),
-                'projects_count': total_projects_count,
-                'avg_daily_hours': round(total_team_hours / ((end_date - start_date).days + 1), 2) if start_date and end_date else 0,
-                # Note: Using hardcoded 8 hour workday - in future versions this should be replaced with user-specific work norms
-                'utilization': min(round((total_team_hours / (8 * working_days * len(user_results))) * 100, 2) if user_results and start_date and end_date and working_days > 0 else 0, 100)
-            })
-        
-        # Add individual team results
-        for i, result in enumerate(team_results):
-            color_index = (i + 1) % len(colors)  # +1 because 0 is used for "All Teams"
-            team_name = result.name
-            team_hours = round(result.total_time / 3600, 2)
-            
-            team_workload['labels'].append(team_name)
-            team_workload['datasets'][0]['data'].append(team_hours)
-            team_workload['datasets'][0]['backgroundColor'].append(colors[color_index])
-            
-            # Get team members for utilization calculation
-            team_members = []
-            team = Team.query.get(result.id)
-            if team:
-                team_members = [member.id for member in team.members if member.is_active]
-            
-            # Calculate working days for this team
-            team_working_days = count_working_days(start_date, end_date) if start_date and end_date else 0
-            
-            detailed_stats.append({
-                'name': team_name,
-                'total_hours': team_hours,
-                'projects_count': result.projects_count,
-                'avg_daily_hours': round(team_hours / ((end_date - start_date).days + 1), 2) if start_date and end_date else 0,
-                # Note: Using hardcoded 8 hour workday - in future versions this should be replaced with user-specific work norms
-                'utilization': min(round((team_hours / (8 * team_working_days * max(1, len(team_members)))) * 100, 2) if start_date and end_date and team_working_days > 0 else 0, 100)
-            })
-        
-        # Process user results
-        for i, result in enumerate(user_results):
-            color_index = i % len(colors)
-            user_name = result.display_name or f"User {result.id}"
-            user_hours = round(result.total_time / 3600, 2)
-            
-            user_workload['labels'].append(user_name)
-            user_workload['datasets'][0]['data'].append(user_hours)
-            user_workload['datasets'][0]['backgroundColor'].append(colors[color_index])
-            
-            # Calculate working days for this user
-            user_working_days = count_working_days(start_date, end_date) if start_date and end_date else 0
-            
-            detailed_stats.append({
-                'name': user_name,
-                'total_hours': user_hours,
-                'projects_count': result.projects_count,
-                'avg_daily_hours': round(user_hours / ((end_date - start_date).days + 1), 2) if start_date and end_date else 0,
-                # Note: Using hardcoded 8 hour workday - in future versions this should be replaced with user-specific work norms
-                'utilization': min(round((user_hours / (8 * user_working_days)) * 100, 2) if start_date and end_date and user_working_days > 0 else 0, 100)
-            })
-        
-        # Sort detailed stats by total hours
-        detailed_stats.sort(key=lambda x: x['total_hours'], reverse=True)
-        
-        # Add date range info to the response
-        date_info = {
-            'start_date': start_date.strftime('%Y-%m-%d') if start_date else None,
-            'end_date': end_date.strftime('%Y-%m-%d') if end_date else None,
-            'days': (end_date - start_date).days + 1 if start_date and end_date else 0
-        }
+        workload = WorkloadReport(start_date, end_date, team_id=team_id, project_ids=project_ids).compute()
         
         return jsonify({
             'status': 'success',
-            'team_workload': team_workload,
-            'user_workload': user_workload,
-            'detailed_stats': detailed_stats,
-            'date_info': date_info,
+            'team_workload': workload['team_workload'],
+            'user_workload': workload['user_workload'],
+            'detailed_stats': workload['detailed_stats'],
+            'date_info': workload['date_info'],
             'filters': {
                 'team_id': team_id,
                 'project_ids': project_ids,
@@ -2474,35 +2230,13 @@ def edit_portfolio_assignments(portfolio_id):
 def sync_jira():
     """Synchronize data with JIRA."""
     try:
-        jira_service = JiraService()
-        success, results = jira_service.sync_all()
-        
-        if success:
-            flash('JIRA synchronization completed successfully.', 'success')
-            return jsonify({
-                'status': 'success',
-                'message': 'Synchronization completed successfully',
-                'results': results
-            })
-        else:
-            error_msg = 'JIRA synchronization completed with errors. Check logs for details.'
-            if results.get('errors'):
-                error_msg = f"Errors occurred: {', '.join(results['errors'])}"
-            flash(error_msg, 'error')
-            return jsonify({
-                'status': 'error',
-                'message': error_msg,
-                'results': results
-            }), 400
-            
+        return _queue_sync('full', 'Full synchronization queued')
     except Exception as e:
-        error_msg = f'Error during JIRA synchronization: {str(e)}'
-        logger.error(error_msg)
-        flash(error_msg, 'error')
+        logger.error(f"Error queueing full sync: {str(e)}", exc_info=True)
         return jsonify({
             'status': 'error',
-            'message': error_msg
-        }), 500 
+            'message': str(e)
+        }), 500
 
 @admin_bp.route('/jira/test-sync', methods=['GET'])
 @login_required
@@ -2595,55 +2329,11 @@ def test_jira_sync():
             'traceback': traceback.format_exc()
         }), 500 
 
-# Cache dictionary with TTL management
-_analysis_cache = {}
-_cache_ttl = 600  # 10 minutes in seconds
-
-def clear_expired_cache():
-    """Clear expired cache entries based on TTL"""
-    now = time.time()
-    expired_keys = [k for k, v in _analysis_cache.items() if v['expires'] < now]
-    for key in expired_keys:
-        del _analysis_cache[key]
-
-def cached_response(ttl=_cache_ttl):
-    """Decorator to cache API responses based on request parameters"""
-    def decorator(f):
-        @wraps(f)
-        def wrapper(*args, **kwargs):
-            # Clear expired cache entries first
-            clear_expired_cache()
-            
-            # Create cache key from endpoint, function arguments and query parameters
-            key_parts = [request.path]
-            key_parts.extend([str(a) for a in args])
-            key_parts.extend([f"{k}:{v}" for k, v in kwargs.items()])
-            key_parts.extend([f"{k}:{v}" for k, v in request.args.items()])
-            
-            cache_key = hashlib.md5(json.dumps(key_parts).encode()).hexdigest()
-            
-            # Check if we have a valid cached response
-            if cache_key in _analysis_cache and _analysis_cache[cache_key]['expires'] > time.time():
-                current_app.logger.debug(f"Cache hit for {request.path}")
-                return _analysis_cache[cache_key]['data']
-            
-            # No cache hit, call the original function
-            response = f(*args, **kwargs)
-            
-            # Cache the response
-            _analysis_cache[cache_key] = {
-                'data': response,
-                'expires': time.time() + ttl
-            }
-            
-            current_app.logger.debug(f"Cache miss for {request.path}, caching for {ttl} seconds")
-            return response
-        return wrapper
-    return decorator
-
 @admin_bp.route('/portfolios/analysis/data/<portfolio_id>')
 @login_required
-@cached_response(ttl=300)  # 5 minute cache for portfolio analysis data
+@warmable('portfolio_analysis')
+@cache.cached(timeout=3600, namespace='portfolio_analysis',
+              tags=lambda portfolio_id: portfolio_tags(portfolio_id))
 def get_portfolio_analysis_data(portfolio_id):
     """
     Returns portfolio analysis data in JSON format
@@ -313,29 +313,12 @@ def get_activity_data():
     
     days = period_days.get(period, 7)
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
+    start_date = end_date - timedelta(days=days - 1)
     
     try:
-        jira = get_jira_service()
-        user = session['user']['user_name']
-        
-        # Przygotuj daty dla wykresu
-        dates = [(end_date - timedelta(days=x)).strftime('%Y-%m-%d') 
-                for x in range(days)]
-        dates.reverse()
-        
-        # Pobierz dane aktywności
-        activity_data = [
-            len(jira.search_issues(
-                f'assignee = {user} AND updated >= "{date}" AND updated < "{(datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")}"'
-            ))
-            for date in dates
-        ]
-        
-        return jsonify({
-            'labels': dates,
-            'data': activity_data
-        })
+        # Jedno zapytanie do dziennych sum worklogów zamiast wyszukiwania JQL per dzień
+        activity = WorklogService.get_activity_by_day(current_user.id, start_date, end_date)
+        return jsonify(activity)
         
     except Exception as e:
         logger.error(f"Error getting activity data: {str(e)}")
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 import requests
 from config import JIRA_BASE_URL, JIRA_API_TOKEN, JIRA_USERNAME
+from app.services.jira_http import get_jira_session
 
 jira_bp = Blueprint('jira', __name__)
 
@@ -18,7 +19,7 @@ def fetch_jira_users():
             'startAt': start_at
         }
         
-        response = requests.get(
+        response = get_jira_session().get(
             url,
             params=params,
             auth=(JIRA_USERNAME, JIRA_API_TOKEN),
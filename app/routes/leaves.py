@@ -18,6 +18,8 @@ import logging
 from app.models.holiday import Holiday
 from app.extensions import db
 from app.utils.auth import requires_auth, requires_admin
+from app.utils.http_cache import conditional
+from app.cache import tag
 from datetime import datetime
 import os
 from werkzeug.utils import secure_filename
@@ -143,8 +145,13 @@ def calendar():
         flash('Error loading team calendar.', 'danger')
         return redirect(url_for('leaves.index'))
 
+def _team_leaves_tags():
+    team_id = request.args.get('team_id', type=int)
+    return ['leaves', 'users'] + ([tag('team', team_id)] if team_id else [])
+
 @leaves_bp.route('/api/team-leaves')
 @requires_auth
+@conditional(tags=_team_leaves_tags)
 def get_team_leaves():
     """Get leaves for team calendar."""
     try:
@@ -13,7 +13,10 @@ from app.extensions import db
 from app.forms.portfolio import PortfolioForm
 import logging
 from app.utils.auth import requires_auth
-from datetime import datetime
+from app.utils.loaders import get_loader
+from app.utils.http_cache import conditional
+from app.cache import tag
+from datetime import datetime, timedelta
 from typing import Optional
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -197,6 +200,8 @@ def get_portfolios():
 
 @portfolio_bp.route('/api/portfolios/<int:portfolio_id>/analytics', methods=['GET'])
 @requires_auth
+@conditional(tags=lambda portfolio_id: [tag('portfolio', portfolio_id), 'worklogs', 'assignments', 'projects',
+                                        'users', 'user_roles', 'roles'])
 def get_portfolio_analytics(portfolio_id: int):
     """Get detailed analytics for a specific portfolio."""
     try:
@@ -268,7 +273,7 @@ def get_portfolio_shadow_work(portfolio_id: int):
         shadow_work_query = db.session.query(
             Worklog.user_id,
             Worklog.project_id,
-            db.func.sum(Worklog.hours_spent).label('hours')
+            (db.func.sum(Worklog.time_spent_seconds) / 3600.0).label('hours')
         ).outerjoin(
             ProjectAssignment,
             db.and_(
@@ -281,9 +286,9 @@ def get_portfolio_shadow_work(portfolio_id: int):
         )
         
         if start_date:
-            shadow_work_query = shadow_work_query.filter(Worklog.date >= start_date)
+            shadow_work_query = shadow_work_query.filter(Worklog.work_date >= start_date)
         if end_date:
-            shadow_work_query = shadow_work_query.filter(Worklog.date <= end_date)
+            shadow_work_query = shadow_work_query.filter(Worklog.work_date < end_date + timedelta(days=1))
             
         shadow_work = shadow_work_query.group_by(
             Worklog.user_id,
@@ -294,10 +299,14 @@ def get_portfolio_shadow_work(portfolio_id: int):
         from app.models.user import User
         from app.models.project import Project
         
+        loader = get_loader()
+        users = loader.load_many(User, (row.user_id for row in shadow_work))
+        projects = loader.load_many(Project, (row.project_id for row in shadow_work))
+        
         shadow_work_analysis = []
         for user_id, project_id, hours in shadow_work:
-            user = User.query.get(user_id)
-            project = Project.query.get(project_id)
+            user = users.get(user_id)
+            project = projects.get(project_id)
             if user and project:
                 shadow_work_analysis.append({
                     'user': user.to_dict(),
@@ -1,10 +1,11 @@
-from flask import Blueprint, jsonify, request, send_file, current_app, render_template, g
+from flask import Blueprint, jsonify, request, send_file, current_app, render_template, g, url_for
 from app.utils.decorators import auth_required
 from app.services.jira_service import get_jira_service
 from datetime import datetime, timedelta
 import io
 from app.extensions import cache
 from app.services.report_service import ReportService, generate_report, analyze_role_distribution, analyze_shadow_work, get_workload_report
+from app.services.report_jobs import get_report_job_queue
 import csv
 from flask_wtf import FlaskForm
 import logging
@@ -413,26 +414,61 @@ def update_report(report_id: int):
 @reports_bp.route('/api/reports/<int:report_id>/run', methods=['POST'])
 @requires_auth
 def run_report(report_id: int):
-    """Run a report manually."""
+    """Queue a report run; the result is polled from the status endpoint."""
     try:
         report = Report.query.get_or_404(report_id)
-        result = report.run()
-        
-        if result:
+        result, reused = get_report_job_queue().submit(
+            report.report_type,
+            report.get_parameters(),
+            report_id=report.id,
+            requested_by_id=current_user.id if current_user.is_authenticated else None
+        )
+        status_url = url_for('reports.get_report_result_status', result_id=result.id)
+
+        if result.status == 'completed':
             return jsonify({
                 'status': 'success',
                 'message': 'Report executed successfully',
+                'reused': reused,
                 'data': result.to_dict()
             }), 200
-        else:
+        if result.status == 'failed':
             return jsonify({
                 'status': 'error',
-                'message': 'Failed to execute report'
+                'message': result.error_message or 'Failed to execute report',
+                'data': result.to_dict(include_data=False)
             }), 500
+        return jsonify({
+            'status': 'accepted',
+            'message': 'Report queued',
+            'reused': reused,
+            'status_url': status_url,
+            'data': result.to_dict(include_data=False)
+        }), 202
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         logger.error(f"Error running report: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@reports_bp.route('/api/reports/results/<int:result_id>', methods=['GET'])
+@requires_auth
+def get_report_result_status(result_id: int):
+    """Status of a report run; ``?wait=<seconds>`` long-polls until it finishes."""
+    try:
+        wait = min(request.args.get('wait', 0, type=float), current_app.config.get('REPORT_JOB_MAX_WAIT', 30))
+        result = get_report_job_queue().wait(result_id, wait) if wait > 0 else db.session.get(ReportResult, result_id)
+        if result is None:
+            return jsonify({'status': 'error', 'message': 'Report result not found'}), 404
+
+        return jsonify({
+            'status': 'success',
+            'data': result.to_dict(include_data=result.status == 'completed')
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting report result status: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @reports_bp.route('/api/reports/<int:report_id>/results', methods=['GET'])
 @requires_auth
 def get_report_results(report_id: int):
@@ -1,7 +1,10 @@
 from flask import Blueprint, jsonify, request, render_template
 from app.models import TeamCapacity, TeamAllocation, Team, Project, User
-from app.extensions import db
+from app.extensions import db, cache
 from app.utils.auth import requires_auth, requires_admin
+from app.utils.http_cache import conditional
+from app.cache import tag
+from app.services.cache_warmup import warmable
 from datetime import datetime
 import logging
 from typing import Dict
@@ -28,8 +31,15 @@ def index():
         logger.error(f"Error loading team capacity view: {str(e)}")
         return render_template('error.html', error=str(e))
 
+def _default_month():
+    """Bieżący miesiąc, gdy zapytanie go nie podaje - od niego zależy odpowiedź (ETag i klucz cache'u)."""
+    if request.args.get('year') and request.args.get('month'):
+        return None
+    return datetime.utcnow().strftime('%Y-%m')
+
 @team_capacity_bp.route('/api/team-capacity', methods=['GET'])
 @requires_auth
+@conditional(tags=lambda: ['capacity', 'teams', 'users'], vary=_default_month)
 def get_team_capacities():
     """Get team capacities for all teams."""
     try:
@@ -65,6 +75,10 @@ def get_team_capacities():
 
 @team_capacity_bp.route('/api/team-capacity/<int:team_id>', methods=['GET'])
 @requires_auth
+@warmable('team_capacity')
+@conditional(tags=lambda team_id: ['capacity', tag('team', team_id)], vary=lambda team_id: _default_month())
+@cache.cached(timeout=3600, namespace='team_capacity', tags=lambda team_id: ['capacity', tag('team', team_id)],
+              vary=lambda team_id: _default_month())
 def get_team_capacity(team_id: int):
     """Get team capacity for specific team."""
     try:
@@ -1,8 +1,12 @@
-from flask import Blueprint, render_template, g, redirect, url_for, flash, session, request, send_from_directory, jsonify, current_app, send_file, make_response
+from flask import Blueprint, render_template, g, redirect, url_for, flash, session, request, send_from_directory, jsonify, current_app, send_file, make_response, stream_with_context
 from app.utils.decorators import auth_required, admin_required
 from pathlib import Path
 from app.services.jira_service import get_jira_service, test_connection, save_jira_config
 from app.services.dashboard_service import get_dashboard_stats
+from app.services.worklog_export import iter_worklog_rows, stream_csv, write_xlsx
+from app.services.worklog_service import WorklogService
+from app.services.jira_read_cache import get_jira_read_cache
+from app.utils.http_cache import conditional
 import logging
 from datetime import datetime, timedelta, date
 import os
@@ -28,8 +32,6 @@ from app.models.jira_config import JiraConfig
 from flask_wtf.csrf import generate_csrf
 from app.models.user import User
 from app.services.jira_service import JiraService
-import io
-import xlsxwriter
 from app.models.issue import Issue
 from sqlalchemy import func, distinct
 
@@ -44,16 +46,17 @@ def tasks():
         logger.info(f"Loading tasks for user: {current_user.username}")
         
         jira_service = JiraService()
-        if not jira_service.is_connected:
-            logger.error("JIRA service not connected")
+        if not jira_service.is_configured:
+            logger.error("JIRA service not configured")
             raise Exception("Nie można połączyć się z JIRA")
 
-        # Pobierz zadania dla zalogowanego użytkownika
+        # Pobierz zadania dla zalogowanego użytkownika (przez cache odczytów JIRA)
         username = current_user.username
         jql = f'assignee = "{username}" AND status not in (Closed, Resolved) ORDER BY updated DESC'
         logger.info(f"Executing JQL: {jql}")
         
-        tasks = jira_service.jira.search_issues(jql, maxResults=50)
+        tasks = get_jira_read_cache().search_issues(jql, max_results=50,
+                                                    fields=('summary', 'status', 'priority', 'updated'))
         logger.info(f"Found {len(tasks) if tasks else 0} tasks")
         
         return render_template('tasks.html', 
@@ -1306,10 +1309,17 @@ def get_project_details(project_key):
             'message': str(e)
         }), 500
 
+def _default_worklog_day():
+    """Dzisiejsza data, gdy brakuje dat - domyślne okno 7 dni przesuwa się codziennie (i ETag z nim)."""
+    if request.args.get('start_date') and request.args.get('end_date'):
+        return None
+    return datetime.utcnow().date().isoformat()
+
 @views_bp.route('/api/worklogs')
 @login_required
+@conditional(tags=lambda: ['worklogs', 'issues', 'projects', 'users'], vary=_default_worklog_day)
 def get_worklogs():
-    """Pobiera worklogi dla wybranego okresu."""
+    """Pobiera worklogi dla wybranego okresu z lokalnie zsynchronizowanej bazy."""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
@@ -1324,34 +1334,16 @@ def get_worklogs():
         else:
             end_date = datetime.utcnow()
 
-        jira_service = JiraService()
-        if not jira_service.is_connected:
-            raise Exception("Nie można połączyć się z JIRA")
-
-        # Pobierz worklogi w zależności od roli użytkownika
-        if current_user.has_role('admin'):
-            worklogs = jira_service.get_all_worklogs(start_date, end_date)
-        else:
-            worklogs = jira_service.get_user_worklogs(current_user.username, start_date, end_date)
-
-        # Grupuj worklogi
-        grouped_worklogs = {}
-        for worklog in worklogs:
-            project_key = worklog['issue'].split('-')[0]
-            username = worklog.get('author', current_user.username)
-            
-            if project_key not in grouped_worklogs:
-                grouped_worklogs[project_key] = {}
-            
-            if username not in grouped_worklogs[project_key]:
-                grouped_worklogs[project_key][username] = []
-                
-            grouped_worklogs[project_key][username].append(worklog)
+        # Administrator widzi wszystkie worklogi, pozostali tylko własne
+        user_id = None if current_user.has_role('admin') else current_user.id
+        worklogs = WorklogService.get_worklogs_for_period(start_date, end_date, user_id=user_id)
 
         # Renderuj tylko część HTML z worklogami
-        html = render_template('worklog_results.html',
-                             grouped_worklogs=grouped_worklogs,
-                             jira_url=jira_service.server)  # Dodaj URL JIRA
+        html = render_template('reports/worklog_results.html',
+                             grouped_worklogs=WorklogService.group_by_project_and_user(worklogs),
+                             start_date=start_date,
+                             end_date=end_date,
+                             jira_url=JiraService().server)  # Dodaj URL JIRA
                              
         return jsonify({
             'status': 'success',
@@ -1435,40 +1427,17 @@ def generate_worklog_report():
         end_date = datetime.strptime(data['date_end'], '%Y-%m-%d')
         project_key = data.get('project_key')
 
-        jira_service = JiraService()
-        if not jira_service.is_connected:
-            raise Exception("Nie można połączyć się z JIRA")
-
-        # Pobierz worklogi
-        if current_user.has_role('admin'):
-            worklogs = jira_service.get_all_worklogs(start_date, end_date)
-        else:
-            worklogs = jira_service.get_user_worklogs(current_user.username, start_date, end_date)
-
-        # Filtruj po projekcie jeśli podano
-        if project_key:
-            worklogs = [w for w in worklogs if w.get('project') == project_key]
-
-        # Grupuj worklogi według projektu i użytkownika
-        grouped_worklogs = {}
-        for worklog in worklogs:
-            project_key = worklog.get('project', 'Brak projektu')
-            username = worklog.get('author', current_user.username)
-            
-            if project_key not in grouped_worklogs:
-                grouped_worklogs[project_key] = {}
-            
-            if username not in grouped_worklogs[project_key]:
-                grouped_worklogs[project_key][username] = []
-                
-            grouped_worklogs[project_key][username].append(worklog)
+        # Worklogi z lokalnej bazy; administrator widzi wszystkie, pozostali tylko własne
+        user_id = None if current_user.has_role('admin') else current_user.id
+        worklogs = WorklogService.get_worklogs_for_period(start_date, end_date, user_id=user_id,
+                                                          project_key=project_key)
 
         # Renderuj szablon z wynikami
         html = render_template('reports/worklog_results.html',
-                             grouped_worklogs=grouped_worklogs,
+                             grouped_worklogs=WorklogService.group_by_project_and_user(worklogs),
                              start_date=start_date,
                              end_date=end_date,
-                             jira_url=jira_service.server)
+                             jira_url=JiraService().server)
 
         return jsonify({
             'status': 'success',
@@ -1485,56 +1454,47 @@ def generate_worklog_report():
 @views_bp.route('/api/reports/worklog/export')
 @login_required
 def export_worklog_report():
-    """Eksportuje raport worklogów do Excela."""
+    """Eksportuje raport worklogów do Excela lub CSV.
+
+    Dane są czytane z lokalnej bazy kursorem po stronie serwera i
+    zapisywane strumieniowo, więc pamięć nie rośnie z zakresem dat.
+    """
     try:
         start_date = datetime.strptime(request.args.get('date_start'), '%Y-%m-%d')
         end_date = datetime.strptime(request.args.get('date_end'), '%Y-%m-%d')
-        project_key = request.args.get('project_key')
+        project_key = request.args.get('project_key') or None
+        export_format = request.args.get('format', 'xlsx').lower()
+        compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
 
-        jira_service = JiraService()
-        if not jira_service.is_connected:
-            raise Exception("Nie można połączyć się z JIRA")
-
-        # Pobierz worklogi
-        if current_user.has_role('admin'):
-            worklogs = jira_service.get_all_worklogs(start_date, end_date)
-        else:
-            worklogs = jira_service.get_user_worklogs(current_user.username, start_date, end_date)
+        if export_format not in ('xlsx', 'csv'):
+            return jsonify({
+                'status': 'error',
+                'message': f'Nieobsługiwany format: {export_format}'
+            }), 400
 
-        # Filtruj po projekcie jeśli podano
-        if project_key:
-            worklogs = [w for w in worklogs if w.get('project') == project_key]
-
-        # Utwórz Excel
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output)
-        worksheet = workbook.add_worksheet()
-
-        # Nagłówki
-        headers = ['Projekt', 'Użytkownik', 'Zadanie', 'Czas (h)', 'Data', 'Komentarz']
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header)
-
-        # Dane
-        row = 1
-        for worklog in worklogs:
-            worksheet.write(row, 0, worklog.get('project', ''))
-            worksheet.write(row, 1, worklog.get('author', ''))
-            worksheet.write(row, 2, worklog.get('issue', ''))
-            worksheet.write(row, 3, worklog.get('time_spent', 0))
-            worksheet.write(row, 4, worklog.get('work_date', ''))
-            worksheet.write(row, 5, worklog.get('comment', ''))
-            row += 1
-
-        workbook.close()
-        output.seek(0)
+        # Administrator eksportuje wszystkie worklogi, pozostali tylko własne
+        user_id = None if current_user.has_role('admin') else current_user.id
+        rows = iter_worklog_rows(start_date, end_date, user_id=user_id, project_key=project_key)
+        filename = f'worklog_report_{start_date.strftime("%Y-%m-%d")}_{end_date.strftime("%Y-%m-%d")}'
+
+        if export_format == 'csv':
+            headers = {'Content-Disposition': f'attachment; filename={filename}.csv{".gz" if compress else ""}'}
+            mimetype = 'application/gzip' if compress else 'text/csv; charset=utf-8'
+            return current_app.response_class(
+                stream_with_context(stream_csv(rows, compress=compress)),
+                mimetype=mimetype,
+                headers=headers
+            )
 
-        return send_file(
-            output,
+        path = write_xlsx(rows)
+        response = send_file(
+            path,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             as_attachment=True,
-            download_name=f'worklog_report_{start_date.strftime("%Y-%m-%d")}_{end_date.strftime("%Y-%m-%d")}.xlsx'
+            download_name=f'{filename}.xlsx'
         )
+        response.call_on_close(lambda: os.remove(path))
+        return response
 
     except Exception as e:
         logger.error(f"Error exporting worklog report: {str(e)}", exc_info=True)
@@ -1,92 +1,78 @@
 from flask_apscheduler import APScheduler
-from app.services.worklog_service import WorklogService
-from app.services.jira_service import get_jira_service
-from datetime import datetime
+from app.services.sync_coordinator import SYNC_SCHEDULE, get_sync_coordinator
 import logging
-from flask import current_app
-from app.extensions import scheduler
 
 logger = logging.getLogger(__name__)
 scheduler = APScheduler()
 
 def init_scheduler(app):
-    """Initialize the scheduler with the Flask app."""
+    """Initialize the scheduler with the Flask app (once per process)."""
+    if scheduler.running:
+        return
     scheduler.init_app(app)
+    if app.config.get('SYNC_SCHEDULER', 'apscheduler') == 'apscheduler':
+        register_sync_jobs(app)
     scheduler.start()
 
-    # Add scheduled jobs
-    scheduler.add_job(
-        id='sync_jira_worklogs',
-        func=sync_jira_worklogs,
-        trigger='interval',
-        minutes=30,  # Sync every 30 minutes
-        next_run_time=datetime.now()  # Run immediately on startup
-    )
+def register_sync_jobs(app):
+    """Register JIRA sync triggers from the single schedule definition.
 
-    scheduler.add_job(
-        id='sync_jira_users',
-        func=sync_jira_users,
-        trigger='cron',
-        hour=0  # Run daily at midnight
-    )
+    Jobs only enqueue into the sync coordinator, which runs them under a
+    database lease, so several gunicorn workers each running this scheduler
+    still execute every sync once.
+    """
+    for kind, trigger in SYNC_SCHEDULE.items():
+        scheduler.add_job(
+            id=f'sync_jira_{kind}',
+            func=run_sync_job,
+            args=[app, kind],
+            coalesce=True,  # Collapse missed runs into one
+            max_instances=1,
+            replace_existing=True,
+            **trigger
+        )
 
+    # Pick up jobs queued from admin endpoints whose worker process went away
     scheduler.add_job(
-        id='sync_jira_data',
-        func=sync_jira_data,
-        trigger='cron',
-        hour='*/4'
+        id='sync_jira_queue',
+        func=drain_sync_queue,
+        args=[app],
+        trigger='interval',
+        minutes=1,
+        coalesce=True,
+        max_instances=1,
+        replace_existing=True
     )
 
-@scheduler.task('interval', id='sync_jira_worklogs', minutes=30)
-def sync_jira_worklogs():
-    """Synchronize worklogs from Jira."""
-    try:
-        logger.info("Starting Jira worklog synchronization")
-        stats = WorklogService.sync_jira_worklogs(days=30)
-        logger.info(f"Jira worklog sync completed: {stats}")
-    except Exception as e:
-        logger.error(f"Error syncing Jira worklogs: {str(e)}")
-
-@scheduler.task('cron', id='sync_jira_users', hour='0')
-def sync_jira_users():
-    """Synchronize users from JIRA daily at midnight."""
-    try:
-        logger.info("Starting JIRA user synchronization")
-        jira = get_jira_service()
-        stats = jira.sync_users()
-        logger.info(f"JIRA user sync completed: {stats}")
-    except Exception as e:
-        logger.error(f"Error syncing JIRA users: {str(e)}", exc_info=True)
-
-@scheduler.task('cron', id='sync_jira_data', hour='*/4')
-def sync_jira_data():
-    """Synchronize all JIRA data every 4 hours."""
-    try:
-        logger.info("Starting JIRA data synchronization")
-        jira = get_jira_service()
-        success, results = jira.sync_all()
-        
-        if success:
-            logger.info("JIRA sync completed successfully")
-            logger.info(f"Sync results: {results}")
-        else:
-            logger.error(f"JIRA sync failed: {results.get('error', 'Unknown error')}")
-            
-    except Exception as e:
-        logger.error(f"Error in JIRA sync task: {str(e)}", exc_info=True)
+def run_sync_job(app, kind):
+    """Enqueue a scheduled JIRA sync and work the queue."""
+    with app.app_context():
+        try:
+            logger.info(f"Scheduled JIRA {kind} synchronization triggered")
+            get_sync_coordinator().run_scheduled(kind)
+        except Exception as e:
+            logger.error(f"Error in scheduled JIRA {kind} sync: {str(e)}", exc_info=True)
 
-@scheduler.task('cron', id='sync_jira_projects', hour='1')
-def sync_jira_projects():
-    """Synchronize projects from JIRA daily at 1 AM."""
-    try:
-        logger.info("Starting JIRA project synchronization")
-        jira = get_jira_service()
-        stats = jira.sync_projects()
-        logger.info(f"JIRA project sync completed: {stats}")
-    except Exception as e:
-        logger.error(f"Error syncing JIRA projects: {str(e)}", exc_info=True)
+def drain_sync_queue(app):
+    """Run queued JIRA syncs if no other process is working the queue."""
+    with app.app_context():
+        try:
+            get_sync_coordinator().drain()
+        except Exception as e:
+            logger.error(f"Error draining JIRA sync queue: {str(e)}", exc_info=True)
 
 def start_scheduler(app):
-    """Start the scheduler with the Flask app."""
+    """Start the JIRA sync triggers from a web or worker entrypoint.
+
+    Not called by ``create_app``, so CLI commands (``flask db upgrade``,
+    ``run-scheduled-reports``, ...) never start the scheduler. Each sync
+    still runs once across processes under the coordinator's lease.
+    """
+    if app.testing or app.config.get('SYNC_SCHEDULER', 'apscheduler') != 'apscheduler':
+        return
+    if not app.config.get('SCHEDULER_ENABLED', True):
+        logger.info("Scheduler disabled by SCHEDULER_ENABLED")
+        return
     init_scheduler(app)
-    logger.info("Scheduler started successfully") 
\ No newline at end of file
+    logger.info("Scheduler started successfully")
+
@@ -1,6 +1,7 @@
 from app.models import UserAvailability
 from app.extensions import db
-from datetime import datetime
+from app.services.business_calendar import get_business_calendar
+from datetime import date, datetime
 import calendar
 import logging
 from typing import Dict, Any
@@ -9,12 +10,11 @@ from sqlalchemy import extract
 logger = logging.getLogger(__name__)
 
 def calculate_working_days(month_year: str) -> int:
-    """Calculate working days in a month excluding weekends."""
+    """Calculate working days in a month excluding weekends and holidays."""
     try:
         year, month = map(int, month_year.split('-'))
-        cal = calendar.monthcalendar(year, month)
-        working_days = sum(1 for week in cal for day in week[0:5] if day != 0)
-        return working_days
+        _, num_days = calendar.monthrange(year, month)
+        return get_business_calendar().working_days(date(year, month, 1), date(year, month, num_days))
     except Exception as e:
         logger.error(f"Error calculating working days: {str(e)}")
         return 0
@@ -77,5 +77,6 @@ def calculate_user_availability(user_id: int, month: datetime) -> Dict[str, Any]
 
 def get_working_days_in_month(month: datetime) -> int:
     """Get number of working days in month."""
-    cal = calendar.monthcalendar(month.year, month.month)
-    return sum(1 for week in cal for day in week[0:5] if day != 0) 
\ No newline at end of file
+    _, num_days = calendar.monthrange(month.year, month.month)
+    return get_business_calendar().working_days(date(month.year, month.month, 1),
+                                                date(month.year, month.month, num_days)) 
\ No newline at end of file
@@ -0,0 +1,137 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+from bisect import bisect_left, bisect_right
+import hashlib
+import logging
+import time
+from flask import current_app, has_app_context
+from app.cache import cache
+from app.extensions import db
+from app.models.holiday import Holiday
+
+logger = logging.getLogger(__name__)
+
+# ISO weekdays (Monday = 1) worked by default
+DEFAULT_WORK_DAYS = (1, 2, 3, 4, 5)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def count_weekday(start: date, end: date, iso_weekday: int) -> int:
+    """Number of days with the given ISO weekday in ``[start, end]``."""
+    days = (end - start).days + 1
+    if days <= 0:
+        return 0
+    full_weeks, remainder = divmod(days, 7)
+    offset = (iso_weekday - start.isoweekday()) % 7
+    return full_weeks + (1 if offset < remainder else 0)
+
+
+class BusinessCalendar:
+    """Working-day arithmetic for one country (and optionally region).
+
+    Holidays are loaded once and kept as sorted ordinal lists, one per
+    weekday. Counting working days in a range is then the closed-form
+    weekday count minus two bisects per work day, so any range costs
+    O(log n) in the number of holidays instead of one query per day.
+
+    Use ``get_business_calendar`` to share instances; they are reloaded
+    whenever holidays are committed, in any process.
+    """
+
+    def __init__(self, country_code: str = 'PL', region: Optional[str] = None,
+                 holidays: Optional[Iterable[date]] = None):
+        self.country_code = country_code
+        self.region = region
+        if holidays is None:
+            holidays = self._load_holidays(country_code, region)
+        ordinals = sorted({_as_date(day).toordinal() for day in holidays})
+        self._holidays = set(ordinals)
+        # Ordinal % 7 is 0 on Sundays, so index by ISO weekday % 7
+        self._by_weekday: List[List[int]] = [[] for _ in range(7)]
+        for ordinal in ordinals:
+            self._by_weekday[ordinal % 7].append(ordinal)
+
+    @staticmethod
+    def _load_holidays(country_code: str, region: Optional[str]) -> List[date]:
+        """National holidays plus the region's own ones, in one query."""
+        query = db.session.query(Holiday.date).filter(Holiday.country_code == country_code)
+        if region:
+            query = query.filter(db.or_(Holiday.region.is_(None), Holiday.region == region))
+        else:
+            query = query.filter(Holiday.region.is_(None))
+        return [row.date for row in query]
+
+    def is_holiday(self, day) -> bool:
+        return _as_date(day).toordinal() in self._holidays
+
+    def is_working_day(self, day, work_days: Iterable[int] = DEFAULT_WORK_DAYS) -> bool:
+        day = _as_date(day)
+        return day.isoweekday() in work_days and not self.is_holiday(day)
+
+    def holidays_between(self, start, end, work_days: Iterable[int] = DEFAULT_WORK_DAYS) -> int:
+        """Number of holidays falling on work days in ``[start, end]``."""
+        low, high = _as_date(start).toordinal(), _as_date(end).toordinal()
+        total = 0
+        for weekday in set(work_days):
+            ordinals = self._by_weekday[weekday % 7]
+            total += bisect_right(ordinals, high) - bisect_left(ordinals, low)
+        return total
+
+    def working_days(self, start, end, work_days: Iterable[int] = DEFAULT_WORK_DAYS) -> int:
+        """Number of work days in ``[start, end]`` that are not holidays."""
+        start, end = _as_date(start), _as_date(end)
+        if end < start:
+            return 0
+        work_days = set(work_days)
+        weekdays = sum(count_weekday(start, end, weekday) for weekday in work_days)
+        return weekdays - self.holidays_between(start, end, work_days)
+
+    def digest(self) -> str:
+        """Fingerprint of the loaded holidays, for results computed from them."""
+        return hashlib.md5(','.join(str(o) for o in sorted(self._holidays)).encode()).hexdigest()
+
+    def expected_hours(self, start, end, hours_per_day: float = 8,
+                       work_days: Iterable[int] = DEFAULT_WORK_DAYS) -> float:
+        return self.working_days(start, end, work_days) * hours_per_day
+
+
+def _cache() -> Dict[Tuple[str, Optional[str]], Tuple[Optional[bytes], float, BusinessCalendar]]:
+    return current_app.extensions.setdefault('business_calendars', {})
+
+
+def get_business_calendar(country_code: str = 'PL', region: Optional[str] = None) -> BusinessCalendar:
+    """Shared calendar for the country/region, loaded on first use.
+
+    Each process keeps its calendars alongside the version of the
+    ``holidays`` cache tag, which every holiday commit bumps, so a change
+    made by another process reloads them here too. Without a tag version
+    (cache unreachable) a calendar is kept for ``BUSINESS_CALENDAR_TTL``
+    seconds.
+    """
+    versions = cache.tag_versions(['holidays'])
+    version = versions['holidays'] if versions else None
+    calendars = _cache()
+    key = (country_code, region)
+    now = time.monotonic()
+
+    cached = calendars.get(key)
+    if cached is not None:
+        cached_version, loaded_at, calendar = cached
+        if version is not None and version == cached_version:
+            return calendar
+        if version is None and now - loaded_at < current_app.config.get('BUSINESS_CALENDAR_TTL', 300):
+            return calendar
+
+    calendar = BusinessCalendar(country_code, region)
+    calendars[key] = (version, now, calendar)
+    return calendar
+
+
+def invalidate_business_calendar() -> None:
+    """Drop all cached calendars so the next lookup reloads holidays."""
+    if has_app_context():
+        current_app.extensions.pop('business_calendars', None)
+        logger.debug("Business calendar cache invalidated")
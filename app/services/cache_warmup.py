@@ -0,0 +1,276 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from functools import wraps
+from urllib.parse import urlencode
+import calendar
+import logging
+import threading
+import time
+from flask import current_app, g, make_response, request
+from flask_login import login_user
+from app.extensions import db
+from app.models.cache_warmup import CacheWarmupKey
+from app.models.role import Role
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class WarmTarget:
+    """A cached dashboard view the warmer can precompute.
+
+    ``period_args`` turns a period into the view's own date parameters;
+    those parameters are left out of the recorded parameter sets, so one
+    popular set is warmed for every period. ``parse_period`` reads the
+    period back from a request: a range ending today (the "last 30 days"
+    pickers) is recorded by its length and warmed for the same number of
+    days up to the day of the warm-up.
+    """
+
+    def __init__(self, endpoint: str, period_args: Callable[[date, date], Dict[str, str]],
+                 parse_period: Optional[Callable[[Any], Optional[Tuple[date, date]]]] = None):
+        self.endpoint = endpoint
+        self.period_args = period_args
+        self.parse_period = parse_period
+        self.period_params = frozenset(period_args(date.today(), date.today()))
+
+    def shape(self, view_args: Optional[Dict[str, Any]], args, today: Optional[date] = None) -> Dict[str, Any]:
+        """Parameter set of a request without its period."""
+        shape = {
+            'view_args': dict(view_args or {}),
+            'args': {name: values for name, values in args.to_dict(flat=False).items()
+                     if name not in self.period_params}
+        }
+        period = self.parse_period(args) if self.parse_period else None
+        today = today or date.today()
+        if period and period[1] == today and period[0] <= today:
+            shape['last_days'] = (today - period[0]).days + 1
+        return shape
+
+    @staticmethod
+    def periods(params: Dict[str, Any], today: date) -> List[Tuple[str, date, date]]:
+        """``(label, first day, last day)`` periods a recorded parameter set is warmed for."""
+        days = params.get('last_days')
+        if days:
+            return [(f'last-{days}-days', today - timedelta(days=days - 1), today)]
+        return month_periods(today)
+
+    def query_string(self, params: Dict[str, Any], start: date, end: date) -> str:
+        pairs = [(name, value) for name, values in sorted(params['args'].items()) for value in values]
+        pairs.extend(self.period_args(start, end).items())
+        return urlencode(pairs)
+
+
+def _parse_day(value: Optional[str]) -> Optional[date]:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def _period(start: Optional[date], end: Optional[date]) -> Optional[Tuple[date, date]]:
+    return (start, end) if start and end else None
+
+
+def _range_period(value: Optional[str]) -> Optional[Tuple[date, date]]:
+    """Period of a ``"YYYY-MM-DD - YYYY-MM-DD"`` range picker value."""
+    parts = (value or '').split(' - ')
+    return _period(_parse_day(parts[0]), _parse_day(parts[1])) if len(parts) == 2 else None
+
+
+# Dashboards warmed after each sync, by the name their requests are counted under
+WARM_TARGETS: Dict[str, WarmTarget] = {
+    'portfolio_analysis': WarmTarget(
+        'admin.get_portfolio_analysis_data',
+        lambda start, end: {'start_date': start.isoformat(), 'end_date': end.isoformat()},
+        lambda args: _period(_parse_day(args.get('start_date')), _parse_day(args.get('end_date')))
+    ),
+    'workload': WarmTarget(
+        'admin.get_workload_data',
+        lambda start, end: {'date_range': f'{start.isoformat()} - {end.isoformat()}'},
+        lambda args: _range_period(args.get('date_range'))
+    ),
+    'team_capacity': WarmTarget(
+        'team_capacity.get_team_capacity',
+        lambda start, end: {'year': str(start.year), 'month': str(start.month)}
+    ),
+}
+
+
+def month_periods(today: Optional[date] = None) -> List[Tuple[str, date, date]]:
+    """``(label, first day, last day)`` of the current and the previous month."""
+    today = today or date.today()
+    periods = []
+    first = today.replace(day=1)
+    for _ in range(2):
+        last = first.replace(day=calendar.monthrange(first.year, first.month)[1])
+        periods.append((first.strftime('%Y-%m'), first, last))
+        first = (first - timedelta(days=1)).replace(day=1)
+    return periods
+
+
+class RequestCounter:
+    """Per-process request counts per parameter set, written in batches.
+
+    Counting in memory keeps dashboard requests, cache hits and ``304``
+    answers included, free of database writes that would compete with a
+    running sync for SQLite's write lock. The counts are added to
+    :class:`CacheWarmupKey` at most every ``CACHE_WARMUP_FLUSH_SECONDS``
+    and before every warm-up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], List[Any]] = {}
+        self._flushed_at = time.monotonic()
+
+    def add(self, target: str, params: Dict[str, Any]) -> None:
+        key = (target, CacheWarmupKey.canonical(params))
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._counts.setdefault(key, [0, now])
+            entry[0] += 1
+            entry[1] = now
+            due = time.monotonic() - self._flushed_at >= current_app.config.get('CACHE_WARMUP_FLUSH_SECONDS', 60)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write the pending counts; returns how many parameter sets were written."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._flushed_at = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            CacheWarmupKey.record_many([(target, params, count, requested_at)
+                                        for (target, params), (count, requested_at) in counts.items()])
+        except Exception as e:
+            logger.error(f"Error recording requests for cache warm-up: {str(e)}")
+            with self._lock:
+                # Keep the counts for the next flush
+                for key, (count, requested_at) in counts.items():
+                    entry = self._counts.setdefault(key, [0, requested_at])
+                    entry[0] += count
+                    entry[1] = max(entry[1], requested_at)
+            return 0
+        return len(counts)
+
+
+_counter = RequestCounter()
+
+
+def get_request_counter() -> RequestCounter:
+    """Return the process-wide request counter."""
+    return _counter
+
+
+def warmable(target: str) -> Callable:
+    """Count a view's requests per parameter set, so the warmer learns what is popular.
+
+    Goes below the authorization decorators: only requests that were
+    answered (``200`` or ``304``) are counted, warm-up requests never are.
+    Counts are kept in memory by :class:`RequestCounter`.
+    """
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if (request.method == 'GET' and response.status_code in (200, 304) and not g.get('cache_warming')
+                    and current_app.config.get('CACHE_WARMUP_ENABLED', True)):
+                try:
+                    _counter.add(target, WARM_TARGETS[target].shape(request.view_args, request.args))
+                except Exception as e:
+                    logger.error(f"Error recording request for cache warm-up: {str(e)}")
+            return response
+        return wrapper
+    return decorator
+
+
+class CacheWarmer:
+    """Precomputes the most requested dashboards after a sync.
+
+    For every target the ``CACHE_WARMUP_TOP_N`` parameter sets requested
+    most often (and at least once in the last ``CACHE_WARMUP_LOOKBACK_DAYS``)
+    are replayed for the current and the previous month, or for their
+    trailing range ending today, through the view itself, as an
+    administrator. The views' own caches store the results
+    in the shared backend, so the first real request is a hit in every
+    process; sets whose data did not change are cheap cache hits. The time
+    each set and period took is kept on :class:`CacheWarmupKey`.
+    """
+
+    def warm(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """Warm every target; returns a summary of what was warmed."""
+        summary = {'keys': 0, 'requests': 0, 'failed': 0, 'seconds': 0.0}
+        config = current_app.config
+        if not config.get('CACHE_WARMUP_ENABLED', True):
+            return summary
+
+        user = self._warm_user()
+        if user is None:
+            logger.warning("No active administrator to warm caches as, skipping cache warm-up")
+            return summary
+
+        # This process's latest requests count too
+        _counter.flush()
+        today = today or date.today()
+        since = datetime.utcnow() - timedelta(days=config.get('CACHE_WARMUP_LOOKBACK_DAYS', 30))
+        started = time.perf_counter()
+        for name, target in WARM_TARGETS.items():
+            for key in CacheWarmupKey.popular(name, since, config.get('CACHE_WARMUP_TOP_N', 10)):
+                stats = {}
+                for label, start, end in target.periods(key.get_params(), today):
+                    stats[label] = self._warm_one(target, key.get_params(), start, end, user)
+                    summary['requests'] += 1
+                    summary['failed'] += stats[label]['status'] != 200
+                key.record_warmup(stats)
+                summary['keys'] += 1
+            db.session.commit()
+
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(f"Warmed {summary['keys']} cache keys ({summary['requests']} requests, "
+                    f"{summary['failed']} failed) in {summary['seconds']:.2f}s")
+        return summary
+
+    @staticmethod
+    def _warm_user() -> Optional[User]:
+        user = User.query.filter_by(is_active=True, is_superadmin=True).order_by(User.id).first()
+        if user is None:
+            user = User.query.join(User.roles).filter(
+                User.is_active.is_(True), Role.name == 'admin'
+            ).order_by(User.id).first()
+        return user
+
+    @staticmethod
+    def _warm_one(target: WarmTarget, params: Dict[str, Any], start: date, end: date,
+                  user: User) -> Dict[str, Any]:
+        app = current_app._get_current_object()
+        view_args = params['view_args']
+        started = time.perf_counter()
+        try:
+            path = app.url_map.bind('localhost').build(target.endpoint, view_args)
+            with app.test_request_context(path, query_string=target.query_string(params, start, end)):
+                g.cache_warming = True
+                try:
+                    login_user(user)
+                    status = make_response(app.view_functions[target.endpoint](**view_args)).status_code
+                finally:
+                    # g belongs to the app context, which outlives this request when one was already pushed
+                    g.pop('cache_warming', None)
+        except Exception as e:
+            logger.error(f"Error warming {target.endpoint} {params}: {str(e)}")
+            db.session.rollback()
+            status = 'error'
+        return {'seconds': round(time.perf_counter() - started, 3), 'status': status}
+
+
+_warmer = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Return the process-wide cache warmer."""
+    global _warmer
+    if _warmer is None:
+        _warmer = CacheWarmer()
+    return _warmer
@@ -1,35 +1,43 @@
 from datetime import datetime, timedelta
 from typing import Dict, Any
 import logging
-from app.services.jira_service import get_jira_service
+from app.extensions import db
+from app.models.project import Project
+from app.models.user import User
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.services.jira_read_cache import get_jira_read_cache
 
 logger = logging.getLogger(__name__)
 
 def get_dashboard_stats(username: str) -> Dict[str, Any]:
-    """Pobiera statystyki dla dashboardu."""
+    """Pobiera statystyki dla dashboardu.
+
+    Projekty i godziny pochodzą z lokalnej bazy, a liczba otwartych zadań
+    z cache'u odczytów JIRA - strona nie czeka na JIRA przy każdym wejściu.
+    """
     try:
-        jira = get_jira_service()
-        if not jira:
-            logger.error("Jira service not initialized")
-            raise ValueError("Jira service not initialized")
-            
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
-        
+
         try:
-            tasks = jira.search_issues(f'assignee = {username} AND status != Done')
-            projects = jira.get_projects()
-            worklog = jira.get_user_worklog(username, start_date, end_date)
+            tasks_count = get_jira_read_cache().count_issues(f'assignee = "{username}" AND status != Done')
         except Exception as e:
             logger.error(f"Error fetching Jira data: {str(e)}")
-            raise
-        
+            tasks_count = 0
+
+        projects_count = Project.query.filter_by(is_active=True).count()
+        user_id = db.session.query(User.id).filter(User.username == username).scalar()
+        worklog_seconds = sum(
+            row['time_spent_seconds']
+            for row in WorklogDailyRollup.summarize(start_date, end_date, user_ids=[user_id])
+        ) if user_id else 0
+
         return {
             'stats': {
-                'tasks_count': len(tasks),
-                'projects_count': len(projects),
+                'tasks_count': tasks_count,
+                'projects_count': projects_count,
                 'reports_count': 0,
-                'worklog_hours': worklog
+                'worklog_hours': round(worklog_seconds / 3600, 2)
             },
             'activity_data': [],
             'activity_labels': [],
@@ -39,4 +47,4 @@ def get_dashboard_stats(username: str) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Error getting dashboard stats: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
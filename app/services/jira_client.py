@@ -3,7 +3,10 @@ from typing import List, Dict, Any
 from datetime import datetime
 from flask import current_app
 from app.models.jira_config import JiraConfig
+from app.services.jira_fetch_pool import JiraFetchPool, embedded_worklogs
+from app.services.jira_search import JqlIssueStream
 import urllib3
+import itertools
 import warnings
 import logging
 
@@ -46,49 +49,61 @@ class JiraClient:
             
             current_app.logger.debug(f"Processing user {username} with JQL: {jql}")
             
-            # Get issues with worklogs
+            # Stream matching issues page by page instead of one truncated page
+            issues = JqlIssueStream(self.jira, f'{jql} ORDER BY created ASC',
+                                    fields=['worklog', 'summary', 'project'])
+
+            worklogs = []
+            user_email = username.lower()
+            pool = JiraFetchPool()
+
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                issues = self.jira.search_issues(
-                    jql,
-                    fields=['worklog', 'summary', 'project'],
-                    maxResults=1000
-                )
-            
-            current_app.logger.debug(f"Found {len(issues)} issues with worklogs for user {username}")
-            
-            worklogs = []
-            for issue in issues:
-                try:
-                    # Get full worklog data
-                    worklog_list = self.jira.worklogs(issue.key)
-                    
-                    for worklog in worklog_list:
-                        # Check if worklog belongs to user (case insensitive)
-                        author_email = getattr(worklog.author, 'emailAddress', '').lower()
-                        author_name = getattr(worklog.author, 'name', '').lower()
-                        user_email = username.lower()
-                        
-                        if author_email == user_email or author_name == user_email:
-                            worklogs.append({
-                                'id': worklog.id,
-                                'issueKey': issue.key,
-                                'summary': issue.fields.summary,
-                                'project': issue.fields.project.key,
-                                'timeSpentSeconds': worklog.timeSpentSeconds,
-                                'started': worklog.started,
-                                'created': worklog.created,
-                                'updated': getattr(worklog, 'updated', None),
-                                'author': {
-                                    'name': worklog.author.name,
-                                    'displayName': worklog.author.displayName,
-                                    'emailAddress': getattr(worklog.author, 'emailAddress', None)
-                                }
-                            })
-                except Exception as e:
-                    current_app.logger.warning(f"Error processing issue {issue.key}: {str(e)}")
-                    continue
-            
+                for page in issues.pages():
+                    # Issues whose embedded worklog page is complete need no extra request
+                    fetched = []
+                    truncated = []
+                    for issue in page:
+                        inline = embedded_worklogs(issue)
+                        if inline is None:
+                            truncated.append(issue)
+                        else:
+                            fetched.append((issue, inline, None))
+
+                    for issue, worklog_list, error in itertools.chain(
+                        fetched, pool.map(lambda i: self.jira.worklogs(i.key), truncated)
+                    ):
+                        if error is not None:
+                            current_app.logger.warning(f"Error processing issue {issue.key}: {str(error)}")
+                            continue
+
+                        try:
+                            for worklog in worklog_list:
+                                # Check if worklog belongs to user (case insensitive)
+                                author_email = getattr(worklog.author, 'emailAddress', '').lower()
+                                author_name = getattr(worklog.author, 'name', '').lower()
+
+                                if author_email == user_email or author_name == user_email:
+                                    worklogs.append({
+                                        'id': worklog.id,
+                                        'issueKey': issue.key,
+                                        'summary': issue.fields.summary,
+                                        'project': issue.fields.project.key,
+                                        'timeSpentSeconds': worklog.timeSpentSeconds,
+                                        'started': worklog.started,
+                                        'created': worklog.created,
+                                        'updated': getattr(worklog, 'updated', None),
+                                        'author': {
+                                            'name': worklog.author.name,
+                                            'displayName': worklog.author.displayName,
+                                            'emailAddress': getattr(worklog.author, 'emailAddress', None)
+                                        }
+                                    })
+                        except Exception as e:
+                            current_app.logger.warning(f"Error processing issue {issue.key}: {str(e)}")
+                            continue
+
+            current_app.logger.debug(f"Scanned {issues.fetched} issues with worklogs for user {username}")
             current_app.logger.debug(f"Found {len(worklogs)} worklogs for user {username}")
             return worklogs
             
@@ -0,0 +1,188 @@
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import logging
+import queue
+import threading
+import time
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses after which JIRA asks us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+_SENTINEL = object()
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers of a fetch pool.
+
+    ``pause`` empties the bucket and blocks every caller until the given
+    number of seconds has passed, which is how a ``Retry-After`` from one
+    worker throttles all of them.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds``."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Return how long JIRA asked us to wait, or None if the error is not a throttle."""
+    status = getattr(error, 'status_code', None)
+    response = getattr(error, 'response', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None)
+    if status not in THROTTLE_STATUSES:
+        return None
+
+    header = response.headers.get('Retry-After') if response is not None and response.headers else None
+    if not header:
+        return 0.0
+    try:
+        return max(0.0, float(header))
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(header)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return 0.0
+
+
+def embedded_worklogs(issue: Any) -> Optional[list]:
+    """Return the worklogs embedded in a search result, or None if they are truncated.
+
+    ``search_issues(..., fields=['worklog'])`` returns the first page (20 on
+    most instances) of an issue's worklogs with ``total`` and ``maxResults``;
+    only issues with more worklogs than that need a follow-up request.
+    """
+    fields = getattr(issue, 'fields', None)
+    page = getattr(fields, 'worklog', None) if fields is not None else None
+    if page is None:
+        return None
+    worklogs = list(getattr(page, 'worklogs', None) or [])
+    total = getattr(page, 'total', None)
+    if total is None or total > len(worklogs):
+        return None
+    return worklogs
+
+
+class JiraFetchPool:
+    """Bounded thread pool fanning out JIRA requests.
+
+    :meth:`map` is a producer/consumer pipeline: workers call ``fn`` for each
+    item and push ``(item, result, error)`` into a bounded queue, while the
+    calling thread consumes the queue as a generator. The queue bound gives
+    back-pressure, so a slow database writer on the consumer side stops the
+    workers instead of buffering every response in memory. Workers only do
+    HTTP; all database work stays on the consumer's thread and session.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, requests_per_second: Optional[float] = None,
+                 queue_size: Optional[int] = None, max_retries: int = 5,
+                 bucket: Optional[TokenBucket] = None):
+        config = current_app.config if has_app_context() else {}
+        self.max_workers = max(1, int(max_workers or config.get('JIRA_FETCH_CONCURRENCY', 8)))
+        self.queue_size = max(1, int(queue_size or config.get('JIRA_FETCH_QUEUE_SIZE', 100)))
+        self.max_retries = max_retries
+        self.bucket = bucket or TokenBucket(requests_per_second or config.get('JIRA_FETCH_RATE', 10))
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run one rate-limited request, retrying when JIRA throttles us."""
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            with self._stats_lock:
+                self.stats['requests'] += 1
+            try:
+                return fn()
+            except Exception as e:
+                wait = retry_after_seconds(e)
+                if wait is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                wait = wait or min(60, 2 ** attempt)
+                logger.warning(f"JIRA throttled request, retrying in {wait:.1f}s (attempt {attempt})")
+                with self._stats_lock:
+                    self.stats['retries'] += 1
+                    self.stats['throttled_seconds'] += wait
+                self.bucket.pause(wait)
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """Yield ``(item, fn(item), error)`` as results arrive, in completion order."""
+        results = queue.Queue(maxsize=self.queue_size)
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+        stop = threading.Event()
+
+        def work(item):
+            try:
+                if stop.is_set():
+                    return
+                try:
+                    outcome = (item, self.call(lambda: fn(item)), None)
+                except Exception as e:
+                    outcome = (item, None, e)
+                results.put(outcome)
+            finally:
+                in_flight.release()
+
+        def produce():
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='jira-fetch') as executor:
+                    for item in items:
+                        in_flight.acquire()
+                        if stop.is_set():
+                            in_flight.release()
+                            break
+                        executor.submit(work, item)
+            except Exception as e:
+                logger.error(f"JIRA fetch producer failed: {str(e)}")
+            finally:
+                results.put(_SENTINEL)
+
+        producer = threading.Thread(target=produce, name='jira-fetch-producer', daemon=True)
+        producer.start()
+        try:
+            while True:
+                outcome = results.get()
+                if outcome is _SENTINEL:
+                    break
+                yield outcome
+        finally:
+            # Consumer stopped early: unblock workers waiting on a full queue
+            stop.set()
+            while producer.is_alive():
+                try:
+                    results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
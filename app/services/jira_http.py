@@ -0,0 +1,134 @@
+from typing import Any, Dict, Optional
+import logging
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import current_app, has_app_context
+from app.monitoring import monitor
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+# POST endpoints that only read data and are therefore safe to retry
+READ_ONLY_POST_PATHS = ('/worklog/list',)
+
+
+class JiraHTTPSession(requests.Session):
+    """``requests.Session`` with a default timeout for every JIRA call.
+
+    Keep-alive connections are pooled per host by the mounted adapter, so
+    consecutive pages of a sweep reuse one TCP/TLS connection instead of
+    opening a new one per request.
+    """
+
+    def __init__(self, timeout: Any = None, read_only_post_adapter: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self.timeout = timeout
+        self.read_only_post_adapter = read_only_post_adapter
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+    def get_adapter(self, url):
+        if self.read_only_post_adapter is not None and \
+                urlparse(url).path.rstrip('/').endswith(READ_ONLY_POST_PATHS):
+            return self.read_only_post_adapter
+        return super().get_adapter(url)
+
+
+def _config() -> Dict[str, Any]:
+    return current_app.config if has_app_context() else {}
+
+
+def create_jira_session() -> JiraHTTPSession:
+    """Build a pooled session configured from ``JIRA_HTTP_*`` settings."""
+    config = _config()
+    pool_size = int(config.get('JIRA_HTTP_POOL_SIZE', 20))
+
+    # 429 is left to JiraFetchPool, which waits for Retry-After across all workers
+    retries = Retry(
+        total=int(config.get('JIRA_HTTP_RETRIES', 3)),
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=int(config.get('JIRA_HTTP_POOL_CONNECTIONS', 10)),
+        pool_maxsize=pool_size,
+        pool_block=True,  # never open more than pool_size connections per host
+        max_retries=retries
+    )
+    # Read-only POSTs also retry; the adapter shares the connection pool above
+    read_only_post_adapter = HTTPAdapter(
+        max_retries=retries.new(allowed_methods=retries.allowed_methods | {'POST'})
+    )
+    read_only_post_adapter.poolmanager = adapter.poolmanager
+
+    session = JiraHTTPSession(timeout=(
+        float(config.get('JIRA_HTTP_CONNECT_TIMEOUT', 5)),
+        float(config.get('JIRA_HTTP_READ_TIMEOUT', 30))
+    ), read_only_post_adapter=read_only_post_adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    logger.info(f"Created pooled JIRA HTTP session (pool size {pool_size} per host)")
+    return session
+
+
+def get_jira_session() -> JiraHTTPSession:
+    """Return the process-wide session shared by all JIRA call sites."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_jira_session()
+    return _session
+
+
+def reset_jira_session() -> None:
+    """Close the shared session, e.g. after the JIRA configuration changed."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def connection_stats(session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """Connection reuse counters summed over every host pool of the session."""
+    session = session or _session
+    stats = {'requests': 0, 'connections_opened': 0, 'connections_reused': 0, 'reuse_ratio': None, 'hosts': 0}
+    if session is None:
+        return stats
+
+    pools = set()
+    for adapter in session.adapters.values():
+        pool_manager = getattr(adapter, 'poolmanager', None)
+        if pool_manager is None:
+            continue
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is not None and id(pool) not in pools:
+                pools.add(id(pool))
+                stats['requests'] += pool.num_requests
+                stats['connections_opened'] += pool.num_connections
+
+    stats['hosts'] = len(pools)
+    stats['connections_reused'] = max(0, stats['requests'] - stats['connections_opened'])
+    if stats['requests']:
+        stats['reuse_ratio'] = round(stats['connections_reused'] / stats['requests'], 3)
+    return stats
+
+
+monitor.register_gauge('jira_http', connection_stats)
@@ -0,0 +1,123 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+import re
+import threading
+import time
+from flask import current_app
+from app.cache import cache, generate_cache_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = 'jira_search'
+
+# Quoted strings (with escapes) or runs of whitespace outside them
+_JQL_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|\s+')
+
+
+def normalize_jql(jql: str) -> str:
+    """Canonical form of a JQL query for cache keys.
+
+    Collapses whitespace outside quoted values, so queries that differ only
+    in formatting share one entry; quoted values are kept verbatim.
+    """
+    return _JQL_TOKEN.sub(lambda m: m.group(0) if m.group(0)[0] in '"\'' else ' ', jql).strip()
+
+
+def _jira_search(jql: str, max_results: int, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    from app.services.jira_service import JiraService
+
+    jira_service = JiraService()
+    if not jira_service.is_configured or jira_service.jira is None:
+        raise ValueError("JIRA is not configured")
+    result = jira_service.jira.search_issues(jql, maxResults=max_results,
+                                             fields=','.join(fields) if fields else None, json_result=True)
+    return {'issues': result.get('issues', []), 'total': result.get('total', 0)}
+
+
+class JiraReadCache:
+    """Read-through cache of JIRA search results, shared by all processes.
+
+    Results are stored as plain JSON (``{'key': ..., 'fields': {...}}``) in
+    the unified cache under the server URL, the normalized JQL and the
+    request parameters. Within ``JIRA_READ_CACHE_TTL`` they are served as
+    is; for another ``JIRA_READ_CACHE_STALE`` seconds the stale result is
+    served while one background thread - one per key across processes -
+    fetches a fresh one. Only after that does a request wait for JIRA, and
+    concurrent misses still share a single call.
+    """
+
+    def __init__(self, fetch: Optional[Callable[[str, int, Optional[Sequence[str]]], Dict[str, Any]]] = None):
+        self._fetch = fetch or _jira_search
+
+    @property
+    def ttl(self) -> int:
+        return current_app.config.get('JIRA_READ_CACHE_TTL', 300)
+
+    @property
+    def stale(self) -> int:
+        return current_app.config.get('JIRA_READ_CACHE_STALE', 1800)
+
+    def search_issues(self, jql: str, max_results: int = 50, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Issues matching ``jql`` as raw JIRA JSON."""
+        return self._search(jql, max_results, fields)['issues']
+
+    def count_issues(self, jql: str) -> int:
+        """Number of issues matching ``jql``; fetches no issue bodies."""
+        return self._search(jql, 0, ('key',))['total']
+
+    def invalidate(self) -> None:
+        """Drop every cached search, e.g. after a synchronization."""
+        cache.clear(CACHE_NAMESPACE)
+
+    def _key(self, jql: str, max_results: int, fields: Optional[Sequence[str]]) -> str:
+        from app.services.jira_service import JiraService
+
+        return generate_cache_key(JiraService().server, normalize_jql(jql), max_results,
+                                  sorted(fields) if fields else None)
+
+    def _search(self, jql: str, max_results: int, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        key = self._key(jql, max_results, fields)
+        entry = cache.get(key, namespace=CACHE_NAMESPACE)
+        if entry is not None:
+            if time.time() - entry['fetched_at'] > self.ttl:
+                self._refresh_in_background(key, jql, max_results, fields)
+            return entry['result']
+
+        entry = cache.get_or_set(key, lambda: self._load(jql, max_results, fields),
+                                 timeout=self.ttl + self.stale, namespace=CACHE_NAMESPACE)
+        return entry['result']
+
+    def _load(self, jql: str, max_results: int, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        logger.debug(f"Fetching JIRA search: {normalize_jql(jql)}")
+        return {'fetched_at': time.time(), 'result': self._fetch(jql, max_results, fields)}
+
+    def _refresh_in_background(self, key: str, jql: str, max_results: int,
+                               fields: Optional[Sequence[str]]) -> None:
+        # One refresh per key across all processes
+        if not cache.add(f'refresh:{key}', True, timeout=current_app.config.get('CACHE_LOCK_TIMEOUT', 30),
+                         namespace=CACHE_NAMESPACE):
+            return
+        app = current_app._get_current_object()
+
+        def refresh():
+            with app.app_context():
+                try:
+                    cache.set(key, self._load(jql, max_results, fields), timeout=self.ttl + self.stale,
+                              namespace=CACHE_NAMESPACE)
+                except Exception as e:
+                    logger.error(f"Error refreshing JIRA search cache: {str(e)}")
+                finally:
+                    cache.delete(f'refresh:{key}', namespace=CACHE_NAMESPACE)
+
+        threading.Thread(target=refresh, name='jira-read-cache-refresh', daemon=True).start()
+
+
+_read_cache = None
+
+
+def get_jira_read_cache() -> JiraReadCache:
+    """Return the process-wide JIRA read cache."""
+    global _read_cache
+    if _read_cache is None:
+        _read_cache = JiraReadCache()
+    return _read_cache
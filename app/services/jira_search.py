@@ -0,0 +1,77 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import logging
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+class JqlIssueStream:
+    """Paginating generator over ``/rest/api/2/search``.
+
+    Issues are requested ``page_size`` at a time with only the listed fields,
+    so large projects are streamed in bounded memory instead of being
+    truncated at one page or materialised all at once.
+
+    ``start_at`` is the checkpoint: it only advances once the consumer has
+    finished with a page and asks for the next one, and ``on_checkpoint`` is
+    called right after that. Persisting ``start_at`` there and passing it
+    back in lets a crashed sync resume from the last completed page. The JQL
+    should have a stable ``ORDER BY`` for offsets to stay meaningful.
+    """
+
+    def __init__(self, jira: Any, jql: str, fields: Optional[List[str]] = None,
+                 page_size: Optional[int] = None, start_at: int = 0,
+                 on_checkpoint: Optional[Callable[['JqlIssueStream'], None]] = None):
+        config = current_app.config if has_app_context() else {}
+        self.jira = jira
+        self.jql = jql
+        self.fields = fields
+        self.page_size = max(1, int(page_size or config.get('JIRA_SEARCH_PAGE_SIZE', 100)))
+        self.start_at = int(start_at or 0)
+        self.on_checkpoint = on_checkpoint
+        self.total = None
+        self.fetched = 0
+        self.pages_fetched = 0
+
+    @property
+    def progress(self) -> Dict[str, Any]:
+        """Current position, usable for logging or progress reporting."""
+        return {
+            'start_at': self.start_at,
+            'fetched': self.fetched,
+            'total': self.total,
+            'pages': self.pages_fetched,
+            'percent': round(100.0 * self.start_at / self.total, 1) if self.total else None
+        }
+
+    def pages(self) -> Iterator[List[Any]]:
+        """Yield one list of issues per search page."""
+        while self.total is None or self.start_at < self.total:
+            page = self.jira.search_issues(
+                self.jql,
+                startAt=self.start_at,
+                maxResults=self.page_size,
+                fields=self.fields
+            )
+            self.total = getattr(page, 'total', None)
+            issues = list(page)
+            self.pages_fetched += 1
+            self.fetched += len(issues)
+            if self.total is None:
+                # Plain lists carry no total; a short page is the last one
+                self.total = self.start_at + len(issues) + (self.page_size if len(issues) >= self.page_size else 0)
+            if not issues:
+                break
+
+            yield issues
+
+            # The consumer is done with this page
+            self.start_at += len(issues)
+            logger.debug(f"JQL search progress: {self.progress}")
+            if self.on_checkpoint:
+                self.on_checkpoint(self)
+
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages():
+            yield from page
+
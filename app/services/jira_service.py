@@ -2,28 +2,35 @@ from typing import Dict, List, Optional, Any, Tuple
 import requests
 from flask import current_app
 import logging
-from datetime import datetime, timedelta
-from flask_caching import Cache
+from datetime import datetime, timedelta, timezone
 from jira import JIRA, JIRAError
 from functools import lru_cache, wraps
 from app.models.jira_config import JiraConfig
 from app.utils.crypto import decrypt_password
-from app.extensions import db
+from app.extensions import db, cache
 import base64
 from app.models.user import User
 from app.models import Setting
 import os
+import time
 from app.models.role import Role
 from contextlib import contextmanager
 import urllib3
 from app.models.project import Project
 from app.models.worklog import Worklog
+from app.models.worklog_daily_rollup import WorklogDailyRollup
 from app.models.issue import Issue
 import tenacity
 from app.exceptions import JiraConnectionError
+from app.services.worklog_ingestion import WorklogIngestor
+from app.services.jira_fetch_pool import JiraFetchPool, embedded_worklogs
+from app.services.jira_http import get_jira_session
+from app.services.jira_search import JqlIssueStream
 
 logger = logging.getLogger(__name__)
-cache = Cache()
+
+# User columns with a unique constraint, checked before bulk writes
+USER_UNIQUE_FIELDS = ('username', 'email', 'jira_id', 'jira_key', 'jira_username')
 
 class JiraService:
     _instance = None
@@ -62,6 +69,11 @@ class JiraService:
         """Check if JIRA is configured."""
         return bool(self.config and self._base_url)
 
+    @property
+    def server(self) -> Optional[str]:
+        """Base URL of the configured JIRA server, for links; no connection needed."""
+        return self._base_url
+
     @property
     def is_connected(self) -> bool:
         """Check if JIRA connection is active."""
@@ -99,7 +111,7 @@ class JiraService:
         headers = self.get_headers()
         
         try:
-            response = requests.request(method, url, headers=headers, verify=True, **kwargs)
+            response = get_jira_session().request(method, url, headers=headers, verify=True, **kwargs)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
@@ -114,7 +126,13 @@ class JiraService:
         after=tenacity.after_log(logger, logging.INFO)
     )
     def sync_projects(self) -> Dict[str, Any]:
-        """Synchronize projects from JIRA."""
+        """Synchronize projects from JIRA.
+
+        Runs as a batched pipeline: existing projects are preloaded in one
+        query, project details are fetched concurrently through the fetch
+        pool, and the resulting inserts and updates are written in bulk with
+        a single commit. ``stats['timings']`` reports seconds per phase.
+        """
         self.ensure_connected()
         logger.info("Starting project synchronization")
         
@@ -122,55 +140,78 @@ class JiraService:
             'total': 0,
             'created': 0,
             'updated': 0,
+            'unchanged': 0,
             'errors': 0,
-            'error_messages': []
+            'error_messages': [],
+            'timings': {}
         }
 
         try:
-            # Get all projects from JIRA
+            # Fetch: project list plus details, fanned out over the fetch pool
+            started = time.perf_counter()
             jira_projects = self.jira.projects()
             stats['total'] = len(jira_projects)
-            
-            for jira_project in jira_projects:
-                try:
-                    # Get detailed project info
-                    project_details = self.jira.project(jira_project.key)
-                    
-                    # Map JIRA project data to our model
-                    project_data = {
-                        'name': jira_project.name,
-                        'jira_key': jira_project.key,
-                        'project_type': getattr(project_details, 'projectTypeKey', 'software'),
-                        'description': getattr(project_details, 'description', '') or '',
-                        'is_active': True,  # Default to active
-                        'last_sync': datetime.utcnow()
-                    }
-
-                    # Try to find existing project
-                    project = Project.query.filter_by(jira_key=jira_project.key).first()
-                    
-                    if project:
-                        # Update existing project
-                        for key, value in project_data.items():
-                            setattr(project, key, value)
-                        stats['updated'] += 1
-                    else:
-                        # Create new project
-                        project = Project(**project_data)
-                        db.session.add(project)
-                        stats['created'] += 1
 
-                    db.session.flush()  # Flush changes for this project
-
-                except Exception as e:
-                    error_msg = f"Error processing project {getattr(jira_project, 'key', 'unknown')}: {str(e)}"
+            pool = JiraFetchPool()
+            details = {}
+            for jira_project, project_details, error in pool.map(lambda p: self.jira.project(p.key), jira_projects):
+                if error is not None:
+                    error_msg = f"Error processing project {getattr(jira_project, 'key', 'unknown')}: {str(error)}"
                     logger.error(error_msg)
                     stats['errors'] += 1
                     stats['error_messages'].append(error_msg)
+                    continue
+                details[jira_project.key] = project_details
+            stats['timings']['fetch'] = round(time.perf_counter() - started, 3)
+
+            # Diff: compare against every existing project loaded in one query
+            started = time.perf_counter()
+            now = datetime.utcnow()
+            existing = Project.query.all()
+            by_key = {p.jira_key: p for p in existing if p.jira_key}
+            by_jira_id = {p.jira_id: p for p in existing if p.jira_id}
+
+            inserts, updates = [], []
+            for jira_project in jira_projects:
+                project_details = details.get(jira_project.key)
+                if project_details is None:
+                    continue
+
+                # Map JIRA project data to our model
+                project_data = {
+                    'name': jira_project.name,
+                    'jira_key': jira_project.key,
+                    'jira_id': str(jira_project.id) if getattr(jira_project, 'id', None) else None,
+                    'description': getattr(project_details, 'description', '') or '',
+                    'is_active': True  # Default to active
+                }
+
+                project = by_key.get(jira_project.key) or by_jira_id.get(project_data['jira_id'])
+                if project is None:
+                    inserts.append({**project_data, 'created_at': now, 'updated_at': now, 'last_sync': now})
+                    stats['created'] += 1
+                    continue
 
-            # Commit all changes
+                changed = {k: v for k, v in project_data.items()
+                           if v is not None and getattr(project, k) != v}
+                if changed:
+                    updates.append({**changed, 'id': project.id, 'updated_at': now, 'last_sync': now})
+                    stats['updated'] += 1
+                else:
+                    updates.append({'id': project.id, 'last_sync': now})
+                    stats['unchanged'] += 1
+            stats['timings']['diff'] = round(time.perf_counter() - started, 3)
+
+            # Write: bulk statements and a single commit
+            started = time.perf_counter()
             try:
+                if inserts:
+                    db.session.bulk_insert_mappings(Project, inserts)
+                if updates:
+                    db.session.bulk_update_mappings(Project, updates)
                 db.session.commit()
+                stats['timings']['write'] = round(time.perf_counter() - started, 3)
+                stats['http_requests'] = pool.stats['requests'] + 1
                 logger.info(f"Project synchronization completed: {stats}")
             except Exception as e:
                 db.session.rollback()
@@ -197,25 +238,31 @@ class JiraService:
         after=tenacity.after_log(logger, logging.INFO)
     )
     def sync_users(self) -> Dict[str, Any]:
-        """Synchronize users from JIRA."""
+        """Synchronize users from JIRA.
+
+        Pages through the whole user directory, matches every JIRA user
+        against an in-memory index of local users (by jira_id, email and
+        username) and writes only rows whose fields actually changed, with
+        bulk statements and a single commit.
+        """
         self.ensure_connected()
         logger.info("Starting user synchronization")
-        logger.info("=" * 50)
-        logger.info("JIRA User Synchronization Debug Log")
-        logger.info("=" * 50)
-        
+
         stats = {
             'total': 0,
             'created': 0,
             'updated': 0,
+            'unchanged': 0,
+            'skipped': 0,
             'errors': 0,
             'error_messages': [],
-            'processed_users': []
+            'changed_fields': {},
+            'timings': {}
         }
 
         try:
-            from app.models.user import User
             from app.models.role import Role
+            from app.models.user_role import UserRole
             
             # Get default role
             default_role = Role.query.filter_by(name='user').first()
@@ -224,200 +271,106 @@ class JiraService:
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
-            logger.info(f"Found default role: {default_role.name}")
-            start_at = 0
-            max_results = 50
-            total_processed = 0
-            previous_batch_size = max_results
-            max_iterations = 20  # Maksymalna liczba iteracji
-            iteration_count = 0
-            last_processed_user = None
-
-            while True:
-                iteration_count += 1
-                logger.info(f"Iteration {iteration_count} of maximum {max_iterations}")
-                
-                if iteration_count > max_iterations:
-                    logger.warning(f"Reached maximum number of iterations ({max_iterations}). Breaking loop.")
-                    break
+            started = time.perf_counter()
+            jira_users = self._fetch_all_jira_users(stats)
+            stats['timings']['fetch'] = round(time.perf_counter() - started, 3)
+
+            # Load every local user once and index by each identifier
+            started = time.perf_counter()
+            local_users = User.query.all()
+            by_jira_id = {u.jira_id: u for u in local_users if u.jira_id}
+            by_email = {u.email: u for u in local_users if u.email}
+            by_username = {u.username: u for u in local_users if u.username}
+            taken = {field: {getattr(u, field): u.id for u in local_users if getattr(u, field)}
+                     for field in USER_UNIQUE_FIELDS}
+            with_default_role = {
+                user_id for (user_id,) in
+                db.session.query(UserRole.user_id).filter(UserRole.role_id == default_role.id)
+            }
 
-                try:
-                    # Make request to JIRA API
-                    endpoint = "/rest/api/2/user/search"
-                    params = {
-                        'username': '.',  # Match all users
-                        'startAt': start_at,
-                        'maxResults': max_results
-                    }
-                    
-                    logger.info("-" * 30)
-                    logger.info(f"Fetching batch of users from JIRA (startAt={start_at}, maxResults={max_results})")
-                    response = self.make_request(endpoint, params=params)
-                    users_data = response.json()
-                    
-                    current_batch_size = len(users_data)
-                    logger.info(f"Retrieved {current_batch_size} users from JIRA")
-                    logger.info(f"Response status code: {response.status_code}")
-
-                    # Warunki wyjścia z pętli
-                    if not users_data:
-                        logger.info("No more users to process - empty response")
-                        break
-
-                    if current_batch_size == 0:
-                        logger.info("Received empty batch - breaking loop")
-                        break
-
-                    if current_batch_size < max_results:
-                        logger.info("Received less users than requested - last batch")
-                        
-                    # Sprawdź czy nie przetwarzamy tych samych użytkowników
-                    first_user_in_batch = users_data[0].get('accountId') if users_data else None
-                    if first_user_in_batch == last_processed_user:
-                        logger.warning("Detected same user as in previous batch - breaking loop")
-                        break
-
-                    last_processed_user = first_user_in_batch
-
-                    # Process each user in the batch
-                    for jira_user in users_data:
-                        try:
-                            logger.info("-" * 20)
-                            display_name = jira_user.get('displayName', 'Unknown')
-                            logger.info(f"Processing user: {display_name}")
-
-                            # Extract user data safely
-                            user_data = {
-                                'username': jira_user.get('name') or jira_user.get('emailAddress', '').split('@')[0],
-                                'email': jira_user.get('emailAddress', ''),
-                                'display_name': display_name,
-                                'jira_key': jira_user.get('key') or None,
-                                'jira_display_name': display_name,
-                                'jira_email': jira_user.get('emailAddress', ''),
-                                'jira_active': True if jira_user.get('active') is None else jira_user.get('active'),
-                                'jira_id': jira_user.get('accountId') or None,
-                                'jira_username': jira_user.get('name', ''),
-                                'is_active': True if jira_user.get('active') is None else jira_user.get('active'),
-                                'last_jira_sync': db.func.now()
-                            }
-
-                            # Validate required fields
-                            if not any([user_data['username'], user_data['email'], user_data['display_name']]):
-                                logger.warning(f"WARNING: Skipping user with no identifiers: {jira_user}")
-                                continue
-
-                            # Find existing user using multiple criteria
-                            user = None
-                            
-                            # Try finding by jira_id if available
-                            if user_data['jira_id']:
-                                user = User.query.filter_by(jira_id=user_data['jira_id']).first()
-                                if user:
-                                    logger.info(f"Found existing user by jira_id: {user.username}")
-                            
-                            # Try finding by email
-                            if not user and user_data['email']:
-                                user = User.query.filter_by(email=user_data['email']).first()
-                                if user:
-                                    logger.info(f"Found existing user by email: {user.username}")
-
-                            # Try finding by username
-                            if not user and user_data['username']:
-                                user = User.query.filter_by(username=user_data['username']).first()
-                                if user:
-                                    logger.info(f"Found existing user by username: {user.username}")
-
-                            try:
-                                if user:
-                                    logger.info(f"Updating existing user: {user.username}")
-                                    # Update existing user with non-None values
-                                    for key, value in user_data.items():
-                                        if value is not None:
-                                            current_value = getattr(user, key)
-                                            if current_value != value:
-                                                logger.info(f"  Updating {key}: {current_value} -> {value}")
-                                                setattr(user, key, value)
-                                        
-                                    # Ensure user has default role
-                                    if default_role not in user.roles:
-                                        logger.info(f"Adding default role to user: {user.username}")
-                                        user.roles.append(default_role)
-                                        
-                                    stats['updated'] += 1
-                                else:
-                                    identifier = user_data['username'] or user_data['email'] or user_data['display_name']
-                                    logger.info(f"Creating new user: {identifier}")
-                                    # Create new user
-                                    user = User(**user_data)
-                                    if default_role not in user.roles:
-                                        user.roles.append(default_role)
-                                    db.session.add(user)
-                                    stats['created'] += 1
-
-                                # Track processed user
-                                stats['processed_users'].append({
-                                    'username': user_data['username'],
-                                    'email': user_data['email'],
-                                    'jira_id': user_data['jira_id'],
-                                    'action': 'updated' if user else 'created'
-                                })
-
-                                total_processed += 1
-                                
-                                # Commit after each user
-                                db.session.commit()
-                                logger.info(f"Successfully saved user: {identifier}")
-
-                            except Exception as e:
-                                db.session.rollback()
-                                error_msg = f"Database error processing user {display_name}: {str(e)}"
-                                logger.error(error_msg)
-                                stats['errors'] += 1
-                                stats['error_messages'].append(error_msg)
-                                continue
-
-                        except Exception as e:
-                            error_msg = f"Error processing user {display_name}: {str(e)}"
-                            logger.error(error_msg)
-                            stats['errors'] += 1
-                            stats['error_messages'].append(error_msg)
-                            continue
-
-                    # Aktualizuj start_at tylko jeśli otrzymaliśmy pełną partię
-                    if current_batch_size >= max_results:
-                        start_at += current_batch_size
-                        logger.info(f"Moving to next batch, startAt: {start_at}")
-                    else:
-                        logger.info("Last batch processed - breaking loop")
-                        break
+            now = datetime.utcnow()
+            inserts, updates, role_grants = [], [], []
+            for jira_user in jira_users:
+                user_data = self._jira_user_fields(jira_user)
+                if not any([user_data['username'], user_data['email'], user_data['display_name']]):
+                    logger.warning(f"Skipping user with no identifiers: {jira_user}")
+                    stats['skipped'] += 1
+                    continue
 
-                    previous_batch_size = current_batch_size
+                user = (by_jira_id.get(user_data['jira_id']) or by_email.get(user_data['email'])
+                        or by_username.get(user_data['username']))
+
+                if user is None:
+                    if not user_data['email']:
+                        user_data['email'] = f"{user_data['username']}@unknown.com"
+                    if any(user_data[f] in taken[f] for f in ('username', 'email')):
+                        # Another JIRA account already claimed this identity in this run
+                        stats['skipped'] += 1
+                        continue
+                    for field in USER_UNIQUE_FIELDS:
+                        if user_data[field] in taken[field]:
+                            user_data[field] = None
+                        elif user_data[field]:
+                            taken[field][user_data[field]] = None
+                    inserts.append({**user_data, 'last_jira_sync': now, 'created_at': now, 'updated_at': now})
+                    stats['created'] += 1
+                    continue
 
-                except Exception as e:
-                    error_msg = f"Error fetching users from JIRA: {str(e)}"
-                    logger.error(error_msg)
-                    stats['errors'] += 1
-                    stats['error_messages'].append(error_msg)
-                    break
-
-            stats['total'] = total_processed
-            logger.info("=" * 50)
-            logger.info("Synchronization Summary:")
-            logger.info(f"Total iterations: {iteration_count}")
-            logger.info(f"Total processed: {stats['total']}")
-            logger.info(f"Created: {stats['created']}")
-            logger.info(f"Updated: {stats['updated']}")
-            logger.info(f"Errors: {stats['errors']}")
-            if stats['error_messages']:
-                logger.info("Error messages:")
-                for msg in stats['error_messages']:
-                    logger.info(f"  - {msg}")
-            
-            # Log final database state
-            final_user_count = User.query.count()
-            logger.info(f"Final user count in database: {final_user_count}")
-            logger.info("=" * 50)
-            
+                changed = {}
+                for field, value in user_data.items():
+                    if value is None or value == '' or getattr(user, field) == value:
+                        continue
+                    if field in USER_UNIQUE_FIELDS and taken[field].get(value, user.id) != user.id:
+                        stats['error_messages'].append(
+                            f"User {user.username}: {field} {value!r} already belongs to another user"
+                        )
+                        continue
+                    changed[field] = value
+
+                if user.id not in with_default_role:
+                    role_grants.append(user.id)
+                    with_default_role.add(user.id)
+
+                if not changed:
+                    stats['unchanged'] += 1
+                    continue
+                for field, value in changed.items():
+                    stats['changed_fields'][field] = stats['changed_fields'].get(field, 0) + 1
+                    if field in USER_UNIQUE_FIELDS:
+                        taken[field][value] = user.id
+                updates.append({**changed, 'id': user.id, 'last_jira_sync': now, 'updated_at': now})
+                stats['updated'] += 1
+            stats['timings']['diff'] = round(time.perf_counter() - started, 3)
+
+            # Write only what changed, in bulk, with one commit
+            started = time.perf_counter()
+            try:
+                if inserts:
+                    db.session.bulk_insert_mappings(User, inserts, return_defaults=True)
+                    role_grants.extend(row['id'] for row in inserts)
+                if updates:
+                    db.session.bulk_update_mappings(User, updates)
+                if role_grants:
+                    db.session.bulk_insert_mappings(UserRole, [
+                        {'user_id': user_id, 'role_id': default_role.id, 'created_at': now, 'updated_at': now}
+                        for user_id in role_grants
+                    ])
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                error_msg = f"Failed to commit user changes: {str(e)}"
+                logger.error(error_msg)
+                stats['errors'] += 1
+                stats['error_messages'].append(error_msg)
+                raise
+            stats['timings']['write'] = round(time.perf_counter() - started, 3)
+
+            stats['total'] = stats['created'] + stats['updated'] + stats['unchanged']
+            logger.info(
+                f"User synchronization completed: {len(jira_users)} in JIRA, {stats['created']} created, "
+                f"{stats['updated']} updated, {stats['unchanged']} unchanged, {stats['skipped']} skipped, "
+                f"{stats['errors']} errors; changed fields {stats['changed_fields']}; timings {stats['timings']}"
+            )
             return stats
 
         except Exception as e:
@@ -427,6 +380,60 @@ class JiraService:
             stats['error_messages'].append(error_msg)
             raise JiraConnectionError(error_msg)
 
+    def _fetch_all_jira_users(self, stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Page through ``/rest/api/2/user/search`` until JIRA runs out of users."""
+        max_results = current_app.config.get('JIRA_USER_PAGE_SIZE', 1000)
+        start_at = 0
+        users = {}
+        while True:
+            params = {
+                'username': '.',  # Match all users
+                'startAt': start_at,
+                'maxResults': max_results
+            }
+            try:
+                users_data = self.make_request('/rest/api/2/user/search', params=params).json()
+            except Exception as e:
+                error_msg = f"Error fetching users from JIRA: {str(e)}"
+                logger.error(error_msg)
+                stats['errors'] += 1
+                stats['error_messages'].append(error_msg)
+                break
+
+            new_users = 0
+            for jira_user in users_data:
+                key = jira_user.get('accountId') or jira_user.get('key') or jira_user.get('name')
+                if key not in users:
+                    users[key] = jira_user
+                    new_users += 1
+
+            # Stop on a short page or when JIRA starts repeating itself
+            if len(users_data) < max_results or not new_users:
+                break
+            start_at += len(users_data)
+
+        logger.info(f"Fetched {len(users)} users from JIRA")
+        return list(users.values())
+
+    @staticmethod
+    def _jira_user_fields(jira_user: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a JIRA user to User column values."""
+        display_name = jira_user.get('displayName', 'Unknown')
+        email = jira_user.get('emailAddress') or ''
+        active = True if jira_user.get('active') is None else jira_user.get('active')
+        return {
+            'username': jira_user.get('name') or email.split('@')[0] or jira_user.get('accountId') or '',
+            'email': email,
+            'display_name': display_name,
+            'jira_key': jira_user.get('key') or None,
+            'jira_display_name': display_name,
+            'jira_email': email,
+            'jira_active': active,
+            'jira_id': jira_user.get('accountId') or None,
+            'jira_username': jira_user.get('name') or None,
+            'is_active': active
+        }
+
     @tenacity.retry(
         stop=tenacity.stop_after_attempt(3),
         wait=tenacity.wait_exponential(multiplier=1, min=4, max=10),
@@ -434,183 +441,99 @@ class JiraService:
         before=tenacity.before_log(logger, logging.INFO),
         after=tenacity.after_log(logger, logging.INFO)
     )
-    def sync_worklogs(self, days_back: int = 30) -> Dict[str, Any]:
-        """Synchronize worklogs from JIRA."""
+    def sync_worklogs(self, days_back: int = 30, run: Optional[Any] = None) -> Dict[str, Any]:
+        """Synchronize worklogs from JIRA.
+
+        Projects without a stored watermark are bootstrapped with a JQL scan of
+        the last ``days_back`` days. Every other project is brought up to date
+        from JIRA's "updated worklogs since" and "deleted worklogs since" feeds,
+        starting at the project's watermark, so a steady-state run only
+        downloads what changed since the previous one.
+
+        Progress is recorded as checkpoints of ``run`` (a new or resumed
+        ``worklogs`` run when none is given). Work is committed per search page
+        and per project, so an interrupted run resumes where it stopped.
+        """
+        from app.models.sync_watermark import SyncWatermark
+        from app.models.sync_run import SyncRun
+
+        own_run = run is None
+        if own_run:
+            run = SyncRun.start('worklogs')
+
+        stats = {
+            'total': 0,
+            'created': 0,
+            'updated': 0,
+            'deleted': 0,
+            'bootstrapped_projects': 0,
+            'incremental_projects': 0,
+            'errors': 0,
+            'error_messages': [],
+            'chunks': [],
+            'worklog_calls_avoided': 0
+        }
+
         try:
-            # Initialize stats
-            stats = {
-                'total': 0,
-                'created': 0,
-                'updated': 0,
-                'errors': 0,
-                'error_messages': []
-            }
+            # A resumed run fetched its first pages in an earlier attempt, so new
+            # watermarks start at the run's original start, not at this attempt
+            run_started_ms = int(run.started_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+            end_date = datetime.utcnow()
+            start_date = end_date - timedelta(days=days_back)
 
-            # Set date range for 2025
-            start_date = datetime(2025, 1, 1)
-            end_date = datetime(2025, 12, 31)
-            logger.info(f"Starting worklog synchronization for 2025")
+            # Users created for unknown worklog authors need the default role;
+            # make sure it exists before the ingestion savepoints are opened.
+            Role.get_or_create_default_role()
 
             # Get active projects from database
             projects = Project.query.filter_by(is_active=True).all()
+            watermarks = SyncWatermark.for_projects(p.id for p in projects)
 
-            for project in projects:
-                try:
-                    logger.info(f"Fetching 2025 worklogs for project {project.jira_key}")
-                    
-                    # Check if project still exists in JIRA
-                    try:
-                        jira_project = self.jira.project(project.jira_key)
-                    except JIRAError as je:
-                        if je.status_code == 404 or 'does not exist' in str(je).lower():
-                            # Project no longer exists in JIRA
-                            logger.warning(f"Project {project.jira_key} no longer exists in JIRA, marking as inactive")
-                            project.is_active = False
-                            db.session.add(project)
-                            db.session.commit()
-                            continue
-                        raise je
-
-                    # Build JQL query for worklogs
-                    jql = f'project = "{project.jira_key}" AND worklogDate >= "{start_date.strftime("%Y-%m-%d")}" AND worklogDate <= "{end_date.strftime("%Y-%m-%d")}"'
-                    
-                    try:
-                        # Search for issues with worklogs
-                        issues = self.jira.search_issues(
-                            jql,
-                            startAt=0,
-                            fields=['worklog', 'summary'],
-                            maxResults=1000
-                        )
-                    except JIRAError as je:
-                        if je.status_code == 400 and 'does not exist for the field' in str(je):
-                            # Project not found in JIRA search
-                            logger.warning(f"Project {project.jira_key} not found in JIRA search, marking as inactive")
-                            project.is_active = False
-                            db.session.add(project)
-                            db.session.commit()
-                            continue
-                        raise je
-
-                    for issue in issues:
-                        try:
-                            # Get detailed worklog info
-                            worklog = self.jira.worklogs(issue.id)
-                            
-                            for work_item in worklog:
-                                try:
-                                    # Skip if worklog is outside our date range
-                                    started = datetime.strptime(work_item.started[:10], '%Y-%m-%d')
-                                    if started < start_date or started > end_date:
-                                        continue
-
-                                    # Get user info safely
-                                    author = work_item.author
-                                    author_name = getattr(author, 'name', None)
-                                    author_display_name = getattr(author, 'displayName', None)
-                                    author_email = getattr(author, 'emailAddress', None)
-                                    
-                                    # Try to find user by various fields
-                                    user = None
-                                    if author_email:
-                                        user = User.query.filter_by(email=author_email).first()
-                                    if not user and author_name:
-                                        user = User.query.filter_by(username=author_name).first()
-                                    if not user and author_display_name:
-                                        user = User.query.filter_by(display_name=author_display_name).first()
-                                        
-                                    if not user:
-                                        # Create new user if not found
-                                        user = User(
-                                            username=author_name or author_email.split('@')[0] if author_email else 'unknown',
-                                            email=author_email or f"{author_name}@unknown.com" if author_name else 'unknown@unknown.com',
-                                            display_name=author_display_name or author_name or 'Unknown User',
-                                            is_active=True
-                                        )
-                                        db.session.add(user)
-                                        db.session.flush()  # Get the ID
-                                        logger.info(f"Created new user: {user.username}")
-
-                                    # Find or create issue
-                                    issue_obj = Issue.query.filter_by(
-                                        jira_key=issue.key
-                                    ).first()
-                                    
-                                    if not issue_obj:
-                                        # Create new issue
-                                        issue_obj = Issue(
-                                            jira_key=issue.key,
-                                            summary=issue.fields.summary,
-                                            project_id=project.id
-                                        )
-                                        db.session.add(issue_obj)
-                                        db.session.flush()  # Get the ID
-
-                                    # Extract worklog data
-                                    worklog_data = {
-                                        'jira_worklog_id': str(work_item.id),
-                                        'issue_id': issue_obj.id,
-                                        'user_id': user.id,
-                                        'project_id': project.id,
-                                        'time_spent': work_item.timeSpentSeconds / 3600,  # Convert to hours
-                                        'time_spent_seconds': work_item.timeSpentSeconds,
-                                        'work_date': started.date(),
-                                        'description': getattr(work_item, 'comment', '') or '',
-                                        'updated_at': datetime.utcnow()
-                                    }
-
-                                    # Find existing worklog
-                                    existing_worklog = Worklog.query.filter_by(
-                                        jira_worklog_id=str(work_item.id)  # Use correct field name
-                                    ).first()
-
-                                    if existing_worklog:
-                                        # Update existing worklog
-                                        for key, value in worklog_data.items():
-                                            setattr(existing_worklog, key, value)
-                                        stats['updated'] += 1
-                                    else:
-                                        # Create new worklog
-                                        new_worklog = Worklog(**worklog_data)
-                                        db.session.add(new_worklog)
-                                        stats['created'] += 1
-
-                                    db.session.flush()
-                                    stats['total'] += 1
-
-                                except Exception as e:
-                                    error_msg = f"Error processing worklog {work_item.id} for issue {issue.key}: {str(e)}"
-                                    logger.error(error_msg)
-                                    stats['errors'] += 1
-                                    stats['error_messages'].append(error_msg)
-                                    db.session.rollback()
-
-                        except Exception as e:
-                            error_msg = f"Error fetching worklogs for issue {issue.key}: {str(e)}"
-                            logger.error(error_msg)
-                            stats['errors'] += 1
-                            stats['error_messages'].append(error_msg)
-                            continue
+            bootstrap_projects = [p for p in projects if p.id not in watermarks]
+            incremental_projects = [p for p in projects if p.id in watermarks]
+            logger.info(
+                f"Starting worklog synchronization: {len(incremental_projects)} incremental, "
+                f"{len(bootstrap_projects)} to bootstrap from {start_date.strftime('%Y-%m-%d')}"
+            )
 
+            for project in bootstrap_projects:
+                checkpoint = run.checkpoint('worklogs', project.id)
+                try:
+                    if self._sync_project_worklogs_full(project, start_date, end_date, stats, checkpoint):
+                        watermark = SyncWatermark(project_id=project.id)
+                        watermark.advance(run_started_ms, run_started_ms)
+                        db.session.add(watermark)
+                        stats['bootstrapped_projects'] += 1
+                    # The project's last page, its watermark and checkpoint land together
+                    checkpoint.complete()
+                    db.session.commit()
                 except Exception as e:
+                    db.session.rollback()
                     error_msg = f"Error processing project {project.jira_key}: {str(e)}"
                     logger.error(error_msg)
                     stats['errors'] += 1
                     stats['error_messages'].append(error_msg)
+                    run.checkpoint('worklogs', project.id).fail(error_msg)
+                    db.session.commit()
                     continue
 
-            # Commit all changes
-            try:
-                db.session.commit()
-                logger.info(f"Worklog synchronization completed: {stats}")
-            except Exception as e:
-                db.session.rollback()
-                error_msg = f"Failed to commit worklog changes: {str(e)}"
-                logger.error(error_msg)
-                stats['errors'] += 1
-                stats['error_messages'].append(error_msg)
-                raise
-
+            if incremental_projects:
+                checkpoint = run.checkpoint('worklog_feeds')
+                try:
+                    self._sync_worklogs_incremental(incremental_projects, watermarks, stats)
+                    stats['incremental_projects'] = len(incremental_projects)
+                    # Commit feed changes together with the advanced watermarks
+                    checkpoint.complete(len(incremental_projects))
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    run.checkpoint('worklog_feeds').fail(str(e))
+                    db.session.commit()
+                    raise
+
+            logger.info(f"Worklog synchronization completed: {stats}")
+            if own_run:
+                run.finish(stats)
             return stats
 
         except Exception as e:
@@ -618,42 +541,290 @@ class JiraService:
             logger.error(error_msg)
             stats['errors'] += 1
             stats['error_messages'].append(error_msg)
+            if own_run:
+                db.session.rollback()
+                run.finish(stats, error=error_msg)
             raise JiraConnectionError(error_msg)
 
+    def _sync_project_worklogs_full(self, project: Project, start_date: datetime, end_date: datetime,
+                                    stats: Dict[str, Any], checkpoint: Optional[Any] = None) -> bool:
+        """Pull every worklog of a project in the date range via JQL.
+
+        Each fully stored search page is committed and recorded on
+        ``checkpoint``, from which a later attempt resumes.
+        Returns False when the project no longer exists in JIRA.
+        """
+        logger.info(f"Bootstrapping worklogs for project {project.jira_key}")
+
+        # Check if project still exists in JIRA
+        try:
+            self.jira.project(project.jira_key)
+        except JIRAError as je:
+            if je.status_code == 404 or 'does not exist' in str(je).lower():
+                logger.warning(f"Project {project.jira_key} no longer exists in JIRA, marking as inactive")
+                project.is_active = False
+                db.session.add(project)
+                db.session.commit()
+                return False
+            raise je
+
+        jql = (
+            f'project = "{project.jira_key}" '
+            f'AND worklogDate >= "{start_date.strftime("%Y-%m-%d")}" '
+            f'AND worklogDate <= "{end_date.strftime("%Y-%m-%d")}" '
+            f'ORDER BY created ASC'
+        )
+
+        # Resume after the last page a crashed run fully stored
+        start_at = checkpoint.resume_offset(jql) if checkpoint else 0
+        if start_at:
+            logger.info(f"Resuming worklog bootstrap of {project.jira_key} at startAt={start_at}")
+
+        def save_page(stream):
+            if checkpoint:
+                checkpoint.advance(stream.start_at, stream.total, jql)
+                checkpoint.processed = stream.start_at
+            db.session.commit()
+
+        stream = JqlIssueStream(
+            self.jira, jql,
+            fields=['worklog', 'summary'],
+            start_at=start_at,
+            on_checkpoint=save_page
+        )
+        ingestor = WorklogIngestor()
+        pool = JiraFetchPool()
+        first_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        entries = []
+
+        def collect(issue, work_items):
+            nonlocal entries
+            for work_item in work_items:
+                raw = getattr(work_item, 'raw', work_item)
+                started = datetime.strptime(raw['started'][:10], '%Y-%m-%d')
+                if started < first_day or started > end_date:
+                    continue
+                entries.append({
+                    'worklog': raw,
+                    'issue_id': issue.id,
+                    'issue_key': issue.key,
+                    'issue_summary': issue.fields.summary,
+                    'project_id': project.id
+                })
+            if len(entries) >= ingestor.chunk_size:
+                ingestor.ingest(entries, stats)
+                entries = []
+
+        try:
+            for page in stream.pages():
+                # The search already returned the first page of worklogs; only
+                # issues whose page is truncated need their own request.
+                truncated = []
+                for issue in page:
+                    inline = embedded_worklogs(issue)
+                    if inline is None:
+                        truncated.append(issue)
+                    else:
+                        collect(issue, inline)
+                        stats['worklog_calls_avoided'] = stats.get('worklog_calls_avoided', 0) + 1
+
+                # Remaining requests fan out over the fetch pool while this thread, which
+                # owns the DB session, writes whatever has arrived in upsert-sized batches.
+                for issue, work_items, error in pool.map(lambda i: self.jira.worklogs(i.id), truncated):
+                    if error is not None:
+                        error_msg = f"Error fetching worklogs for issue {issue.key}: {str(error)}"
+                        logger.error(error_msg)
+                        stats['errors'] += 1
+                        stats['error_messages'].append(error_msg)
+                        continue
+                    collect(issue, work_items)
+
+                # Everything from this page is written before the checkpoint moves past it
+                ingestor.ingest(entries, stats)
+                entries = []
+                logger.info(f"Bootstrap {project.jira_key}: {stream.progress}")
+        except JIRAError as je:
+            if je.status_code == 400 and 'does not exist for the field' in str(je):
+                logger.warning(f"Project {project.jira_key} not found in JIRA search, marking as inactive")
+                project.is_active = False
+                db.session.add(project)
+                db.session.commit()
+                return False
+            raise je
+
+        stats['issues_scanned'] = stats.get('issues_scanned', 0) + stream.fetched
+        stats['http_requests'] = stats.get('http_requests', 0) + pool.stats['requests'] + stream.pages_fetched
+        stats['http_retries'] = stats.get('http_retries', 0) + pool.stats['retries']
+        return True
+
+    def _sync_worklogs_incremental(self, projects: List[Project], watermarks: Dict[int, Any],
+                                   stats: Dict[str, Any]) -> None:
+        """Apply the JIRA worklog change feeds to projects that have a watermark."""
+        projects_by_key = {p.jira_key: p for p in projects}
+
+        # The feeds are global, so read them once from the oldest watermark
+        # and skip per project whatever that project has already seen.
+        updated_since = min(watermarks[p.id].worklogs_updated_since for p in projects)
+        deleted_since = min(watermarks[p.id].worklogs_deleted_since for p in projects)
+
+        changes, updated_until = self._read_worklog_feed('/rest/api/2/worklog/updated', updated_since)
+        deletions, deleted_until = self._read_worklog_feed('/rest/api/2/worklog/deleted', deleted_since)
+        logger.info(f"Worklog feeds: {len(changes)} updated since {updated_since}, "
+                    f"{len(deletions)} deleted since {deleted_since}")
+
+        if changes:
+            updated_at = {str(c['worklogId']): c.get('updatedTime', 0) for c in changes}
+            worklogs = self._fetch_worklogs_by_ids(list(updated_at))
+            issues = self._fetch_issues_by_ids({str(w['issueId']) for w in worklogs})
+
+            entries = []
+            for raw in worklogs:
+                issue = issues.get(str(raw['issueId']))
+                if not issue:
+                    continue
+                project = projects_by_key.get(issue['project_key'])
+                if not project:
+                    continue
+                if updated_at.get(str(raw['id']), 0) <= watermarks[project.id].worklogs_updated_since:
+                    continue
+                entries.append({
+                    'worklog': raw,
+                    'issue_id': issue['id'],
+                    'issue_key': issue['key'],
+                    'issue_summary': issue['summary'],
+                    'project_id': project.id
+                })
+            WorklogIngestor().ingest(entries, stats)
+
+        if deletions:
+            deleted_ids = [str(d['worklogId']) for d in deletions]
+            for i in range(0, len(deleted_ids), 500):
+                doomed = Worklog.query.filter(
+                    Worklog.jira_worklog_id.in_(deleted_ids[i:i + 500]),
+                    Worklog.project_id.in_([p.id for p in projects])
+                )
+                touched = {WorklogDailyRollup.key_for(*row) for row in
+                           doomed.with_entities(Worklog.work_date, Worklog.user_id, Worklog.project_id)}
+                stats['deleted'] += doomed.delete(synchronize_session=False)
+                WorklogDailyRollup.refresh(touched)
+
+        for project in projects:
+            watermarks[project.id].advance(updated_until, deleted_until)
+
+    def _read_worklog_feed(self, endpoint: str, since: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Read every page of a worklog change feed.
+
+        Returns the feed entries and the ``until`` value to use as the next watermark.
+        """
+        entries = []
+        until = since
+        while True:
+            data = self.make_request(endpoint, params={'since': since}).json()
+            entries.extend(data.get('values', []))
+            until = max(until, int(data.get('until') or since))
+            if data.get('lastPage', True):
+                break
+            next_since = int(data.get('until') or since)
+            if next_since <= since:
+                break
+            since = next_since
+        return entries, until
+
+    def _fetch_worklogs_by_ids(self, worklog_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch full worklogs for the given ids (JIRA accepts at most 1000 per call)."""
+        worklogs = []
+        for i in range(0, len(worklog_ids), 1000):
+            # Read-only endpoint; JIRA only exposes it as POST because of the id list size
+            response = self.make_request(
+                '/rest/api/2/worklog/list',
+                method='POST',
+                json={'ids': [int(w) for w in worklog_ids[i:i + 1000]]}
+            )
+            worklogs.extend(response.json())
+        return worklogs
+
+    def _fetch_issues_by_ids(self, issue_ids: set) -> Dict[str, Dict[str, Any]]:
+        """Resolve JIRA issue ids to key, summary and project key.
+
+        Issues already known locally are served from the database; the rest are
+        looked up in JIRA in chunks.
+        """
+        issues = {}
+        if not issue_ids:
+            return issues
+
+        known = Issue.query.options(db.joinedload(Issue.project))\
+            .filter(Issue.jira_id.in_(list(issue_ids))).all()
+        for issue in known:
+            issues[issue.jira_id] = {
+                'id': issue.jira_id,
+                'key': issue.jira_key,
+                'summary': issue.summary,
+                'project_key': issue.project.jira_key if issue.project else None
+            }
+
+        missing = sorted(issue_ids - set(issues))
+        for i in range(0, len(missing), 100):
+            chunk = missing[i:i + 100]
+            found = self.jira.search_issues(
+                f"id in ({','.join(chunk)})",
+                fields=['summary', 'project'],
+                maxResults=len(chunk),
+                validate_query=False
+            )
+            for issue in found:
+                issues[str(issue.id)] = {
+                    'id': str(issue.id),
+                    'key': issue.key,
+                    'summary': issue.fields.summary,
+                    'project_key': issue.fields.project.key
+                }
+        return issues
+
     def sync_all(self) -> Tuple[bool, Dict[str, Any]]:
-        """Synchronize all data from JIRA."""
+        """Synchronize all data from JIRA.
+
+        Runs as a ``full`` sync run: each phase commits on its own and is
+        checkpointed, so re-running after a failure skips completed phases
+        and resumes the worklog phase at the last stored page.
+        """
+        from app.models.sync_run import SyncRun
+
         try:
             logger.info("Starting full JIRA synchronization")
             self.ensure_connected()
+            run = SyncRun.start('full')
             
             results = {
+                'run_id': run.id,
                 'users': None,
                 'projects': None,
                 'worklogs': None,
                 'errors': []
             }
             
-            # Sync users first
-            try:
-                results['users'] = self.sync_users()
-                logger.info("Users sync completed")
-            except Exception as e:
-                error_msg = f"Error syncing users: {str(e)}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
-            
-            # Then sync projects
-            try:
-                results['projects'] = self.sync_projects()
-                logger.info("Projects sync completed")
-            except Exception as e:
-                error_msg = f"Error syncing projects: {str(e)}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+            # Users first, then projects
+            for phase, sync in (('users', self.sync_users), ('projects', self.sync_projects)):
+                checkpoint = run.checkpoint(phase)
+                if checkpoint.status == 'done':
+                    logger.info(f"{phase.capitalize()} already synchronized in run {run.id}, skipping")
+                    results[phase] = {'resumed': True, 'total': checkpoint.processed}
+                    continue
+                try:
+                    results[phase] = sync()
+                    run.checkpoint(phase).complete(results[phase].get('total'))
+                    logger.info(f"{phase.capitalize()} sync completed")
+                except Exception as e:
+                    db.session.rollback()
+                    error_msg = f"Error syncing {phase}: {str(e)}"
+                    logger.error(error_msg)
+                    results['errors'].append(error_msg)
+                    run.checkpoint(phase).fail(error_msg)
+                db.session.commit()
             
             # Finally sync worklogs
             try:
-                results['worklogs'] = self.sync_worklogs()
+                results['worklogs'] = self.sync_worklogs(run=run)
                 logger.info("Worklogs sync completed")
             except Exception as e:
                 error_msg = f"Error syncing worklogs: {str(e)}"
@@ -665,6 +836,7 @@ class JiraService:
                 results['projects'] is not None,
                 results['worklogs'] is not None
             ])
+            run.finish(results, error='; '.join(results['errors']) or None)
             
             if success:
                 logger.info("Full sync completed successfully")
@@ -864,8 +1036,7 @@ def get_jira_users(start: int = 0, limit: int = 50) -> List[Dict]:
     try:
         users = []
         while True:
-            batch = requests.get(f"{jira_service.jira.server}/rest/api/2/user/search", params={'startAt': start, 'maxResults': limit})
-            batch.raise_for_status()
+            batch = jira_service.make_request('/rest/api/2/user/search', params={'startAt': start, 'maxResults': limit})
             batch_users = batch.json()['users']
             if not batch_users:
                 break
@@ -892,8 +1063,7 @@ def get_jira_user_groups(account_id: str) -> List[str]:
     """Pobiera grupy użytkownika z Jiry."""
     jira_service = get_jira_service()
     try:
-        groups = requests.get(f"{jira_service.jira.server}/rest/api/2/user/groups", params={'accountId': account_id})
-        groups.raise_for_status()
+        groups = jira_service.make_request('/rest/api/2/user/groups', params={'accountId': account_id})
         return [group['name'] for group in groups.json()['groups']]
     except Exception as e:
         logger.error(f"Failed to get user groups from Jira: {str(e)}")
@@ -971,7 +1141,6 @@ def sync_jira_users():
 
             for jira_user in users['values']:
                 try:
-                    from app.models.user import User
                     from app.models.role import Role
 
                     # Get or create user
@@ -1045,7 +1214,7 @@ def sync_jira_data():
         }
 
         # Get projects
-        response = requests.get(
+        response = get_jira_session().get(
             f"{jira.jira.server}/rest/api/2/project",
             headers=headers,
             verify=current_app.config.get('VERIFY_SSL', True)
@@ -1126,7 +1295,7 @@ def make_jira_request(url: str, method: str = 'GET', **kwargs) -> requests.Respo
         'Content-Type': 'application/json'
     }
     
-    return requests.request(
+    return get_jira_session().request(
         method='GET',  # Wymuszamy GET
         url=url,
         headers=headers,
@@ -1147,7 +1316,7 @@ def create_jira_client():
         logger.info(f"Environment variables: {dict(os.environ)}")
 
         # Dodaj więcej logowania
-        response = requests.get(
+        response = get_jira_session().get(
             current_app.config['JIRA_URL'],
             verify=options['verify'],
             timeout=options['timeout']
@@ -1,6 +1,7 @@
 from app.extensions import db
 from app.models import User, Project, WorkLog
 from jira import JIRA
+from app.services.jira_search import JqlIssueStream
 from datetime import datetime, timedelta
 import logging
 
@@ -72,7 +73,8 @@ class JiraSync:
         try:
             since = datetime.now() - timedelta(days=days_back)
             jql = f'worklogDate >= "{since.strftime("%Y-%m-%d")}"'
-            issues = self.jira_client.search_issues(jql, maxResults=False)
+            # Stream issues page by page rather than loading them all at once
+            issues = JqlIssueStream(self.jira_client, f'{jql} ORDER BY created ASC', fields=['summary'])
             
             for issue in issues:
                 worklogs = self.jira_client.worklogs(issue.id)
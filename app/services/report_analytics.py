@@ -0,0 +1,217 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+import logging
+from app.extensions import db
+from app.models.user import User
+from app.models.project import Project
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; ReportService falls back to the Python path
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+def columnar_available() -> bool:
+    """Check whether the columnar backend can be used."""
+    return np is not None
+
+
+def _as_date(value: Any) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class WorklogFrame:
+    """Columnar slice of worklog totals.
+
+    Rows are held as parallel NumPy arrays: ``days`` (date ordinals),
+    ``user_ids``, ``project_ids`` and ``seconds``. Issues are kept as
+    ``(issue_rows, issue_ids)`` pairs so a row may carry several distinct
+    issues; this makes raw worklogs (one issue per row) and rollup rows
+    (all issues of the day) the same shape.
+    """
+
+    def __init__(self, days, user_ids, project_ids, seconds, issue_rows, issue_ids):
+        self.days = np.asarray(days, dtype=np.int64)
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.project_ids = np.asarray(project_ids, dtype=np.int64)
+        self.seconds = np.asarray(seconds, dtype=np.float64)
+        self.issue_rows = np.asarray(issue_rows, dtype=np.int64)
+        self.issue_ids = np.asarray(issue_ids, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.days)
+
+    @classmethod
+    def from_rollup(cls, start_date: Any, end_date: Any) -> 'WorklogFrame':
+        """Load the ``worklog_daily_rollup`` rows of a date range."""
+        rows = db.session.query(
+            WorklogDailyRollup.work_date,
+            WorklogDailyRollup.user_id,
+            WorklogDailyRollup.project_id,
+            WorklogDailyRollup.time_spent_seconds,
+            WorklogDailyRollup.issue_ids
+        ).filter(
+            WorklogDailyRollup.work_date >= _as_date(start_date),
+            WorklogDailyRollup.work_date <= _as_date(end_date)
+        ).all()
+
+        issue_rows, issue_ids = [], []
+        for index, row in enumerate(rows):
+            if row.issue_ids:
+                ids = row.issue_ids.split(',')
+                issue_rows.extend([index] * len(ids))
+                issue_ids.extend(ids)
+
+        count = len(rows)
+        return cls(
+            np.fromiter((row.work_date.toordinal() for row in rows), dtype=np.int64, count=count),
+            np.fromiter((row.user_id for row in rows), dtype=np.int64, count=count),
+            np.fromiter((row.project_id for row in rows), dtype=np.int64, count=count),
+            np.fromiter((row.time_spent_seconds or 0 for row in rows), dtype=np.float64, count=count),
+            issue_rows,
+            np.array(issue_ids, dtype=np.int64)
+        )
+
+    def group_by(self, *columns: str) -> Tuple['np.ndarray', List['np.ndarray']]:
+        """Return the group index of every row and the key columns of every group."""
+        code = np.zeros(len(self), dtype=np.int64)
+        for column in columns:
+            uniques, inverse = _factorize(getattr(self, column))
+            # Re-densify after every column so the combined code never overflows
+            _, code = _factorize(code * len(uniques) + inverse)
+        first = np.zeros(int(code.max()) + 1 if len(code) else 0, dtype=np.int64)
+        first[code[::-1]] = np.arange(len(code) - 1, -1, -1)
+        return code, [getattr(self, column)[first] for column in columns]
+
+    def sum_seconds(self, group, size: int):
+        return np.bincount(group, weights=self.seconds, minlength=size)
+
+    def distinct_issues(self, group, size: int):
+        if not len(self.issue_ids):
+            return np.zeros(size, dtype=np.int64)
+        base = int(self.issue_ids.max()) + 1
+        pairs = np.sort(group[self.issue_rows] * base + self.issue_ids)
+        first = np.ones(len(pairs), dtype=bool)
+        first[1:] = pairs[1:] != pairs[:-1]
+        return np.bincount(pairs[first] // base, minlength=size)
+
+
+def _factorize(values) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Sorted unique values and the index of each value among them.
+
+    Ids, day ordinals and group codes are dense integers, so a lookup table
+    over their range avoids the sort ``np.unique`` needs.
+    """
+    if not len(values):
+        return values[:0], np.zeros(0, dtype=np.int64)
+    low, high = int(values.min()), int(values.max())
+    if high - low > 4 * len(values) + 1024:
+        return np.unique(values, return_inverse=True)
+    present = np.zeros(high - low + 1, dtype=bool)
+    present[values - low] = True
+    position = np.cumsum(present) - 1
+    return np.flatnonzero(present) + low, position[values - low]
+
+
+class ColumnarReportEngine:
+    """Vectorized implementation of the ``ReportService`` worklog reports.
+
+    Produces the same JSON shapes as ``generate_activity_report`` and
+    ``generate_project_report``. Enabled with
+    ``REPORT_ANALYTICS_BACKEND = 'numpy'``.
+    """
+
+    def __init__(self):
+        if not columnar_available():
+            raise RuntimeError("NumPy is required for the columnar report backend")
+
+    def activity_report(self, start_date: datetime, end_date: datetime, frame: Optional[WorklogFrame] = None,
+                        usernames: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
+        """Columnar counterpart of ``ReportService.generate_activity_report``."""
+        frame = frame if frame is not None else WorklogFrame.from_rollup(start_date, end_date)
+        group, (users, days) = frame.group_by('user_ids', 'days')
+        size = len(users)
+        hours = np.round(frame.sum_seconds(group, size) / 3600, 2)
+        tasks = frame.distinct_issues(group, size)
+
+        day_values, day_index = _factorize(days)
+        user_values, user_index = _factorize(users)
+        day_hours = np.bincount(day_index, weights=hours, minlength=len(day_values))
+        user_hours = np.bincount(user_index, weights=hours, minlength=len(user_values))
+        user_tasks = np.bincount(user_index, weights=tasks, minlength=len(user_values))
+
+        names = self._names(usernames, User, User.username, user_values, 'User')
+        day_labels = [date.fromordinal(int(d)).strftime('%Y-%m-%d') for d in day_values]
+        period = (end_date - start_date).days + 1
+
+        report = {
+            'daily_activity': {
+                label: {'total_hours': float(total), 'users': {}}
+                for label, total in zip(day_labels, day_hours.tolist())
+            },
+            'user_summary': {
+                names[i]: {
+                    'total_hours': float(user_hours[i]),
+                    'total_tasks': int(user_tasks[i]),
+                    'avg_daily_hours': float(user_hours[i]) / period
+                } for i in range(len(user_values))
+            },
+            'total_hours': float(hours.sum()),
+            'total_tasks': int(tasks.sum())
+        }
+        for day, user, group_hours, group_tasks in zip(day_index.tolist(), user_index.tolist(),
+                                                       hours.tolist(), tasks.tolist()):
+            report['daily_activity'][day_labels[day]]['users'][names[user]] = {
+                'hours': group_hours,
+                'tasks': int(group_tasks)
+            }
+        return report
+
+    def project_report(self, start_date: datetime, end_date: datetime, frame: Optional[WorklogFrame] = None,
+                       usernames: Optional[Dict[int, str]] = None,
+                       project_keys: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
+        """Columnar counterpart of ``ReportService.generate_project_report``."""
+        frame = frame if frame is not None else WorklogFrame.from_rollup(start_date, end_date)
+        group, (projects, users) = frame.group_by('project_ids', 'user_ids')
+        size = len(users)
+        seconds = frame.sum_seconds(group, size)
+        hours = np.round(seconds / 3600, 2)
+        tasks = frame.distinct_issues(group, size)
+
+        project_values, project_index = _factorize(projects)
+        user_values, user_index = _factorize(users)
+        project_hours = np.bincount(project_index, weights=hours, minlength=len(project_values))
+        project_tasks = np.bincount(project_index, weights=tasks, minlength=len(project_values))
+
+        user_names = self._names(usernames, User, User.username, user_values, 'User')
+        keys = self._names(project_keys, Project, Project.jira_key, project_values, 'Project')
+
+        report = {'projects': {}, 'total_hours': float(hours.sum()), 'total_tasks': int(tasks.sum())}
+        # Projects by key, users by hours descending
+        key_rank = np.argsort(np.array([keys[i] or '' for i in range(len(project_values))], dtype=object))
+        rank_of = np.empty_like(key_rank)
+        rank_of[key_rank] = np.arange(len(key_rank))
+        for i in np.lexsort((-seconds, rank_of[project_index])).tolist():
+            project = keys[project_index[i]]
+            if project not in report['projects']:
+                report['projects'][project] = {
+                    'total_hours': float(project_hours[project_index[i]]),
+                    'total_tasks': int(project_tasks[project_index[i]]),
+                    'users': {}
+                }
+            report['projects'][project]['users'][user_names[user_index[i]]] = {
+                'hours': float(hours[i]),
+                'tasks': int(tasks[i])
+            }
+        return report
+
+    @staticmethod
+    def _names(mapping: Optional[Dict[int, str]], model, column, ids, label: str) -> List[str]:
+        """Labels for the sorted unique ids, loading them in one query when not given."""
+        ids = ids.tolist()
+        if mapping is None:
+            mapping = dict(db.session.query(model.id, column).filter(model.id.in_(ids))) if ids else {}
+        return [mapping.get(i, f"{label} {i}") for i in ids]
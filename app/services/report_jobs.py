@@ -0,0 +1,233 @@
+from typing import Any, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import threading
+import time
+from flask import current_app
+from sqlalchemy import func, select, update
+from app.extensions import db
+from app.models.report import Report, ReportResult
+from app.models.worklog import Worklog
+from app.models.leave import Leave
+from app.models.leave_request import LeaveRequest
+from app.models.project_assignment import ProjectAssignment
+from app.models.team_membership import TeamMembership
+from app.models.user_availability import UserAvailability
+from app.models.user_role import UserRole
+from app.models.holiday import Holiday
+from app.models.team import Team
+from app.models.user import User
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+# Tables report data is computed from; any write to them changes the data version.
+# Each needs an ``updated_at`` column maintained on update.
+DATA_VERSION_MODELS = (Worklog, Leave, LeaveRequest, ProjectAssignment, TeamMembership,
+                       UserAvailability, UserRole, Holiday, Team, User, Project)
+
+
+def data_version() -> str:
+    """Digest of the row count and latest change of every report source table.
+
+    Inserts, updates (through ``updated_at``) and deletes all move it, so two
+    runs with the same version are guaranteed to see the same data. One
+    query, whatever the number of tables.
+    """
+    columns = []
+    for model in DATA_VERSION_MODELS:
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+    return hashlib.sha1(json.dumps(list(row), default=str).encode('utf-8')).hexdigest()
+
+
+def request_hash(report_type: str, params: Dict[str, Any], version: str) -> str:
+    """Identity of a report run: type, canonical parameters and data version."""
+    payload = json.dumps([report_type, params, version], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportJobQueue:
+    """Runs reports in the background and stores them on :class:`ReportResult`.
+
+    ``submit`` records a ``pending`` result and hands its id to the
+    configured backend (``REPORT_JOB_BACKEND``): a local thread pool, a
+    Celery worker, or the calling thread (``inline``). A request identical
+    to a pending, running or completed one - same type, parameters and data
+    version - reuses that result instead of computing the report again.
+    Clients poll ``/api/reports/results/<id>`` until the result finishes.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def job_timeout(self) -> timedelta:
+        return timedelta(seconds=current_app.config.get('REPORT_JOB_TIMEOUT', 3600))
+
+    def submit(self, report_type: str, params: Optional[Dict[str, Any]] = None, report_id: Optional[int] = None,
+               requested_by_id: Optional[int] = None, backend: Optional[str] = None) -> Tuple[ReportResult, bool]:
+        """Queue a report run; returns ``(result, reused)``."""
+        from app.services.report_service import REPORT_TYPES
+
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Unknown report type: {report_type}")
+        params = params or {}
+        self._expire_abandoned()
+
+        version = data_version()
+        digest = request_hash(report_type, params, version)
+        candidates = ReportResult.query.filter(
+            ReportResult.result_hash == digest,
+            ReportResult.status.in_(('pending', 'running', 'completed'))
+        ).order_by(ReportResult.id.desc()).all()
+        # An in-flight run first, then this report's own result, then anyone's
+        existing = (next((r for r in candidates if r.status != 'completed'), None)
+                    or next((r for r in candidates if r.report_id == report_id), None)
+                    or (candidates[0] if candidates else None))
+        if existing:
+            if existing.status != 'completed' or existing.report_id == report_id:
+                logger.info(f"Reusing report result {existing.id} ({existing.status}) for {report_type}")
+                return existing, True
+            # Same data for another report: share the payload, keep the report's own history
+            now = datetime.utcnow()
+            copy = ReportResult(
+                report_id=report_id, report_type=report_type, parameters=existing.parameters,
+                result_hash=digest, data_version=version, requested_by_id=requested_by_id,
+                status='completed', progress=100, result_blob=existing.result_blob,
+                result_data=existing.result_data, execution_date=now, started_at=now,
+                finished_at=now, execution_time=0
+            )
+            db.session.add(copy)
+            self._touch_report(report_id, now)
+            db.session.commit()
+            logger.info(f"Copied report result {existing.id} for report {report_id}")
+            return copy, True
+
+        result = ReportResult(
+            report_id=report_id,
+            report_type=report_type,
+            parameters=json.dumps(params, sort_keys=True, default=str),
+            result_hash=digest,
+            data_version=version,
+            requested_by_id=requested_by_id,
+            status='pending',
+            progress=0
+        )
+        db.session.add(result)
+        db.session.commit()
+        logger.info(f"Queued report result {result.id} ({report_type})")
+
+        result_id = result.id
+        self._dispatch(result_id, backend or current_app.config.get('REPORT_JOB_BACKEND', 'thread'))
+        return db.session.get(ReportResult, result_id), False
+
+    def _dispatch(self, result_id: int, backend: str) -> None:
+        if backend == 'inline':
+            self.execute(result_id)
+        elif backend == 'celery':
+            from app.tasks import generate_report_async
+            generate_report_async.delay(result_id)
+        else:
+            app = current_app._get_current_object()
+            self._get_executor(app).submit(self._execute_in_context, app, result_id)
+
+    def _get_executor(self, app) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=app.config.get('REPORT_JOB_WORKERS', 2),
+                    thread_name_prefix='report-job'
+                )
+            return self._executor
+
+    def _execute_in_context(self, app, result_id: int) -> None:
+        with app.app_context():
+            try:
+                self.execute(result_id)
+            except Exception as e:
+                logger.error(f"Report job {result_id} crashed: {str(e)}", exc_info=True)
+            finally:
+                db.session.remove()
+
+    def execute(self, result_id: int) -> Optional[ReportResult]:
+        """Compute a pending result; a result already claimed by another worker is left alone."""
+        from app.services.report_service import build_report_data
+
+        now = datetime.utcnow()
+        claimed = db.session.execute(
+            update(ReportResult)
+            .where(ReportResult.id == result_id, ReportResult.status == 'pending')
+            .values(status='running', started_at=now, progress=10)
+        ).rowcount
+        db.session.commit()
+        result = db.session.get(ReportResult, result_id)
+        if not claimed:
+            return result
+
+        try:
+            data = build_report_data(result.report_type, result.get_parameters())
+            self.set_progress(result, 90)
+            result.set_result(data)
+            self._touch_report(result.report_id, result.finished_at)
+            db.session.commit()
+            logger.info(f"Report result {result_id} completed in {result.execution_time:.2f}s")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Report result {result_id} failed: {str(e)}")
+            result = db.session.get(ReportResult, result_id)
+            result.set_error(str(e))
+            db.session.commit()
+        return result
+
+    @staticmethod
+    def set_progress(result: ReportResult, progress: int) -> None:
+        """Record progress so pollers see it while the job is still running."""
+        result.progress = progress
+        db.session.commit()
+
+    def wait(self, result_id: int, timeout: float, interval: float = 0.5) -> Optional[ReportResult]:
+        """Long-poll: return once the result has finished or ``timeout`` seconds passed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            result = db.session.get(ReportResult, result_id, populate_existing=True)
+            if result is None or result.is_finished or time.monotonic() >= deadline:
+                return result
+            db.session.rollback()  # end the read transaction so the next poll sees new commits
+            time.sleep(min(interval, max(0, deadline - time.monotonic())))
+
+    def _expire_abandoned(self) -> None:
+        """Fail jobs whose worker went away, so they are not reused forever."""
+        cutoff = datetime.utcnow() - self.job_timeout
+        expired = ReportResult.query.filter(
+            ReportResult.status.in_(('pending', 'running')),
+            ReportResult.execution_date < cutoff
+        ).all()
+        for result in expired:
+            result.set_error('Report job abandoned')
+        if expired:
+            db.session.commit()
+            logger.warning(f"Marked {len(expired)} abandoned report jobs as failed")
+
+    @staticmethod
+    def _touch_report(report_id: Optional[int], when: datetime) -> None:
+        if report_id:
+            report = db.session.get(Report, report_id)
+            if report:
+                report.last_run_at = when
+
+
+_queue = None
+
+
+def get_report_job_queue() -> ReportJobQueue:
+    """Return the process-wide report job queue."""
+    global _queue
+    if _queue is None:
+        _queue = ReportJobQueue()
+    return _queue
@@ -1,6 +1,8 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from app.models.worklog import Worklog
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.services.report_analytics import ColumnarReportEngine, columnar_available
 from app.database import get_db
 import logging
 from calendar import monthrange
@@ -12,9 +14,10 @@ from app.models.role import Role
 from app.models.project_assignment import ProjectAssignment
 from app.models.team import Team
 from app.models.team_membership import TeamMembership as TeamMember
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, cast
 from app.utils.date_helpers import get_date_range
 from app.cache import cache
+from app.utils.loaders import get_loader
 from app.monitoring import monitor, Monitor
 from app.exceptions import (
     AppError, ValidationError, ExportError, DatabaseError,
@@ -25,26 +28,22 @@ from app.models import Report, ReportResult, Leave, Portfolio
 logger = logging.getLogger(__name__)
 
 class ReportService:
+    @staticmethod
+    def _columnar_enabled() -> bool:
+        """Czy raporty mają być liczone silnikiem kolumnowym (REPORT_ANALYTICS_BACKEND)."""
+        return current_app.config.get('REPORT_ANALYTICS_BACKEND') == 'numpy' and columnar_available()
+
     @staticmethod
     def generate_activity_report(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Generuje raport aktywności użytkowników."""
         try:
-            db = get_db()
-            cursor = db.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    user_name,
-                    DATE(work_date) as date,
-                    SUM(time_spent) as hours,
-                    COUNT(DISTINCT issue_key) as tasks
-                FROM worklogs
-                WHERE work_date BETWEEN ? AND ?
-                GROUP BY user_name, DATE(work_date)
-                ORDER BY user_name, date
-            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
-            
-            results = cursor.fetchall()
+            if ReportService._columnar_enabled():
+                return ColumnarReportEngine().activity_report(start_date, end_date)
+
+            results = WorklogDailyRollup.summarize(start_date, end_date, group_by=('user_id', 'work_date'))
+            usernames = dict(db.session.query(User.id, User.username).filter(
+                User.id.in_({row['user_id'] for row in results})
+            ))
             
             report = {
                 'daily_activity': {},
@@ -54,10 +53,10 @@ class ReportService:
             }
             
             for row in results:
-                user = row['user_name']
-                date = row['date']
-                hours = row['hours']
-                tasks = row['tasks']
+                user = usernames.get(row['user_id'], f"User {row['user_id']}")
+                date = row['work_date'].strftime('%Y-%m-%d')
+                hours = round(row['time_spent_seconds'] / 3600, 2)
+                tasks = row['issue_count']
                 
                 # Daily activity
                 if date not in report['daily_activity']:
@@ -103,22 +102,17 @@ class ReportService:
     def generate_project_report(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Generuje raport projektów."""
         try:
-            db = get_db()
-            cursor = db.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    project_key,
-                    user_name,
-                    SUM(time_spent) as hours,
-                    COUNT(DISTINCT issue_key) as tasks
-                FROM worklogs
-                WHERE work_date BETWEEN ? AND ?
-                GROUP BY project_key, user_name
-                ORDER BY project_key, hours DESC
-            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
-            
-            results = cursor.fetchall()
+            if ReportService._columnar_enabled():
+                return ColumnarReportEngine().project_report(start_date, end_date)
+
+            results = WorklogDailyRollup.summarize(start_date, end_date, group_by=('project_id', 'user_id'))
+            usernames = dict(db.session.query(User.id, User.username).filter(
+                User.id.in_({row['user_id'] for row in results})
+            ))
+            project_keys = dict(db.session.query(Project.id, Project.jira_key).filter(
+                Project.id.in_({row['project_id'] for row in results})
+            ))
+            results.sort(key=lambda row: (project_keys.get(row['project_id']) or '', -row['time_spent_seconds']))
             
             report = {
                 'projects': {},
@@ -127,10 +121,10 @@ class ReportService:
             }
             
             for row in results:
-                project = row['project_key']
-                user = row['user_name']
-                hours = row['hours']
-                tasks = row['tasks']
+                project = project_keys.get(row['project_id'], f"Project {row['project_id']}")
+                user = usernames.get(row['user_id'], f"User {row['user_id']}")
+                hours = round(row['time_spent_seconds'] / 3600, 2)
+                tasks = row['issue_count']
                 
                 if project not in report['projects']:
                     report['projects'][project] = {
@@ -616,42 +610,56 @@ def get_workload_report(start_date=None, end_date=None, format='json'):
         raise ReportError(f"Failed to generate workload report: {str(e)}")
 
 def generate_report(report: Report) -> Optional[ReportResult]:
-    """Generate report based on type and parameters."""
+    """Generate report based on type and parameters.
+
+    Runs in the calling thread; an identical result (same type, parameters
+    and data version) is reused instead of being computed again.
+    """
+    from app.services.report_jobs import get_report_job_queue
     try:
-        result = ReportResult(
-            report_id=report.id,
-            status='running'
+        result, _ = get_report_job_queue().submit(
+            report.report_type, report.get_parameters(), report_id=report.id, backend='inline'
         )
-        db.session.add(result)
-        db.session.commit()
-
-        params = report.get_parameters()
-        report_data = None
-
-        if report.report_type == 'leave_usage':
-            report_data = generate_leave_usage_report(params)
-        elif report.report_type == 'team_availability':
-            report_data = generate_team_availability_report(params)
-        elif report.report_type == 'cost_tracking':
-            report_data = generate_cost_tracking_report(params)
-        elif report.report_type == 'project_allocation':
-            report_data = generate_project_allocation_report(params)
-        else:
-            result.set_error(f"Unknown report type: {report.report_type}")
-            db.session.commit()
-            return result
-
-        result.set_result(report_data)
-        db.session.commit()
         return result
-
     except Exception as e:
         logger.error(f"Error generating report: {str(e)}")
-        if result:
-            result.set_error(str(e))
-            db.session.commit()
         return None
 
+def build_report_data(report_type: str, params: Dict) -> Dict:
+    """Compute the data of a report type for the given parameters."""
+    if report_type == 'leave_usage':
+        return generate_leave_usage_report(params)
+    if report_type == 'team_availability':
+        return generate_team_availability_report(params)
+    if report_type == 'cost_tracking':
+        return generate_cost_tracking_report(params)
+    if report_type == 'project_allocation':
+        return generate_project_allocation_report(params)
+    if report_type in TEAM_REPORT_TYPES:
+        return generate_team_report(report_type, params)
+    raise ValueError(f"Unknown report type: {report_type}")
+
+# Team reports exported through app.utils.export
+TEAM_REPORT_TYPES = ('team_workload', 'team_activity', 'team_efficiency')
+
+REPORT_TYPES = ('leave_usage', 'team_availability', 'cost_tracking', 'project_allocation') + TEAM_REPORT_TYPES
+
+def generate_team_report(report_type: str, params: Dict) -> Dict:
+    """Generate a team workload, activity or efficiency report."""
+    team = db.session.get(Team, int(params['team_id']))
+    if not team:
+        raise ResourceNotFoundError(f"Team {params['team_id']} not found", {'entity': 'Team'})
+    start_date = datetime.strptime(params['start_date'][:10], '%Y-%m-%d')
+    end_date = datetime.strptime(params['end_date'][:10], '%Y-%m-%d')
+    method = getattr(team, f"get_{report_type[len('team_'):]}")
+    return method(start_date, end_date)
+
+def _leave_days():
+    """SQL counterpart of ``Leave.duration``: whole days from start to end, inclusive."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.floor(func.extract('epoch', Leave.end_date - Leave.start_date) / 86400) + 1
+    return cast(func.julianday(Leave.end_date) - func.julianday(Leave.start_date), db.Integer) + 1
+
 def generate_leave_usage_report(params: Dict) -> Dict:
     """Generate leave usage report."""
     try:
@@ -662,7 +670,7 @@ def generate_leave_usage_report(params: Dict) -> Dict:
         query = db.session.query(
             Leave.user_id,
             Leave.leave_type,
-            func.sum(Leave.duration).label('total_days')
+            func.sum(_leave_days()).label('total_days')
         ).filter(Leave.status == 'approved')
 
         if start_date:
@@ -670,18 +678,17 @@ def generate_leave_usage_report(params: Dict) -> Dict:
         if end_date:
             query = query.filter(Leave.end_date <= end_date)
         if team_id:
-            query = query.join(User).filter(User.team_id == team_id)
+            query = query.join(TeamMember, TeamMember.user_id == Leave.user_id).filter(TeamMember.team_id == team_id)
 
         results = query.group_by(Leave.user_id, Leave.leave_type).all()
+        users = get_loader().load_many(User, (user_id for user_id, _, _ in results))
 
         # Process results
         leave_usage = {}
         for user_id, leave_type, total_days in results:
-            user = User.query.get(user_id)
+            user = users.get(user_id)
             if user:
-                if user.username not in leave_usage:
-                    leave_usage[user.username] = {}
-                leave_usage[user.username][leave_type] = float(total_days)
+                leave_usage.setdefault(user.username, {})[leave_type] = float(total_days)
 
         return {
             'leave_usage': leave_usage,
@@ -702,23 +709,26 @@ def generate_team_availability_report(params: Dict) -> Dict:
         end_date = datetime.strptime(params.get('end_date', ''), '%Y-%m-%d') if params.get('end_date') else None
         team_id = params.get('team_id')
 
-        # Get all approved leaves in the period
-        leaves_query = Leave.query.filter(Leave.status == 'approved')
+        # Approved leaves overlapping the period
+        leave_criteria = [Leave.status == 'approved']
         if start_date:
-            leaves_query = leaves_query.filter(Leave.end_date >= start_date)
+            leave_criteria.append(Leave.end_date >= start_date)
         if end_date:
-            leaves_query = leaves_query.filter(Leave.start_date <= end_date)
+            leave_criteria.append(Leave.start_date <= end_date)
 
         # Get team members
-        team_members = User.query.filter_by(team_id=team_id).all() if team_id else User.query.all()
+        loader = get_loader()
+        if team_id:
+            member_ids = [m.user_id for m in db.session.query(TeamMember.user_id).filter_by(team_id=team_id)]
+            team_members = [u for u in loader.load_many(User, member_ids).values() if u]
+        else:
+            team_members = User.query.all()
+        leaves_by_user = loader.load_grouped(Leave.user_id, [user.id for user in team_members], *leave_criteria)
 
+        total_days = (end_date - start_date).days + 1 if start_date and end_date else 0
         availability = {}
         for user in team_members:
-            user_leaves = leaves_query.filter(Leave.user_id == user.id).all()
-            
-            # Calculate availability
-            total_days = (end_date - start_date).days + 1 if start_date and end_date else 0
-            leave_days = sum(leave.duration for leave in user_leaves)
+            leave_days = sum(leave.duration for leave in leaves_by_user.get(user.id, ()))
             
             availability[user.username] = {
                 'total_days': total_days,
@@ -754,7 +764,7 @@ def generate_cost_tracking_report(params: Dict) -> Dict:
             Worklog.project_id,
             Role.name.label('role_name'),
             Role.hourly_rate,
-            func.sum(Worklog.hours_spent).label('total_hours')
+            (func.sum(Worklog.time_spent_seconds) / 3600.0).label('total_hours')
         ).join(
             UserRole, UserRole.user_id == Worklog.user_id
         ).join(
@@ -762,9 +772,9 @@ def generate_cost_tracking_report(params: Dict) -> Dict:
         )
 
         if start_date:
-            query = query.filter(Worklog.date >= start_date)
+            query = query.filter(Worklog.work_date >= start_date)
         if end_date:
-            query = query.filter(Worklog.date <= end_date)
+            query = query.filter(Worklog.work_date < end_date + timedelta(days=1))
         if project_id:
             query = query.filter(Worklog.project_id == project_id)
 
@@ -773,11 +783,12 @@ def generate_cost_tracking_report(params: Dict) -> Dict:
             Role.name,
             Role.hourly_rate
         ).all()
+        projects = get_loader().load_many(Project, (row.project_id for row in results))
 
         # Process results
         cost_tracking = {}
         for project_id, role_name, hourly_rate, total_hours in results:
-            project = Project.query.get(project_id)
+            project = projects.get(project_id)
             if project:
                 if project.name not in cost_tracking:
                     cost_tracking[project.name] = {
@@ -785,10 +796,10 @@ def generate_cost_tracking_report(params: Dict) -> Dict:
                         'roles': {}
                     }
                 
-                role_cost = float(hourly_rate) * float(total_hours)
+                role_cost = float(hourly_rate or 0) * float(total_hours)
                 cost_tracking[project.name]['roles'][role_name] = {
                     'hours': float(total_hours),
-                    'rate': float(hourly_rate),
+                    'rate': float(hourly_rate or 0),
                     'cost': role_cost
                 }
                 cost_tracking[project.name]['total_cost'] += role_cost
@@ -0,0 +1,305 @@
+from typing import Any, Dict, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import socket
+import threading
+from flask import current_app
+from app.extensions import db
+from app.models.sync_job import SyncJob, SyncLease
+from app.models.sync_run import SyncRun
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'jira_sync'
+
+# The only place JIRA sync schedules are defined; APScheduler or Celery beat
+# (see SYNC_SCHEDULER) register exactly these.
+SYNC_SCHEDULE = {
+    'worklogs': {'trigger': 'interval', 'minutes': 30},
+    'full': {'trigger': 'cron', 'hour': '*/4'},
+    'users': {'trigger': 'cron', 'hour': 0},
+    'projects': {'trigger': 'cron', 'hour': 1},
+}
+
+SYNC_KINDS = tuple(SYNC_SCHEDULE)
+
+# Worklog bootstrap range of a sync without an explicit days_back (also used by full syncs)
+DEFAULT_DAYS_BACK = 30
+
+
+class SyncCoordinator:
+    """Single entry point for running JIRA synchronizations.
+
+    Every trigger (scheduler, Celery, admin endpoint) enqueues a
+    :class:`SyncJob`. Jobs are executed one at a time by whichever process
+    holds the ``jira_sync`` database lease, so gunicorn workers and Celery
+    can't run overlapping syncs against JIRA and SQLite. A trigger for a
+    sync that is already queued is coalesced into the queued job, which
+    takes over the longer ``days_back`` of the two.
+    """
+
+    def __init__(self):
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self._drain_lock = threading.Lock()
+        self._worker = None
+
+    @property
+    def lease_ttl(self) -> timedelta:
+        return timedelta(seconds=current_app.config.get('SYNC_LEASE_SECONDS', 7200))
+
+    @property
+    def heartbeat_interval(self) -> float:
+        return (current_app.config.get('SYNC_LEASE_HEARTBEAT_SECONDS')
+                or self.lease_ttl.total_seconds() / 3)
+
+    def enqueue(self, kind: str, trigger: str = 'admin', requested_by_id: Optional[int] = None,
+                **parameters) -> Tuple[SyncJob, bool]:
+        """Queue a sync; returns ``(job, coalesced)``."""
+        if kind not in SYNC_KINDS:
+            raise ValueError(f"Unknown sync kind: {kind}")
+
+        # A queued job of the same kind, or a queued full sync, may already cover this request
+        for queued in SyncJob.query.filter(
+            SyncJob.status == 'queued',
+            SyncJob.kind.in_({kind, 'full'})
+        ).order_by(SyncJob.id):
+            if queued.kind == kind:
+                merged = _merge_parameters(queued.get_parameters(), parameters)
+                if merged is None:
+                    continue
+                queued.parameters = json.dumps(merged) if merged else None
+            elif not _covered_by_full(parameters):
+                continue
+            queued.coalesced_count = (queued.coalesced_count or 0) + 1
+            db.session.commit()
+            logger.info(f"Coalesced {trigger} {kind} sync into queued job {queued.id}")
+            return queued, True
+
+        job = SyncJob(
+            kind=kind,
+            trigger=trigger,
+            requested_by_id=requested_by_id,
+            parameters=json.dumps(parameters) if parameters else None
+        )
+        db.session.add(job)
+
+        if kind == 'full':
+            # A full sync subsumes every narrower job still waiting
+            narrower = [other for other in SyncJob.query.filter(SyncJob.status == 'queued', SyncJob.kind != 'full')
+                        if _covered_by_full(other.get_parameters())]
+            for other in narrower:
+                other.status = 'coalesced'
+                other.finished_at = datetime.utcnow()
+            job.coalesced_count = len(narrower)
+
+        db.session.commit()
+        logger.info(f"Queued {kind} sync job {job.id} ({trigger})")
+        return job, False
+
+    def drain(self) -> int:
+        """Run queued jobs while holding the lease; returns how many ran.
+
+        Caches are warmed once the queue is empty, after the lease is given
+        up, so syncs queued meanwhile can start in any process.
+        """
+        if not self._drain_lock.acquire(blocking=False):
+            return 0
+        try:
+            if not SyncLease.acquire(LEASE_NAME, self.owner, self.lease_ttl):
+                logger.info("JIRA sync lease held by another process, leaving queue to it")
+                return 0
+            try:
+                processed, completed = self._drain_queue()
+            finally:
+                SyncLease.release(LEASE_NAME, self.owner)
+        finally:
+            self._drain_lock.release()
+
+        if completed:
+            self._warm_caches()
+        return processed
+
+    def _drain_queue(self) -> Tuple[int, int]:
+        # Whoever held the lease before us is gone; its running jobs never finished
+        SyncJob.query.filter_by(status='running').update({'status': 'queued'}, synchronize_session=False)
+        db.session.commit()
+
+        processed = completed = 0
+        while True:
+            job = SyncJob.query.filter_by(status='queued').order_by(SyncJob.id).first()
+            if job is None:
+                return processed, completed
+
+            if not SyncLease.acquire(LEASE_NAME, self.owner, self.lease_ttl):  # renew for this job
+                logger.warning(f"JIRA sync lease lost before job {job.id}, leaving the queue to its new holder")
+                db.session.rollback()
+                return processed, completed
+            job.status = 'running'
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+
+            job_id = job.id
+            try:
+                with self._heartbeat() as lease_lost:
+                    result = self._execute(job)
+                job.status = 'completed'
+                job.result = json.dumps(result, default=str)
+                completed += 1
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Sync job {job_id} ({job.kind}) failed: {str(e)}")
+                job = db.session.get(SyncJob, job_id)
+                job.status = 'failed'
+                job.error_message = str(e)
+
+            latest_run = SyncRun.latest(job.kind)
+            if latest_run and latest_run.heartbeat_at and latest_run.heartbeat_at >= job.started_at:
+                job.run_id = latest_run.id
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            processed += 1
+
+            if lease_lost.is_set():
+                logger.warning(f"JIRA sync lease lost while job {job_id} ran, stopping the drain")
+                return processed, completed
+
+    @contextmanager
+    def _heartbeat(self) -> Iterator[threading.Event]:
+        """Keep renewing the lease from a background thread while a job runs.
+
+        Yields an event that is set once the lease is found held by another
+        process. Errors while renewing are logged and the next beat retries.
+        """
+        app = current_app._get_current_object()
+        interval = self.heartbeat_interval
+        ttl = self.lease_ttl
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            with app.app_context():
+                try:
+                    while not stop.wait(interval):
+                        try:
+                            renewed = SyncLease.acquire(LEASE_NAME, self.owner, ttl)
+                        except Exception as e:
+                            # Transient (e.g. "database is locked" while the sync writes); retry next beat
+                            logger.error(f"Error renewing JIRA sync lease: {str(e)}")
+                            db.session.rollback()
+                            continue
+                        if not renewed:
+                            logger.error(f"JIRA sync lease taken over from {self.owner} during a running job")
+                            lost.set()
+                            return
+                finally:
+                    db.session.remove()
+
+        thread = threading.Thread(target=beat, name='jira-sync-lease-heartbeat', daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
+
+    @staticmethod
+    def _warm_caches() -> None:
+        """Precompute the popular dashboards once the queued syncs have written their data."""
+        from app.services.cache_warmup import get_cache_warmer
+
+        try:
+            get_cache_warmer().warm()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Cache warm-up after sync failed: {str(e)}", exc_info=True)
+
+    def _execute(self, job: SyncJob) -> Dict[str, Any]:
+        from app.services.jira_service import get_jira_service
+
+        jira_service = get_jira_service()
+        if not jira_service or not jira_service.is_configured:
+            raise ValueError("JIRA is not configured")
+
+        parameters = job.get_parameters()
+        if job.kind == 'full':
+            success, results = jira_service.sync_all()
+            if not success:
+                raise RuntimeError('; '.join(results.get('errors') or [results.get('error', 'Synchronization failed')]))
+            return results
+        if job.kind == 'users':
+            return jira_service.sync_users()
+        if job.kind == 'projects':
+            return jira_service.sync_projects()
+        return jira_service.sync_worklogs(days_back=parameters.get('days_back', DEFAULT_DAYS_BACK))
+
+    def run_scheduled(self, kind: str, trigger: str = 'schedule') -> None:
+        """Scheduler entry point: queue ``kind`` and work the queue in this thread."""
+        self.enqueue(kind, trigger=trigger)
+        self.drain()
+
+    def start_worker(self, app=None) -> None:
+        """Work the queue in a background thread of this process."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        app = app or current_app._get_current_object()
+
+        def work():
+            with app.app_context():
+                try:
+                    self.drain()
+                except Exception as e:
+                    logger.error(f"JIRA sync worker failed: {str(e)}", exc_info=True)
+                finally:
+                    db.session.remove()
+
+        self._worker = threading.Thread(target=work, name='jira-sync-worker', daemon=True)
+        self._worker.start()
+
+    def status(self) -> Dict[str, Any]:
+        """Queue and lease state for the admin status endpoint."""
+        lease = SyncLease.holder(LEASE_NAME)
+        return {
+            'lease': {
+                'owner': lease.owner,
+                'expires_at': lease.expires_at.isoformat()
+            } if lease else None,
+            'queued': [j.to_dict() for j in SyncJob.query.filter_by(status='queued').order_by(SyncJob.id)],
+            'running': [j.to_dict() for j in SyncJob.query.filter_by(status='running').order_by(SyncJob.id)]
+        }
+
+
+def _merge_parameters(queued: Dict[str, Any], requested: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parameters of a queued job that also covers ``requested``, or None if it can't.
+
+    The longer ``days_back`` wins; any other parameter has to match.
+    """
+    merged = dict(queued)
+    for name, value in requested.items():
+        if name == 'days_back':
+            merged[name] = max(value, queued.get(name, DEFAULT_DAYS_BACK))
+        elif name in queued and queued[name] != value:
+            return None
+        else:
+            merged[name] = value
+    if any(name not in requested for name in queued if name != 'days_back'):
+        return None
+    return merged
+
+
+def _covered_by_full(parameters: Dict[str, Any]) -> bool:
+    """Whether a full sync, which runs with default parameters, does everything ``parameters`` ask for."""
+    return all(name == 'days_back' and value <= DEFAULT_DAYS_BACK for name, value in parameters.items())
+
+
+_coordinator = None
+
+
+def get_sync_coordinator() -> SyncCoordinator:
+    """Return the process-wide coordinator."""
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = SyncCoordinator()
+    return _coordinator
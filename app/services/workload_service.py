@@ -0,0 +1,184 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from collections import defaultdict
+import logging
+from sqlalchemy import func
+from app.extensions import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.team_membership import TeamMembership
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.services.business_calendar import get_business_calendar
+
+logger = logging.getLogger(__name__)
+
+# Chart colors; the first one is reserved for the "All Teams" bar
+WORKLOAD_COLORS = ['#4e73df', '#1cc88a', '#36b9cc', '#f6c23e', '#e74a3b', '#858796', '#5a5c69',
+                   '#4d5c68', '#3e5c76', '#2e5984', '#1e5f8f', '#0f639a', '#0068a5', '#006db0']
+
+# Note: Using hardcoded 8 hour workday - in future versions this should be replaced with user-specific work norms
+WORKDAY_HOURS = 8
+
+
+class WorkloadReport:
+    """Team and user workload series for the admin workload report.
+
+    Everything is computed from two queries: per (user, project) totals from
+    ``worklog_daily_rollup`` for the filtered range, and the team memberships.
+    Team and user totals, project counts and utilization are then folded
+    from those rows in memory, with the working day count computed once.
+    """
+
+    def __init__(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                 team_id: Optional[str] = None, project_ids: Optional[List[str]] = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.team_id = int(team_id) if team_id else None
+        self.project_ids = [int(pid) for pid in project_ids] if project_ids and project_ids[0] != '' else None
+
+    def compute(self) -> Dict[str, Any]:
+        """Return ``team_workload``, ``user_workload``, ``detailed_stats`` and ``date_info``."""
+        user_rows = self._user_project_totals()
+        teams = self._teams()
+
+        has_range = bool(self.start_date and self.end_date)
+        period_days = (self.end_date - self.start_date).days + 1 if has_range else 0
+        working_days = get_business_calendar().working_days(self.start_date, self.end_date) if has_range else 0
+
+        # Per-user totals, restricted to active users (and the selected team's members)
+        selected = teams.get(self.team_id) if self.team_id else None
+        users = {}
+        for row in user_rows:
+            if not row.is_active or (selected is not None and row.user_id not in selected['members']):
+                continue
+            user = users.setdefault(row.user_id, {'name': row.display_name, 'seconds': 0, 'projects': set()})
+            user['seconds'] += row.seconds
+            user['projects'].add(row.project_id)
+
+        # Per-team totals over every member's rows
+        rows_by_user = defaultdict(list)
+        for row in user_rows:
+            rows_by_user[row.user_id].append(row)
+        team_results = []
+        for team_id, team in sorted(teams.items()):
+            if not team['is_active'] or (self.team_id and team_id != self.team_id):
+                continue
+            seconds, projects = 0, set()
+            for member_id in team['members']:
+                for row in rows_by_user.get(member_id, ()):
+                    seconds += row.seconds
+                    projects.add(row.project_id)
+            if projects:
+                team_results.append({'id': team_id, 'name': team['name'], 'seconds': seconds,
+                                     'projects_count': len(projects), 'active_members': team['active_members']})
+
+        team_workload = self._series('Team Hours')
+        user_workload = self._series('User Hours')
+        detailed_stats = []
+
+        def avg_daily(hours):
+            return round(hours / period_days, 2) if has_range else 0
+
+        def utilization(hours, people):
+            capacity = WORKDAY_HOURS * working_days * people
+            return min(round((hours / capacity) * 100, 2) if has_range and capacity > 0 else 0, 100)
+
+        # Add "All Teams" entry if we have multiple teams
+        if len(team_results) > 1 or not self.team_id:
+            total_team_hours = sum(team['seconds'] for team in team_results) / 3600
+            self._add_bar(team_workload, "All Teams", round(total_team_hours, 2), WORKLOAD_COLORS[0])
+            detailed_stats.append({
+                'name': "All Teams",
+                'total_hours': round(total_team_hours, 2),
+                'projects_count': sum(team['projects_count'] for team in team_results),
+                'avg_daily_hours': avg_daily(total_team_hours),
+                'utilization': utilization(total_team_hours, len(users))
+            })
+
+        for i, team in enumerate(team_results):
+            team_hours = round(team['seconds'] / 3600, 2)
+            self._add_bar(team_workload, team['name'], team_hours, WORKLOAD_COLORS[(i + 1) % len(WORKLOAD_COLORS)])
+            detailed_stats.append({
+                'name': team['name'],
+                'total_hours': team_hours,
+                'projects_count': team['projects_count'],
+                'avg_daily_hours': avg_daily(team_hours),
+                'utilization': utilization(team_hours, max(1, team['active_members']))
+            })
+
+        for i, (user_id, user) in enumerate(sorted(users.items())):
+            user_name = user['name'] or f"User {user_id}"
+            user_hours = round(user['seconds'] / 3600, 2)
+            self._add_bar(user_workload, user_name, user_hours, WORKLOAD_COLORS[i % len(WORKLOAD_COLORS)])
+            detailed_stats.append({
+                'name': user_name,
+                'total_hours': user_hours,
+                'projects_count': len(user['projects']),
+                'avg_daily_hours': avg_daily(user_hours),
+                'utilization': utilization(user_hours, 1)
+            })
+
+        # Sort detailed stats by total hours
+        detailed_stats.sort(key=lambda x: x['total_hours'], reverse=True)
+
+        return {
+            'team_workload': team_workload,
+            'user_workload': user_workload,
+            'detailed_stats': detailed_stats,
+            'date_info': {
+                'start_date': self.start_date.strftime('%Y-%m-%d') if self.start_date else None,
+                'end_date': self.end_date.strftime('%Y-%m-%d') if self.end_date else None,
+                'days': period_days
+            }
+        }
+
+    def _user_project_totals(self):
+        """One scan of the rollup: seconds per (user, project) in the filtered range."""
+        query = db.session.query(
+            WorklogDailyRollup.user_id,
+            WorklogDailyRollup.project_id,
+            func.sum(WorklogDailyRollup.time_spent_seconds).label('seconds'),
+            User.display_name,
+            User.is_active
+        ).join(
+            User, User.id == WorklogDailyRollup.user_id
+        )
+        if self.start_date:
+            query = query.filter(WorklogDailyRollup.work_date >= self.start_date.date())
+        if self.end_date:
+            query = query.filter(WorklogDailyRollup.work_date <= self.end_date.date())
+        if self.project_ids:
+            query = query.filter(WorklogDailyRollup.project_id.in_(self.project_ids))
+        return query.group_by(WorklogDailyRollup.user_id, WorklogDailyRollup.project_id).all()
+
+    def _teams(self) -> Dict[int, Dict[str, Any]]:
+        """Teams with their member ids, in one query."""
+        query = db.session.query(
+            Team.id, Team.name, Team.is_active, TeamMembership.user_id, User.is_active.label('user_active')
+        ).outerjoin(
+            TeamMembership, TeamMembership.team_id == Team.id
+        ).outerjoin(
+            User, User.id == TeamMembership.user_id
+        )
+        if self.team_id:
+            query = query.filter(Team.id == self.team_id)
+
+        teams = {}
+        for row in query:
+            team = teams.setdefault(row.id, {'name': row.name, 'is_active': row.is_active,
+                                             'members': set(), 'active_members': 0})
+            if row.user_id is not None:
+                team['members'].add(row.user_id)
+                if row.user_active:
+                    team['active_members'] += 1
+        return teams
+
+    @staticmethod
+    def _series(label: str) -> Dict[str, Any]:
+        return {'labels': [], 'datasets': [{'label': label, 'data': [], 'backgroundColor': []}]}
+
+    @staticmethod
+    def _add_bar(series: Dict[str, Any], label: str, value: float, color: str) -> None:
+        series['labels'].append(label)
+        series['datasets'][0]['data'].append(value)
+        series['datasets'][0]['backgroundColor'].append(color)
@@ -0,0 +1,119 @@
+from typing import Any, Iterator, Optional, Sequence
+from datetime import datetime, timedelta
+import csv
+import io
+import os
+import tempfile
+import zlib
+import logging
+from sqlalchemy import select
+from app.extensions import db
+from app.models.worklog import Worklog
+from app.models.project import Project
+from app.models.user import User
+from app.models.issue import Issue
+
+logger = logging.getLogger(__name__)
+
+EXPORT_HEADERS = ['Projekt', 'Użytkownik', 'Zadanie', 'Czas (h)', 'Data', 'Komentarz']
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_worklog_rows(start_date: datetime, end_date: datetime, user_id: Optional[int] = None,
+                      project_key: Optional[str] = None,
+                      chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Sequence[Any]]:
+    """Yield export rows for the range straight from a server-side cursor.
+
+    Rows come out in ``EXPORT_HEADERS`` order and are never collected, so
+    memory stays bounded by ``chunk_size`` whatever the range.
+    """
+    stmt = select(
+        Project.jira_key,
+        db.func.coalesce(User.display_name, User.username),
+        Issue.jira_key,
+        Worklog.time_spent_seconds,
+        Worklog.work_date,
+        Worklog.description
+    ).join(
+        Project, Project.id == Worklog.project_id
+    ).join(
+        User, User.id == Worklog.user_id
+    ).join(
+        Issue, Issue.id == Worklog.issue_id
+    ).where(
+        Worklog.work_date >= start_date,
+        Worklog.work_date < end_date + timedelta(days=1)
+    ).order_by(Worklog.work_date, Worklog.id)
+    if user_id is not None:
+        stmt = stmt.where(Worklog.user_id == user_id)
+    if project_key:
+        stmt = stmt.where(Project.jira_key == project_key)
+
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+    try:
+        for project, author, issue, seconds, work_date, comment in result:
+            yield (project or '', author or '', issue or '', round((seconds or 0) / 3600, 2),
+                   work_date.strftime('%Y-%m-%d') if work_date else '', comment or '')
+    finally:
+        result.close()
+
+
+def stream_csv(rows: Iterator[Sequence[Any]], compress: bool = False,
+               chunk_size: int = EXPORT_CHUNK_SIZE,
+               headers: Sequence[str] = EXPORT_HEADERS) -> Iterator[bytes]:
+    """Encode rows as CSV in chunks of ``chunk_size`` rows, optionally gzipped.
+
+    ``headers`` is the first row; it defaults to the worklog export columns.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # gzip container (wbits 16 + 15) so the stream is a regular .gz file
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def flush() -> bytes:
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    # BOM so Excel opens the UTF-8 file with Polish characters intact
+    buffer.write('\ufeff')
+    writer.writerow(headers)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % chunk_size == 0:
+            chunk = flush()
+            if chunk:
+                yield chunk
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def write_xlsx(rows: Iterator[Sequence[Any]], directory: Optional[str] = None) -> str:
+    """Write rows to a temporary XLSX file and return its path.
+
+    xlsxwriter's ``constant_memory`` mode flushes every row to disk as soon
+    as the next one starts, so only the current row is held in memory. The
+    caller is responsible for removing the file.
+    """
+    import xlsxwriter
+
+    handle, path = tempfile.mkstemp(suffix='.xlsx', dir=directory)
+    os.close(handle)
+    try:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'tmpdir': directory})
+        worksheet = workbook.add_worksheet()
+        for col, header in enumerate(EXPORT_HEADERS):
+            worksheet.write(0, col, header)
+        for row_index, row in enumerate(rows, 1):
+            worksheet.write_row(row_index, 0, row)
+        workbook.close()
+    except Exception:
+        os.remove(path)
+        raise
+    return path
@@ -0,0 +1,329 @@
+from typing import Dict, List, Any, Optional, Iterable
+from datetime import datetime
+import logging
+import time
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects import sqlite, postgresql
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.user import User
+from app.models.role import Role
+from app.models.issue import Issue
+from app.models.worklog import Worklog
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.models.cache_tags import note_cache_tags, rollup_key_tags
+
+logger = logging.getLogger(__name__)
+
+# Columns overwritten when a worklog already exists locally
+UPSERT_COLUMNS = (
+    'issue_id', 'user_id', 'project_id', 'time_spent_seconds',
+    'work_date', 'description', 'updated_at', 'last_sync'
+)
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+LOOKUP_BATCH = 500
+
+
+def _batched(values: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class WorklogIngestor:
+    """Batched writer for JIRA worklogs.
+
+    Instead of querying users, issues and worklogs row by row, a batch of raw
+    JIRA worklogs is resolved against identity maps loaded with a handful of
+    IN queries and then written with ``INSERT ... ON CONFLICT(jira_worklog_id)
+    DO UPDATE`` in chunks of ``WORKLOG_UPSERT_CHUNK_SIZE`` rows.
+
+    The ``worklog_daily_rollup`` rows of every day a chunk touches are
+    recomputed in the same savepoint, and their cache tags are queued for
+    invalidation on commit, since these bulk statements bypass the session's
+    flush listeners.
+
+    Each entry passed to :meth:`ingest` is a dict with keys ``worklog`` (raw
+    JIRA JSON), ``issue_id`` (JIRA issue id), ``issue_key``, ``issue_summary``
+    and ``project_id`` (local project id).
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        if chunk_size is None:
+            chunk_size = current_app.config.get('WORKLOG_UPSERT_CHUNK_SIZE', 500)
+        self.chunk_size = max(1, int(chunk_size))
+
+    def ingest(self, entries: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+        """Resolve and upsert a batch of worklogs, updating ``stats`` in place."""
+        stats.setdefault('chunks', [])
+        if not entries:
+            return
+
+        # Last occurrence wins when JIRA returns the same worklog twice
+        entries = list({str(e['worklog']['id']): e for e in entries}.values())
+
+        users = self._resolve_users([e['worklog'].get('author') or {} for e in entries])
+        issues = self._resolve_issues(entries)
+        existing = self._existing_worklog_ids([str(e['worklog']['id']) for e in entries])
+
+        now = datetime.utcnow()
+        rows = []
+        for entry in entries:
+            raw = entry['worklog']
+            try:
+                rows.append({
+                    'jira_worklog_id': str(raw['id']),
+                    'issue_id': issues[entry['issue_key']].id,
+                    'user_id': users[self._author_key(raw.get('author') or {})].id,
+                    'project_id': entry['project_id'],
+                    'time_spent_seconds': raw['timeSpentSeconds'],
+                    'work_date': datetime.strptime(raw['started'][:10], '%Y-%m-%d'),
+                    'description': raw.get('comment') or '',
+                    'created_at': now,
+                    'updated_at': now,
+                    'last_sync': now
+                })
+            except Exception as e:
+                error_msg = f"Error processing worklog {raw.get('id')} for issue {entry.get('issue_key')}: {str(e)}"
+                logger.error(error_msg)
+                stats['errors'] += 1
+                stats['error_messages'].append(error_msg)
+
+        for chunk in _batched(rows, self.chunk_size):
+            started = time.perf_counter()
+            try:
+                # A savepoint per chunk keeps one bad chunk from discarding the rest of the run
+                with db.session.begin_nested():
+                    # Days the updated worklogs are moving away from need recomputing too
+                    touched = WorklogDailyRollup.keys_for_worklogs(
+                        [existing[row['jira_worklog_id']] for row in chunk if existing.get(row['jira_worklog_id'])]
+                    )
+                    self._upsert(chunk, existing)
+                    touched.update(WorklogDailyRollup.key_for(row['work_date'], row['user_id'], row['project_id'])
+                                   for row in chunk)
+                    WorklogDailyRollup.refresh(touched)
+                    note_cache_tags(db.session, rollup_key_tags(touched))
+            except Exception as e:
+                error_msg = f"Error writing chunk of {len(chunk)} worklogs: {str(e)}"
+                logger.error(error_msg)
+                stats['errors'] += len(chunk)
+                stats['error_messages'].append(error_msg)
+                continue
+
+            elapsed = time.perf_counter() - started
+            created = sum(1 for row in chunk if row['jira_worklog_id'] not in existing)
+            stats['created'] += created
+            stats['updated'] += len(chunk) - created
+            stats['total'] += len(chunk)
+            stats['chunks'].append({
+                'rows': len(chunk),
+                'seconds': round(elapsed, 4),
+                'rows_per_second': round(len(chunk) / elapsed, 1) if elapsed > 0 else None
+            })
+
+        logger.info(f"Ingested {len(rows)} worklogs in {len(stats['chunks'])} chunks")
+
+    @staticmethod
+    def _author_key(author: Dict[str, Any]) -> str:
+        return (author.get('emailAddress') or author.get('name')
+                or author.get('displayName') or 'unknown').lower()
+
+    def _resolve_users(self, authors: List[Dict[str, Any]]) -> Dict[str, User]:
+        """Map every author to a local user, creating the missing ones in one flush."""
+        emails = sorted({a['emailAddress'] for a in authors if a.get('emailAddress')})
+        names = sorted({a['name'] for a in authors if a.get('name')})
+        display_names = sorted({a['displayName'] for a in authors if a.get('displayName')})
+
+        by_email, by_username, by_display_name = {}, {}, {}
+        for batch in _batched(emails, LOOKUP_BATCH):
+            by_email.update({u.email: u for u in User.query.filter(User.email.in_(batch))})
+        for batch in _batched(names, LOOKUP_BATCH):
+            by_username.update({u.username: u for u in User.query.filter(User.username.in_(batch))})
+        for batch in _batched(display_names, LOOKUP_BATCH):
+            for user in User.query.filter(User.display_name.in_(batch)):
+                by_display_name.setdefault(user.display_name, user)
+
+        resolved, missing = {}, {}
+        for author in authors:
+            key = self._author_key(author)
+            if key in resolved or key in missing:
+                continue
+            user = (by_email.get(author.get('emailAddress')) or by_username.get(author.get('name'))
+                    or by_display_name.get(author.get('displayName')))
+            if user:
+                resolved[key] = user
+            else:
+                missing[key] = author
+
+        if missing:
+            resolved.update(self._create_users(missing))
+        return resolved
+
+    def _create_users(self, authors: Dict[str, Dict[str, Any]]) -> Dict[str, User]:
+        """Create users for unknown authors, in a savepoint.
+
+        Generated usernames and emails (Cloud authors often have neither
+        ``name`` nor ``emailAddress``) get a numeric suffix until they are
+        unique within the batch and the table. If the batch still collides,
+        users are created one savepoint at a time and the ones that fail are
+        skipped - their worklogs are reported as errors.
+        """
+        bases = {}
+        for key, author in authors.items():
+            email = author.get('emailAddress')
+            username = (author.get('name') or (email.split('@')[0] if email else None)
+                        or author.get('accountId') or 'unknown')
+            bases[key] = (username, email)
+
+        taken_usernames, taken_emails = set(), set()
+        for batch in _batched(sorted({username for username, _ in bases.values()}), LOOKUP_BATCH):
+            taken_usernames.update(db.session.scalars(select(User.username).where(User.username.in_(batch))))
+        generated = sorted({f"{username}@unknown.com" for username, email in bases.values() if not email})
+        for batch in _batched(generated, LOOKUP_BATCH):
+            taken_emails.update(db.session.scalars(select(User.email).where(User.email.in_(batch))))
+
+        fields = {}
+        for key, (base, email) in bases.items():
+            username, suffix = base, 1
+            while username in taken_usernames or (not email and f"{username}@unknown.com" in taken_emails):
+                suffix += 1
+                username = f"{base}-{suffix}"
+            email = email or f"{username}@unknown.com"
+            taken_usernames.add(username)
+            taken_emails.add(email)
+            author = authors[key]
+            fields[key] = {
+                'username': username,
+                'email': email,
+                'display_name': author.get('displayName') or author.get('name') or 'Unknown User',
+                'is_active': True
+            }
+
+        # Looked up first: creating the default role commits, which a savepoint can't contain
+        default_role = Role.get_or_create_default_role()
+        for values in fields.values():
+            values['roles'] = [default_role] if default_role else []
+
+        try:
+            with db.session.begin_nested():
+                created = {key: User(**values) for key, values in fields.items()}
+                db.session.add_all(created.values())
+                db.session.flush()  # Assign ids to new users
+        except IntegrityError as e:
+            logger.warning(f"Creating {len(fields)} users at once failed, retrying one by one: {str(e)}")
+            created = {}
+            for key, values in fields.items():
+                try:
+                    with db.session.begin_nested():
+                        user = User(**values)
+                        db.session.add(user)
+                        db.session.flush()
+                    created[key] = user
+                except Exception as e:
+                    logger.error(f"Error creating user {values['username']}: {str(e)}")
+
+        for user in created.values():
+            logger.info(f"Created new user: {user.username}")
+        return created
+
+    def _resolve_issues(self, entries: List[Dict[str, Any]]) -> Dict[str, Issue]:
+        """Map issue keys to local issues, creating the missing ones (see ``_save_issues``)."""
+        keys = sorted({e['issue_key'] for e in entries})
+        issues = {}
+        for batch in _batched(keys, LOOKUP_BATCH):
+            issues.update({i.jira_key: i for i in Issue.query.filter(Issue.jira_key.in_(batch))})
+
+        fields, jira_ids = {}, {}
+        for entry in entries:
+            issue = issues.get(entry['issue_key'])
+            if issue is None:
+                fields.setdefault(entry['issue_key'], {
+                    'jira_id': str(entry['issue_id']),
+                    'jira_key': entry['issue_key'],
+                    'summary': entry.get('issue_summary'),
+                    'project_id': entry['project_id']
+                })
+            elif not issue.jira_id:
+                jira_ids.setdefault(issue.jira_key, str(entry['issue_id']))
+
+        if fields or jira_ids:
+            issues.update(self._save_issues(issues, fields, jira_ids))
+        return issues
+
+    def _save_issues(self, issues: Dict[str, Issue], fields: Dict[str, Dict[str, Any]],
+                     jira_ids: Dict[str, str]) -> Dict[str, Issue]:
+        """Create missing issues and fill in missing JIRA ids, in a savepoint.
+
+        If the batch collides (e.g. another sync stored one of the issues in
+        the meantime), issues are saved one savepoint at a time and the ones
+        that fail are skipped - worklogs of an issue that could not be
+        created are reported as errors.
+        """
+        try:
+            with db.session.begin_nested():
+                for key, jira_id in jira_ids.items():
+                    issues[key].jira_id = jira_id
+                created = {key: Issue(**values) for key, values in fields.items()}
+                db.session.add_all(created.values())
+                db.session.flush()  # Assign ids to new issues
+        except IntegrityError as e:
+            logger.warning(f"Saving {len(fields) + len(jira_ids)} issues at once failed, "
+                           f"retrying one by one: {str(e)}")
+            for key, jira_id in jira_ids.items():
+                try:
+                    with db.session.begin_nested():
+                        issues[key].jira_id = jira_id
+                        db.session.flush()
+                except Exception as e:
+                    logger.error(f"Error updating issue {key}: {str(e)}")
+            created = {}
+            for key, values in fields.items():
+                try:
+                    with db.session.begin_nested():
+                        issue = Issue(**values)
+                        db.session.add(issue)
+                        db.session.flush()
+                    created[key] = issue
+                except Exception as e:
+                    logger.error(f"Error creating issue {key}: {str(e)}")
+
+        return created
+
+    def _existing_worklog_ids(self, jira_worklog_ids: List[str]) -> Dict[str, int]:
+        """Return ``{jira_worklog_id: local id}`` for worklogs already stored."""
+        existing = {}
+        for batch in _batched(sorted(set(jira_worklog_ids)), LOOKUP_BATCH):
+            existing.update(dict(
+                db.session.query(Worklog.jira_worklog_id, Worklog.id)
+                .filter(Worklog.jira_worklog_id.in_(batch))
+                .all()
+            ))
+        return existing
+
+    def _upsert(self, rows: List[Dict[str, Any]], existing: Dict[str, Optional[int]]) -> None:
+        """Write one chunk with the fastest statement the database supports."""
+        dialect = db.session.get_bind().dialect.name
+        table = Worklog.__table__
+
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.jira_worklog_id],
+                set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS}
+            )
+            db.session.execute(stmt, rows)
+            return
+
+        # Generic fallback: split into bulk inserts and bulk updates by primary key
+        inserts = [row for row in rows if row['jira_worklog_id'] not in existing]
+        updates = [
+            {**{k: row[k] for k in UPSERT_COLUMNS}, 'id': existing[row['jira_worklog_id']]}
+            for row in rows
+            if existing.get(row['jira_worklog_id']) is not None
+        ]
+        if inserts:
+            db.session.bulk_insert_mappings(Worklog, inserts)
+        if updates:
+            db.session.bulk_update_mappings(Worklog, updates)
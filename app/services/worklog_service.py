@@ -1,8 +1,12 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 from app.models.worklog import Worklog
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.models.user import User
+from app.models.project import Project
 from app.services.jira_service import get_jira_service
 from flask import current_app
+from sqlalchemy.orm import joinedload
 import logging
 from app.extensions import db
 
@@ -35,75 +39,86 @@ class WorklogService:
             raise
 
     @staticmethod
-    def sync_jira_worklogs(days: int = 30) -> Dict[str, int]:
-        """Synchronizes worklogs from Jira."""
+    def sync_jira_worklogs(days: int = 30) -> Dict[str, Any]:
+        """Synchronizes worklogs from Jira.
+
+        Delegates to the watermark-driven JiraService.sync_worklogs; ``days``
+        only bounds the initial scan of projects that have never been synced.
+        """
         try:
             jira = get_jira_service()
-            start_date = datetime.now() - timedelta(days=days)
-            
-            stats = {
-                'added': 0,
-                'updated': 0,
-                'errors': 0
-            }
+            if not jira or not jira.is_configured:
+                raise ValueError("JIRA is not configured")
+            return jira.sync_worklogs(days_back=days)
 
-            # Get worklogs from Jira
-            jira_worklogs = jira.get_worklogs(start_date=start_date)
-            
-            for jira_worklog in jira_worklogs:
-                try:
-                    worklog_data = {
-                        'user_name': jira_worklog['author']['name'],
-                        'project_key': jira_worklog['issue']['key'].split('-')[0],
-                        'issue_key': jira_worklog['issue']['key'],
-                        'time_spent': jira_worklog['timeSpentSeconds'] / 3600,  # Convert to hours
-                        'work_date': datetime.fromisoformat(jira_worklog['started']).date(),
-                        'description': jira_worklog.get('comment', '')
-                    }
+        except Exception as e:
+            logger.error(f"Error syncing Jira worklogs: {str(e)}")
+            raise
 
-                    # Check if worklog already exists
-                    existing_worklog = Worklog.get_by_id(jira_worklog['id'])
-                    
-                    if existing_worklog:
-                        worklog_data['id'] = existing_worklog.id
-                        Worklog.from_dict(worklog_data).save()
-                        stats['updated'] += 1
-                    else:
-                        Worklog.from_dict(worklog_data).save()
-                        stats['added'] += 1
+    @staticmethod
+    def get_worklogs_for_period(start_date: datetime, end_date: datetime, user_id: Optional[int] = None,
+                                project_key: Optional[str] = None) -> List[Worklog]:
+        """Synced worklogs in ``[start_date, end_date]`` with issue, user and project loaded."""
+        query = Worklog.query.options(
+            joinedload(Worklog.issue), joinedload(Worklog.user), joinedload(Worklog.project)
+        ).filter(
+            Worklog.work_date >= start_date,
+            Worklog.work_date < end_date + timedelta(days=1)
+        )
+        if user_id is not None:
+            query = query.filter(Worklog.user_id == user_id)
+        if project_key:
+            query = query.join(Project, Project.id == Worklog.project_id).filter(Project.jira_key == project_key)
+        return query.order_by(Worklog.work_date, Worklog.id).all()
 
-                except Exception as e:
-                    logger.error(f"Error processing worklog: {str(e)}")
-                    stats['errors'] += 1
+    @staticmethod
+    def group_by_project_and_user(worklogs: List[Worklog]) -> Dict[str, Dict[str, List[Worklog]]]:
+        """Group worklogs as ``{project_key: {username: [worklog, ...]}}``."""
+        grouped = {}
+        for worklog in worklogs:
+            project_key = worklog.project.jira_key if worklog.project else 'Brak projektu'
+            username = worklog.user.username if worklog.user else 'Unknown'
+            grouped.setdefault(project_key, {}).setdefault(username, []).append(worklog)
+        return grouped
 
-            return stats
+    @staticmethod
+    def get_activity_by_day(user_id: int, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Daily activity of a user: issues worked on and hours logged per day.
 
-        except Exception as e:
-            logger.error(f"Error syncing Jira worklogs: {str(e)}")
-            raise
+        One query over the daily rollup; days without work are filled with zeros.
+        """
+        days = {
+            row['work_date']: row
+            for row in WorklogDailyRollup.summarize(start_date, end_date, group_by=('work_date',),
+                                                    user_ids=[user_id])
+        }
+        labels, issues, hours = [], [], []
+        day = start_date.date() if isinstance(start_date, datetime) else start_date
+        last = end_date.date() if isinstance(end_date, datetime) else end_date
+        while day <= last:
+            row = days.get(day)
+            labels.append(day.strftime('%Y-%m-%d'))
+            issues.append(row['issue_count'] if row else 0)
+            hours.append(round(row['time_spent_seconds'] / 3600, 2) if row else 0)
+            day += timedelta(days=1)
+        return {'labels': labels, 'data': issues, 'hours': hours}
 
     @staticmethod
     def get_worklog_summary(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Generates a summary of worklogs for the given period."""
         try:
-            db = get_db()
-            cursor = db.cursor()
-
-            cursor.execute("""
-                SELECT 
-                    user_name,
-                    project_key,
-                    SUM(time_spent) as total_hours,
-                    COUNT(DISTINCT issue_key) as issues_count
-                FROM worklogs
-                WHERE work_date BETWEEN ? AND ?
-                GROUP BY user_name, project_key
-                ORDER BY user_name, total_hours DESC
-            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+            results = WorklogDailyRollup.summarize(start_date, end_date, group_by=('user_id', 'project_id'))
+            usernames = dict(db.session.query(User.id, User.username).filter(
+                User.id.in_({row['user_id'] for row in results})
+            ))
+            project_keys = dict(db.session.query(Project.id, Project.jira_key).filter(
+                Project.id.in_({row['project_id'] for row in results})
+            ))
 
             summary = {}
-            for row in cursor.fetchall():
-                user = row['user_name']
+            for row in sorted(results, key=lambda r: (usernames.get(r['user_id']) or '', -r['time_spent_seconds'])):
+                user = usernames.get(row['user_id'], f"User {row['user_id']}")
+                hours = round(row['time_spent_seconds'] / 3600, 2)
                 if user not in summary:
                     summary[user] = {
                         'total_hours': 0,
@@ -111,11 +126,11 @@ class WorklogService:
                         'issues_count': 0
                     }
                 
-                summary[user]['total_hours'] += row['total_hours']
-                summary[user]['issues_count'] += row['issues_count']
-                summary[user]['projects'][row['project_key']] = {
-                    'hours': row['total_hours'],
-                    'issues': row['issues_count']
+                summary[user]['total_hours'] += hours
+                summary[user]['issues_count'] += row['issue_count']
+                summary[user]['projects'][project_keys.get(row['project_id'], f"Project {row['project_id']}")] = {
+                    'hours': hours,
+                    'issues': row['issue_count']
                 }
 
             return summary
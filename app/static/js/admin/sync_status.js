@@ -0,0 +1,80 @@
+// Śledzenie synchronizacji JIRA zleconej do kolejki.
+// Endpointy synchronizacji odpowiadają 202 z zadaniem (job), które wykonuje
+// koordynator w tle; status odpytujemy aż do zakończenia zadania.
+
+const SYNC_STATUS_URL = '/admin/api/sync/jira/status';
+const SYNC_POLL_INTERVAL_MS = 2000;
+const SYNC_FINISHED_STATUSES = ['completed', 'failed', 'coalesced'];
+
+function describeSyncRun(run) {
+    if (!run) {
+        return '';
+    }
+    return run.phase ? `Phase: ${run.phase}` : `Run status: ${run.status}`;
+}
+
+// Czeka na zakończenie zadania; onProgress(message, job, run) dostaje postęp.
+// Zwraca Promise z końcowym stanem zadania.
+window.waitForSyncJob = function(job, onProgress = () => {}) {
+    return new Promise((resolve, reject) => {
+        const poll = async () => {
+            try {
+                const response = await fetch(`${SYNC_STATUS_URL}?job_id=${job.id}`, {
+                    credentials: 'same-origin'
+                });
+                const data = await response.json();
+                if (!response.ok || data.status !== 'success') {
+                    throw new Error(data.message || 'Error checking synchronization status');
+                }
+
+                const current = data.job || job;
+                if (SYNC_FINISHED_STATUSES.includes(current.status)) {
+                    resolve(current);
+                    return;
+                }
+
+                const message = current.status === 'running'
+                    ? 'Synchronization running...'
+                    : 'Synchronization queued, waiting for the sync worker...';
+                onProgress(message, current, data.run);
+                setTimeout(poll, SYNC_POLL_INTERVAL_MS);
+            } catch (error) {
+                reject(error);
+            }
+        };
+        poll();
+    });
+};
+
+// Komunikat końcowy dla zakończonego zadania.
+window.syncResultMessage = function(job) {
+    if (job && job.status === 'coalesced') {
+        return 'Synchronization merged into a queued full synchronization';
+    }
+    return 'Synchronization completed successfully';
+};
+
+// Obsługa odpowiedzi 202 z endpointu synchronizacji: komunikat o kolejce,
+// odpytywanie statusu i wynik zadania. Zwraca końcowe zadanie lub rzuca błąd.
+window.followQueuedSync = async function(response, onProgress = () => {}) {
+    const data = await response.json();
+    if (!response.ok || data.status !== 'success') {
+        throw new Error(data.message || 'Synchronization failed');
+    }
+    if (!data.job) {
+        return null;
+    }
+
+    onProgress(data.coalesced
+        ? 'Synchronization already queued, following the queued job...'
+        : (data.message || 'Synchronization queued'), data.job, null);
+
+    const job = await window.waitForSyncJob(data.job, (message, current, run) => {
+        const details = describeSyncRun(run);
+        onProgress(details ? `${message} ${details}` : message, current, run);
+    });
+    if (job.status === 'failed') {
+        throw new Error(job.error_message || 'Synchronization failed');
+    }
+    return job;
+};
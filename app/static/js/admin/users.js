@@ -23,18 +23,18 @@ async function startJiraImport() {
             }
         });
 
-        const data = await response.json();
+        // Import trafia do kolejki synchronizacji - czekamy na zakończenie zadania
+        const job = await window.followQueuedSync(response, message => {
+            Swal.update({ text: message });
+            Swal.showLoading();
+        });
 
-        if (response.ok && data.status === 'success') {
-            await Swal.fire({
-                title: 'Success!',
-                text: 'Users imported successfully',
-                icon: 'success'
-            });
-            location.reload();
-        } else {
-            throw new Error(data.message || 'Error during import');
-        }
+        await Swal.fire({
+            title: 'Success!',
+            text: job && job.status === 'coalesced' ? window.syncResultMessage(job) : 'Users imported successfully',
+            icon: 'success'
+        });
+        location.reload();
     } catch (error) {
         console.error('Import error:', error);
         Swal.fire({
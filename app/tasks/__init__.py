@@ -3,36 +3,14 @@
 # Okresowe czyszczenie cache'u 
 
 from celery import Celery
-from app.extensions import db
+from app.extensions import db, celery as app_celery
 from app.models import Worklog, ProjectAssignment, UserAvailability
-from datetime import datetime, timedelta
 import pandas as pd
 import logging
 
 celery = Celery('tasks', broker='redis://localhost:6379/0')
 logger = logging.getLogger(__name__)
 
-@celery.task
-def sync_jira_worklogs():
-    """Synchronize worklogs from JIRA."""
-    try:
-        jira_service = get_jira_service()
-        if not jira_service:
-            logger.error("JIRA service not available")
-            return False
-
-        # Pobierz worklogi z ostatnich 24h
-        yesterday = datetime.now() - timedelta(days=1)
-        worklogs = jira_service.get_worklogs_since(yesterday)
-        
-        for worklog in worklogs:
-            save_worklog(worklog)
-            
-        return True
-    except Exception as e:
-        logger.error(f"Error syncing worklogs: {str(e)}")
-        return False
-
 @celery.task
 def calculate_portfolio_stats():
     """Calculate and cache portfolio statistics."""
@@ -58,4 +36,14 @@ def import_leave_data(file_path):
         return True
     except Exception as e:
         logger.error(f"Error importing leave data: {str(e)}")
-        return False 
\ No newline at end of file
+        return False
+
+@app_celery.task(name='app.tasks.generate_report_async')
+def generate_report_async(result_id):
+    """Compute a queued report result (see app.services.report_jobs)."""
+    from app.services.report_jobs import get_report_job_queue
+    try:
+        get_report_job_queue().execute(result_id)
+    except Exception as e:
+        logger.error(f"Error in report job {result_id}: {str(e)}")
+        raise
@@ -1,44 +1,28 @@
 from app.extensions import celery
-from app.services.jira_sync import JiraSync
+from app.services.sync_coordinator import SYNC_SCHEDULE, get_sync_coordinator
 from celery.schedules import crontab
+from datetime import timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
 @celery.task(name='app.tasks.sync_jira_data')
-def sync_jira_data():
-    """Celery task to synchronize all JIRA data."""
+def sync_jira_data(kind='full'):
+    """Celery task to synchronize JIRA data through the sync coordinator."""
     try:
-        from flask import current_app
-        jira_sync = JiraSync(current_app._get_current_object())
-        
-        # Sync users
-        if jira_sync.sync_users():
-            logger.info("Successfully synchronized JIRA users")
-        else:
-            logger.error("Failed to synchronize JIRA users")
-
-        # Sync projects
-        if jira_sync.sync_projects():
-            logger.info("Successfully synchronized JIRA projects")
-        else:
-            logger.error("Failed to synchronize JIRA projects")
-
-        # Sync worklogs
-        if jira_sync.sync_worklogs():
-            logger.info("Successfully synchronized JIRA worklogs")
-        else:
-            logger.error("Failed to synchronize JIRA worklogs")
-
+        get_sync_coordinator().run_scheduled(kind, trigger='celery')
     except Exception as e:
         logger.error(f"Error in JIRA sync task: {str(e)}")
         raise
 
-# Schedule the sync task to run every hour
+# Celery beat uses the same schedule as APScheduler, but only when selected
 @celery.on_after_finalize.connect
 def setup_periodic_tasks(sender, **kwargs):
-    sender.add_periodic_task(
-        crontab(hour='*'),  # Every hour
-        sync_jira_data.s(),
-        name='sync-jira-data'
-    ) 
\ No newline at end of file
+    if sender.conf.get('SYNC_SCHEDULER') != 'celery':
+        return
+    for kind, trigger in SYNC_SCHEDULE.items():
+        if trigger['trigger'] == 'interval':
+            schedule = timedelta(minutes=trigger['minutes'])
+        else:
+            schedule = crontab(minute=0, hour=trigger['hour'])
+        sender.add_periodic_task(schedule, sync_jira_data.s(kind), name=f'sync-jira-{kind}')
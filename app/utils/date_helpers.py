@@ -51,8 +51,13 @@ def parse_date(date_str: str, format: str = '%Y-%m-%d') -> datetime:
 
 def get_working_days(start_date: datetime, end_date: datetime) -> int:
     """Get number of working days between dates (excluding weekends)."""
-    days = get_date_range(start_date, end_date)
-    return len([day for day in days if day.weekday() < 5])
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return 0
+    # Every full week has five working days; only the remainder needs checking
+    full_weeks, remainder = divmod(days, 7)
+    first_weekday = start_date.weekday()
+    return full_weeks * 5 + sum(1 for offset in range(remainder) if (first_weekday + offset) % 7 < 5)
 
 def get_month_working_days(year: int, month: int) -> int:
     """Get number of working days in given month."""
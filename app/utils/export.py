@@ -1,8 +1,7 @@
-import csv
-from io import StringIO, BytesIO
+from io import BytesIO
 from typing import Dict, Any, List
 from datetime import datetime
-from flask import send_file, current_app, render_template, make_response
+from flask import send_file, current_app, render_template, make_response, url_for
 import pdfkit
 from jinja2 import Environment, FileSystemLoader
 import os
@@ -11,7 +10,9 @@ from app.exceptions import ExportError, ValidationError
 from app.utils.helpers import get_activity_level, get_efficiency_level
 import io
 from app.cache import cache
+from app.models.cache_tags import team_tags
 from app.monitoring import monitor
+from app.services.worklog_export import stream_csv
 import gzip
 
 logger = logging.getLogger(__name__)
@@ -70,97 +71,81 @@ def export_pdf_report(team, report_type: str, start_date: datetime, end_date: da
     logger.warning("PDF export is disabled, using CSV instead")
     return export_csv_report(team, report_type, start_date, end_date)
 
+def _csv_response(headers: List[str], rows, filename: str):
+    """Odpowiedź CSV strumieniowana przez wspólny zapis ``stream_csv``."""
+    return current_app.response_class(
+        stream_csv(rows, headers=headers),
+        content_type='text/csv',
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 def export_workload_csv(team, start_date: datetime, end_date: datetime):
     """Eksportuje raport obciążenia do CSV."""
     workload = team.get_workload(start_date, end_date)
     
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Nagłówki
-    writer.writerow(['Użytkownik', 'Godziny', 'Obciążenie (%)', 'Status'])
-    
-    # Dane użytkowników
-    for user, data in sorted(workload['users'].items(), key=lambda x: x[1]['percentage'], reverse=True):
-        writer.writerow([
-            user,
-            f"{data['hours']:.1f}",
-            f"{data['percentage']:.1f}",
-            data['status']
-        ])
-    
-    # Podsumowanie
-    writer.writerow([])
-    writer.writerow(['Oczekiwana liczba godzin', f"{workload['expected_hours']:.1f}"])
-    writer.writerow(['Średnie obciążenie zespołu', f"{workload['avg_workload']:.1f}%"])
+    def rows():
+        # Dane użytkowników
+        for user, data in sorted(workload['users'].items(), key=lambda x: x[1]['percentage'], reverse=True):
+            yield [
+                user,
+                f"{data['hours']:.1f}",
+                f"{data['percentage']:.1f}",
+                data['status']
+            ]
+        
+        # Podsumowanie
+        yield []
+        yield ['Oczekiwana liczba godzin', f"{workload['expected_hours']:.1f}"]
+        yield ['Średnie obciążenie zespołu', f"{workload['avg_workload']:.1f}%"]
     
-    # Przygotuj plik do wysłania
-    output.seek(0)
     filename = sanitize_filename(f"workload_report_{start_date.strftime('%Y%m%d')}.csv")
-    
-    return make_response(output.getvalue(), content_type='text/csv', headers={"Content-Disposition": f"attachment; filename={filename}"})
+    return _csv_response(['Użytkownik', 'Godziny', 'Obciążenie (%)', 'Status'], rows(), filename)
 
 def export_activity_csv(team, start_date: datetime, end_date: datetime):
     """Eksportuje raport aktywności do CSV."""
     activity = team.get_activity(start_date, end_date)
     
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Nagłówki
-    writer.writerow(['Data', 'Godziny', 'Zadania', 'Poziom Aktywności'])
-    
-    # Dane dzienne
-    for date, hours in sorted(activity['daily_activity'].items()):
-        level = get_activity_level(hours, activity['avg_daily_hours'])
-        writer.writerow([
-            date,
-            f"{hours:.1f}",
-            activity['tasks'].get(date, 0),
-            level.upper()
-        ])
-    
-    # Podsumowanie
-    writer.writerow([])
-    writer.writerow(['Łączna liczba godzin', f"{activity['total_hours']:.1f}"])
-    writer.writerow(['Łączna liczba zadań', activity['total_tasks']])
-    writer.writerow(['Średnia dzienna aktywność', f"{activity['avg_daily_hours']:.1f}"])
+    def rows():
+        # Dane dzienne
+        for date, hours in sorted(activity['daily_activity'].items()):
+            level = get_activity_level(hours, activity['avg_daily_hours'])
+            yield [
+                date,
+                f"{hours:.1f}",
+                activity['tasks'].get(date, 0),
+                level.upper()
+            ]
+        
+        # Podsumowanie
+        yield []
+        yield ['Łączna liczba godzin', f"{activity['total_hours']:.1f}"]
+        yield ['Łączna liczba zadań', activity['total_tasks']]
+        yield ['Średnia dzienna aktywność', f"{activity['avg_daily_hours']:.1f}"]
     
-    # Przygotuj plik do wysłania
-    output.seek(0)
     filename = sanitize_filename(f"activity_report_{start_date.strftime('%Y%m%d')}.csv")
-    
-    return make_response(output.getvalue(), content_type='text/csv', headers={"Content-Disposition": f"attachment; filename={filename}"})
+    return _csv_response(['Data', 'Godziny', 'Zadania', 'Poziom Aktywności'], rows(), filename)
 
 def export_efficiency_csv(team, start_date: datetime, end_date: datetime):
     """Eksportuje raport efektywności do CSV."""
     efficiency = team.get_efficiency(start_date, end_date)
     
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Nagłówki
-    writer.writerow(['Użytkownik', 'Godziny', 'Zadania', 'Efektywność (%)', 'Status'])
-    
-    # Dane użytkowników
-    for user, data in sorted(efficiency['users'].items(), key=lambda x: x[1]['efficiency'], reverse=True):
-        writer.writerow([
-            user,
-            f"{data['hours']:.1f}",
-            data['tasks'],
-            f"{data['efficiency']:.1f}",
-            data['status']
-        ])
-    
-    # Podsumowanie
-    writer.writerow([])
-    writer.writerow(['Średnia efektywność zespołu', f"{efficiency['avg_efficiency']:.1f}%"])
+    def rows():
+        # Dane użytkowników
+        for user, data in sorted(efficiency['users'].items(), key=lambda x: x[1]['efficiency'], reverse=True):
+            yield [
+                user,
+                f"{data['hours']:.1f}",
+                data['tasks'],
+                f"{data['efficiency']:.1f}",
+                data['status']
+            ]
+        
+        # Podsumowanie
+        yield []
+        yield ['Średnia efektywność zespołu', f"{efficiency['avg_efficiency']:.1f}%"]
     
-    # Przygotuj plik do wysłania
-    output.seek(0)
     filename = sanitize_filename(f"efficiency_report_{start_date.strftime('%Y%m%d')}.csv")
-    
-    return make_response(output.getvalue(), content_type='text/csv', headers={"Content-Disposition": f"attachment; filename={filename}"})
+    return _csv_response(['Użytkownik', 'Godziny', 'Zadania', 'Efektywność (%)', 'Status'], rows(), filename)
 
 def export_workload_pdf(team, start_date: datetime, end_date: datetime):
     """Eksportuje raport obciążenia do PDF."""
@@ -237,32 +222,24 @@ def export_efficiency_pdf(team, start_date: datetime, end_date: datetime):
 def export_member_stats_csv(team, user_name: str, stats: Dict[str, Any], 
                           start_date: datetime, end_date: datetime):
     """Eksportuje statystyki członka zespołu do CSV."""
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Nagłówki
-    writer.writerow(['Data', 'Godziny', 'Zadania', 'Projekty'])
-    
-    # Dane dzienne
-    for date, data in sorted(stats['daily_stats'].items()):
-        writer.writerow([
-            date,
-            data['hours'],
-            data['tasks'],
-            ', '.join(data['projects'])
-        ])
-    
-    # Podsumowanie
-    writer.writerow([])
-    writer.writerow(['Suma godzin', stats['total_hours']])
-    writer.writerow(['Suma zadań', stats['total_tasks']])
-    writer.writerow(['Średnio godzin dziennie', stats['avg_daily_hours']])
+    def rows():
+        # Dane dzienne
+        for date, data in sorted(stats['daily_stats'].items()):
+            yield [
+                date,
+                data['hours'],
+                data['tasks'],
+                ', '.join(data['projects'])
+            ]
+        
+        # Podsumowanie
+        yield []
+        yield ['Suma godzin', stats['total_hours']]
+        yield ['Suma zadań', stats['total_tasks']]
+        yield ['Średnio godzin dziennie', stats['avg_daily_hours']]
     
-    # Przygotuj plik do wysłania
-    output.seek(0)
     filename = f"member_stats_{user_name}_{start_date.strftime('%Y%m%d')}.csv"
-    
-    return make_response(output.getvalue(), content_type='text/csv', headers={"Content-Disposition": f"attachment; filename={filename}"})
+    return _csv_response(['Data', 'Godziny', 'Zadania', 'Projekty'], rows(), filename)
 
 def export_member_stats_pdf(team, user_name: str, stats: Dict[str, Any],
                           start_date: datetime, end_date: datetime):
@@ -295,33 +272,25 @@ def export_member_stats_pdf(team, user_name: str, stats: Dict[str, Any],
 def export_project_stats_csv(team, project_key: str, stats: Dict[str, Any],
                            start_date: datetime, end_date: datetime):
     """Eksportuje statystyki projektu do CSV."""
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Nagłówki
-    writer.writerow(['Użytkownik', 'Godziny', 'Zadania', 'Udział (%)'])
-    
-    # Dane użytkowników
-    for user, data in sorted(stats['users'].items()):
-        percentage = (data['hours'] / stats['total_hours'] * 100) if stats['total_hours'] > 0 else 0
-        writer.writerow([
-            user,
-            data['hours'],
-            data['tasks'],
-            f"{percentage:.1f}"
-        ])
-    
-    # Podsumowanie
-    writer.writerow([])
-    writer.writerow(['Suma godzin', stats['total_hours']])
-    writer.writerow(['Suma zadań', stats['total_tasks']])
-    writer.writerow(['Średnio godzin na użytkownika', stats['avg_hours_per_user']])
+    def rows():
+        # Dane użytkowników
+        for user, data in sorted(stats['users'].items()):
+            percentage = (data['hours'] / stats['total_hours'] * 100) if stats['total_hours'] > 0 else 0
+            yield [
+                user,
+                data['hours'],
+                data['tasks'],
+                f"{percentage:.1f}"
+            ]
+        
+        # Podsumowanie
+        yield []
+        yield ['Suma godzin', stats['total_hours']]
+        yield ['Suma zadań', stats['total_tasks']]
+        yield ['Średnio godzin na użytkownika', stats['avg_hours_per_user']]
     
-    # Przygotuj plik do wysłania
-    output.seek(0)
     filename = f"project_stats_{project_key}_{start_date.strftime('%Y%m%d')}.csv"
-    
-    return make_response(output.getvalue(), content_type='text/csv', headers={"Content-Disposition": f"attachment; filename={filename}"})
+    return _csv_response(['Użytkownik', 'Godziny', 'Zadania', 'Udział (%)'], rows(), filename)
 
 def export_project_stats_pdf(team, project_key: str, stats: Dict[str, Any],
                            start_date: datetime, end_date: datetime):
@@ -393,45 +362,52 @@ def validate_export_params(team, start_date: datetime, end_date: datetime):
 
 def export_large_dataset(team, report_type: str, start_date: datetime, end_date: datetime):
     """Eksportuje duży zestaw danych w tle."""
-    from app.tasks import generate_report_async
+    from app.services.report_jobs import get_report_job_queue
     
-    task = generate_report_async.delay(
-        team.id, 
-        report_type, 
-        start_date.isoformat(), 
-        end_date.isoformat()
+    result, reused = get_report_job_queue().submit(
+        f'team_{report_type}',
+        _team_report_params(team.id, start_date, end_date)
     )
     
     return {
-        'task_id': task.id,
-        'status': 'pending',
+        'task_id': result.id,
+        'status': result.status,
+        'status_url': url_for('reports.get_report_result_status', result_id=result.id),
         'message': 'Raport jest generowany w tle. Sprawdź status używając task_id.'
     }
 
+def _team_report_params(team_id: int, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    return {
+        'team_id': team_id,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d')
+    }
+
 def get_cached_report(team_id: int, report_type: str, start_date: datetime, end_date: datetime):
     """Pobiera raport z cache'u lub generuje nowy."""
-    cache_key = f"report_{team_id}_{report_type}_{start_date.date()}_{end_date.date()}"
-    
-    # Próba pobrania z cache'u
-    cached_report = cache.get(cache_key)
-    if cached_report:
-        return cached_report
-    
-    # Generowanie nowego raportu
-    report = generate_report(team_id, report_type, start_date, end_date)
-    
-    # Zapisanie w cache na 1 godzinę
-    cache.set(cache_key, report, timeout=3600)
-    
-    return report
+    cache_key = f"{team_id}_{report_type}_{start_date.date()}_{end_date.date()}"
+    
+    # Raport z cache'u albo generowany raz (na 1 godzinę) dla równoczesnych żądań
+    return cache.get_or_set(
+        cache_key,
+        lambda: generate_report(team_id, report_type, start_date, end_date),
+        timeout=3600,
+        namespace='reports',
+        tags=team_tags(team_id) + ['holidays']
+    )
 
 @monitor.measure_time('report_generation')
 def generate_report(team_id: int, report_type: str, start_date: datetime, end_date: datetime):
     """Generuje raport z monitorowaniem czasu."""
-    # ... implementacja generowania raportu 
+    from app.services.report_service import build_report_data
+    return build_report_data(f'team_{report_type}', _team_report_params(team_id, start_date, end_date))
 
 def check_file_size(data: bytes, max_size: int = 50 * 1024 * 1024):  # 50MB
-    """Sprawdza rozmiar pliku."""
+    """Sprawdza rozmiar pliku.
+
+    Dotyczy plików budowanych w całości w pamięci (PDF); eksporty CSV są
+    strumieniowane przez ``_csv_response`` i nie mają limitu rozmiaru.
+    """
     if len(data) > max_size:
         raise ValidationError(
             "Wygenerowany plik przekracza maksymalny rozmiar",
@@ -0,0 +1,86 @@
+from typing import Any, Callable, Iterable, Optional
+from functools import wraps
+import hashlib
+import json
+import logging
+from flask import current_app, make_response, request
+from flask_login import current_user
+from app.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def _requester() -> str:
+    try:
+        return str(current_user.get_id() or '') if current_user.is_authenticated else ''
+    except Exception:
+        return ''
+
+
+def tag_etag(tags: Iterable[str], extra: Any = None) -> Optional[str]:
+    """Strong ETag for the current request from the versions of the tags its data depends on.
+
+    Combines the path, the query parameters, the requesting user and
+    ``extra`` (e.g. the default period resolved for missing parameters)
+    with the tag versions kept by the cache layer, so it changes whenever
+    one of the tags is invalidated - without reading any table. ``None``
+    when tag versions are unavailable.
+    """
+    versions = cache.tag_versions(tags)
+    if versions is None:
+        return None
+    payload = json.dumps([
+        request.path,
+        sorted(request.args.items(multi=True)),
+        _requester(),
+        extra,
+        sorted((name, version.decode('ascii')) for name, version in versions.items())
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def _set_policy(response, etag: Optional[str], max_age: int):
+    if etag:
+        response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    if not max_age:
+        response.cache_control.no_cache = True
+    response.vary.update(('Cookie', 'Authorization'))
+    return response
+
+
+def conditional(tags: Optional[Callable[..., Iterable[str]]] = None, max_age: int = 0,
+                vary: Optional[Callable[..., Any]] = None) -> Callable:
+    """Answer ``If-None-Match`` for a read-only JSON view with ``304 Not Modified``.
+
+    ``tags`` receives the view arguments (and can read ``request.args``) and
+    returns the cache tags the payload depends on; a matching ``ETag`` is
+    then answered before the view runs, i.e. without touching the database.
+    ``vary`` (same arguments) returns whatever else the payload depends on
+    that is not in the request, such as a default period relative to today.
+    Without ``tags`` - for views whose data does not live in the local
+    database - the ETag is a hash of the rendered body, which saves the
+    transfer but not the work. Responses are ``private`` and revalidated on
+    every use unless ``max_age`` allows reusing them for a while.
+    """
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+
+            extra = vary(*args, **kwargs) if vary else None
+            etag = tag_etag(tags(*args, **kwargs), extra) if tags else None
+            if etag and etag in request.if_none_match:
+                return _set_policy(current_app.response_class(status=304), etag, max_age)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            if etag is None:
+                response.add_etag()
+            _set_policy(response, etag, max_age)
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
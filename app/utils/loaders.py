@@ -0,0 +1,68 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+from collections import defaultdict
+import logging
+from flask import g, has_app_context
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+BATCH_SIZE = 500
+
+
+class BatchLoader:
+    """Identity cache that loads rows by key in batches.
+
+    Replaces a ``Model.query.get(id)`` per result row with one ``IN`` query
+    per model: collect the ids first, call :meth:`load_many`, then read from
+    the returned mapping. Rows already loaded (or known to be missing) are
+    served from the cache, so the same loader can be shared by every
+    function handling a request - see :func:`get_loader`.
+    """
+
+    def __init__(self):
+        self._rows: Dict[Any, Dict[Hashable, Any]] = defaultdict(dict)
+
+    def load_many(self, model, ids: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Rows of ``model`` by primary key; missing ids map to ``None``."""
+        cache = self._rows[model]
+        ids = [i for i in dict.fromkeys(ids) if i is not None]
+        missing = [i for i in ids if i not in cache]
+        for start in range(0, len(missing), BATCH_SIZE):
+            chunk = missing[start:start + BATCH_SIZE]
+            found = {row.id: row for row in db.session.query(model).filter(model.id.in_(chunk))}
+            for key in chunk:
+                cache[key] = found.get(key)
+        return {i: cache[i] for i in ids}
+
+    def load(self, model, id: Hashable) -> Optional[Any]:
+        """Single row by primary key, through the cache."""
+        return self.load_many(model, [id]).get(id)
+
+    def load_grouped(self, column, keys: Iterable[Hashable], *criteria) -> Dict[Hashable, List[Any]]:
+        """Rows whose ``column`` is in ``keys``, grouped by that column's value.
+
+        The one-to-many counterpart of :meth:`load_many` (e.g. leaves per
+        user). ``criteria`` are extra filters; results are not cached since
+        they depend on them.
+        """
+        model = column.class_
+        keys = [k for k in dict.fromkeys(keys) if k is not None]
+        grouped = {key: [] for key in keys}
+        for start in range(0, len(keys), BATCH_SIZE):
+            chunk = keys[start:start + BATCH_SIZE]
+            for row in db.session.query(model).filter(column.in_(chunk), *criteria):
+                grouped[getattr(row, column.key)].append(row)
+        return grouped
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+
+def get_loader() -> BatchLoader:
+    """Loader shared for the current request or app context (a new one outside a context)."""
+    if not has_app_context():
+        return BatchLoader()
+    if 'batch_loader' not in g:
+        g.batch_loader = BatchLoader()
+    return g.batch_loader
@@ -0,0 +1,63 @@
+from typing import Any, List, Optional, Tuple
+from datetime import date, datetime
+import base64
+import json
+from sqlalchemy import tuple_
+
+
+def encode_cursor(value: Any, row_id: int) -> str:
+    """Opaque cursor for the row a page ended on."""
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    elif isinstance(value, date):
+        value = {'d': value.isoformat()}
+    payload = json.dumps([value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Inverse of :func:`encode_cursor`; raises ``ValueError`` for a malformed cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if isinstance(value, dict):
+        if 'dt' in value:
+            value = datetime.fromisoformat(value['dt'])
+        elif 'd' in value:
+            value = date.fromisoformat(value['d'])
+    return value, int(row_id)
+
+
+def keyset_page(query, sort_field, id_field, per_page: int, descending: bool = True,
+                cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """One page of ``query`` ordered by ``(sort_field, id_field)``, seeking past ``cursor``.
+
+    Instead of ``OFFSET`` the page starts with a row-value comparison on
+    the last row of the previous page, so with an index on
+    ``(sort_field, id)`` every page costs the same as the first. The query
+    must select the sort value as its second column, i.e.
+    ``query.add_columns(sort_field)``. Returns the rows (entities only) and
+    the cursor of the next page, or ``None`` on the last page. ``offset``
+    is only for clients still asking for numbered pages.
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        key = tuple_(sort_field, id_field)
+        query = query.filter(key < tuple_(value, row_id) if descending else key > tuple_(value, row_id))
+    if descending:
+        query = query.order_by(sort_field.desc(), id_field.desc())
+    else:
+        query = query.order_by(sort_field.asc(), id_field.asc())
+
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = None
+    if has_more and rows:
+        last, last_value = rows[-1][0], rows[-1][1]
+        next_cursor = encode_cursor(last_value, last.id)
+    return [row[0] for row in rows], next_cursor
@@ -124,15 +124,12 @@ def validate_concurrent_access(team_id: int) -> None:
     from app.models.team import Team
     from app.cache import cache
     
-    lock_key = f"team_lock_{team_id}"
-    if cache.get(lock_key):
+    # Ustaw blokadę na 30 sekund - atomowo, także między procesami
+    if not cache.add(f"team_lock_{team_id}", True, timeout=30, namespace='locks'):
         raise ValidationError(
             "Zasób jest aktualnie używany przez inny proces",
             {"team_id": team_id}
         )
-    
-    # Ustaw blokadę na 30 sekund
-    cache.set(lock_key, True, timeout=30)
 
 def validate_export_format(format: str) -> None:
     """Waliduje format eksportu."""
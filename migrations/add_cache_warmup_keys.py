@@ -0,0 +1,57 @@
+"""Add cache warm-up keys table
+
+This migration adds cache_warmup_keys: request counts per parameter set of
+the heavy cached dashboards, used to pick what to precompute after a sync,
+and the duration of each set's last warm-up.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS cache_warmup_keys (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target VARCHAR(50) NOT NULL,
+                params_hash VARCHAR(64) NOT NULL,
+                params TEXT NOT NULL,
+                request_count INTEGER NOT NULL DEFAULT 0,
+                first_requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_warmed_at TIMESTAMP,
+                last_warm_seconds FLOAT,
+                warm_stats TEXT,
+                CONSTRAINT uq_cache_warmup_keys_target_params UNIQUE (target, params_hash)
+            );
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_cache_warmup_keys_target_requested
+            ON cache_warmup_keys(target, last_requested_at);
+        """))
+
+        db.session.commit()
+        logger.info("Successfully created cache warm-up keys table")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating cache warm-up keys table: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP TABLE IF EXISTS cache_warmup_keys;"))
+
+        db.session.commit()
+        logger.info("Successfully removed cache warm-up keys table")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing cache warm-up keys table: {str(e)}")
+        return False
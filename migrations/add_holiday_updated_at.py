@@ -0,0 +1,64 @@
+"""Add updated_at to holidays
+
+This migration adds an updated_at column to the holidays table, so editing a
+holiday moves the report data version like changes to every other report
+source table do.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def column_exists(column_name: str, table_name: str) -> bool:
+    """Check if a column exists in a table."""
+    result = db.session.execute(text(f"""
+        SELECT COUNT(*) as count
+        FROM pragma_table_info('{table_name}')
+        WHERE name='{column_name}';
+    """)).fetchone()
+    return result[0] > 0
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        if not column_exists('updated_at', 'holidays'):
+            db.session.execute(text("""
+                ALTER TABLE holidays
+                ADD COLUMN updated_at TIMESTAMP;
+            """))
+            logger.info("Added updated_at column to holidays table")
+
+        # Existing holidays were last changed when they were created
+        db.session.execute(text("""
+            UPDATE holidays
+            SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+            WHERE updated_at IS NULL;
+        """))
+
+        db.session.commit()
+        logger.info("Successfully added holiday updated_at column")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error adding holiday updated_at column: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        if column_exists('updated_at', 'holidays'):
+            db.session.execute(text("""
+                ALTER TABLE holidays
+                DROP COLUMN updated_at;
+            """))
+            logger.info("Removed updated_at column from holidays table")
+
+        db.session.commit()
+        logger.info("Successfully removed holiday updated_at column")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing holiday updated_at column: {str(e)}")
+        return False
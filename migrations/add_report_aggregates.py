@@ -0,0 +1,72 @@
+"""Add report aggregate tables
+
+This migration adds the report_aggregates table holding monthly worklog totals
+per team, portfolio and role, and report_aggregate_dependencies recording the
+memberships and assignments each set of aggregates was computed from. Both
+are filled lazily on first read.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS report_aggregates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scope VARCHAR(20) NOT NULL,
+                scope_id INTEGER NOT NULL,
+                month DATE NOT NULL,
+                project_id INTEGER NOT NULL,
+                time_spent_seconds BIGINT NOT NULL DEFAULT 0,
+                entry_count INTEGER NOT NULL DEFAULT 0,
+                planned_seconds BIGINT NOT NULL DEFAULT 0,
+                user_ids TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                CONSTRAINT uq_report_aggregate UNIQUE (scope, scope_id, month, project_id)
+            );
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_report_aggregates_lookup
+            ON report_aggregates(scope, scope_id, month);
+        """))
+
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS report_aggregate_dependencies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scope VARCHAR(20) NOT NULL,
+                scope_id INTEGER NOT NULL,
+                members TEXT,
+                assignments TEXT,
+                computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT uq_report_aggregate_dependency UNIQUE (scope, scope_id)
+            );
+        """))
+
+        db.session.commit()
+        logger.info("Successfully created report aggregate tables")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating report aggregate tables: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP TABLE IF EXISTS report_aggregate_dependencies;"))
+        db.session.execute(text("DROP TABLE IF EXISTS report_aggregates;"))
+
+        db.session.commit()
+        logger.info("Successfully removed report aggregate tables")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing report aggregate tables: {str(e)}")
+        return False
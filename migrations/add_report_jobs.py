@@ -0,0 +1,86 @@
+"""Add background job columns to report results
+
+This migration turns report_results into job records for the background
+report queue: progress and timing columns, the (type, parameters, data
+version) hash used to reuse identical results, and a compressed payload
+column replacing the plain JSON result_data for new results.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+NEW_COLUMNS = (
+    ('report_type', 'VARCHAR(50)'),
+    ('parameters', 'TEXT'),
+    ('result_hash', 'VARCHAR(64)'),
+    ('data_version', 'VARCHAR(64)'),
+    ('started_at', 'TIMESTAMP'),
+    ('finished_at', 'TIMESTAMP'),
+    ('progress', 'INTEGER DEFAULT 0'),
+    ('result_blob', 'BLOB'),
+    ('requested_by_id', 'INTEGER REFERENCES users(id)'),
+)
+
+def column_exists(column_name: str, table_name: str) -> bool:
+    """Check if a column exists in a table."""
+    result = db.session.execute(text(f"""
+        SELECT COUNT(*) as count
+        FROM pragma_table_info('{table_name}')
+        WHERE name='{column_name}';
+    """)).fetchone()
+    return result[0] > 0
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        for column_name, column_type in NEW_COLUMNS:
+            if not column_exists(column_name, 'report_results'):
+                db.session.execute(text(f"""
+                    ALTER TABLE report_results
+                    ADD COLUMN {column_name} {column_type};
+                """))
+                logger.info(f"Added {column_name} column to report_results table")
+
+        # Existing results were computed for their report's type
+        db.session.execute(text("""
+            UPDATE report_results
+            SET report_type = (SELECT report_type FROM reports WHERE reports.id = report_results.report_id),
+                progress = CASE WHEN status = 'completed' THEN 100 ELSE 0 END
+            WHERE report_type IS NULL;
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_report_results_hash
+            ON report_results(result_hash, status);
+        """))
+
+        db.session.commit()
+        logger.info("Successfully added report job columns")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error adding report job columns: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP INDEX IF EXISTS idx_report_results_hash;"))
+        for column_name, _ in reversed(NEW_COLUMNS):
+            if column_exists(column_name, 'report_results'):
+                db.session.execute(text(f"""
+                    ALTER TABLE report_results
+                    DROP COLUMN {column_name};
+                """))
+                logger.info(f"Removed {column_name} column from report_results table")
+
+        db.session.commit()
+        logger.info("Successfully removed report job columns")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing report job columns: {str(e)}")
+        return False
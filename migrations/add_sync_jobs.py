@@ -0,0 +1,70 @@
+"""Add sync jobs and leases tables
+
+This migration adds the sync_jobs queue and the sync_leases lock table used by
+the JIRA sync coordinator to run one synchronization at a time across
+processes.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS sync_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                trigger VARCHAR(50),
+                parameters TEXT,
+                requested_by_id INTEGER,
+                coalesced_count INTEGER DEFAULT 0,
+                run_id INTEGER,
+                result TEXT,
+                error_message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                FOREIGN KEY(requested_by_id) REFERENCES users(id) ON DELETE SET NULL,
+                FOREIGN KEY(run_id) REFERENCES sync_runs(id) ON DELETE SET NULL
+            );
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_sync_jobs_status ON sync_jobs(status, id);
+        """))
+
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS sync_leases (
+                name VARCHAR(50) PRIMARY KEY,
+                owner VARCHAR(200) NOT NULL,
+                acquired_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
+            );
+        """))
+
+        db.session.commit()
+        logger.info("Successfully created sync jobs tables")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating sync jobs tables: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP TABLE IF EXISTS sync_leases;"))
+        db.session.execute(text("DROP TABLE IF EXISTS sync_jobs;"))
+
+        db.session.commit()
+        logger.info("Successfully removed sync jobs tables")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing sync jobs tables: {str(e)}")
+        return False
@@ -0,0 +1,74 @@
+"""Add sync runs and checkpoints tables
+
+This migration adds the sync_runs and sync_checkpoints tables used to record
+JIRA synchronization progress and to resume interrupted runs.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS sync_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'running',
+                phase VARCHAR(50),
+                stats TEXT,
+                error_message TEXT,
+                resumed_count INTEGER DEFAULT 0,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP,
+                heartbeat_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_sync_runs_kind_status ON sync_runs(kind, status);
+        """))
+
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS sync_checkpoints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL,
+                phase VARCHAR(50) NOT NULL,
+                project_id INTEGER,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                page_offset INTEGER NOT NULL DEFAULT 0,
+                cursor TEXT,
+                processed INTEGER NOT NULL DEFAULT 0,
+                total INTEGER,
+                error_message TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(run_id) REFERENCES sync_runs(id) ON DELETE CASCADE,
+                FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                CONSTRAINT uq_sync_checkpoint UNIQUE (run_id, phase, project_id)
+            );
+        """))
+
+        db.session.commit()
+        logger.info("Successfully created sync runs tables")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating sync runs tables: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP TABLE IF EXISTS sync_checkpoints;"))
+        db.session.execute(text("DROP TABLE IF EXISTS sync_runs;"))
+
+        db.session.commit()
+        logger.info("Successfully removed sync runs tables")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing sync runs tables: {str(e)}")
+        return False
@@ -0,0 +1,48 @@
+"""Add sync watermarks table
+
+This migration adds the sync_watermarks table holding the per-project position
+in the JIRA worklog change feeds used by the incremental worklog sync.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS sync_watermarks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id INTEGER NOT NULL UNIQUE,
+                worklogs_updated_since BIGINT NOT NULL DEFAULT 0,
+                worklogs_deleted_since BIGINT NOT NULL DEFAULT 0,
+                last_sync_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE
+            );
+        """))
+
+        db.session.commit()
+        logger.info("Successfully created sync watermarks table")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating sync watermarks table: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP TABLE IF EXISTS sync_watermarks;"))
+
+        db.session.commit()
+        logger.info("Successfully removed sync watermarks table")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing sync watermarks table: {str(e)}")
+        return False
@@ -0,0 +1,73 @@
+"""Add worklog daily rollup table
+
+This migration adds the worklog_daily_rollup table holding worklog totals per
+day, user and project, and fills it from the existing worklogs.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS worklog_daily_rollup (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                work_date DATE NOT NULL,
+                user_id INTEGER NOT NULL,
+                project_id INTEGER NOT NULL,
+                time_spent_seconds BIGINT NOT NULL DEFAULT 0,
+                entry_count INTEGER NOT NULL DEFAULT 0,
+                issue_count INTEGER NOT NULL DEFAULT 0,
+                issue_ids TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+                FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                CONSTRAINT uq_worklog_daily_rollup UNIQUE (work_date, user_id, project_id)
+            );
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_worklog_rollup_user_date
+            ON worklog_daily_rollup(user_id, work_date);
+        """))
+
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_worklog_rollup_project_date
+            ON worklog_daily_rollup(project_id, work_date);
+        """))
+
+        # Backfill from the worklogs stored so far
+        db.session.execute(text("DELETE FROM worklog_daily_rollup;"))
+        db.session.execute(text("""
+            INSERT INTO worklog_daily_rollup
+                (work_date, user_id, project_id, time_spent_seconds, entry_count, issue_count, issue_ids)
+            SELECT DATE(work_date), user_id, project_id, SUM(time_spent_seconds), COUNT(*),
+                   COUNT(DISTINCT issue_id), GROUP_CONCAT(DISTINCT issue_id)
+            FROM worklogs
+            GROUP BY DATE(work_date), user_id, project_id;
+        """))
+
+        db.session.commit()
+        logger.info("Successfully created worklog daily rollup table")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating worklog daily rollup table: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        db.session.execute(text("DROP TABLE IF EXISTS worklog_daily_rollup;"))
+
+        db.session.commit()
+        logger.info("Successfully removed worklog daily rollup table")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing worklog daily rollup table: {str(e)}")
+        return False
@@ -0,0 +1,48 @@
+"""Add worklog keyset pagination indexes
+
+This migration adds composite (sort column, id) indexes on worklogs so the
+admin worklog list can seek to any page instead of scanning past an
+OFFSET: by date, by date within a user or project filter, and by time
+spent.
+"""
+
+from app.extensions import db
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    'idx_worklogs_work_date_id': 'worklogs(work_date, id)',
+    'idx_worklogs_user_work_date_id': 'worklogs(user_id, work_date, id)',
+    'idx_worklogs_project_work_date_id': 'worklogs(project_id, work_date, id)',
+    'idx_worklogs_time_spent_id': 'worklogs(time_spent_seconds, id)',
+}
+
+def upgrade():
+    """Upgrade the database."""
+    try:
+        for name, columns in INDEXES.items():
+            db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {columns};"))
+
+        db.session.commit()
+        logger.info("Successfully created worklog keyset indexes")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating worklog keyset indexes: {str(e)}")
+        return False
+
+def downgrade():
+    """Downgrade the database."""
+    try:
+        for name in INDEXES:
+            db.session.execute(text(f"DROP INDEX IF EXISTS {name};"))
+
+        db.session.commit()
+        logger.info("Successfully removed worklog keyset indexes")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error removing worklog keyset indexes: {str(e)}")
+        return False
@@ -1,6 +1,9 @@
 from app import create_app
+from app.scheduler import start_scheduler
 
 app = create_app()
 
 if __name__ == '__main__':
+    # Only when started directly; `flask <command>` imports this module too
+    start_scheduler(app)
     app.run(host='0.0.0.0', port=5003, debug=True)
\ No newline at end of file
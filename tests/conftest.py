@@ -1,7 +1,7 @@
 import pytest
 from app import create_app
 from app.extensions import db
-from app.models import User, Role, Team, Project
+from app.models import User, Role  # rejestruje też pozostałe modele w metadanych
 
 @pytest.fixture
 def app():
@@ -43,4 +43,24 @@ def _setup_test_data():
     admin.roles.append(admin_role)
     db.session.add(admin)
     
-    db.session.commit() 
\ No newline at end of file
+    db.session.commit() 
+
+
+@pytest.fixture
+def db_app():
+    """Minimalna aplikacja na bazie SQLite w pamięci - bez pełnej fabryki create_app."""
+    from flask import Flask
+
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI='sqlite://',
+        SQLALCHEMY_TRACK_MODIFICATIONS=False
+    )
+    db.init_app(flask_app)
+
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,74 @@
+import os
+import time
+from datetime import date, datetime
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from app.extensions import db
+from app.models.worklog_daily_rollup import WorklogDailyRollup
+from app.services.report_service import ReportService
+
+# Benchmark uruchamiany na żądanie: RUN_BENCHMARKS=1 pytest tests/performance
+pytestmark = pytest.mark.skipif(not os.environ.get('RUN_BENCHMARKS'),
+                                reason='benchmark, set RUN_BENCHMARKS=1 to run it')
+
+ROLLUP_ROWS = int(os.environ.get('BENCHMARK_ROLLUP_ROWS', '200000'))
+USERS, PROJECTS, DAYS = 200, 40, 365
+
+
+def synthetic_rollup(count, seed=7):
+    """Losowe wiersze worklog_daily_rollup z jednego roku: 200 użytkowników, 40 projektów, 20 000 zadań."""
+    rng = np.random.default_rng(seed)
+    first_day = date(2025, 1, 1).toordinal()
+    keys = rng.choice(DAYS * USERS * PROJECTS, count, replace=False)
+    days, rest = np.divmod(keys, USERS * PROJECTS)
+    users, projects = np.divmod(rest, PROJECTS)
+    issue_counts = rng.integers(1, 5, count)
+    rows = []
+    for day, user, project, issues in zip(days.tolist(), users.tolist(), projects.tolist(), issue_counts.tolist()):
+        issue_ids = sorted({project * 500 + int(i) for i in rng.integers(1, 500, issues)})
+        rows.append({
+            'work_date': date.fromordinal(first_day + day),
+            'user_id': user + 1,
+            'project_id': project + 1,
+            'time_spent_seconds': 900 * int(rng.integers(1, 33)),
+            'entry_count': len(issue_ids),
+            'issue_count': len(issue_ids),
+            'issue_ids': ','.join(map(str, issue_ids))
+        })
+    return rows
+
+
+@pytest.fixture
+def rollup(db_app):
+    db.session.execute(WorklogDailyRollup.__table__.insert(), synthetic_rollup(ROLLUP_ROWS))
+    db.session.commit()
+
+
+def timed_activity_report(app, backend, start_date, end_date):
+    """Raport aktywności przez ReportService, łącznie z wczytaniem wierszy z bazy."""
+    app.config['REPORT_ANALYTICS_BACKEND'] = backend
+    db.session.expire_all()
+    started = time.perf_counter()
+    report = ReportService.generate_activity_report(start_date, end_date)
+    return report, time.perf_counter() - started
+
+
+def test_columnar_activity_report_is_faster_than_python_backend(rollup, db_app, record_property):
+    """Silnik kolumnowy liczy raport aktywności z rollupu szybciej niż ścieżka w Pythonie."""
+    start_date, end_date = datetime(2025, 1, 1), datetime(2025, 12, 31)
+
+    expected, python_seconds = timed_activity_report(db_app, 'python', start_date, end_date)
+    actual, columnar_seconds = timed_activity_report(db_app, 'numpy', start_date, end_date)
+
+    record_property('rollup_rows', ROLLUP_ROWS)
+    record_property('python_seconds', round(python_seconds, 3))
+    record_property('columnar_seconds', round(columnar_seconds, 3))
+    assert actual['total_tasks'] == expected['total_tasks']
+    assert actual['total_hours'] == pytest.approx(expected['total_hours'])
+    for name, activity in expected['daily_activity']['2025-03-14']['users'].items():
+        assert actual['daily_activity']['2025-03-14']['users'][name] == pytest.approx(activity)
+    for name, summary in expected['user_summary'].items():
+        assert actual['user_summary'][name] == pytest.approx(summary)
+    assert columnar_seconds < python_seconds
@@ -0,0 +1,115 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models import User, Team, Project, Role, Leave, Worklog, TeamMembership
+from app.models.issue import Issue
+from app.models.user_role import UserRole
+from app.services.report_service import (generate_team_availability_report, generate_leave_usage_report,
+                                         generate_cost_tracking_report)
+from app.utils.loaders import BatchLoader, get_loader
+
+PERIOD = {'start_date': '2026-10-01', 'end_date': '2026-10-31'}
+
+
+@pytest.fixture
+def count_queries(db_app):
+    """Zwraca funkcję rozpoczynającą zliczanie zapytań; nasłuch jest usuwany po teście."""
+    listeners = []
+
+    def start():
+        statements = []
+
+        def record(*args):
+            statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', record)
+        listeners.append(record)
+        return statements
+
+    yield start
+    for record in listeners:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def make_team(name, size):
+    team = Team(name=name)
+    users = [User(username=f'{name}-{i}', email=f'{name}-{i}@example.com') for i in range(size)]
+    db.session.add_all([team] + users)
+    db.session.flush()
+    for user in users:
+        db.session.add(TeamMembership(team_id=team.id, user_id=user.id))
+        db.session.add(Leave(user_id=user.id, leave_type='vacation', status='approved',
+                             start_date=datetime(2026, 10, 5), end_date=datetime(2026, 10, 6)))
+    db.session.commit()
+    return team
+
+
+def test_loader_batches_and_caches(db_app, count_queries):
+    """Loader pobiera brakujące wiersze jednym zapytaniem i pamięta także brakujące id."""
+    users = [User(username=f'u{i}', email=f'u{i}@example.com') for i in range(3)]
+    db.session.add_all(users)
+    db.session.commit()
+    ids = [user.id for user in users]
+    loader = BatchLoader()
+
+    statements = count_queries()
+    rows = loader.load_many(User, [ids[0], ids[1], 999, ids[0]])
+    assert len(statements) == 1
+    assert rows[999] is None and rows[ids[1]].username == 'u1'
+
+    assert loader.load(User, ids[1]) is rows[ids[1]]
+    loader.load_many(User, [ids[0], 999])
+    assert len(statements) == 1
+    assert get_loader() is get_loader()
+
+
+@pytest.mark.parametrize('size', [3, 30])
+def test_team_availability_query_count_is_constant(db_app, count_queries, size):
+    """Liczba zapytań raportu dostępności nie zależy od wielkości zespołu."""
+    team_id = make_team('team', size).id
+    get_loader().clear()
+
+    statements = count_queries()
+    report = generate_team_availability_report(dict(PERIOD, team_id=team_id))
+
+    assert len(statements) == 3
+    assert len(report['team_availability']) == size
+    assert report['team_availability']['team-0'] == {
+        'total_days': 31, 'leave_days': 2, 'available_days': 29,
+        'availability_percentage': pytest.approx(29 / 31 * 100)
+    }
+
+
+def test_leave_usage_and_cost_tracking_use_batched_lookups(db_app, count_queries):
+    """Raporty urlopów i kosztów pobierają użytkowników i projekty jednym zapytaniem."""
+    team = make_team('team', 5)
+    role = Role(name='developer', hourly_rate=100)
+    projects = [Project(name=f'Project {k}', jira_key=k, jira_id=str(i)) for i, k in enumerate('AB')]
+    db.session.add_all([role] + projects)
+    db.session.flush()
+    for project in projects:
+        issue = Issue(jira_key=f'{project.jira_key}-1', jira_id=f'{project.id}1', project_id=project.id)
+        db.session.add(issue)
+        db.session.flush()
+        for membership in TeamMembership.query.filter_by(team_id=team.id):
+            db.session.add(Worklog(user_id=membership.user_id, project_id=project.id, issue_id=issue.id,
+                                   time_spent_seconds=3600, work_date=datetime(2026, 10, 7)))
+    db.session.add(UserRole(user_id=TeamMembership.query.first().user_id, role_id=role.id))
+    team_1 = User.query.filter_by(username='team-1').one()
+    db.session.add(Leave(user_id=team_1.id, leave_type='vacation', status='approved',
+                         start_date=datetime(2026, 10, 12, 8), end_date=datetime(2026, 10, 14, 16)))
+    db.session.commit()
+    team_id = team.id
+    get_loader().clear()
+
+    statements = count_queries()
+    usage = generate_leave_usage_report(dict(PERIOD, team_id=team_id))
+    assert len(statements) == 2
+    assert 'GROUP BY' in statements[0] and 'sum(' in statements[0]
+    assert usage['leave_usage']['team-1'] == {'vacation': 5.0}
+    assert usage['leave_usage']['team-2'] == {'vacation': 2.0}
+
+    del statements[:]
+    costs = generate_cost_tracking_report(PERIOD)
+    assert len(statements) == 2
+    assert costs['cost_tracking']['Project A']['roles']['developer'] == {'hours': 1.0, 'rate': 100.0, 'cost': 100.0}
@@ -0,0 +1,87 @@
+from datetime import date, datetime, timedelta
+from app.extensions import db, cache
+from app.models import Holiday, Team
+from app.services.business_calendar import BusinessCalendar, get_business_calendar
+
+
+def brute_force(start, end, holidays, work_days=(1, 2, 3, 4, 5)):
+    days = (end - start).days + 1
+    return sum(1 for i in range(days)
+               if (start + timedelta(days=i)).isoweekday() in work_days
+               and start + timedelta(days=i) not in holidays)
+
+
+def test_working_days_match_day_by_day_count():
+    """Liczba dni roboczych zgadza się z liczeniem dzień po dniu dla dowolnych zakresów."""
+    holidays = {date(2026, 1, 1), date(2026, 1, 6), date(2026, 5, 1), date(2026, 5, 3),
+                date(2026, 11, 11), date(2026, 12, 25), date(2026, 12, 26)}
+    calendar = BusinessCalendar(holidays=holidays)
+    start = date(2026, 1, 1)
+    for offset in range(0, 365, 17):
+        for length in (0, 1, 6, 7, 30, 200):
+            first, last = start + timedelta(days=offset), start + timedelta(days=offset + length)
+            assert calendar.working_days(first, last) == brute_force(first, last, holidays)
+            assert calendar.working_days(first, last, (1, 3, 6)) == brute_force(first, last, holidays, (1, 3, 6))
+    assert not calendar.is_working_day(date(2026, 11, 11))
+    assert calendar.is_working_day(datetime(2026, 11, 12))
+    assert calendar.working_days(date(2026, 2, 1), date(2026, 1, 1)) == 0
+
+
+def test_region_holidays_only_apply_to_region(db_app):
+    """Święta regionalne liczą się tylko w kalendarzu swojego regionu."""
+    db.session.add_all([
+        Holiday(date=date(2026, 11, 11), name='Niepodległości', country_code='PL'),
+        Holiday(date=date(2026, 11, 12), name='Regionalne', country_code='PL', region='Slask'),
+    ])
+    db.session.commit()
+
+    assert get_business_calendar().working_days(date(2026, 11, 9), date(2026, 11, 13)) == 4
+    assert get_business_calendar('PL', 'Slask').working_days(date(2026, 11, 9), date(2026, 11, 13)) == 3
+
+
+def test_commit_of_holidays_invalidates_cache(db_app):
+    """Zapis nowego święta unieważnia zbuforowany kalendarz."""
+    assert Holiday.get_working_days(datetime(2026, 11, 9), datetime(2026, 11, 13)) == 5
+    calendar = get_business_calendar()
+
+    db.session.add(Holiday(date=date(2026, 11, 11), name='Niepodległości', country_code='PL'))
+    db.session.commit()
+
+    assert get_business_calendar() is not calendar
+    assert Holiday.get_working_days(datetime(2026, 11, 9), datetime(2026, 11, 13)) == 4
+
+
+def test_holidays_committed_elsewhere_reload_the_calendar(db_app):
+    """Kalendarz zależy od wersji tagu 'holidays' - zmiana w innym procesie też go przeładowuje."""
+    calendar = get_business_calendar()
+    assert get_business_calendar() is calendar
+
+    # Inny proces dopisuje święto i podbija wersję tagu we wspólnym cache'u
+    with db.engine.begin() as connection:
+        connection.execute(Holiday.__table__.insert().values(
+            date=date(2026, 11, 11), name='Niepodległości', country_code='PL'))
+    cache.invalidate_tags('holidays')
+
+    assert get_business_calendar().working_days(date(2026, 11, 9), date(2026, 11, 13)) == 4
+
+
+def test_savepoint_does_not_reload_the_calendar_before_commit(db_app):
+    """Zwolnienie savepointu nie odświeża kalendarza - dopiero zatwierdzenie całej transakcji."""
+    calendar = get_business_calendar()
+    with db.session.begin_nested():
+        db.session.add(Holiday(date=date(2026, 11, 11), name='Niepodległości', country_code='PL'))
+    assert get_business_calendar() is calendar
+
+    db.session.commit()
+    assert get_business_calendar().working_days(date(2026, 11, 9), date(2026, 11, 13)) == 4
+
+
+def test_team_expected_hours_use_calendar(db_app):
+    """Oczekiwane godziny zespołu pomijają weekendy i święta."""
+    team = Team(name='Team')
+    db.session.add_all([team, Holiday(date=date(2026, 11, 11), name='Niepodległości', country_code='PL')])
+    db.session.commit()
+
+    settings = team.get_settings()
+    assert team.get_expected_hours(datetime(2026, 11, 1), datetime(2026, 11, 30)) == \
+        20 * settings['default_work_hours']
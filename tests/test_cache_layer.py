@@ -0,0 +1,125 @@
+import threading
+import time
+from flask import Flask, jsonify
+from app.cache import TieredCache
+
+
+def make_cache(tmp_path, **config):
+    app = Flask(__name__)
+    app.config.update(CACHE_TYPE='sqlite', CACHE_SQLITE_PATH=str(tmp_path / 'cache.sqlite3'))
+    app.config.update(config)
+    cache = TieredCache()
+    cache.init_app(app)
+    return app, cache
+
+
+def test_local_lru_is_bounded_and_counts_evictions(tmp_path):
+    """LRU procesu trzyma się limitu wpisów i bajtów, usunięcia liczone są per przestrzeń nazw."""
+    _, cache = make_cache(tmp_path, CACHE_TYPE='simple', CACHE_LOCAL_MAX_ITEMS=3, CACHE_LOCAL_MAX_BYTES=10_000)
+    for i in range(5):
+        cache.set(i, 'x' * 100, namespace='reports')
+    assert cache.get(2, namespace='reports') == 'x' * 100
+    cache.set('big', 'y' * 6000, namespace='views')
+    cache.set('bigger', 'y' * 6000, namespace='views')
+
+    stats = cache.stats()
+    assert stats['local']['items'] <= 3 and stats['local']['bytes'] <= 10_000
+    assert cache.get(0, namespace='reports') is None
+    assert cache.get('bigger', namespace='views') == 'y' * 6000
+    assert stats['namespaces']['reports']['evictions'] == 5
+    assert stats['namespaces']['views']['evictions'] == 1
+    assert stats['namespaces']['reports']['hits'] == 1
+
+
+def test_shared_backend_is_seen_by_other_processes(tmp_path):
+    """Druga instancja (inny proces) czyta wpisy z pliku i czyści przestrzeń nazw dla wszystkich."""
+    _, first = make_cache(tmp_path)
+    _, second = make_cache(tmp_path)
+
+    first.set('q1', {'total': 7}, namespace='worklog_stats')
+    first.set('q1', 'other', namespace='reports')
+    assert second.get('q1', namespace='worklog_stats') == {'total': 7}
+    assert second.metrics.snapshot()['worklog_stats']['shared_hits'] == 1
+
+    second.clear('worklog_stats')
+    first._local.clear()
+    assert first.get('q1', namespace='worklog_stats') is None
+    assert first.get('q1', namespace='reports') == 'other'
+
+
+def test_get_or_set_computes_once_for_concurrent_callers(tmp_path):
+    """Równoczesne chybienia na tym samym kluczu liczą wartość tylko raz."""
+    _, cache = make_cache(tmp_path)
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        time.sleep(0.2)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_set('k', expensive, namespace='jira')))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+    assert cache.metrics.snapshot()['jira']['coalesced'] == 7
+
+
+def test_memoize_and_view_cache(tmp_path):
+    """Memoize cache'uje per argumenty, a widok zapisuje tylko odpowiedzi 200."""
+    app, cache = make_cache(tmp_path)
+    calls = []
+
+    @cache.memoize(timeout=60)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    cache.delete_memoized(square, 3)
+    square(3)
+    assert calls == [3, 4, 3]
+
+    hits, hits_flags = [], set()
+
+    @app.route('/data')
+    @cache.cached(timeout=60)
+    def data():
+        hits.append(1)
+        if 'fail' in hits_flags:
+            return jsonify(error='boom'), 500
+        return jsonify(value=len(hits))
+
+    client = app.test_client()
+    assert client.get('/data?a=1').get_json() == {'value': 1}
+    assert client.get('/data?a=1').get_json() == {'value': 1}
+    assert client.get('/data?a=2').get_json() == {'value': 2}
+
+    hits_flags.add('fail')
+    assert client.get('/data?a=3').status_code == 500
+    assert client.get('/data?a=3').status_code == 500
+    assert len(hits) == 4
+
+
+def test_backend_errors_degrade_to_local_cache(tmp_path):
+    """Awaria backendu współdzielonego nie psuje żądań - liczona jest jako błąd i chybienie."""
+    _, cache = make_cache(tmp_path)
+
+    class Broken:
+        name = 'broken'
+
+        def __getattr__(self, item):
+            def fail(*args):
+                raise ConnectionError('down')
+            return fail
+
+    cache._shared = Broken()
+    assert cache.get_or_set('k', lambda: 'value', namespace='jira') == 'value'
+    assert cache.get('k', namespace='jira') == 'value'
+    assert cache.metrics.snapshot()['jira']['errors'] >= 1
@@ -0,0 +1,160 @@
+from datetime import datetime
+import time
+import pytest
+from flask import Flask, current_app
+from sqlalchemy import event
+from app.extensions import db
+from app.cache import TieredCache, cache, tag
+from app.models import User, Team, Project, Worklog, TeamMembership
+from app.models.issue import Issue
+from app.models.cache_tags import team_tags
+
+
+@pytest.fixture
+def tagged_app(db_app):
+    cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+    users = [User(username=f'user{i}', email=f'user{i}@example.com') for i in range(2)]
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    team = Team(name='Team')
+    db.session.add_all(users + [project, team])
+    db.session.flush()
+    issue = Issue(jira_key='P-1', jira_id='1', project_id=project.id)
+    db.session.add_all([issue, TeamMembership(team_id=team.id, user_id=users[0].id)])
+    db.session.flush()
+    for user in users:
+        db.session.add(Worklog(user_id=user.id, project_id=project.id, issue_id=issue.id,
+                               time_spent_seconds=3600, work_date=datetime(2026, 10, 5)))
+    db.session.commit()
+    return [u.id for u in users], project.id, issue.id, team.id
+
+
+def stats(user_id):
+    from app.routes.admin import _worklog_stats
+    return _worklog_stats(None, None, None, user_id)['total_count']
+
+
+def make_shared_caches(tmp_path, local_timeout=60):
+    caches = []
+    for _ in range(2):
+        app = Flask(__name__)
+        app.config.update(CACHE_TYPE='sqlite', CACHE_SQLITE_PATH=str(tmp_path / 'cache.sqlite3'),
+                          CACHE_LOCAL_TIMEOUT=local_timeout)
+        caches.append(TieredCache(app))
+    return caches
+
+
+def test_tags_invalidate_entries_in_every_process(tmp_path):
+    """Unieważnienie tagu widzi od razu ten proces, inne najpóźniej po CACHE_LOCAL_TIMEOUT; wpisy bez tagu zostają."""
+    first, second = make_shared_caches(tmp_path, local_timeout=0.2)
+
+    first.set('a', 1, namespace='stats', tags=[tag('team', 1), tag('user', 5)])
+    first.set('b', 2, namespace='stats', tags=[tag('team', 2)])
+    assert second.get('a', namespace='stats') == 1
+
+    second.invalidate_tags(tag('user', 5))
+    assert second.get('a', namespace='stats') is None
+    time.sleep(0.25)
+    assert first.get('a', namespace='stats') is None
+    assert first.get('b', namespace='stats') == 2
+    assert first.metrics.snapshot()['stats']['stale'] == 1
+
+
+def test_local_hits_reuse_recent_tag_versions(tmp_path):
+    """Trafienie w LRU nie pyta backendu o wersje tagów; wpis innego procesu z nowszą wersją nie jest odrzucany."""
+    first, second = make_shared_caches(tmp_path)
+    first.set('a', 1, namespace='stats', tags=['worklogs'])
+    calls = []
+    get_many = first._shared.get_many
+    first._shared.get_many = lambda keys: calls.append(keys) or get_many(keys)
+
+    assert [first.get('a', namespace='stats') for _ in range(3)] == [1, 1, 1]
+    assert calls == []
+
+    # Inny proces unieważnia tag i zapisuje nową wartość - pierwszy sprawdza backend dopiero przy niezgodności
+    second.invalidate_tags('worklogs')
+    second.set('b', 2, namespace='stats', tags=['worklogs'])
+    assert first.get('b', namespace='stats') == 2
+    assert len(calls) == 1
+    assert first.get('a', namespace='stats') is None
+
+
+def test_change_during_computation_is_not_cached_as_current(tmp_path):
+    """Wynik liczony przed zmianą danych nie jest później podawany jako aktualny."""
+    app = Flask(__name__)
+    app.config.update(CACHE_TYPE='simple')
+    local = TieredCache(app)
+
+    def compute():
+        local.invalidate_tags('worklogs')  # zapis w trakcie liczenia
+        return 'old'
+
+    assert local.get_or_set('k', compute, tags=['worklogs']) == 'old'
+    assert local.get_or_set('k', lambda: 'new', tags=['worklogs']) == 'new'
+
+
+def test_worklog_commit_invalidates_only_dependent_stats(tagged_app):
+    """Zapis worklogu unieważnia statystyki jego użytkownika dopiero po commicie, inne zostają."""
+    (first, second), project_id, issue_id, _ = tagged_app
+    assert (stats(first), stats(second)) == (1, 1)
+
+    db.session.add(Worklog(user_id=first, project_id=project_id, issue_id=issue_id,
+                           time_spent_seconds=600, work_date=datetime(2026, 10, 6)))
+    db.session.flush()
+    assert stats(first) == 1  # jeszcze bez commitu
+    db.session.rollback()
+    assert stats(first) == 1
+
+    db.session.add(Worklog(user_id=first, project_id=project_id, issue_id=issue_id,
+                           time_spent_seconds=600, work_date=datetime(2026, 10, 6)))
+    db.session.commit()
+
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    assert stats(second) == 1
+    assert statements == []
+    assert stats(first) == 2
+
+
+def test_moved_worklog_and_membership_change_invalidate_both_sides(tagged_app):
+    """Przeniesienie worklogu unieważnia starego i nowego użytkownika, zmiana składu - zespół."""
+    (first, second), _, _, team_id = tagged_app
+    assert (stats(first), stats(second)) == (1, 1)
+    cache.set('report', 'cached', namespace='reports', tags=team_tags(team_id))
+
+    worklog = Worklog.query.filter_by(user_id=first).one()
+    worklog.user_id = second
+    db.session.commit()
+    assert (stats(first), stats(second)) == (0, 2)
+    assert cache.get('report', namespace='reports') is None
+
+    cache.set('report', 'cached', namespace='reports', tags=team_tags(team_id))
+    db.session.add(TeamMembership(team_id=team_id, user_id=second))
+    db.session.commit()
+    assert cache.get('report', namespace='reports') is None
+
+
+def test_savepoints_do_not_invalidate_before_the_real_commit(tagged_app):
+    """Zwolnienie lub wycofanie savepointu nie unieważnia tagów - dopiero commit całej transakcji."""
+    (first, _), project_id, issue_id, _ = tagged_app
+    assert stats(first) == 1
+
+    with db.session.begin_nested():
+        db.session.add(Worklog(user_id=first, project_id=project_id, issue_id=issue_id,
+                               time_spent_seconds=600, work_date=datetime(2026, 10, 6)))
+    assert tag('user', first) in db.session.info['cache_tags']
+    try:
+        with db.session.begin_nested():
+            db.session.add(Worklog(user_id=first, project_id=project_id, issue_id=issue_id,
+                                   time_spent_seconds=-1, work_date=None))
+            db.session.flush()
+    except Exception:
+        pass
+    assert tag('user', first) in db.session.info['cache_tags']
+
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    assert stats(first) == 1  # wpis sprzed commitu nadal aktualny, bez zapytań
+    assert statements == []
+
+    db.session.commit()
+    assert stats(first) == 2
@@ -0,0 +1,146 @@
+from datetime import date, datetime
+import pytest
+from flask import current_app
+from flask_login import LoginManager
+from werkzeug.datastructures import MultiDict
+from app.extensions import db, cache
+from app.models import User, Team, TeamCapacity, SyncJob, SyncLease, CacheWarmupKey
+from app.routes.team_capacity import team_capacity_bp
+from app.services.cache_warmup import CacheWarmer, RequestCounter, WARM_TARGETS, month_periods, get_request_counter
+from app.services.sync_coordinator import SyncCoordinator, LEASE_NAME
+
+
+@pytest.fixture(autouse=True)
+def counter(monkeypatch):
+    """Każdy test liczy żądania od zera, bez liczników poprzednich testów."""
+    monkeypatch.setattr('app.services.cache_warmup._counter', RequestCounter())
+
+
+@pytest.fixture
+def client(db_app):
+    cache.init_app(db_app, config={'CACHE_TYPE': 'SimpleCache'})
+    admin = User(username='admin', email='admin@example.com', is_active=True, is_superadmin=True)
+    teams = [Team(name='Alpha'), Team(name='Beta')]
+    db.session.add_all([admin] + teams)
+    db.session.commit()
+
+    db_app.secret_key = 'test'
+    login_manager = LoginManager(db_app)
+    login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+    login_manager.request_loader(lambda req: db.session.get(User, admin.id) if req.headers.get('X-User') else None)
+    db_app.register_blueprint(team_capacity_bp)
+
+    test_client = db_app.test_client()
+    test_client.team_ids = [team.id for team in teams]
+    return test_client
+
+
+def capacity(client, team_id, month):
+    return client.get(f'/api/team-capacity/{team_id}?year=2026&month={month}', headers={'X-User': '1'})
+
+
+def test_month_periods_cover_current_and_previous_month():
+    """Rozgrzewany jest bieżący i poprzedni miesiąc, także na przełomie roku."""
+    assert month_periods(date(2026, 1, 15)) == [('2026-01', date(2026, 1, 1), date(2026, 1, 31)),
+                                                ('2025-12', date(2025, 12, 1), date(2025, 12, 31))]
+
+
+def test_popular_parameter_sets_are_warmed_for_both_months(client):
+    """Najczęstsze zestawy parametrów (bez okresu) są liczone po synchronizacji dla dwóch miesięcy."""
+    alpha, beta = client.team_ids
+    for month in (8, 9, 10):
+        assert capacity(client, alpha, month).status_code == 200
+    assert capacity(client, beta, 10).status_code == 200
+
+    assert CacheWarmupKey.query.count() == 0  # liczniki są w pamięci procesu do zapisu
+    assert get_request_counter().flush() == 2
+    keys = {key.get_params()['view_args']['team_id']: key for key in CacheWarmupKey.query}
+    assert (keys[alpha].request_count, keys[beta].request_count) == (3, 1)
+    assert keys[alpha].get_params()['args'] == {}  # rok i miesiąc podstawia rozgrzewanie
+
+    # Synchronizacja zmienia dane - wpisy cache'u dla zespołu przestają być aktualne
+    for row in TeamCapacity.query.filter_by(team_id=alpha):
+        row.working_days = 20
+    db.session.commit()
+
+    current_app.config['CACHE_WARMUP_TOP_N'] = 1
+    summary = CacheWarmer().warm(today=date(2026, 10, 18))
+    assert (summary['keys'], summary['requests'], summary['failed']) == (1, 2, 0)
+
+    warmed = db.session.get(CacheWarmupKey, keys[alpha].id)
+    stats = warmed.get_warm_stats()
+    assert set(stats) == {'2026-10', '2026-09'}
+    assert all(entry['status'] == 200 and entry['seconds'] >= 0 for entry in stats.values())
+    assert warmed.last_warm_seconds is not None and warmed.request_count == 3  # rozgrzewanie nie liczy się jako żądanie
+    assert db.session.get(CacheWarmupKey, keys[beta].id).last_warmed_at is None
+
+    hits = cache.stats()['namespaces']['team_capacity']['hits']
+    assert capacity(client, alpha, 9).get_json()['data']['working_days'] == 20
+    assert cache.stats()['namespaces']['team_capacity']['hits'] == hits + 1
+
+    # Po upływie CACHE_WARMUP_FLUSH_SECONDS liczniki zapisuje kolejne żądanie
+    current_app.config['CACHE_WARMUP_FLUSH_SECONDS'] = 0
+    capacity(client, beta, 10)
+    db.session.expire_all()
+    assert db.session.get(CacheWarmupKey, keys[beta].id).request_count == 2
+
+
+def test_default_month_is_part_of_the_cache_key(client, monkeypatch):
+    """Bez roku i miesiąca odpowiedź z cache'u dotyczy bieżącego miesiąca także po jego zmianie."""
+    now = [datetime(2026, 10, 31, 23)]
+
+    class Clock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now[0]
+    monkeypatch.setattr('app.routes.team_capacity.datetime', Clock)
+    alpha = client.team_ids[0]
+
+    def current_month():
+        data = client.get(f'/api/team-capacity/{alpha}', headers={'X-User': '1'}).get_json()['data']
+        return data['year'], data['month']
+
+    assert current_month() == (2026, 10)
+    assert current_month() == (2026, 10)
+    now[0] = datetime(2026, 11, 1, 1)
+    assert current_month() == (2026, 11)
+
+
+def test_ranges_ending_today_are_warmed_up_to_the_warm_up_day(db_app, monkeypatch):
+    """Zakres "ostatnie N dni" jest zapamiętywany jako długość i rozgrzewany względem dnia rozgrzewania."""
+    workload = WARM_TARGETS['workload']
+    last_30 = workload.shape({}, MultiDict({'date_range': '2026-09-19 - 2026-10-18', 'team_id': '1'}),
+                             today=date(2026, 10, 18))
+    assert last_30 == {'view_args': {}, 'args': {'team_id': ['1']}, 'last_days': 30}
+    fixed = workload.shape({}, MultiDict({'date_range': '2026-09-01 - 2026-09-30'}), today=date(2026, 10, 18))
+    assert 'last_days' not in fixed
+
+    db.session.add(User(username='admin', email='admin@example.com', is_active=True, is_superadmin=True))
+    db.session.commit()
+    CacheWarmupKey.record('workload', last_30)
+    warmed = []
+    monkeypatch.setattr(CacheWarmer, '_warm_one', staticmethod(
+        lambda target, params, start, end, user: warmed.append(target.query_string(params, start, end))
+        or {'seconds': 0.0, 'status': 200}))
+
+    CacheWarmer().warm(today=date(2026, 10, 25))
+    assert warmed == ['team_id=1&date_range=2026-09-26+-+2026-10-25']
+    assert set(CacheWarmupKey.query.one().get_warm_stats()) == {'last-30-days'}
+
+
+def test_warm_up_runs_once_after_the_queue_is_drained(db_app, monkeypatch):
+    """Po opróżnieniu kolejki z ukończonymi synchronizacjami rozgrzewanie startuje jeden raz, już bez blokady."""
+    calls = []
+    monkeypatch.setattr('app.services.cache_warmup.CacheWarmer.warm',
+                        lambda self: calls.append(SyncLease.holder(LEASE_NAME)))
+    coordinator = SyncCoordinator()
+    monkeypatch.setattr(coordinator, '_execute', lambda job: {'total': 1})
+
+    coordinator.enqueue('users')
+    coordinator.enqueue('projects')
+    assert coordinator.drain() == 2
+    assert calls == [None]
+    assert SyncJob.query.filter_by(status='completed').count() == 2
+
+    assert coordinator.drain() == 0
+    assert calls == [None]
@@ -0,0 +1,95 @@
+from datetime import datetime
+import pytest
+from flask import jsonify, request
+from sqlalchemy import event
+from app.extensions import db, cache
+from app.models import User, Leave
+from app.utils.http_cache import conditional
+
+
+@pytest.fixture
+def client(db_app):
+    cache.init_app(db_app, config={'CACHE_TYPE': 'SimpleCache'})
+    user = User(username='user', email='user@example.com')
+    db.session.add(user)
+    db.session.commit()
+    calls = []
+    client_day = ['2026-10-18']
+
+    @db_app.route('/api/team-leaves')
+    @conditional(tags=lambda: ['leaves', 'users'])
+    def team_leaves():
+        calls.append('leaves')
+        return jsonify(count=Leave.query.count())
+
+    @db_app.route('/api/recent')
+    @conditional(tags=lambda: ['leaves'], vary=lambda: None if request.args.get('day') else client_day[0])
+    def recent():
+        calls.append('recent')
+        return jsonify(day=request.args.get('day') or client_day[0])
+
+    @db_app.route('/api/live')
+    @conditional()
+    def live():
+        calls.append('live')
+        return jsonify(value=1)
+
+    test_client = db_app.test_client()
+    test_client.calls = calls
+    test_client.day = client_day
+    test_client.user_id = user.id
+    return test_client
+
+
+def test_unchanged_data_is_answered_with_304_before_the_view(client):
+    """Niezmienione dane: 304 bez wywołania widoku i bez zapytań do bazy."""
+    first = client.get('/api/team-leaves?start_date=2026-10-01')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert 'private' in first.headers['Cache-Control'] and 'no-cache' in first.headers['Cache-Control']
+
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    second = client.get('/api/team-leaves?start_date=2026-10-01', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert statements == []
+    assert client.calls == ['leaves']
+
+    other = client.get('/api/team-leaves?start_date=2026-11-01', headers={'If-None-Match': etag})
+    assert other.status_code == 200
+
+
+def test_data_change_produces_new_etag(client):
+    """Zapis urlopu zmienia ETag, więc klient dostaje nowe dane."""
+    etag = client.get('/api/team-leaves').headers['ETag']
+    db.session.add(Leave(user_id=client.user_id, leave_type='vacation', status='approved',
+                         start_date=datetime(2026, 10, 5), end_date=datetime(2026, 10, 6)))
+    db.session.commit()
+
+    response = client.get('/api/team-leaves', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json() == {'count': 1}
+    assert response.headers['ETag'] != etag
+
+
+def test_view_without_tags_uses_body_hash(client):
+    """Widok bez tagów (dane z JIRA) liczy ETag z treści - oszczędza transfer, nie pracę."""
+    etag = client.get('/api/live').headers['ETag']
+    response = client.get('/api/live', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert client.calls == ['live', 'live']
+
+
+def test_default_period_is_part_of_the_etag(client):
+    """Domyślny okres liczony od dzisiaj zmienia ETag, gdy mija dzień - podany jawnie już nie."""
+    etag = client.get('/api/recent').headers['ETag']
+    assert client.get('/api/recent', headers={'If-None-Match': etag}).status_code == 304
+
+    client.day[0] = '2026-10-19'
+    moved = client.get('/api/recent', headers={'If-None-Match': etag})
+    assert moved.status_code == 200 and moved.get_json() == {'day': '2026-10-19'}
+
+    explicit = client.get('/api/recent?day=2026-10-01').headers['ETag']
+    client.day[0] = '2026-10-20'
+    assert client.get('/api/recent?day=2026-10-01', headers={'If-None-Match': explicit}).status_code == 304
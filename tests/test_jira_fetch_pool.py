@@ -0,0 +1,72 @@
+import threading
+import time
+from types import SimpleNamespace
+from app.services.jira_fetch_pool import JiraFetchPool, TokenBucket, retry_after_seconds
+
+
+class ThrottledError(Exception):
+    def __init__(self, retry_after):
+        super().__init__('429')
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers={'Retry-After': retry_after})
+
+
+def test_retry_after_is_parsed_only_for_throttling_errors():
+    """Retry-After jest brany pod uwagę tylko dla odpowiedzi 429/503."""
+    assert retry_after_seconds(ThrottledError('2')) == 2.0
+    assert retry_after_seconds(ValueError('boom')) is None
+
+
+def test_map_returns_every_item_and_bounds_concurrency():
+    """Pula zwraca wszystkie wyniki i nie przekracza limitu równoległości."""
+    active = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def fetch(item):
+        with lock:
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+        time.sleep(0.01)
+        with lock:
+            active['now'] -= 1
+        return item * 2
+
+    pool = JiraFetchPool(max_workers=3, requests_per_second=1000, queue_size=2)
+    results = {item: value for item, value, error in pool.map(fetch, range(20))}
+
+    assert results == {i: i * 2 for i in range(20)}
+    assert active['max'] <= 3
+
+
+def test_throttled_request_is_retried_after_pause():
+    """Odpowiedź 429 wstrzymuje pulę i ponawia zapytanie."""
+    attempts = []
+
+    def fetch(item):
+        attempts.append(item)
+        if len(attempts) == 1:
+            raise ThrottledError('0.05')
+        return 'ok'
+
+    pool = JiraFetchPool(max_workers=1, requests_per_second=1000)
+    outcome = list(pool.map(fetch, ['A']))
+
+    assert outcome == [('A', 'ok', None)]
+    assert pool.stats['retries'] == 1
+
+
+def test_consumer_can_stop_early():
+    """Przerwanie konsumpcji nie blokuje wątków roboczych."""
+    pool = JiraFetchPool(max_workers=2, requests_per_second=1000, queue_size=1)
+    for item, value, error in pool.map(lambda i: i, range(1000)):
+        break
+    assert threading.active_count() < 10
+
+
+def test_token_bucket_limits_rate():
+    """Kubełek tokenów ogranicza tempo zapytań."""
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.09
@@ -0,0 +1,95 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from flask import Flask
+from app.monitoring import monitor
+from app.services.jira_http import create_jira_session, connection_stats
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.server.posts.append(self.path)
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.send_response(502)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.posts = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def jira_server(http_server):
+    return f'http://127.0.0.1:{http_server.server_address[1]}'
+
+
+def test_session_reuses_connections_between_requests(jira_server):
+    """Kolejne strony zapytań korzystają z tego samego połączenia keep-alive."""
+    session = create_jira_session()
+
+    for start in range(0, 250, 50):
+        response = session.get(f'{jira_server}/rest/api/2/user/search', params={'startAt': start})
+        assert response.json()['path'].startswith('/rest/api/2/user/search')
+
+    stats = connection_stats(session)
+    assert stats['requests'] == 5
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 4
+    assert stats['hosts'] == 1
+
+
+def test_session_applies_default_timeout_and_gzip():
+    """Sesja ustawia domyślny timeout i akceptuje kompresję gzip."""
+    session = create_jira_session()
+
+    assert session.timeout == (5.0, 30.0)
+    assert 'gzip' in session.headers['Accept-Encoding']
+
+
+def test_connection_stats_are_exposed_to_monitoring():
+    """Liczniki ponownego użycia połączeń są dostępne w metrykach monitoringu."""
+    assert 'jira_http' in monitor.get_metrics()['gauges']
+
+
+def test_only_read_only_posts_are_retried(http_server, jira_server):
+    """POST jest ponawiany tylko dla /worklog/list; pozostałe POST-y idą raz."""
+    app = Flask(__name__)
+    app.config['JIRA_HTTP_RETRIES'] = 1
+    with app.app_context():
+        session = create_jira_session()
+
+    session.post(f'{jira_server}/rest/api/2/issue', json={'fields': {}})
+    assert http_server.posts == ['/rest/api/2/issue']
+
+    http_server.posts.clear()
+    session.post(f'{jira_server}/rest/api/2/worklog/list', json={'ids': [1]})
+    assert http_server.posts == ['/rest/api/2/worklog/list'] * 2
+
+
+def test_throttling_is_left_to_the_fetch_pool():
+    """429 nie jest ponawiany przez urllib3, robi to JiraFetchPool według Retry-After."""
+    session = create_jira_session()
+
+    assert 429 not in session.get_adapter('https://jira.example.com/rest/api/2/search').max_retries.status_forcelist
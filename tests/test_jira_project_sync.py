@@ -0,0 +1,101 @@
+import pytest
+from types import SimpleNamespace
+from app.extensions import db
+from app.models import Project
+from app.services.jira_service import JiraService
+
+
+class FakeJira:
+    """Udaje klienta jira z listą projektów i szczegółami pobieranymi osobno."""
+
+    def __init__(self, projects):
+        self._projects = projects
+        self.detail_calls = 0
+
+    def server_info(self):
+        return {}
+
+    def projects(self):
+        return [SimpleNamespace(id=p['id'], key=p['key'], name=p['name']) for p in self._projects]
+
+    def project(self, key):
+        self.detail_calls += 1
+        if key == 'BROKEN':
+            raise RuntimeError('boom')
+        data = next(p for p in self._projects if p['key'] == key)
+        return SimpleNamespace(key=key, description=data.get('description'))
+
+
+@pytest.fixture
+def jira_service(db_app):
+    service = JiraService.__new__(JiraService)
+    service.config = object()
+    service._base_url = 'http://jira.example.com'
+    return service
+
+
+def test_sync_projects_bulk_upserts_with_phase_timings(jira_service):
+    """Synchronizacja projektów tworzy, aktualizuje i pomija niezmienione projekty jednym zapisem."""
+    db.session.add_all([
+        Project(name='Old name', jira_key='AAA', jira_id='1', description='A'),
+        Project(name='Same', jira_key='BBB', jira_id='2', description='B', is_active=True),
+    ])
+    db.session.commit()
+
+    jira_service.jira = FakeJira([
+        {'id': '1', 'key': 'AAA', 'name': 'New name', 'description': 'A'},
+        {'id': '2', 'key': 'BBB', 'name': 'Same', 'description': 'B'},
+        {'id': '3', 'key': 'CCC', 'name': 'Created', 'description': 'C'},
+        {'id': '4', 'key': 'BROKEN', 'name': 'Broken'},
+    ])
+
+    stats = jira_service.sync_projects()
+
+    assert (stats['created'], stats['updated'], stats['unchanged'], stats['errors']) == (1, 1, 1, 1)
+    assert jira_service.jira.detail_calls == 4
+    assert set(stats['timings']) == {'fetch', 'diff', 'write'}
+    assert {p.jira_key: p.name for p in Project.query.all()} == {'AAA': 'New name', 'BBB': 'Same', 'CCC': 'Created'}
+    assert all(p.last_sync for p in Project.query.all())
+
+
+def test_sync_users_writes_only_changed_rows(jira_service):
+    """Synchronizacja użytkowników pobiera wszystkie strony i zapisuje tylko zmienione wiersze."""
+    from app.models import User, Role
+
+    db.session.add(Role(name='user'))
+    db.session.commit()
+    db.session.add_all([
+        User(username='alice', email='alice@example.com', display_name='Alice', jira_id='a-1'),
+        User(username='bob', email='bob@example.com', display_name='Bob', jira_id='b-1',
+             jira_display_name='Bob', jira_email='bob@example.com', jira_active=True, is_active=True),
+    ])
+    db.session.commit()
+
+    directory = [{'accountId': 'a-1', 'name': 'alice', 'displayName': 'Alice Smith',
+                  'emailAddress': 'alice@example.com'},
+                 {'accountId': 'b-1', 'name': 'bob', 'displayName': 'Bob', 'emailAddress': 'bob@example.com'}]
+    directory += [{'accountId': f'n-{i}', 'name': f'new{i}', 'displayName': f'New {i}',
+                   'emailAddress': f'new{i}@example.com'} for i in range(1200)]
+    pages = []
+
+    class Response:
+        def __init__(self, data):
+            self._data = data
+
+        def json(self):
+            return self._data
+
+    def make_request(endpoint, params=None, **kwargs):
+        pages.append(params['startAt'])
+        return Response(directory[params['startAt']:params['startAt'] + params['maxResults']])
+
+    jira_service.jira = FakeJira([])
+    jira_service.make_request = make_request
+    jira_service.sync_users()
+    stats = jira_service.sync_users()
+
+    assert pages == [0, 1000, 0, 1000]
+    assert User.query.count() == 1202
+    assert (stats['created'], stats['updated'], stats['unchanged']) == (0, 0, 1202)
+    assert User.query.filter_by(jira_id='a-1').one().display_name == 'Alice Smith'
+    assert all(u.roles for u in User.query.filter(User.jira_id.like('n-%')).limit(5))
@@ -0,0 +1,96 @@
+from datetime import datetime
+import threading
+import pytest
+from flask import current_app
+from sqlalchemy import event
+from app.extensions import db, cache
+from app.models import User, Project, Worklog
+from app.models.issue import Issue
+from app.services.jira_read_cache import JiraReadCache, normalize_jql
+from app.services.worklog_service import WorklogService
+
+
+@pytest.fixture
+def read_cache(db_app):
+    cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+    calls = []
+
+    def fetch(jql, max_results, fields):
+        calls.append(jql)
+        return {'issues': [{'key': f'P-{len(calls)}', 'fields': {'summary': 'Task'}}], 'total': len(calls)}
+
+    read_cache = JiraReadCache(fetch=fetch)
+    read_cache.calls = calls
+    return read_cache
+
+
+def test_normalize_jql_collapses_whitespace_outside_quotes():
+    """Formatowanie zapytania nie zmienia klucza, wartości w cudzysłowach zostają bez zmian."""
+    assert normalize_jql('  assignee =  "a  b"\n AND   status != Done ') == 'assignee = "a  b" AND status != Done'
+
+
+def test_equivalent_queries_share_one_jira_call(read_cache):
+    """Zapytania różniące się tylko białymi znakami trafiają do JIRA raz."""
+    first = read_cache.search_issues('assignee = "alice" AND status != Done')
+    second = read_cache.search_issues('assignee = "alice"\n   AND status != Done')
+    assert first == second == [{'key': 'P-1', 'fields': {'summary': 'Task'}}]
+    assert len(read_cache.calls) == 1
+
+    read_cache.search_issues('assignee = "bob"')
+    assert len(read_cache.calls) == 2
+
+
+def test_stale_result_is_served_and_refreshed_in_background(read_cache):
+    """Po TTL podawany jest poprzedni wynik, a nowy pobiera jeden wątek w tle."""
+    current_app.config['JIRA_READ_CACHE_TTL'] = 0
+    assert read_cache.count_issues('project = P') == 1
+
+    refreshed = threading.Event()
+    fetch = read_cache._fetch
+
+    def fetch_and_signal(*args):
+        try:
+            return fetch(*args)
+        finally:
+            refreshed.set()
+    read_cache._fetch = fetch_and_signal
+
+    assert read_cache.count_issues('project = P') == 1  # stary wynik, bez czekania na JIRA
+    assert refreshed.wait(5)
+    current_app.config['JIRA_READ_CACHE_TTL'] = 300
+    for _ in range(50):
+        if read_cache.count_issues('project = P') == 2:
+            break
+        threading.Event().wait(0.05)
+    assert read_cache.count_issues('project = P') == 2
+    assert len(read_cache.calls) == 2
+
+
+def test_activity_chart_is_one_query_grouped_by_day(db_app):
+    """Wykres aktywności to jedno zapytanie, dni bez pracy mają zera."""
+    user = User(username='alice', email='alice@example.com')
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    db.session.add_all([user, project])
+    db.session.flush()
+    issues = [Issue(jira_key=f'P-{i}', jira_id=str(i), project_id=project.id) for i in (1, 2)]
+    db.session.add_all(issues)
+    db.session.flush()
+    for issue, day, seconds in ((issues[0], 1, 3600), (issues[1], 1, 1800), (issues[0], 3, 7200)):
+        db.session.add(Worklog(user_id=user.id, project_id=project.id, issue_id=issue.id,
+                               time_spent_seconds=seconds, work_date=datetime(2026, 10, day, 10)))
+    db.session.commit()
+    user_id = user.id
+
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    activity = WorklogService.get_activity_by_day(user_id, datetime(2026, 10, 1, 8), datetime(2026, 10, 4, 8))
+    assert activity == {
+        'labels': ['2026-10-01', '2026-10-02', '2026-10-03', '2026-10-04'],
+        'data': [2, 0, 1, 0],
+        'hours': [1.5, 0, 2.0, 0]
+    }
+    assert len(statements) == 1
+
+    grouped = WorklogService.group_by_project_and_user(
+        WorklogService.get_worklogs_for_period(datetime(2026, 10, 1), datetime(2026, 10, 1), project_key='P'))
+    assert [log.issue.jira_key for log in grouped['P']['alice']] == ['P-1', 'P-2']
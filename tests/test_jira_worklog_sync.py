@@ -0,0 +1,295 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.extensions import db
+from app.models import Project, Worklog, SyncWatermark, SyncRun
+from app.services.jira_service import JiraService
+
+FAR_FUTURE_MS = 99999999999999
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+        self.status_code = 200
+
+    def json(self):
+        return self._data
+
+
+def make_worklog(worklog_id, issue_id, seconds=3600, author='alice'):
+    return {
+        'id': str(worklog_id),
+        'issueId': str(issue_id),
+        'timeSpentSeconds': seconds,
+        'started': '2026-10-10T09:00:00.000+0000',
+        'comment': 'work',
+        'author': {'name': author, 'displayName': author.title(), 'emailAddress': f'{author}@example.com'}
+    }
+
+
+class ResultList(list):
+    total = None
+
+
+class FakeJira:
+    """Udaje klienta biblioteki jira na potrzeby testów synchronizacji."""
+
+    def __init__(self, worklogs_by_issue, embedded=(), embedded_page=20):
+        self.worklogs_by_issue = worklogs_by_issue
+        self.embedded = set(embedded)
+        self.embedded_page = embedded_page
+        self.worklog_calls = 0
+        self.search_calls = []
+        self.fail_at = None
+
+    def project(self, key):
+        return SimpleNamespace(key=key)
+
+    def search_issues(self, jql, startAt=0, maxResults=50, **kwargs):
+        self.search_calls.append(startAt)
+        if startAt == self.fail_at:
+            self.fail_at = None
+            raise RuntimeError('connection reset')
+        issues = []
+        for issue_id, worklogs in self.worklogs_by_issue.items():
+            fields = SimpleNamespace(summary='Summary', project=SimpleNamespace(key='P'))
+            if issue_id in self.embedded:
+                # Pierwsza strona worklogów osadzona w wyniku wyszukiwania
+                page = [SimpleNamespace(raw=w) for w in worklogs[:self.embedded_page]]
+                fields.worklog = SimpleNamespace(total=len(worklogs), maxResults=self.embedded_page, worklogs=page)
+            issues.append(SimpleNamespace(id=issue_id, key=f'P-{issue_id}', fields=fields))
+        page = ResultList(issues[startAt:startAt + maxResults])
+        page.total = len(issues)
+        return page
+
+    def worklogs(self, issue_id):
+        self.worklog_calls += 1
+        return [SimpleNamespace(raw=w) for w in self.worklogs_by_issue[issue_id]]
+
+
+@pytest.fixture
+def jira_service(db_app):
+    db.session.add(Project(name='P', jira_key='P', is_active=True))
+    db.session.commit()
+
+    service = JiraService.__new__(JiraService)
+    service.config = object()
+    service._base_url = 'http://jira.example.com'
+    service.jira = FakeJira({'100': [make_worklog(1, 100), make_worklog(2, 100, author='bob')]})
+    service.feeds = {
+        '/rest/api/2/worklog/updated': {'values': [], 'until': FAR_FUTURE_MS, 'lastPage': True},
+        '/rest/api/2/worklog/deleted': {'values': [], 'until': FAR_FUTURE_MS, 'lastPage': True},
+    }
+
+    def make_request(endpoint, method='GET', **kwargs):
+        if endpoint == '/rest/api/2/worklog/list':
+            ids = {str(i) for i in kwargs['json']['ids']}
+            return FakeResponse([w for ws in service.jira.worklogs_by_issue.values() for w in ws if w['id'] in ids])
+        return FakeResponse(service.feeds[endpoint])
+
+    service.make_request = make_request
+    return service
+
+
+def test_first_run_bootstraps_and_stores_watermark(jira_service):
+    """Pierwsza synchronizacja pobiera worklogi przez JQL i zapisuje znacznik."""
+    stats = jira_service.sync_worklogs(days_back=30)
+
+    assert stats['created'] == 2
+    assert stats['bootstrapped_projects'] == 1
+    assert Worklog.query.count() == 2
+    assert SyncWatermark.query.count() == 1
+
+
+def test_next_run_only_applies_feed_changes(jira_service):
+    """Kolejna synchronizacja korzysta wyłącznie z kanałów zmian JIRA."""
+    jira_service.sync_worklogs(days_back=30)
+    calls_after_bootstrap = jira_service.jira.worklog_calls
+
+    jira_service.jira.worklogs_by_issue['100'][0]['timeSpentSeconds'] = 7200
+    jira_service.feeds['/rest/api/2/worklog/updated']['values'] = [{'worklogId': 1, 'updatedTime': FAR_FUTURE_MS}]
+    jira_service.feeds['/rest/api/2/worklog/deleted']['values'] = [{'worklogId': 2, 'updatedTime': FAR_FUTURE_MS}]
+
+    stats = jira_service.sync_worklogs(days_back=30)
+
+    assert stats['updated'] == 1
+    assert stats['deleted'] == 1
+    assert jira_service.jira.worklog_calls == calls_after_bootstrap
+    assert [(w.jira_worklog_id, w.time_spent_seconds) for w in Worklog.query.all()] == [('1', 7200)]
+
+
+def test_embedded_worklogs_avoid_follow_up_requests(jira_service):
+    """Osadzone worklogi są używane bez dodatkowych zapytań, chyba że są obcięte."""
+    jira_service.jira = FakeJira({
+        '100': [make_worklog(1, 100)],
+        '101': [make_worklog(2, 101), make_worklog(3, 101), make_worklog(4, 101)],
+    }, embedded={'100', '101'}, embedded_page=2)
+
+    stats = jira_service.sync_worklogs(days_back=30)
+
+    assert stats['created'] == 4
+    assert stats['worklog_calls_avoided'] == 1
+    assert jira_service.jira.worklog_calls == 1
+
+
+def test_bootstrap_pages_through_search_and_resumes_from_checkpoint(jira_service, db_app):
+    """Wyszukiwanie JQL jest stronicowane, a przerwany bootstrap wznawia od zapisanego startAt."""
+    db_app.config['JIRA_SEARCH_PAGE_SIZE'] = 1
+    jira_service.jira = FakeJira({str(i): [make_worklog(i, i)] for i in (100, 101, 102)})
+    jira_service.jira.fail_at = 2
+
+    stats = jira_service.sync_worklogs(days_back=30)
+
+    assert stats['errors'] == 1
+    assert stats['created'] == 2
+    assert SyncWatermark.query.count() == 0
+    failed_run = SyncRun.latest('worklogs')
+    assert failed_run.status == 'failed'
+    assert failed_run.to_dict()['checkpoints'][0]['page_offset'] == 2
+
+    jira_service.jira.search_calls = []
+    stats = jira_service.sync_worklogs(days_back=30)
+
+    assert jira_service.jira.search_calls == [2]
+    assert stats['created'] == 1
+    assert Worklog.query.count() == 3
+    assert SyncWatermark.query.count() == 1
+    # Znacznik zaczyna się od startu przebiegu, który pobrał pierwsze strony
+    first_page_ms = int(failed_run.started_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    assert SyncWatermark.query.one().worklogs_updated_since == first_page_ms
+    assert SyncRun.query.count() == 1
+    assert SyncRun.latest('worklogs').status == 'completed'
+
+
+
+def test_unfinished_run_is_resumed_a_limited_number_of_times(db_app):
+    """Przerwany przebieg jest wznawiany najwyżej SYNC_RESUME_MAX_ATTEMPTS razy, potem zaczyna się od nowa."""
+    db_app.config['SYNC_RESUME_MAX_ATTEMPTS'] = 2
+    first = SyncRun.start('full')
+    first.checkpoint('users').complete(10)
+    first.finish(error='worklogs failed')
+
+    for attempt in (1, 2):
+        run = SyncRun.start('full')
+        assert (run.id, run.resumed_count) == (first.id, attempt)
+        assert run.is_done('users')
+        run.finish(error='worklogs failed')
+
+    fresh = SyncRun.start('full')
+    assert fresh.id != first.id and not fresh.is_done('users')
+    assert db.session.get(SyncRun, first.id).status == 'abandoned'
+
+    # Zbyt stary przebieg też nie jest wznawiany
+    fresh.started_at = datetime.utcnow() - timedelta(days=2)
+    fresh.finish(error='worklogs failed')
+    assert SyncRun.start('full').id not in (first.id, fresh.id)
+    assert db.session.get(SyncRun, fresh.id).status == 'abandoned'
+
+def test_ingestor_upserts_in_chunks_and_reports_throughput(db_app):
+    """Ingestor zapisuje worklogi porcjami i raportuje przepustowość."""
+    from app.services.worklog_ingestion import WorklogIngestor
+
+    project = Project(name='P', jira_key='P', is_active=True)
+    db.session.add(project)
+    db.session.commit()
+
+    entries = [
+        {'worklog': make_worklog(i, 100 + i % 3, author=f'user{i % 4}'), 'issue_id': 100 + i % 3,
+         'issue_key': f'P-{100 + i % 3}', 'issue_summary': 'Summary', 'project_id': project.id}
+        for i in range(25)
+    ]
+    stats = {'total': 0, 'created': 0, 'updated': 0, 'errors': 0, 'error_messages': []}
+    WorklogIngestor(chunk_size=10).ingest(entries, stats)
+
+    assert stats['created'] == 25
+    assert [c['rows'] for c in stats['chunks']] == [10, 10, 5]
+    assert all('rows_per_second' in c for c in stats['chunks'])
+
+    entries[0]['worklog']['timeSpentSeconds'] = 60
+    stats = {'total': 0, 'created': 0, 'updated': 0, 'errors': 0, 'error_messages': []}
+    WorklogIngestor(chunk_size=10).ingest(entries[:3], stats)
+
+    assert (stats['created'], stats['updated']) == (0, 3)
+    assert Worklog.query.count() == 25
+    assert db.session.query(Worklog.time_spent_seconds).filter_by(jira_worklog_id='0').scalar() == 60
+
+
+def test_ingestor_creates_unique_users_for_cloud_authors(db_app):
+    """Autorzy z Cloud bez nazwy i e-maila dostają unikalne konta, kolizje z bazą nie psują partii."""
+    from app.models import User
+    from app.services.worklog_ingestion import WorklogIngestor
+
+    project = Project(name='P', jira_key='P', is_active=True)
+    db.session.add_all([project, User(username='carol', email='carol@corp.example')])
+    db.session.commit()
+
+    authors = [
+        {'accountId': 'acc-1', 'displayName': 'Anna'},
+        {'accountId': 'acc-2', 'displayName': 'Bartek'},
+        {'displayName': 'Nobody'},
+        {'displayName': 'Nobody Else'},
+        {'emailAddress': 'carol@example.com', 'displayName': 'Carol Cloud'},
+    ]
+    entries = []
+    for i, author in enumerate(authors):
+        worklog = make_worklog(i, 100)
+        worklog['author'] = author
+        entries.append({'worklog': worklog, 'issue_id': 100, 'issue_key': 'P-100',
+                        'issue_summary': 'Summary', 'project_id': project.id})
+    stats = {'total': 0, 'created': 0, 'updated': 0, 'errors': 0, 'error_messages': []}
+    WorklogIngestor().ingest(entries, stats)
+
+    assert (stats['created'], stats['errors']) == (5, 0)
+    created = {u.display_name: (u.username, u.email) for u in User.query.filter(User.username != 'carol')}
+    assert created == {
+        'Anna': ('acc-1', 'acc-1@unknown.com'),
+        'Bartek': ('acc-2', 'acc-2@unknown.com'),
+        'Nobody': ('unknown', 'unknown@unknown.com'),
+        'Nobody Else': ('unknown-2', 'unknown-2@unknown.com'),
+        'Carol Cloud': ('carol-2', 'carol@example.com'),
+    }
+
+
+def test_ingestor_skips_only_the_user_that_cannot_be_created(db_app):
+    """Kolizja przy tworzeniu użytkowników (np. wyścig z innym procesem) pomija tylko tego autora."""
+    from app.models import User
+    from app.services.worklog_ingestion import WorklogIngestor
+
+    db.session.add(User(username='dave', email='dave@example.com'))
+    db.session.commit()
+
+    created = WorklogIngestor()._create_users({
+        'eve@example.com': {'name': 'eve', 'emailAddress': 'eve@example.com'},
+        'dave@example.com': {'name': 'dave-cloud', 'emailAddress': 'dave@example.com'},
+    })
+    db.session.commit()
+
+    assert list(created) == ['eve@example.com']
+    assert User.query.filter_by(username='eve').one().roles
+    assert User.query.count() == 2
+
+
+def test_ingestor_skips_only_the_issue_that_cannot_be_created(db_app):
+    """Kolizja przy tworzeniu zadań pomija tylko worklogi tego zadania, reszta projektu się zapisuje."""
+    from app.models.issue import Issue
+    from app.services.worklog_ingestion import WorklogIngestor
+
+    project = Project(name='P', jira_key='P', is_active=True)
+    db.session.add(project)
+    db.session.flush()
+    db.session.add(Issue(jira_id='200', jira_key='OLD-200', project_id=project.id))
+    db.session.commit()
+
+    entries = [
+        {'worklog': make_worklog(i, issue_id), 'issue_id': issue_id, 'issue_key': f'P-{issue_id}',
+         'issue_summary': 'Summary', 'project_id': project.id}
+        for i, issue_id in enumerate((100, 200, 300))
+    ]
+    stats = {'total': 0, 'created': 0, 'updated': 0, 'errors': 0, 'error_messages': []}
+    WorklogIngestor().ingest(entries, stats)
+    db.session.commit()
+
+    assert (stats['created'], stats['errors']) == (2, 1)
+    assert sorted(i.jira_key for i in Issue.query) == ['OLD-200', 'P-100', 'P-300']
+    assert sorted(w.jira_worklog_id for w in Worklog.query) == ['0', '2']
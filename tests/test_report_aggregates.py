@@ -0,0 +1,163 @@
+from datetime import date, datetime
+import pytest
+from app.extensions import db
+from app.models import (User, Role, Team, Project, Portfolio, Worklog, TeamMembership, Holiday,
+                        ProjectAssignment, ReportAggregate, ReportAggregateDependency)
+from app.models.issue import Issue
+from app.models.user_role import UserRole
+
+
+@pytest.fixture
+def data(db_app):
+    alice = User(username='alice', email='alice@example.com')
+    bob = User(username='bob', email='bob@example.com')
+    team = Team(name='Team')
+    role = Role(name='developer', hourly_rate=100)
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    db.session.add_all([alice, bob, team, role, project])
+    db.session.flush()
+    issue = Issue(jira_key='P-1', jira_id='1', project_id=project.id)
+    portfolio = Portfolio(name='Portfolio', projects=[project])
+    db.session.add_all([issue, portfolio, TeamMembership(team_id=team.id, user_id=alice.id),
+                        UserRole(user_id=bob.id, role_id=role.id)])
+    db.session.flush()
+    for user, day, seconds in ((alice, datetime(2026, 9, 15), 7200), (bob, datetime(2026, 10, 1), 3600)):
+        db.session.add(Worklog(user_id=user.id, project_id=project.id, issue_id=issue.id,
+                               time_spent_seconds=seconds, work_date=day))
+    db.session.commit()
+    return alice, bob, team, role, project, portfolio, issue
+
+
+def team_months(team):
+    return {c.month: c.time_spent_seconds for c in ReportAggregate.cells('team', [team.id])}
+
+
+def test_membership_change_rebuilds_only_affected_months(data):
+    """Zmiana składu zespołu przelicza tylko miesiące, w których pracowały zmienione osoby."""
+    alice, bob, team, role, project, portfolio, issue = data
+    assert team_months(team) == {date(2026, 9, 1): 7200}
+
+    september = ReportAggregate.query.filter_by(scope='team', month=date(2026, 9, 1)).one()
+    stamp = september.updated_at
+    db.session.add(TeamMembership(team_id=team.id, user_id=bob.id))
+    db.session.commit()
+
+    assert team_months(team) == {date(2026, 9, 1): 7200, date(2026, 10, 1): 3600}
+    assert ReportAggregate.query.filter_by(scope='team', month=date(2026, 9, 1)).one().updated_at == stamp
+    assert ReportAggregateDependency.query.filter_by(scope='team').one().members == f'{alice.id},{bob.id}'
+
+
+def test_worklog_changes_push_into_materialized_cells(data):
+    """Nowy worklog aktualizuje zmaterializowane komórki zespołu, roli i portfela."""
+    alice, bob, team, role, project, portfolio, issue = data
+    assert role.get_workload_statistics()['total_hours'] == 1.0
+    assert team_months(team) == {date(2026, 9, 1): 7200}
+
+    db.session.add(Worklog(user_id=bob.id, project_id=project.id, issue_id=issue.id,
+                           time_spent_seconds=3600, work_date=datetime(2026, 10, 2)))
+    db.session.commit()
+
+    stats = role.get_workload_statistics(datetime(2026, 10, 1), datetime(2026, 10, 31))
+    assert stats == {'total_hours': 2.0, 'active_users': 1, 'avg_hours_per_user': 2.0, 'total_cost': 200.0}
+    assert role.get_project_distribution() == {'Project': 100.0}
+    # Każdy użytkownik ma też domyślną rolę 'user'
+    distribution = portfolio.get_role_distribution()
+    assert distribution == pytest.approx({'user': 200 / 3, 'developer': 100 / 3})
+
+
+def test_assignment_change_replans_portfolio(data):
+    """Zmiana przypisania do projektu przelicza godziny planowane portfela."""
+    alice, bob, team, role, project, portfolio, issue = data
+    assert portfolio.get_planned_vs_actual_hours()['actual'] == 3.0
+
+    db.session.add(ProjectAssignment(project_id=project.id, user_id=alice.id, allocation=50,
+                                     start_date=date(2026, 9, 1), end_date=date(2026, 9, 30)))
+    db.session.commit()
+
+    hours = portfolio.get_planned_vs_actual_hours(datetime(2026, 9, 1), datetime(2026, 9, 30))
+    # 22 dni robocze we wrześniu 2026 * 8h * 50%
+    assert hours['planned'] == 88.0
+    assert hours['actual'] == 2.0
+
+
+def test_reading_aggregates_leaves_the_session_uncommitted(data):
+    """Odczyt statystyk nie zatwierdza zmian w sesji - przy zapisach przeliczenie idzie w jej transakcji."""
+    alice, bob, team, role, project, portfolio, issue = data
+    team_id, alice_id = team.id, alice.id
+    db.session.add(Team(name='Draft'))
+    assert [c.time_spent_seconds for c in ReportAggregate.cells('team', [team_id])] == [7200]
+    db.session.rollback()
+
+    # Przeliczenie dzieliło transakcję z niezatwierdzonym zapisem, więc wycofało się razem z nim
+    assert Team.query.filter_by(name='Draft').count() == 0
+    assert ReportAggregateDependency.query.filter_by(scope='team').count() == 0
+
+    # Bez zapisów w sesji przeliczenie ma własną transakcję i zostaje zapisane
+    assert [c.time_spent_seconds for c in ReportAggregate.cells('team', [team_id])] == [7200]
+    db.session.rollback()
+    assert ReportAggregateDependency.query.filter_by(scope='team').one().members == str(alice_id)
+
+
+def test_open_ended_assignment_is_replanned_in_a_new_month(data, monkeypatch):
+    """Przypisanie bez daty końca jest planowane do bieżącego miesiąca - nowy miesiąc je przelicza."""
+    alice, bob, team, role, project, portfolio, issue = data
+
+    class Today(date):
+        current = date(2026, 9, 15)
+
+        @classmethod
+        def today(cls):
+            return cls.current
+    monkeypatch.setattr('app.models.report_aggregate.date', Today)
+
+    db.session.add(ProjectAssignment(project_id=project.id, user_id=alice.id, allocation=50,
+                                     start_date=date(2026, 9, 1)))
+    db.session.commit()
+    october = (datetime(2026, 10, 1), datetime(2026, 10, 31))
+    assert portfolio.get_planned_vs_actual_hours(*october)['planned'] == 0
+
+    Today.current = date(2026, 10, 2)
+    # 22 dni robocze w październiku 2026 * 8h * 50%
+    assert portfolio.get_planned_vs_actual_hours(*october)['planned'] == 88.0
+
+
+def test_partial_months_are_read_from_the_daily_rollup(data):
+    """Zakres niepokrywający pełnych miesięcy nie jest poszerzany - brzegi liczone są z rollupu dziennego."""
+    alice, bob, team, role, project, portfolio, issue = data
+    db.session.add_all([
+        Worklog(user_id=bob.id, project_id=project.id, issue_id=issue.id,
+                time_spent_seconds=7200, work_date=datetime(2026, 10, 20)),
+        Worklog(user_id=alice.id, project_id=project.id, issue_id=issue.id,
+                time_spent_seconds=3600, work_date=datetime(2026, 8, 31)),
+        ProjectAssignment(project_id=project.id, user_id=alice.id, allocation=50,
+                          start_date=date(2026, 9, 1), end_date=date(2026, 9, 30))
+    ])
+    db.session.commit()
+
+    assert role.get_workload_statistics(datetime(2026, 10, 1), datetime(2026, 10, 10))['total_hours'] == 1.0
+    assert role.get_workload_statistics(datetime(2026, 10, 1), datetime(2026, 10, 31))['total_hours'] == 3.0
+
+    # 1-15 września 2026: 11 dni roboczych * 8h * 50%
+    hours = portfolio.get_planned_vs_actual_hours(datetime(2026, 9, 1), datetime(2026, 9, 15))
+    assert (hours['planned'], hours['actual']) == (44.0, 2.0)
+    # Koniec sierpnia i pełny wrzesień
+    hours = portfolio.get_planned_vs_actual_hours(datetime(2026, 8, 31), datetime(2026, 9, 30))
+    assert (hours['planned'], hours['actual']) == (88.0, 3.0)
+    # Dwa niepełne miesiące bez pełnego pomiędzy
+    hours = portfolio.get_planned_vs_actual_hours(datetime(2026, 9, 30), datetime(2026, 10, 1))
+    assert (hours['planned'], hours['actual']) == (4.0, 1.0)
+
+
+def test_holidays_are_not_planned(data):
+    """Godziny planowane pomijają święta, a nowe święto przelicza plan portfela."""
+    alice, bob, team, role, project, portfolio, issue = data
+    db.session.add(ProjectAssignment(project_id=project.id, user_id=alice.id, allocation=50,
+                                     start_date=date(2026, 9, 1), end_date=date(2026, 9, 30)))
+    db.session.commit()
+    september = (datetime(2026, 9, 1), datetime(2026, 9, 30))
+    assert portfolio.get_planned_vs_actual_hours(*september)['planned'] == 88.0
+
+    db.session.add(Holiday(date=date(2026, 9, 14), name='Święto firmowe', country_code='PL'))
+    db.session.commit()
+    # 21 dni roboczych * 8h * 50%
+    assert portfolio.get_planned_vs_actual_hours(*september)['planned'] == 84.0
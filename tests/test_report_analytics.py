@@ -0,0 +1,50 @@
+from datetime import datetime
+import pytest
+from app.extensions import db
+from app.models import User, Project, Worklog
+from app.models.issue import Issue
+from app.services.report_service import ReportService
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def worklogs(db_app):
+    users = [User(username=name, email=f'{name}@example.com') for name in ('alice', 'bob')]
+    projects = [Project(name=key, jira_key=key, jira_id=str(i)) for i, key in enumerate(('BBB', 'AAA'))]
+    db.session.add_all(users + projects)
+    db.session.flush()
+    issues = [Issue(jira_key=f'{p.jira_key}-{i}', jira_id=f'{p.id}{i}', project_id=p.id)
+              for p in projects for i in range(3)]
+    db.session.add_all(issues)
+    db.session.flush()
+    for n in range(40):
+        issue = issues[n % len(issues)]
+        db.session.add(Worklog(user_id=users[n % 2].id, project_id=issue.project_id, issue_id=issue.id,
+                               time_spent_seconds=900 * (n % 7 + 1), work_date=datetime(2026, 10, 1 + n % 9)))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('report', ['generate_activity_report', 'generate_project_report'])
+def test_columnar_backend_matches_python_backend(worklogs, db_app, report):
+    """Silnik kolumnowy zwraca te same struktury i wartości co implementacja w Pythonie."""
+    start, end = datetime(2026, 10, 1), datetime(2026, 10, 31)
+
+    db_app.config['REPORT_ANALYTICS_BACKEND'] = 'python'
+    expected = getattr(ReportService, report)(start, end)
+    db_app.config['REPORT_ANALYTICS_BACKEND'] = 'numpy'
+    actual = getattr(ReportService, report)(start, end)
+
+    assert _normalize(actual) == _normalize(expected)
+    if report == 'generate_project_report':
+        assert list(actual['projects']) == list(expected['projects']) == ['AAA', 'BBB']
+        for key in expected['projects']:
+            assert list(actual['projects'][key]['users']) == list(expected['projects'][key]['users'])
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
@@ -0,0 +1,111 @@
+from datetime import date, datetime
+import pytest
+from app.extensions import db
+from app.models import User, Team, Project, Worklog, TeamMembership, Report, Holiday
+from app.models.issue import Issue
+from app.services.report_jobs import get_report_job_queue, data_version
+
+PARAMS = {'team_id': None, 'start_date': '2026-10-01', 'end_date': '2026-10-31'}
+
+
+@pytest.fixture
+def team(db_app):
+    alice = User(username='alice', email='alice@example.com')
+    team = Team(name='Team')
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    db.session.add_all([alice, team, project])
+    db.session.flush()
+    issue = Issue(jira_key='P-1', jira_id='1', project_id=project.id)
+    db.session.add_all([issue, TeamMembership(team_id=team.id, user_id=alice.id)])
+    db.session.flush()
+    db.session.add(Worklog(user_id=alice.id, project_id=project.id, issue_id=issue.id,
+                           time_spent_seconds=7200, work_date=datetime(2026, 10, 5)))
+    db.session.commit()
+    return team, alice, issue
+
+
+def params_for(team):
+    return dict(PARAMS, team_id=team.id)
+
+
+def test_inline_job_stores_compressed_result(team):
+    """Zadanie wykonane w wątku wywołującym zapisuje skompresowany wynik i postęp 100%."""
+    team, alice, issue = team
+    result, reused = get_report_job_queue().submit('team_workload', params_for(team), backend='inline')
+
+    assert not reused
+    assert result.status == 'completed'
+    assert result.progress == 100
+    assert result.result_data is None and result.result_blob
+    assert result.get_result()['users']['alice']['hours'] == 2.0
+    assert result.started_at <= result.finished_at
+
+
+def test_identical_request_reuses_result_until_data_changes(team):
+    """Ten sam typ, parametry i wersja danych zwracają istniejący wynik; nowy worklog wymusza przeliczenie."""
+    team, alice, issue = team
+    queue = get_report_job_queue()
+    first, _ = queue.submit('team_workload', params_for(team), backend='inline')
+    version = data_version()
+
+    again, reused = queue.submit('team_workload', params_for(team), backend='inline')
+    assert reused and again.id == first.id
+
+    db.session.add(Worklog(user_id=alice.id, project_id=issue.project_id, issue_id=issue.id,
+                           time_spent_seconds=3600, work_date=datetime(2026, 10, 6)))
+    db.session.commit()
+    assert data_version() != version
+
+    fresh, reused = queue.submit('team_workload', params_for(team), backend='inline')
+    assert not reused and fresh.id != first.id
+    assert fresh.get_result()['users']['alice']['hours'] == 3.0
+
+
+def test_editing_a_holiday_changes_the_data_version(team):
+    """Zmiana daty święta zmienia wersję danych, choć liczba wierszy zostaje ta sama."""
+    holiday = Holiday(date=date(2026, 10, 12), name='Święto')
+    db.session.add(holiday)
+    db.session.commit()
+    version = data_version()
+
+    holiday.date = date(2026, 10, 13)
+    db.session.commit()
+    assert data_version() != version
+
+
+def test_pending_job_is_coalesced_and_copied_for_other_reports(team, monkeypatch):
+    """Oczekujące zadanie jest współdzielone, a gotowy wynik kopiowany do historii innego raportu."""
+    team, alice, issue = team
+    queue = get_report_job_queue()
+    reports = [Report(name=name, report_type='team_activity') for name in ('A', 'B')]
+    for report in reports:
+        report.set_parameters(params_for(team))
+    db.session.add_all(reports)
+    db.session.commit()
+
+    # Bez wysłania do workera zadanie zostaje w kolejce
+    monkeypatch.setattr(queue, '_dispatch', lambda result_id, backend: None)
+    pending, _ = queue.submit('team_activity', params_for(team), report_id=reports[0].id)
+    assert pending.status == 'pending'
+    monkeypatch.undo()
+    coalesced, reused = queue.submit('team_activity', params_for(team), report_id=reports[1].id, backend='inline')
+    assert reused and coalesced.id == pending.id
+
+    queue.execute(pending.id)
+    copy, reused = queue.submit('team_activity', params_for(team), report_id=reports[1].id, backend='inline')
+    assert reused and copy.id != pending.id
+    assert copy.report_id == reports[1].id
+    assert copy.get_result() == pending.get_result()
+    assert reports[1].last_run_at is not None
+    assert queue.wait(copy.id, timeout=1).status == 'completed'
+
+
+def test_failed_job_records_error(team):
+    """Błąd generowania raportu kończy zadanie ze statusem 'failed'."""
+    result, _ = get_report_job_queue().submit('team_workload', {'team_id': 999, 'start_date': '2026-10-01',
+                                                                'end_date': '2026-10-31'}, backend='inline')
+    assert result.status == 'failed'
+    assert '999' in result.error_message
+
+    with pytest.raises(ValueError):
+        get_report_job_queue().submit('unknown', {})
@@ -0,0 +1,76 @@
+from datetime import datetime
+import pytest
+from flask import Flask
+from app.extensions import db
+from app.models import User, Team, Project, Worklog, TeamMembership, Report, ReportResult
+from app.models.issue import Issue
+from app.commands.run_scheduled_reports import run_due_reports
+
+
+@pytest.fixture
+def file_db_app(tmp_path):
+    """Aplikacja na pliku SQLite - wątki puli raportów widzą te same dane."""
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'reports.db'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        REPORT_JOB_TIMEOUT=30
+    )
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def reports(file_db_app):
+    alice = User(username='alice', email='alice@example.com')
+    teams = [Team(name='Team A'), Team(name='Team B')]
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    db.session.add_all([alice, project] + teams)
+    db.session.flush()
+    issue = Issue(jira_key='P-1', jira_id='1', project_id=project.id)
+    db.session.add_all([issue] + [TeamMembership(team_id=t.id, user_id=alice.id) for t in teams])
+    db.session.flush()
+    db.session.add(Worklog(user_id=alice.id, project_id=project.id, issue_id=issue.id,
+                           time_spent_seconds=7200, work_date=datetime(2026, 10, 5)))
+
+    created = []
+    for name, team in (('A1', teams[0]), ('A2', teams[0]), ('B', teams[1])):
+        report = Report(name=name, report_type='team_workload', schedule='0 6 * * *')
+        report.set_parameters({'team_id': team.id, 'start_date': '2026-10-01', 'end_date': '2026-10-31'})
+        created.append(report)
+    db.session.add_all(created)
+    db.session.commit()
+    return created
+
+
+def test_reports_sharing_a_query_are_computed_once(reports):
+    """Raporty o tych samych parametrach liczone są raz, a grupy równolegle w puli wątków."""
+    timings = run_due_reports(reports, backend='thread')
+
+    assert [t['status'] for t in timings] == ['completed'] * 3
+    by_name = {t['report']: t for t in timings}
+    assert by_name['A2']['shared_with'] == by_name['A1']['report_id']
+    # Czas obliczenia własnego wyniku, bez czekania na wcześniejsze grupy; kopia nic nie liczy
+    for name in ('A1', 'B'):
+        assert by_name[name]['seconds'] == round(db.session.get(ReportResult, by_name[name]['result_id']).execution_time, 3)
+    assert by_name['A2']['seconds'] == 0
+
+    computed = ReportResult.query.filter(ReportResult.execution_time > 0).count()
+    assert computed == 2
+    assert ReportResult.query.count() == 3
+    assert all(report.last_run_at for report in reports)
+
+
+def test_unchanged_data_short_circuits_rerun(reports):
+    """Bez zmian danych ponowne uruchomienie nie przelicza raportów."""
+    run_due_reports(reports, backend='inline')
+    before = ReportResult.query.count()
+
+    timings = run_due_reports(reports, backend='inline')
+    assert all(t['reused'] for t in timings)
+    assert ReportResult.query.count() == before
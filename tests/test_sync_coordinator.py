@@ -0,0 +1,211 @@
+from datetime import timedelta
+import threading
+import pytest
+from app.extensions import db
+from app.models import SyncJob, SyncLease
+from app.services.sync_coordinator import SyncCoordinator, LEASE_NAME
+
+
+class FakeJiraService:
+    """Rejestruje wywołania synchronizacji zamiast łączyć się z JIRA."""
+
+    is_configured = True
+
+    def __init__(self):
+        self.calls = []
+
+    def sync_users(self):
+        self.calls.append('users')
+        return {'total': 1}
+
+    def sync_projects(self):
+        self.calls.append('projects')
+        return {'total': 1}
+
+    def sync_worklogs(self, days_back=30):
+        self.calls.append(('worklogs', days_back))
+        return {'total': 1}
+
+    def sync_all(self):
+        self.calls.append('full')
+        return True, {'errors': []}
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    service = FakeJiraService()
+    monkeypatch.setattr('app.services.jira_service.get_jira_service', lambda: service)
+    return service
+
+
+def test_overlapping_triggers_are_coalesced(db_app):
+    """Powtórzone zlecenia tej samej synchronizacji są łączone w jedno zadanie."""
+    coordinator = SyncCoordinator()
+
+    first, coalesced_first = coordinator.enqueue('worklogs', trigger='schedule')
+    second, coalesced_second = coordinator.enqueue('worklogs', trigger='admin')
+    full, _ = coordinator.enqueue('full', trigger='admin')
+    users, coalesced_users = coordinator.enqueue('users', trigger='admin')
+
+    assert (coalesced_first, coalesced_second, coalesced_users) == (False, True, True)
+    assert second.id == first.id
+    assert users.id == full.id
+    assert SyncJob.query.filter_by(status='queued').count() == 1
+    assert SyncJob.query.get(first.id).status == 'coalesced'
+
+
+def test_coalesced_requests_keep_the_longest_days_back(db_app):
+    """Dłuższy zakres dni nie ginie przy łączeniu, a pełna synchronizacja go nie zastępuje."""
+    coordinator = SyncCoordinator()
+
+    job, _ = coordinator.enqueue('worklogs', days_back=30)
+    merged, coalesced = coordinator.enqueue('worklogs', days_back=90)
+    assert coalesced and merged.id == job.id
+    assert merged.get_parameters() == {'days_back': 90}
+    coordinator.enqueue('worklogs', days_back=7)
+    assert SyncJob.query.get(job.id).get_parameters() == {'days_back': 90}
+
+    coordinator.enqueue('full')
+    assert SyncJob.query.get(job.id).status == 'queued'
+    _, coalesced_short = coordinator.enqueue('projects')
+    assert coalesced_short
+    assert SyncJob.query.filter_by(status='queued').count() == 2
+
+
+def test_drain_runs_queue_once_under_lease(db_app, jira):
+    """Kolejka jest wykonywana tylko przez proces posiadający blokadę."""
+    coordinator = SyncCoordinator()
+    coordinator.enqueue('users')
+    coordinator.enqueue('worklogs', days_back=7)
+
+    other = SyncCoordinator()
+    other.owner = 'other-host:1'
+    assert SyncLease.acquire(LEASE_NAME, other.owner, timedelta(minutes=5))
+    assert coordinator.drain() == 0
+    assert jira.calls == []
+
+    SyncLease.release(LEASE_NAME, other.owner)
+    assert coordinator.drain() == 2
+    assert jira.calls == ['users', ('worklogs', 7)]
+    assert [j.status for j in SyncJob.query.order_by(SyncJob.id)] == ['completed', 'completed']
+    assert SyncLease.holder(LEASE_NAME) is None
+
+
+def test_expired_lease_is_taken_over(db_app):
+    """Wygasła blokada po awarii procesu może zostać przejęta."""
+    assert SyncLease.acquire(LEASE_NAME, 'crashed:1', timedelta(seconds=-1))
+    assert SyncLease.acquire(LEASE_NAME, 'alive:2', timedelta(minutes=5))
+    assert not SyncLease.acquire(LEASE_NAME, 'late:3', timedelta(minutes=5))
+    assert SyncLease.holder(LEASE_NAME).owner == 'alive:2'
+
+
+def test_lease_is_renewed_while_a_job_runs(db_app, monkeypatch):
+    """Podczas długiego zadania blokada jest odnawiana, więc nie wygasa w jego trakcie."""
+    db_app.config.update(SYNC_LEASE_SECONDS=1, SYNC_LEASE_HEARTBEAT_SECONDS=0.05)
+    coordinator = SyncCoordinator()
+    expirations = []
+
+    def execute(job):
+        for _ in range(100):
+            db.session.expire_all()
+            expirations.append(SyncLease.holder(LEASE_NAME).expires_at)
+            if len(set(expirations)) > 2:
+                break
+            threading.Event().wait(0.05)
+        return {'total': 1}
+    monkeypatch.setattr(coordinator, '_execute', execute)
+
+    coordinator.enqueue('users')
+    assert coordinator.drain() == 1
+    assert len(set(expirations)) > 2
+
+
+def test_heartbeat_keeps_renewing_after_a_transient_error(db_app, monkeypatch):
+    """Chwilowy błąd odnawiania (np. zablokowana baza) nie zatrzymuje kolejnych odnowień."""
+    db_app.config.update(SYNC_LEASE_HEARTBEAT_SECONDS=0.05)
+    coordinator = SyncCoordinator()
+    acquire = SyncLease.acquire
+    attempts = []
+
+    def flaky_acquire(name, owner, ttl):
+        attempts.append(owner)
+        if len(attempts) <= 2:
+            raise RuntimeError('database is locked')
+        return acquire(name, owner, ttl)
+
+    def execute(job):
+        monkeypatch.setattr(SyncLease, 'acquire', staticmethod(flaky_acquire))
+        for _ in range(100):
+            if len(attempts) > 4:
+                break
+            threading.Event().wait(0.05)
+        return {'total': 1}
+    monkeypatch.setattr(coordinator, '_execute', execute)
+
+    coordinator.enqueue('users')
+    coordinator.enqueue('projects')
+    assert coordinator.drain() == 2
+    assert len(attempts) > 4
+
+
+def test_drain_stops_when_the_lease_is_taken_over(db_app, monkeypatch):
+    """Gdy inny proces przejmie blokadę, kolejne zadania zostają w kolejce dla niego."""
+    db_app.config.update(SYNC_LEASE_HEARTBEAT_SECONDS=0.05)
+    coordinator = SyncCoordinator()
+
+    def execute(job):
+        SyncLease.query.filter_by(name=LEASE_NAME).update({'owner': 'other-host:1'})
+        db.session.commit()
+        threading.Event().wait(0.3)
+        return {'total': 1}
+    monkeypatch.setattr(coordinator, '_execute', execute)
+
+    coordinator.enqueue('users')
+    coordinator.enqueue('projects')
+    assert coordinator.drain() == 1
+    assert [j.status for j in SyncJob.query.order_by(SyncJob.id)] == ['completed', 'queued']
+    assert SyncLease.holder(LEASE_NAME).owner == 'other-host:1'
+
+
+def test_celery_sync_task_is_importable():
+    """Zadanie Celery synchronizacji jest importowalne obok zadań z pakietu app.tasks."""
+    from app.tasks import generate_report_async
+    from app.tasks.jira_sync import sync_jira_data
+
+    assert sync_jira_data.name == 'app.tasks.sync_jira_data'
+    assert generate_report_async.name == 'app.tasks.generate_report_async'
+
+
+def test_scheduler_registers_every_sync_trigger_once(db_app, monkeypatch):
+    """Harmonogram rejestruje wyzwalacze z SYNC_SCHEDULE i kolejkę, ponowna inicjalizacja nic nie robi."""
+    from flask_apscheduler import APScheduler
+    from app import scheduler as scheduler_module
+    from app.services.sync_coordinator import SYNC_SCHEDULE
+
+    scheduler = APScheduler()
+    monkeypatch.setattr(scheduler_module, 'scheduler', scheduler)
+    scheduler_module.init_scheduler(db_app)
+    try:
+        scheduler_module.init_scheduler(db_app)
+        assert {job.id for job in scheduler.get_jobs()} == \
+            {f'sync_jira_{kind}' for kind in SYNC_SCHEDULE} | {'sync_jira_queue'}
+    finally:
+        scheduler.shutdown(wait=False)
+
+
+def test_scheduler_starts_only_when_enabled(db_app, monkeypatch):
+    """start_scheduler nie uruchamia harmonogramu w testach ani przy SCHEDULER_ENABLED=False."""
+    from flask_apscheduler import APScheduler
+    from app import scheduler as scheduler_module
+
+    scheduler = APScheduler()
+    monkeypatch.setattr(scheduler_module, 'scheduler', scheduler)
+    assert not scheduler.running
+
+    scheduler_module.start_scheduler(db_app)
+    assert not scheduler.running
+
+    monkeypatch.setattr(db_app, 'testing', False)
+    monkeypatch.setitem(db_app.config, 'SCHEDULER_ENABLED', False)
+    scheduler_module.start_scheduler(db_app)
+    assert not scheduler.running
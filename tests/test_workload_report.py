@@ -0,0 +1,81 @@
+from datetime import date, datetime
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models import User, Team, Project, Worklog, TeamMembership, Holiday
+from app.models.issue import Issue
+from app.services.business_calendar import get_business_calendar
+from app.services.workload_service import WorkloadReport
+
+
+@pytest.fixture
+def workload(db_app):
+    alice = User(username='alice', email='alice@example.com', display_name='Alice')
+    bob = User(username='bob', email='bob@example.com', display_name='Bob')
+    carol = User(username='carol', email='carol@example.com', display_name='Carol', is_active=False)
+    backend, frontend = Team(name='Backend'), Team(name='Frontend')
+    projects = [Project(name=k, jira_key=k, jira_id=str(i)) for i, k in enumerate(('AAA', 'BBB'))]
+    db.session.add_all([alice, bob, carol, backend, frontend] + projects)
+    db.session.flush()
+    issues = [Issue(jira_key=f'{p.jira_key}-1', jira_id=f'{p.id}1', project_id=p.id) for p in projects]
+    db.session.add_all(issues + [
+        TeamMembership(team_id=backend.id, user_id=alice.id),
+        TeamMembership(team_id=backend.id, user_id=carol.id),
+        TeamMembership(team_id=frontend.id, user_id=bob.id),
+    ])
+    db.session.flush()
+    for user, issue, hours, day in ((alice, issues[0], 8, 5), (alice, issues[1], 4, 6),
+                                    (bob, issues[1], 6, 5), (carol, issues[0], 2, 7)):
+        db.session.add(Worklog(user_id=user.id, project_id=issue.project_id, issue_id=issue.id,
+                               time_spent_seconds=hours * 3600, work_date=datetime(2026, 10, day)))
+    db.session.commit()
+    return backend, frontend, projects
+
+
+def count_queries():
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_workload_series_from_two_queries(workload):
+    """Raport obciążenia liczy serie zespołów i użytkowników z dwóch zapytań."""
+    get_business_calendar()  # kalendarz świąt ładowany raz na proces
+    statements = count_queries()
+    result = WorkloadReport(datetime(2026, 10, 1), datetime(2026, 10, 14)).compute()
+
+    assert len(statements) == 2
+    assert result['team_workload']['labels'] == ['All Teams', 'Backend', 'Frontend']
+    assert result['team_workload']['datasets'][0]['data'] == [20.0, 14.0, 6.0]
+    assert result['user_workload']['labels'] == ['Alice', 'Bob']
+    stats = {s['name']: s for s in result['detailed_stats']}
+    # 10 dni roboczych, 2 aktywnych użytkowników
+    assert stats['All Teams'] == {'name': 'All Teams', 'total_hours': 20.0, 'projects_count': 3,
+                                  'avg_daily_hours': 1.43, 'utilization': 12.5}
+    assert stats['Backend']['utilization'] == 17.5
+    assert stats['Alice'] == {'name': 'Alice', 'total_hours': 12.0, 'projects_count': 2,
+                              'avg_daily_hours': 0.86, 'utilization': 15.0}
+    assert result['date_info'] == {'start_date': '2026-10-01', 'end_date': '2026-10-14', 'days': 14}
+
+
+def test_workload_team_and_project_filters(workload):
+    """Filtr zespołu i projektów zawęża obie serie."""
+    backend, frontend, projects = workload
+    result = WorkloadReport(datetime(2026, 10, 1), datetime(2026, 10, 14), team_id=str(backend.id),
+                            project_ids=[str(projects[0].id)]).compute()
+
+    assert result['team_workload']['labels'] == ['Backend']
+    assert result['team_workload']['datasets'][0]['data'] == [10.0]
+    assert result['user_workload']['labels'] == ['Alice']
+    assert result['user_workload']['datasets'][0]['data'] == [8.0]
+
+
+def test_workload_utilization_skips_holidays(workload):
+    """Wykorzystanie liczone jest względem dni roboczych kalendarza, bez świąt."""
+    db.session.add(Holiday(date=date(2026, 10, 12), name='Święto firmowe', country_code='PL'))
+    db.session.commit()
+
+    result = WorkloadReport(datetime(2026, 10, 1), datetime(2026, 10, 14)).compute()
+    stats = {s['name']: s for s in result['detailed_stats']}
+    # 9 dni roboczych, 2 aktywnych użytkowników
+    assert stats['All Teams']['utilization'] == 13.89
@@ -0,0 +1,84 @@
+from datetime import datetime
+import csv
+import gzip
+import io
+import os
+import pytest
+from app.extensions import db
+from app.models import User, Project, Worklog
+from app.models.issue import Issue
+from app.services.worklog_export import EXPORT_HEADERS, iter_worklog_rows, stream_csv, write_xlsx
+
+
+@pytest.fixture
+def worklogs(db_app):
+    alice = User(username='alice', email='alice@example.com', display_name='Alicja')
+    bob = User(username='bob', email='bob@example.com')
+    projects = [Project(name=k, jira_key=k, jira_id=str(i)) for i, k in enumerate(('AAA', 'BBB'))]
+    db.session.add_all([alice, bob] + projects)
+    db.session.flush()
+    issues = [Issue(jira_key=f'{p.jira_key}-1', jira_id=f'{p.id}1', project_id=p.id) for p in projects]
+    db.session.add_all(issues)
+    db.session.flush()
+    for day in range(1, 31):
+        for user, issue in ((alice, issues[0]), (bob, issues[1])):
+            db.session.add(Worklog(user_id=user.id, project_id=issue.project_id, issue_id=issue.id,
+                                   time_spent_seconds=5400, work_date=datetime(2026, 9, day, 10),
+                                   description=f'Praca {day}'))
+    db.session.commit()
+    return alice, bob
+
+
+def test_rows_are_filtered_by_range_user_and_project(worklogs):
+    """Wiersze eksportu respektują zakres dat, użytkownika i projekt."""
+    alice, bob = worklogs
+    rows = list(iter_worklog_rows(datetime(2026, 9, 1), datetime(2026, 9, 10), chunk_size=7))
+    assert len(rows) == 20
+    assert rows[0] == ('AAA', 'Alicja', 'AAA-1', 1.5, '2026-09-01', 'Praca 1')
+
+    assert {r[1] for r in iter_worklog_rows(datetime(2026, 9, 1), datetime(2026, 9, 30), user_id=bob.id)} == {'bob'}
+    assert len(list(iter_worklog_rows(datetime(2026, 9, 30), datetime(2026, 9, 30), project_key='BBB'))) == 1
+
+
+def test_csv_stream_is_chunked_and_gzip_round_trips(worklogs):
+    """CSV jest wysyłany w kawałkach, a wersja gzip rozpakowuje się do tej samej treści."""
+    start, end = datetime(2026, 9, 1), datetime(2026, 9, 30)
+    chunks = list(stream_csv(iter_worklog_rows(start, end), chunk_size=10))
+    assert len(chunks) == 6
+    plain = b''.join(chunks)
+
+    compressed = b''.join(stream_csv(iter_worklog_rows(start, end), compress=True, chunk_size=10))
+    assert gzip.decompress(compressed) == plain
+
+    rows = list(csv.reader(io.StringIO(plain.decode('utf-8-sig'))))
+    assert rows[0] == EXPORT_HEADERS
+    assert len(rows) == 61
+
+
+def test_xlsx_written_in_constant_memory_mode(worklogs, tmp_path):
+    """Plik XLSX zawiera wszystkie wiersze zapisane w trybie constant_memory."""
+    openpyxl = pytest.importorskip('openpyxl')
+    path = write_xlsx(iter_worklog_rows(datetime(2026, 9, 1), datetime(2026, 9, 30)), directory=str(tmp_path))
+    try:
+        sheet = openpyxl.load_workbook(path, read_only=True).active
+        rows = list(sheet.iter_rows(values_only=True))
+    finally:
+        os.remove(path)
+    assert list(rows[0]) == EXPORT_HEADERS
+    assert len(rows) == 61
+    assert rows[-1] == ('BBB', 'bob', 'BBB-1', 1.5, '2026-09-30', 'Praca 30')
+
+
+def test_team_stats_csv_uses_the_streaming_writer(db_app):
+    """Eksport statystyk projektu jest strumieniowany wspólnym zapisem CSV z własnymi nagłówkami."""
+    from app.utils.export import export_project_stats_csv
+    stats = {'users': {'alice': {'hours': 6.0, 'tasks': 2}, 'bob': {'hours': 2.0, 'tasks': 1}},
+             'total_hours': 8.0, 'total_tasks': 3, 'avg_hours_per_user': 4.0}
+    response = export_project_stats_csv(None, 'AAA', stats, datetime(2026, 9, 1), datetime(2026, 9, 30))
+
+    assert response.is_streamed
+    assert 'project_stats_AAA_20260901.csv' in response.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(response.get_data().decode('utf-8-sig'))))
+    assert rows[:3] == [['Użytkownik', 'Godziny', 'Zadania', 'Udział (%)'],
+                        ['alice', '6.0', '2', '75.0'], ['bob', '2.0', '1', '25.0']]
+    assert rows[-1] == ['Średnio godzin na użytkownika', '4.0']
@@ -0,0 +1,78 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import event, text
+from app.extensions import db, cache
+from app.models import User, Project, Worklog
+from app.models.issue import Issue
+from app.utils.pagination import keyset_page, encode_cursor, decode_cursor
+
+
+@pytest.fixture
+def worklogs(db_app):
+    users = [User(username=f'user{i}', email=f'user{i}@example.com') for i in range(3)]
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    db.session.add_all(users + [project])
+    db.session.flush()
+    issue = Issue(jira_key='P-1', jira_id='1', project_id=project.id)
+    db.session.add(issue)
+    db.session.flush()
+    # Po kilka worklogów na dzień, żeby klucz sortowania miał remisy
+    for i in range(47):
+        db.session.add(Worklog(user_id=users[i % 3].id, project_id=project.id, issue_id=issue.id,
+                               time_spent_seconds=600 * (i % 5 + 1), work_date=datetime(2026, 10, i // 4 + 1, 9)))
+    db.session.commit()
+    return users, project
+
+
+def walk(sort_field, descending, per_page=10):
+    pages, cursor = [], None
+    while True:
+        query = db.session.query(Worklog, sort_field)
+        items, cursor = keyset_page(query, sort_field, Worklog.id, per_page, descending=descending, cursor=cursor)
+        pages.append([w.id for w in items])
+        if not cursor:
+            return pages
+
+
+@pytest.mark.parametrize('column, descending', [('work_date', True), ('time_spent_seconds', False)])
+def test_keyset_pages_cover_every_row_once_in_order(worklogs, column, descending):
+    """Kolejne strony po kursorze dają wszystkie wiersze dokładnie raz, w kolejności sortowania."""
+    sort_field = getattr(Worklog, column)
+    pages = walk(sort_field, descending)
+
+    order = [sort_field.desc(), Worklog.id.desc()] if descending else [sort_field.asc(), Worklog.id.asc()]
+    expected = [w.id for w in Worklog.query.order_by(*order)]
+    assert [i for page in pages for i in page] == expected
+    assert [len(p) for p in pages] == [10, 10, 10, 10, 7]
+
+
+def test_cursor_round_trip_and_seek_uses_index(worklogs):
+    """Kursor koduje datę i id, a strona po kursorze korzysta z indeksu (work_date, id)."""
+    value, row_id = decode_cursor(encode_cursor(datetime(2026, 10, 3, 9), 17))
+    assert (value, row_id) == (datetime(2026, 10, 3, 9), 17)
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM worklogs WHERE (work_date, id) < ('2026-10-03 09:00:00', 17) "
+        "ORDER BY work_date DESC, id DESC LIMIT 11"
+    )).all()
+    assert any('idx_worklogs_work_date_id' in row[-1] for row in plan)
+
+
+def test_stats_come_from_rollup_and_are_cached(worklogs):
+    """Statystyki listy worklogów liczone są z rollupu i cache'owane dla zestawu filtrów."""
+    from flask import current_app
+    from app.routes.admin import _worklog_stats
+    cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+    users, project = worklogs
+
+    stats = _worklog_stats(datetime(2026, 10, 1), datetime(2026, 10, 31), project.id, None)
+    assert stats['total_count'] == 47
+    assert stats['active_users'] == 3
+
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    assert _worklog_stats(datetime(2026, 10, 1), datetime(2026, 10, 31), project.id, None) == stats
+    assert statements == []
+    assert _worklog_stats(None, None, None, users[0].id)['total_count'] == 16
@@ -0,0 +1,83 @@
+from datetime import date, datetime
+import pytest
+from app.extensions import db
+from app.models import User, Project, Worklog, WorklogDailyRollup
+from app.models.issue import Issue
+from app.services.worklog_ingestion import WorklogIngestor
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def data(db_app):
+    alice = User(username='alice', email='alice@example.com')
+    bob = User(username='bob', email='bob@example.com')
+    project = Project(name='Project', jira_key='P', jira_id='10')
+    db.session.add_all([alice, bob, project])
+    db.session.flush()
+    issues = [Issue(jira_key=f'P-{i}', jira_id=str(i), project_id=project.id) for i in (1, 2)]
+    db.session.add_all(issues)
+    db.session.commit()
+    return alice, bob, project, issues
+
+
+def rollup_rows():
+    return {(r.work_date, r.user_id): (r.time_spent_seconds, r.entry_count, r.issue_count)
+            for r in WorklogDailyRollup.query.all()}
+
+
+def test_orm_writes_keep_rollup_current(data):
+    """Dodanie, zmiana i usunięcie worklogu przez ORM aktualizuje zagregowane wiersze."""
+    alice, bob, project, issues = data
+    first = Worklog(user_id=alice.id, project_id=project.id, issue_id=issues[0].id,
+                    time_spent_seconds=3600, work_date=datetime(2026, 10, 1, 9))
+    second = Worklog(user_id=alice.id, project_id=project.id, issue_id=issues[0].id,
+                     time_spent_seconds=1800, work_date=datetime(2026, 10, 1, 14))
+    db.session.add_all([first, second])
+    db.session.commit()
+    assert rollup_rows() == {(date(2026, 10, 1), alice.id): (5400, 2, 1)}
+
+    second.work_date = datetime(2026, 10, 2)
+    second.user_id = bob.id
+    db.session.commit()
+    assert rollup_rows() == {(date(2026, 10, 1), alice.id): (3600, 1, 1),
+                             (date(2026, 10, 2), bob.id): (1800, 1, 1)}
+
+    db.session.delete(first)
+    db.session.commit()
+    assert rollup_rows() == {(date(2026, 10, 2), bob.id): (1800, 1, 1)}
+
+
+def test_ingestion_updates_rollup_and_reports_read_it(data):
+    """Zbiorczy zapis z synchronizacji odświeża agregaty, a raporty liczą z nich unikalne zadania."""
+    alice, bob, project, issues = data
+
+    def entry(worklog_id, issue, day, seconds):
+        return {
+            'worklog': {'id': worklog_id, 'timeSpentSeconds': seconds, 'started': f'{day}T09:00:00.000+0000',
+                        'author': {'name': 'alice', 'emailAddress': 'alice@example.com'}},
+            'issue_id': issue.jira_id, 'issue_key': issue.jira_key, 'issue_summary': None,
+            'project_id': project.id
+        }
+
+    stats = {'total': 0, 'created': 0, 'updated': 0, 'errors': 0, 'error_messages': []}
+    WorklogIngestor().ingest([entry(1, issues[0], '2026-10-01', 3600),
+                              entry(2, issues[1], '2026-10-01', 3600),
+                              entry(3, issues[0], '2026-10-02', 7200)], stats)
+    # Worklog przeniesiony na inny dzień znika z agregatu poprzedniego dnia
+    WorklogIngestor().ingest([entry(2, issues[1], '2026-10-03', 1800)], stats)
+    db.session.commit()
+
+    assert rollup_rows() == {(date(2026, 10, 1), alice.id): (3600, 1, 1),
+                             (date(2026, 10, 2), alice.id): (7200, 1, 1),
+                             (date(2026, 10, 3), alice.id): (1800, 1, 1)}
+
+    summary = WorklogDailyRollup.summarize(date(2026, 10, 1), date(2026, 10, 31), group_by=('user_id',))
+    assert summary == [{'user_id': alice.id, 'time_spent_seconds': 12600, 'entry_count': 3,
+                        'issue_count': 2, 'days': 3}]
+
+    report = ReportService.generate_project_report(datetime(2026, 10, 1), datetime(2026, 10, 31))
+    assert report['projects']['P']['users']['alice'] == {'hours': 3.5, 'tasks': 2}
+
+    WorklogDailyRollup.query.delete()
+    assert WorklogDailyRollup.rebuild() == 3
+    assert rollup_rows()[(date(2026, 10, 2), alice.id)] == (7200, 1, 1)
@@ -1,8 +1,12 @@
 from app import create_app
+from app.scheduler import start_scheduler
 
 # Create the application instance
 application = create_app()
 app = application  # for Flask CLI to find the app
 
+# JIRA sync triggers run in the web processes only (SCHEDULER_ENABLED)
+start_scheduler(application)
+
 if __name__ == "__main__":
     app.run() 
\ No newline at end of file